@@ -0,0 +1,41 @@
+"""Add lease columns to task_queue for concurrent multi-worker claiming.
+
+Workers claim rows with FOR UPDATE SKIP LOCKED and stamp worker_id +
+lease_expires_at. Rows stuck in 'processing' past their lease (crashed
+worker) are returned to the queue. The partial index keeps the reclaim
+scan limited to in-flight rows.
+
+Revision ID: 033
+Revises: 032
+Create Date: 2026-03-05
+"""
+import sqlalchemy as sa
+from alembic import op
+
+revision = "033"
+down_revision = "032"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "task_queue",
+        sa.Column("worker_id", sa.String(64), nullable=True),
+    )
+    op.add_column(
+        "task_queue",
+        sa.Column("lease_expires_at", sa.DateTime(timezone=True), nullable=True),
+    )
+    op.create_index(
+        "ix_task_queue_lease",
+        "task_queue",
+        ["lease_expires_at"],
+        postgresql_where="status = 'processing'",
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_task_queue_lease", table_name="task_queue")
+    op.drop_column("task_queue", "lease_expires_at")
+    op.drop_column("task_queue", "worker_id")
@@ -0,0 +1,43 @@
+"""Add scheduling lane to task_queue.
+
+Tasks are routed to express / normal / bulk lanes by task_type so the
+executor can give each lane its own worker budget. Existing rows are
+backfilled from the same mapping used by task_dispatch.TASK_LANES.
+
+Revision ID: 034
+Revises: 033
+Create Date: 2026-03-06
+"""
+import sqlalchemy as sa
+from alembic import op
+
+revision = "034"
+down_revision = "033"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "task_queue",
+        sa.Column("lane", sa.String(20), nullable=False, server_default="normal"),
+    )
+    op.execute(
+        "UPDATE task_queue SET lane = 'express' "
+        "WHERE task_type IN ('sms_retry', 'send_sms_followup')"
+    )
+    op.execute(
+        "UPDATE task_queue SET lane = 'bulk' "
+        "WHERE task_type IN ('enrich_prospect', 'enrich_email', 'generate_content', "
+        "'generate_ab_variants', 'send_winback_email')"
+    )
+    op.create_index(
+        "ix_task_queue_lane_dispatch",
+        "task_queue",
+        ["lane", "status", "scheduled_at"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_task_queue_lane_dispatch", table_name="task_queue")
+    op.drop_column("task_queue", "lane")
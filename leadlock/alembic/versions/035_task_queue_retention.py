@@ -0,0 +1,91 @@
+"""Task queue hot/cold split: archive table, daily rollups, pending-only dispatch index.
+
+Terminal task_queue rows older than the retention window are moved to
+task_queue_archive by the compactor and folded into per-day, per-type
+rollups for the fleet dashboard. The dispatch index becomes a partial
+index over pending rows only, so it stays small regardless of history.
+
+Revision ID: 035
+Revises: 034
+Create Date: 2026-03-07
+"""
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects.postgresql import UUID, JSONB
+
+revision = "035"
+down_revision = "034"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "task_queue_archive",
+        sa.Column("id", UUID(as_uuid=True), primary_key=True),
+        sa.Column("task_type", sa.String(50), nullable=False),
+        sa.Column("lane", sa.String(20), nullable=False, server_default="normal"),
+        sa.Column("status", sa.String(20), nullable=False),
+        sa.Column("priority", sa.Integer(), nullable=True),
+        sa.Column("retry_count", sa.Integer(), nullable=True),
+        sa.Column("payload", JSONB(), nullable=True),
+        sa.Column("result_data", JSONB(), nullable=True),
+        sa.Column("error_message", sa.Text(), nullable=True),
+        sa.Column("scheduled_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("started_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("completed_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("archived_at", sa.DateTime(timezone=True), server_default=sa.text("now()")),
+    )
+    op.create_index(
+        "ix_task_queue_archive_type_completed",
+        "task_queue_archive",
+        ["task_type", "completed_at"],
+    )
+    op.create_index(
+        "ix_task_queue_archive_archived_at",
+        "task_queue_archive",
+        ["archived_at"],
+    )
+
+    op.create_table(
+        "task_queue_daily_rollups",
+        sa.Column("id", UUID(as_uuid=True), primary_key=True, server_default=sa.text("gen_random_uuid()")),
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("task_type", sa.String(50), nullable=False),
+        sa.Column("status", sa.String(20), nullable=False),
+        sa.Column("task_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("retry_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("total_duration_s", sa.Float(), nullable=False, server_default="0.0"),
+        sa.Column("timed_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("max_duration_s", sa.Float(), nullable=False, server_default="0.0"),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text("now()")),
+    )
+    op.create_index(
+        "ix_task_queue_rollups_day_type_status",
+        "task_queue_daily_rollups",
+        ["day", "task_type", "status"],
+        unique=True,
+    )
+
+    op.drop_index("ix_task_queue_lane_dispatch", table_name="task_queue")
+    op.create_index(
+        "ix_task_queue_pending",
+        "task_queue",
+        ["lane", "scheduled_at", "priority"],
+        postgresql_where="status = 'pending'",
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_task_queue_pending", table_name="task_queue")
+    op.create_index(
+        "ix_task_queue_lane_dispatch",
+        "task_queue",
+        ["lane", "status", "scheduled_at"],
+    )
+    op.drop_index("ix_task_queue_rollups_day_type_status", table_name="task_queue_daily_rollups")
+    op.drop_table("task_queue_daily_rollups")
+    op.drop_index("ix_task_queue_archive_archived_at", table_name="task_queue_archive")
+    op.drop_index("ix_task_queue_archive_type_completed", table_name="task_queue_archive")
+    op.drop_table("task_queue_archive")
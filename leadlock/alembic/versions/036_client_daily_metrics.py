@@ -0,0 +1,116 @@
+"""Daily metric rollups for the client dashboard and ROI pages.
+
+client_daily_metrics holds lead totals per client, UTC day, source, state
+and qualify variant; client_daily_messages holds conversation counts per
+client and day. Both are backfilled from history here and then maintained
+incrementally by the metrics rollup worker, which scans leads by
+updated_at (new index) past its watermark.
+
+Revision ID: 036
+Revises: 035
+Create Date: 2026-03-08
+"""
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects.postgresql import UUID
+
+revision = "036"
+down_revision = "035"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "client_daily_metrics",
+        sa.Column("id", UUID(as_uuid=True), primary_key=True, server_default=sa.text("gen_random_uuid()")),
+        sa.Column(
+            "client_id", UUID(as_uuid=True),
+            sa.ForeignKey("clients.id", ondelete="CASCADE"), nullable=False,
+        ),
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("source", sa.String(50), nullable=False),
+        sa.Column("state", sa.String(30), nullable=False),
+        sa.Column("qualify_variant", sa.String(10), nullable=False, server_default=""),
+        sa.Column("leads", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("responded", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("response_ms_total", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.Column("responded_under_5s", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("responded_under_10s", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("responded_under_30s", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("responded_under_60s", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("ai_cost_usd", sa.Float(), nullable=False, server_default="0.0"),
+        sa.Column("sms_cost_usd", sa.Float(), nullable=False, server_default="0.0"),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text("now()")),
+    )
+    op.create_index(
+        "ix_client_daily_metrics_cell",
+        "client_daily_metrics",
+        ["client_id", "day", "source", "state", "qualify_variant"],
+        unique=True,
+    )
+
+    op.create_table(
+        "client_daily_messages",
+        sa.Column("id", UUID(as_uuid=True), primary_key=True, server_default=sa.text("gen_random_uuid()")),
+        sa.Column(
+            "client_id", UUID(as_uuid=True),
+            sa.ForeignKey("clients.id", ondelete="CASCADE"), nullable=False,
+        ),
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("messages", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text("now()")),
+    )
+    op.create_index(
+        "ix_client_daily_messages_client_day",
+        "client_daily_messages",
+        ["client_id", "day"],
+        unique=True,
+    )
+
+    op.create_index("ix_leads_updated_at", "leads", ["updated_at"])
+
+    op.execute(
+        """
+        INSERT INTO client_daily_metrics (
+            client_id, day, source, state, qualify_variant, leads,
+            responded, response_ms_total, responded_under_5s, responded_under_10s,
+            responded_under_30s, responded_under_60s, ai_cost_usd, sms_cost_usd
+        )
+        SELECT
+            client_id,
+            (created_at AT TIME ZONE 'UTC')::date,
+            source,
+            state,
+            COALESCE(qualify_variant, ''),
+            COUNT(*),
+            COUNT(first_response_ms),
+            COALESCE(SUM(first_response_ms), 0),
+            COUNT(*) FILTER (WHERE first_response_ms < 5000),
+            COUNT(*) FILTER (WHERE first_response_ms < 10000),
+            COUNT(*) FILTER (WHERE first_response_ms < 30000),
+            COUNT(*) FILTER (WHERE first_response_ms < 60000),
+            COALESCE(SUM(total_ai_cost_usd), 0),
+            COALESCE(SUM(total_sms_cost_usd), 0)
+        FROM leads
+        WHERE created_at IS NOT NULL
+        GROUP BY 1, 2, 3, 4, 5
+        """
+    )
+    op.execute(
+        """
+        INSERT INTO client_daily_messages (client_id, day, messages)
+        SELECT client_id, (created_at AT TIME ZONE 'UTC')::date, COUNT(*)
+        FROM conversations
+        WHERE created_at IS NOT NULL
+        GROUP BY 1, 2
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_leads_updated_at", table_name="leads")
+    op.drop_index("ix_client_daily_messages_client_day", table_name="client_daily_messages")
+    op.drop_table("client_daily_messages")
+    op.drop_index("ix_client_daily_metrics_cell", table_name="client_daily_metrics")
+    op.drop_table("client_daily_metrics")
@@ -0,0 +1,63 @@
+"""Daily send-time rollup for smart send timing.
+
+send_time_stats holds email_opened signal counts per UTC day, trade, state
+and time bucket. It is backfilled from learning_signals here and then
+maintained incrementally by the metrics rollup worker; get_best_send_time
+serves from an in-memory model summed from these rows.
+
+Revision ID: 037
+Revises: 036
+Create Date: 2026-03-09
+"""
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects.postgresql import UUID
+
+revision = "037"
+down_revision = "036"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "send_time_stats",
+        sa.Column("id", UUID(as_uuid=True), primary_key=True, server_default=sa.text("gen_random_uuid()")),
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("trade", sa.String(50), nullable=False),
+        sa.Column("state", sa.String(10), nullable=False, server_default=""),
+        sa.Column("time_bucket", sa.String(20), nullable=False),
+        sa.Column("samples", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("value_sum", sa.Float(), nullable=False, server_default="0.0"),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text("now()")),
+    )
+    op.create_index(
+        "ix_send_time_stats_cell",
+        "send_time_stats",
+        ["day", "trade", "state", "time_bucket"],
+        unique=True,
+    )
+
+    op.execute(
+        """
+        INSERT INTO send_time_stats (day, trade, state, time_bucket, samples, value_sum)
+        SELECT
+            (created_at AT TIME ZONE 'UTC')::date,
+            LEFT(dimensions->>'trade', 50),
+            LEFT(COALESCE(dimensions->>'state', ''), 10),
+            LEFT(dimensions->>'time_bucket', 20),
+            COUNT(*),
+            COALESCE(SUM(value), 0)
+        FROM learning_signals
+        WHERE signal_type = 'email_opened'
+          AND created_at IS NOT NULL
+          AND dimensions->>'trade' IS NOT NULL
+          AND dimensions->>'time_bucket' IS NOT NULL
+        GROUP BY 1, 2, 3, 4
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_send_time_stats_cell", table_name="send_time_stats")
+    op.drop_table("send_time_stats")
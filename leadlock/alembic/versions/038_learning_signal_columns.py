@@ -0,0 +1,66 @@
+"""Typed, indexed columns for hot LearningSignal dimensions.
+
+trade, state, time_bucket, step and lead_id are copied out of the
+dimensions JSONB into columns with composite indexes, so analytics queries
+can use index scans instead of jsonb_extract_path_text over every row.
+New signals fill the columns at write time. Existing email_opened rows get
+trade, state and time_bucket here, before any worker runs: the send-time
+rollup rebuilds whole days from these columns, and a day rebuilt while they
+were still NULL would drop its older opens. Everything else is filled in
+batches by scripts/backfill_learning_signal_columns.py, run after upgrade.
+
+Revision ID: 038
+Revises: 037
+Create Date: 2026-03-10
+"""
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects.postgresql import UUID
+
+revision = "038"
+down_revision = "037"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("learning_signals", sa.Column("trade", sa.String(50), nullable=True))
+    op.add_column("learning_signals", sa.Column("state", sa.String(10), nullable=True))
+    op.add_column("learning_signals", sa.Column("time_bucket", sa.String(20), nullable=True))
+    op.add_column("learning_signals", sa.Column("step", sa.Integer(), nullable=True))
+    op.add_column("learning_signals", sa.Column("lead_id", UUID(as_uuid=True), nullable=True))
+
+    op.execute(
+        """
+        UPDATE learning_signals
+        SET trade = LEFT(NULLIF(dimensions->>'trade', ''), 50),
+            state = LEFT(NULLIF(dimensions->>'state', ''), 10),
+            time_bucket = LEFT(NULLIF(dimensions->>'time_bucket', ''), 20)
+        WHERE signal_type = 'email_opened'
+        """
+    )
+
+    op.create_index(
+        "ix_learning_signals_type_trade_state_bucket",
+        "learning_signals",
+        ["signal_type", "trade", "state", "time_bucket"],
+        postgresql_include=["value"],
+    )
+    op.create_index(
+        "ix_learning_signals_type_step",
+        "learning_signals",
+        ["signal_type", "step"],
+        postgresql_include=["value"],
+    )
+    op.create_index("ix_learning_signals_lead_id", "learning_signals", ["lead_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_learning_signals_lead_id", table_name="learning_signals")
+    op.drop_index("ix_learning_signals_type_step", table_name="learning_signals")
+    op.drop_index("ix_learning_signals_type_trade_state_bucket", table_name="learning_signals")
+    op.drop_column("learning_signals", "lead_id")
+    op.drop_column("learning_signals", "step")
+    op.drop_column("learning_signals", "time_bucket")
+    op.drop_column("learning_signals", "state")
+    op.drop_column("learning_signals", "trade")
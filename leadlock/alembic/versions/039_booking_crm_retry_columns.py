@@ -0,0 +1,62 @@
+"""Indexed CRM retry schedule on bookings.
+
+crm_sync kept its retry count and next-retry time in the metadata JSONB
+and selected due retries with a string comparison on
+metadata->>'crm_next_retry_at', which no index could serve. Both move to
+columns, and (crm_sync_status, crm_next_retry_at) is indexed for the
+worker's claim query. Existing retry state is copied out of metadata.
+
+Revision ID: 039
+Revises: 038
+Create Date: 2026-03-12
+"""
+import sqlalchemy as sa
+from alembic import op
+
+revision = "039"
+down_revision = "038"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "bookings",
+        sa.Column("crm_retry_count", sa.Integer(), nullable=False, server_default="0"),
+    )
+    op.add_column(
+        "bookings",
+        sa.Column("crm_next_retry_at", sa.DateTime(timezone=True), nullable=True),
+    )
+
+    op.execute(
+        """
+        UPDATE bookings
+        SET crm_retry_count = COALESCE((metadata->>'crm_retry_count')::int, 0),
+            crm_next_retry_at = (metadata->>'crm_next_retry_at')::timestamptz,
+            metadata = metadata - 'crm_retry_count' - 'crm_next_retry_at'
+        WHERE metadata ? 'crm_retry_count' OR metadata ? 'crm_next_retry_at'
+        """
+    )
+
+    op.create_index(
+        "ix_bookings_crm_sync_status_next_retry",
+        "bookings",
+        ["crm_sync_status", "crm_next_retry_at"],
+    )
+
+
+def downgrade() -> None:
+    op.execute(
+        """
+        UPDATE bookings
+        SET metadata = COALESCE(metadata, '{}'::jsonb) || jsonb_strip_nulls(jsonb_build_object(
+            'crm_retry_count', crm_retry_count,
+            'crm_next_retry_at', crm_next_retry_at
+        ))
+        WHERE crm_retry_count > 0 OR crm_next_retry_at IS NOT NULL
+        """
+    )
+    op.drop_index("ix_bookings_crm_sync_status_next_retry", table_name="bookings")
+    op.drop_column("bookings", "crm_next_retry_at")
+    op.drop_column("bookings", "crm_retry_count")
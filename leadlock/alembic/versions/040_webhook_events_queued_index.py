@@ -0,0 +1,29 @@
+"""Add partial index for queued inbound SMS webhook events.
+
+The Twilio SMS webhook now records events as 'queued' and hands them to
+the inbound_sms worker, which periodically re-queues events left waiting.
+Index covers: (received_at) WHERE processing_status = 'queued'.
+
+Revision ID: 040
+Revises: 039
+Create Date: 2026-03-13
+"""
+from alembic import op
+
+revision = "040"
+down_revision = "039"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_webhook_events_queued",
+        "webhook_events",
+        ["received_at"],
+        postgresql_where="processing_status = 'queued'",
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_webhook_events_queued", table_name="webhook_events")
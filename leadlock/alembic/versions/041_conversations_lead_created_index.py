@@ -0,0 +1,29 @@
+"""Add composite (lead_id, created_at) index on conversations.
+
+The qualify/book agents now load only the last few turns of a lead's
+conversation (services/transcript.py) with
+ORDER BY created_at DESC LIMIT n. This index serves that keyset read
+without sorting the lead's whole history.
+
+Revision ID: 041
+Revises: 040
+Create Date: 2026-03-14
+"""
+from alembic import op
+
+revision = "041"
+down_revision = "040"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_conversations_lead_created",
+        "conversations",
+        ["lead_id", "created_at"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_conversations_lead_created", table_name="conversations")
@@ -0,0 +1,28 @@
+"""Add composite (client_id, appointment_date) index on bookings.
+
+The slot inventory (services/slot_inventory.py) seeds and reconciles a
+client's per-day booking counts with a GROUP BY over that client's
+bookings on a set of appointment dates.
+
+Revision ID: 042
+Revises: 041
+Create Date: 2026-03-15
+"""
+from alembic import op
+
+revision = "042"
+down_revision = "041"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_bookings_client_appointment_date",
+        "bookings",
+        ["client_id", "appointment_date"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_bookings_client_appointment_date", table_name="bookings")
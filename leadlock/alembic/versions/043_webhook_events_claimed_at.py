@@ -0,0 +1,37 @@
+"""Add claimed_at lease to webhook_events.
+
+The inbound_sms worker stamps claimed_at when it moves a queued event to
+'processing'. Events whose worker was interrupted mid-conductor stay in
+'processing'; the stale-event sweep reclaims them once the lease expires.
+Index covers: (claimed_at) WHERE processing_status = 'processing'
+AND claimed_at IS NOT NULL.
+
+Revision ID: 043
+Revises: 042
+Create Date: 2026-03-16
+"""
+import sqlalchemy as sa
+from alembic import op
+
+revision = "043"
+down_revision = "042"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "webhook_events",
+        sa.Column("claimed_at", sa.DateTime(timezone=True), nullable=True),
+    )
+    op.create_index(
+        "ix_webhook_events_processing_claimed",
+        "webhook_events",
+        ["claimed_at"],
+        postgresql_where="processing_status = 'processing' AND claimed_at IS NOT NULL",
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_webhook_events_processing_claimed", table_name="webhook_events")
+    op.drop_column("webhook_events", "claimed_at")
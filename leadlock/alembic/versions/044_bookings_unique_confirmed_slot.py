@@ -0,0 +1,89 @@
+"""Add partial unique index on confirmed bookings per client slot.
+
+The slot inventory (services/slot_inventory.py) reserves slots in Redis
+before a Booking commits. This index makes the database refuse a second
+confirmed booking for the same client, date and start time if the
+inventory is ever wrong. Bookings without a start time are not limited
+(NULLs are distinct).
+Index covers: (client_id, appointment_date, time_window_start)
+WHERE status = 'confirmed'.
+
+Before the inventory existed, every lead was offered the same open slots,
+so a database may already hold duplicate confirmed bookings. For each
+duplicated slot the earliest booking (created_at, then id) stays
+confirmed; the others are set to status 'conflict' and get a
+'booking_conflict' event_logs row (data.booking_id, data.kept_booking_id)
+so staff can rebook them. Nothing is deleted.
+
+The index is built CONCURRENTLY outside the migration transaction, so
+bookings stay writable while it builds.
+
+Revision ID: 044
+Revises: 043
+Create Date: 2026-03-16
+"""
+from alembic import op
+
+revision = "044"
+down_revision = "043"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        WITH ranked AS (
+            SELECT
+                id,
+                FIRST_VALUE(id) OVER slot AS kept_id,
+                ROW_NUMBER() OVER slot AS rn
+            FROM bookings
+            WHERE status = 'confirmed'
+              AND time_window_start IS NOT NULL
+            WINDOW slot AS (
+                PARTITION BY client_id, appointment_date, time_window_start
+                ORDER BY created_at, id
+            )
+        ),
+        demoted AS (
+            UPDATE bookings b
+            SET status = 'conflict', updated_at = now()
+            FROM ranked r
+            WHERE b.id = r.id AND r.rn > 1
+            RETURNING b.id, b.lead_id, b.client_id, b.appointment_date,
+                      b.time_window_start, r.kept_id
+        )
+        INSERT INTO event_logs (id, lead_id, client_id, action, status, message, data, created_at)
+        SELECT
+            gen_random_uuid(),
+            lead_id,
+            client_id,
+            'booking_conflict',
+            'skipped',
+            'Duplicate confirmed booking for ' || appointment_date || ' '
+                || time_window_start || ' marked conflict (slot already booked)',
+            jsonb_build_object('booking_id', id::text, 'kept_booking_id', kept_id::text),
+            now()
+        FROM demoted
+        """
+    )
+
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "uq_bookings_client_slot_confirmed",
+            "bookings",
+            ["client_id", "appointment_date", "time_window_start"],
+            unique=True,
+            postgresql_where="status = 'confirmed'",
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "uq_bookings_client_slot_confirmed",
+            table_name="bookings",
+            postgresql_concurrently=True,
+        )
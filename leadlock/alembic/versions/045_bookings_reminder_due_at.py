@@ -0,0 +1,28 @@
+"""Add reminder_due_at to bookings.
+
+sms_dispatch stores the next permissible send instant here when quiet
+hours block a day-before reminder. The reminder scan picks the booking up
+once it passes, even when that is already the appointment day.
+
+Revision ID: 045
+Revises: 044
+Create Date: 2026-03-16
+"""
+import sqlalchemy as sa
+from alembic import op
+
+revision = "045"
+down_revision = "044"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "bookings",
+        sa.Column("reminder_due_at", sa.DateTime(timezone=True), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("bookings", "reminder_due_at")
@@ -0,0 +1,100 @@
+"""
+Backfill the typed dimension columns on existing learning_signals rows.
+
+Migration 038 added trade, state, time_bucket, step and lead_id columns;
+new signals fill them at write time, and the migration itself fills the
+send-time columns of email_opened rows. This copies the values out of the
+dimensions JSONB for the remaining older rows, walking the table in
+primary-key order.
+
+Processes in batches to avoid holding a DB session open for hours.
+Commits per-batch so progress survives interruptions; re-running is safe.
+
+Usage:
+    python scripts/backfill_learning_signal_columns.py                # dry-run
+    python scripts/backfill_learning_signal_columns.py --commit       # persist changes
+    python scripts/backfill_learning_signal_columns.py --commit --batch-size 5000
+"""
+import argparse
+import asyncio
+import logging
+import uuid
+
+from sqlalchemy import select, func
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 2000
+
+_COLUMNS = ("trade", "state", "time_bucket", "step", "lead_id")
+
+
+async def backfill(commit: bool = False, batch_size: int = BATCH_SIZE) -> dict:
+    """Fill typed dimension columns from JSONB in id-ordered batches."""
+    from src.database import async_session_factory
+    from src.models.learning_signal import LearningSignal
+    from src.services.learning import dimension_columns
+
+    async with async_session_factory() as db:
+        total = (await db.execute(
+            select(func.count()).select_from(LearningSignal)
+        )).scalar() or 0
+    logger.info(
+        "Found %d learning signals%s", total, " [DRY RUN]" if not commit else "",
+    )
+
+    stats = {"scanned": 0, "updated": 0}
+    last_id = uuid.UUID(int=0)
+
+    while True:
+        async with async_session_factory() as db:
+            result = await db.execute(
+                select(LearningSignal)
+                .where(LearningSignal.id > last_id)
+                .order_by(LearningSignal.id)
+                .limit(batch_size)
+            )
+            signals = list(result.scalars().all())
+            if not signals:
+                break
+
+            for signal in signals:
+                values = dimension_columns(signal.dimensions)
+                changed = False
+                for column in _COLUMNS:
+                    if getattr(signal, column) is None and values[column] is not None:
+                        setattr(signal, column, values[column])
+                        changed = True
+                if changed:
+                    stats["updated"] += 1
+
+            stats["scanned"] += len(signals)
+            last_id = signals[-1].id
+            if commit:
+                await db.commit()
+            logger.info(
+                "Batch done (%d/%d scanned, %d updated)",
+                stats["scanned"], total, stats["updated"],
+            )
+
+        if len(signals) < batch_size:
+            break
+
+    if not commit:
+        logger.info("DRY RUN — no changes persisted. Use --commit to apply.")
+    logger.info("Summary: %d scanned, %d updated", stats["scanned"], stats["updated"])
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backfill typed learning signal dimension columns")
+    parser.add_argument("--commit", action="store_true", help="Persist changes (default: dry-run)")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE, help="Rows per batch")
+    args = parser.parse_args()
+
+    asyncio.run(backfill(commit=args.commit, batch_size=args.batch_size))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+"""
+Run a standalone task-queue executor.
+
+The API process that owns the background-worker lock already runs one
+executor. Start this in additional processes or containers to drain the
+task_queue faster: claims use FOR UPDATE SKIP LOCKED with per-row leases,
+so any number of executors can run side by side, and rows left behind by
+a crashed executor are reclaimed once their lease expires.
+
+Usage:
+    python scripts/run_task_worker.py
+    python scripts/run_task_worker.py --concurrency 32
+"""
+import argparse
+import asyncio
+import logging
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+logger = logging.getLogger(__name__)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a standalone task-queue executor")
+    parser.add_argument(
+        "--concurrency", type=int, default=0,
+        help="Max handlers in flight in this process (0 = default)",
+    )
+    args = parser.parse_args()
+
+    from src.workers import task_processor
+
+    if args.concurrency > 0:
+        task_processor.MAX_CONCURRENT_TASKS = args.concurrency
+
+    logger.info("Starting standalone task executor (worker=%s)", task_processor.WORKER_ID)
+    try:
+        asyncio.run(task_processor.run_task_processor())
+    except KeyboardInterrupt:
+        logger.info("Task executor stopped")
+
+
+if __name__ == "__main__":
+    main()
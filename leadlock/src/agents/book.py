@@ -7,7 +7,7 @@ import logging
 from datetime import date, time, timedelta
 from typing import Optional
 from src.services.ai import generate_response, parse_json_content
-from src.services.scheduling import generate_available_slots
+from src.services.scheduling import TimeSlot, generate_available_slots
 from src.schemas.agent_responses import BookResponse
 from src.prompts.humanizer import SMS_HUMANIZER
 
@@ -68,28 +68,30 @@ async def process_booking(
     hours_config: dict,
     conversation_history: list[dict],
     booking_url: Optional[str] = None,
+    slots: Optional[list[TimeSlot]] = None,
 ) -> BookResponse:
     """
-    Process a booking request. Generates available slots and uses AI to
-    negotiate the appointment with the lead.
+    Process a booking request. Uses AI to negotiate the appointment with the
+    lead from `slots` (open slots from the slot inventory), or from slots
+    generated off the config when none are given.
     """
-    # Generate available slots
-    saturday_hours = None
-    sat_config = hours_config.get("saturday")
-    if sat_config:
-        saturday_hours = {"start": sat_config.get("start", "08:00"), "end": sat_config.get("end", "14:00")}
-
-    slots = generate_available_slots(
-        start_date=date.today(),
-        days_ahead=scheduling_config.get("advance_booking_days", 14),
-        business_hours_start=hours_config.get("business", {}).get("start", "07:00"),
-        business_hours_end=hours_config.get("business", {}).get("end", "18:00"),
-        slot_duration_minutes=scheduling_config.get("slot_duration_minutes", 120),
-        buffer_minutes=scheduling_config.get("buffer_minutes", 30),
-        max_daily_bookings=scheduling_config.get("max_daily_bookings", 8),
-        team_members=team_members,
-        saturday_hours=saturday_hours,
-    )
+    if slots is None:
+        saturday_hours = None
+        sat_config = hours_config.get("saturday")
+        if sat_config:
+            saturday_hours = {"start": sat_config.get("start", "08:00"), "end": sat_config.get("end", "14:00")}
+
+        slots = generate_available_slots(
+            start_date=date.today(),
+            days_ahead=scheduling_config.get("advance_booking_days", 14),
+            business_hours_start=hours_config.get("business", {}).get("start", "07:00"),
+            business_hours_end=hours_config.get("business", {}).get("end", "18:00"),
+            slot_duration_minutes=scheduling_config.get("slot_duration_minutes", 120),
+            buffer_minutes=scheduling_config.get("buffer_minutes", 30),
+            max_daily_bookings=scheduling_config.get("max_daily_bookings", 8),
+            team_members=team_members,
+            saturday_hours=saturday_hours,
+        )
 
     # Format slots for the prompt (show next 10)
     slots_text = ""
@@ -204,3 +206,19 @@ def _fallback_booking(slots: list) -> BookResponse:
         needs_human_handoff=True,
         internal_notes="AI fallback - no slots available",
     )
+
+
+def slot_taken_message(slots: list) -> str:
+    """Reply when another conversation booked the confirmed slot first."""
+    if slots:
+        slot = slots[0]
+        tech_text = f" with {slot.tech_name}" if slot.tech_name else ""
+        return (
+            f"Sorry, that time just got booked. The next opening is "
+            f"{slot.date.strftime('%A, %B %d')} from {slot.to_display()}{tech_text}. "
+            f"Would that work?"
+        )
+    return (
+        "Sorry, that time just got booked. Let me check our schedule and "
+        "get back to you with another time."
+    )
@@ -13,14 +13,15 @@ State machine:
 """
 import asyncio
 import logging
-import uuid
 from datetime import datetime, timezone
 from typing import Optional
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, and_
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
 
 from src.models.lead import Lead
 from src.models.client import Client
+from src.models.booking import Booking
 from src.models.consent import ConsentRecord
 from src.models.conversation import Conversation
 from src.models.event_log import EventLog
@@ -33,15 +34,18 @@ from src.services.compliance import (
     get_ai_disclosure,
 )
 from src.services.sms import send_sms, mask_phone
+from src.services.client_cache import get_cached_client, get_client_config
 from src.services.phone_validation import normalize_phone
+from src.services import slot_inventory, transcript
 from src.utils.emergency import detect_emergency
 from src.utils.dedup import is_duplicate
 from src.utils.locks import lead_lock, LockTimeoutError
-from src.utils.metrics import Timer
+from src.utils.metrics import Timer, LatencyTrace, record_stage_samples
 from src.agents.intake import process_intake
 from src.agents.qualify import process_qualify
-from src.agents.book import process_booking
+from src.agents.book import process_booking, slot_taken_message
 from src.services.plan_limits import get_monthly_lead_limit
+from src.services.lead_usage import reserve_monthly_lead
 
 logger = logging.getLogger(__name__)
 
@@ -68,9 +72,13 @@ async def handle_new_lead(
     Process a brand new lead from any source.
     This is the entry point for the entire pipeline.
 
+    Each stage up to the first SMS is timed on a LatencyTrace so SLA misses
+    can be attributed to the stage that caused them.
+
     Returns: {"lead_id": str, "status": str, "response_ms": int}
     """
-    timer = Timer().start()
+    trace = LatencyTrace("new_lead")
+    timer = trace.timer
 
     # Normalize phone
     phone = normalize_phone(envelope.lead.phone)
@@ -80,8 +88,8 @@ async def handle_new_lead(
 
     # Dedup check + client load in parallel (independent operations)
     is_dupe, client = await asyncio.gather(
-        is_duplicate(envelope.client_id, phone, envelope.source),
-        db.get(Client, uuid.UUID(envelope.client_id)),
+        trace.timed("dedup", is_duplicate(envelope.client_id, phone, envelope.source)),
+        trace.timed("client_load", get_cached_client(envelope.client_id, db)),
     )
 
     if is_dupe:
@@ -101,19 +109,15 @@ async def handle_new_lead(
         logger.error("Client not found: %s", envelope.client_id)
         return {"lead_id": None, "status": "client_not_found", "response_ms": timer.elapsed_ms}
 
-    config = ClientConfig(**client.config) if client.config else ClientConfig()
+    config = get_client_config(client)
 
     # Enforce monthly lead limit based on plan tier
     monthly_limit = get_monthly_lead_limit(client.tier)
     if monthly_limit is not None:
-        from datetime import timezone as tz
-        month_start = datetime.now(tz.utc).replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-        leads_this_month = (await db.execute(
-            select(func.count(Lead.id)).where(
-                and_(Lead.client_id == client.id, Lead.created_at >= month_start)
-            )
-        )).scalar() or 0
-        if leads_this_month >= monthly_limit:
+        # O(1) Redis counter; reserves this lead's slot atomically
+        with trace.span("monthly_limit"):
+            allowed, leads_this_month = await reserve_monthly_lead(db, client.id, monthly_limit)
+        if not allowed:
             logger.warning(
                 "Client %s hit monthly lead limit (%d/%d, tier=%s)",
                 str(client.id)[:8], leads_this_month, monthly_limit, client.tier,
@@ -134,7 +138,8 @@ async def handle_new_lead(
         raw_consent_data=envelope.metadata.model_dump() if envelope.metadata else {},
     )
     db.add(consent)
-    await db.flush()
+    with trace.span("consent_flush"):
+        await db.flush()
 
     # Create lead record
     lead = Lead(
@@ -169,7 +174,8 @@ async def handle_new_lead(
         lead.score = 95
 
     db.add(lead)
-    await db.flush()
+    with trace.span("lead_flush"):
+        await db.flush()
 
     # Log lead creation
     db.add(EventLog(
@@ -180,7 +186,9 @@ async def handle_new_lead(
         data={"source": envelope.source, "is_emergency": lead.is_emergency},
     ))
 
-    # Record inbound message if present
+    # Record inbound message if present. A new lead has no cached transcript
+    # yet, so there is nothing to append to - the first recent_turns() call
+    # builds it from these rows.
     if envelope.inbound_message:
         inbound_conv = Conversation(
             lead_id=lead.id,
@@ -197,17 +205,19 @@ async def handle_new_lead(
 
     # SPLIT COMMIT: Persist lead + consent + inbound conversation immediately
     # so the record survives even if SMS send fails or process crashes
-    await db.commit()
+    with trace.span("commit"):
+        await db.commit()
 
     # Check for prior opt-out on this phone+client before responding
-    prior_optout_result = await db.execute(
-        select(ConsentRecord).where(
-            ConsentRecord.phone == phone,
-            ConsentRecord.client_id == client.id,
-            ConsentRecord.opted_out == True,
-            ConsentRecord.id != consent.id,  # Exclude the just-created record
-        ).limit(1)
-    )
+    with trace.span("optout_lookup"):
+        prior_optout_result = await db.execute(
+            select(ConsentRecord).where(
+                ConsentRecord.phone == phone,
+                ConsentRecord.client_id == client.id,
+                ConsentRecord.opted_out == True,
+                ConsentRecord.id != consent.id,  # Exclude the just-created record
+            ).limit(1)
+        )
     prior_optout = prior_optout_result.scalar_one_or_none()
 
     # Run compliance check before responding
@@ -236,15 +246,16 @@ async def handle_new_lead(
         }
 
     # Generate intake response (template-based, <2ms)
-    intake_response = await process_intake(
-        first_name=lead.first_name,
-        service_type=lead.service_type,
-        source=envelope.source,
-        business_name=client.business_name,
-        rep_name=config.persona.rep_name,
-        message_text=message_text,
-        custom_emergency_keywords=config.emergency_keywords,
-    )
+    with trace.span("template_render"):
+        intake_response = await process_intake(
+            first_name=lead.first_name,
+            service_type=lead.service_type,
+            source=envelope.source,
+            business_name=client.business_name,
+            rep_name=config.persona.rep_name,
+            message_text=message_text,
+            custom_emergency_keywords=config.emergency_keywords,
+        )
 
     # Content compliance check on the actual message
     from src.services.compliance import check_content_compliance
@@ -271,13 +282,14 @@ async def handle_new_lead(
 
     # SEND THE SMS - critical path, no retries to avoid blocking webhook
     logger.info("Pre-SMS overhead: %dms (lead=%s)", timer.elapsed_ms, str(lead.id)[:8])
-    sms_result = await send_sms(
-        to=phone,
-        body=sms_body,
-        from_phone=client.twilio_phone,
-        messaging_service_sid=client.twilio_messaging_service_sid,
-        no_retry=True,
-    )
+    with trace.span("sms_send"):
+        sms_result = await send_sms(
+            to=phone,
+            body=sms_body,
+            from_phone=client.twilio_phone,
+            messaging_service_sid=client.twilio_messaging_service_sid,
+            no_retry=True,
+        )
 
     # On transient failure, enqueue background retry instead of blocking
     if sms_result.get("status") == "transient_failure":
@@ -294,7 +306,8 @@ async def handle_new_lead(
             str(lead.id)[:8], sms_result.get("error_code"),
         )
 
-    response_ms = timer.stop()
+    from src.config import get_settings
+    response_ms = trace.finish(target_ms=get_settings().lead_response_target_ms)
 
     # Record outbound message
     outbound_conv = Conversation(
@@ -336,10 +349,12 @@ async def handle_new_lead(
             "segments": sms_result.get("segments"),
             "is_emergency": intake_response.is_emergency,
             "retry_enqueued": sms_result.get("status") == "transient_failure",
+            "stages_ms": trace.stages,
         },
     ))
 
     await db.commit()
+    await record_stage_samples(trace)
 
     logger.info(
         "Lead %s: intake sent in %dms via %s (emergency=%s, retry=%s)",
@@ -366,7 +381,7 @@ async def handle_inbound_reply(
     Uses Redis lock to prevent race conditions from simultaneous webhooks.
     """
     timer = Timer().start()
-    config = ClientConfig(**client.config) if client.config else ClientConfig()
+    config = get_client_config(client)
 
     # Check for opt-out FIRST - this overrides everything (no lock needed)
     if is_stop_keyword(message_text):
@@ -413,6 +428,7 @@ async def _process_reply_locked(
         delivery_status="received",
     )
     db.add(inbound_conv)
+    await transcript.append_turn(lead.id, "inbound", message_text)
     lead.total_messages_received += 1
     lead.last_inbound_at = datetime.now(timezone.utc)
     lead.conversation_turn += 1
@@ -513,6 +529,7 @@ async def _process_reply_locked(
                 ai_latency_ms=response.get("ai_latency_ms"),
             )
             db.add(outbound_conv)
+            await transcript.append_turn(lead.id, "outbound", response["message"])
 
             lead.total_messages_sent += 1
             lead.total_sms_cost_usd += sms_result.get("cost_usd", 0.0)
@@ -522,7 +539,26 @@ async def _process_reply_locked(
         else:
             logger.warning("Compliance blocked reply: %s", compliance.reason)
 
-    await db.commit()
+    # Taken from the agent response, not db.new: _route_to_book already
+    # flushed the Booking in a savepoint, so it is not in the new set
+    new_booking = response.get("booking") if response else None
+    try:
+        await db.commit()
+    except Exception:
+        # The booking never landed; give its reserved slot back
+        if new_booking is not None:
+            await slot_inventory.release(
+                new_booking.client_id, new_booking.appointment_date, new_booking.time_window_start,
+            )
+        raise
+
+    # Wake CRM sync and reminder scheduling now that the booking is committed
+    if new_booking is not None:
+        from src.workers.crm_sync import schedule_booking_sync
+        from src.workers.sms_dispatch import schedule_booking_reminders
+        await schedule_booking_sync(new_booking.id)
+        await schedule_booking_reminders(new_booking)
+
     return {"lead_id": str(lead.id), "status": lead.state, "response_ms": response_ms}
 
 
@@ -535,13 +571,8 @@ async def _route_to_qualify(
         from src.agents.qualify import select_variant
         lead.qualify_variant = select_variant(str(lead.id))
 
-    # Build conversation history
-    conversations = []
-    for conv in lead.conversations:
-        conversations.append({
-            "direction": conv.direction,
-            "content": conv.content,
-        })
+    # Build conversation history (last turns only, includes this message)
+    conversations = await transcript.recent_turns(db, lead.id)
 
     result = await process_qualify(
         lead_message=message,
@@ -622,11 +653,12 @@ async def _route_to_qualify(
 async def _route_to_book(
     db: AsyncSession, lead: Lead, client: Client, config: ClientConfig, message: str
 ) -> dict:
-    """Route lead to the booking agent."""
-    conversations = [
-        {"direction": c.direction, "content": c.content}
-        for c in lead.conversations
-    ]
+    """
+    Route lead to the booking agent. The response carries the Booking this
+    reply created (or None) so the caller can act on it once committed.
+    """
+    conversations = await transcript.recent_turns(db, lead.id)
+    booking = None
 
     # Resolve booking_url: ClientConfig first, then SalesEngineConfig fallback
     booking_url = config.booking_url
@@ -642,6 +674,13 @@ async def _route_to_book(
                 str(client.id)[:8], str(e),
             )
 
+    # Open slots from the inventory (None: process_booking builds them from config)
+    slots = None
+    try:
+        slots = await slot_inventory.available_slots(db, client, config)
+    except Exception as e:
+        logger.warning("Slot inventory lookup failed for client %s: %s", str(client.id)[:8], str(e))
+
     result = await process_booking(
         lead_message=message,
         first_name=lead.first_name or "there",
@@ -654,14 +693,11 @@ async def _route_to_book(
         hours_config=config.hours.model_dump() if config.hours else {},
         conversation_history=conversations,
         booking_url=booking_url,
+        slots=slots,
     )
 
     if result.booking_confirmed:
-        lead.state = "booked"
-        lead.current_agent = None
-
         # Create booking record (CRM sync happens asynchronously)
-        from src.models.booking import Booking
         parsed_date = None
         if result.appointment_date:
             try:
@@ -690,18 +726,47 @@ async def _route_to_book(
                         label, raw_val, str(lead.id)[:8],
                     )
 
+        appointment_date = parsed_date or datetime.now(timezone.utc).date()
+        if not await slot_inventory.reserve(db, client.id, config, appointment_date, parsed_start):
+            # Another conversation booked this slot after it was offered
+            logger.info(
+                "Slot %s %s taken before lead %s confirmed",
+                appointment_date, parsed_start, str(lead.id)[:8],
+            )
+            return _slot_taken_reply(db, lead, client, result, slots, appointment_date, parsed_start)
+
         booking = Booking(
             lead_id=lead.id,
             client_id=client.id,
-            appointment_date=parsed_date or datetime.now(timezone.utc).date(),
+            appointment_date=appointment_date,
             time_window_start=parsed_start,
             time_window_end=parsed_end,
             service_type=lead.service_type or "service",
             tech_name=result.tech_name,
             crm_sync_status="pending",
         )
-        db.add(booking)
+        # Flush the booking in a savepoint: if the database rejects it (the
+        # unique slot index, or any other flush error) the reserved slot is
+        # handed back here, instead of the error surfacing at a later
+        # autoflush outside the caller's commit guard
+        savepoint = None
+        try:
+            savepoint = await db.begin_nested()
+            db.add(booking)
+            await savepoint.commit()
+        except Exception as e:
+            await slot_inventory.release(client.id, appointment_date, parsed_start)
+            if savepoint is None or not isinstance(e, IntegrityError):
+                raise
+            await savepoint.rollback()
+            logger.info(
+                "Slot %s %s rejected by the database for lead %s",
+                appointment_date, parsed_start, str(lead.id)[:8],
+            )
+            return _slot_taken_reply(db, lead, client, result, slots, appointment_date, parsed_start)
 
+        lead.state = "booked"
+        lead.current_agent = None
         db.add(EventLog(
             lead_id=lead.id,
             client_id=client.id,
@@ -737,6 +802,30 @@ async def _route_to_book(
         "agent_id": "book",
         "ai_cost": getattr(result, "ai_cost_usd", 0.0),
         "ai_latency_ms": getattr(result, "ai_latency_ms", None),
+        "booking": booking,
+    }
+
+
+def _slot_taken_reply(
+    db: AsyncSession, lead: Lead, client: Client, result, slots, appointment_date, start,
+) -> dict:
+    """Keep the lead booking and offer the remaining slots instead of the taken one."""
+    lead.state = "booking"
+    db.add(EventLog(
+        lead_id=lead.id,
+        client_id=client.id,
+        action="booking_slot_taken",
+        message=f"Confirmed slot {appointment_date} {start} was already booked",
+    ))
+    alternatives = [
+        s for s in (slots or [])
+        if not (s.date == appointment_date and s.start == start)
+    ]
+    return {
+        "message": slot_taken_message(alternatives),
+        "agent_id": "book",
+        "ai_cost": getattr(result, "ai_cost_usd", 0.0),
+        "ai_latency_ms": getattr(result, "ai_latency_ms", None),
     }
 
 
@@ -767,6 +856,7 @@ async def _handle_opt_out(
         to_phone=client.twilio_phone or "",
         delivery_status="received",
     ))
+    await transcript.append_turn(lead.id, "inbound", message)
 
     db.add(EventLog(
         lead_id=lead.id,
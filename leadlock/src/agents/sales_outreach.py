@@ -47,9 +47,7 @@ async def _get_reply_rate_by_trade(trade_type: str) -> float:
                 .where(
                     and_(
                         LearningSignal.signal_type == "email_replied",
-                        func.jsonb_extract_path_text(
-                            LearningSignal.dimensions, "trade"
-                        ) == trade_type,
+                        LearningSignal.trade == trade_type,
                     )
                 )
             )
@@ -79,9 +77,7 @@ async def _get_best_day_of_week(trade_type: str, state: str) -> str:
                 .where(
                     and_(
                         LearningSignal.signal_type == "email_opened",
-                        func.jsonb_extract_path_text(
-                            LearningSignal.dimensions, "trade"
-                        ) == trade_type,
+                        LearningSignal.trade == trade_type,
                     )
                 )
                 .group_by(text("dow"))
@@ -610,8 +606,9 @@ async def generate_outreach_email(
             f"- {p}" for p in personalization
         )
 
-    # Enrich with learning insights
-    learning_context = await _get_learning_context(trade_type, state, step)
+    # Enrich with learning insights (precomputed snapshot, one Redis GET)
+    from src.services.learning_snapshot import get_learning_context
+    learning_context = await get_learning_context(trade_type, state, step)
     if learning_context:
         prospect_details += f"\n\n{learning_context}"
 
@@ -269,8 +269,9 @@ async def admin_health(
     db: AsyncSession = Depends(get_db),
     admin: Client = Depends(get_current_admin),
 ):
-    """System health - recent errors, integration status."""
+    """System health - recent errors, integration status, outbound HTTP pool reuse."""
     from datetime import timedelta
+    from src.utils.http_client import get_http_client_stats
     since_24h = datetime.now(timezone.utc) - timedelta(hours=24)
 
     # Recent errors
@@ -312,6 +313,7 @@ async def admin_health(
             }
             for c in pending_clients
         ],
+        "http_pools": get_http_client_stats(),
     }
 
 
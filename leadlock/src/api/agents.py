@@ -50,6 +50,17 @@ async def task_queue(
     return {"success": True, "data": data}
 
 
+@router.get("/tasks/rollups")
+async def task_rollups(
+    _admin=Depends(get_current_admin),
+    days: int = Query(30, ge=1, le=365),
+):
+    """Daily per-type totals for archived tasks."""
+    from src.services.task_retention import get_daily_rollups
+    data = await get_daily_rollups(days=days)
+    return {"success": True, "data": {"rollups": data}}
+
+
 @router.get("/costs")
 async def cost_tracker(
     _admin=Depends(get_current_admin),
@@ -451,6 +451,8 @@ async def reply_to_lead(
         twilio_sid=sms_result.get("sid"),
     )
     db.add(conv)
+    from src.services.transcript import append_turn
+    await append_turn(lead.id, "outbound", message)
 
     # Update lead counters
     lead.total_messages_sent = (lead.total_messages_sent or 0) + 1
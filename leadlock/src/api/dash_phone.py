@@ -131,7 +131,11 @@ async def provision_number(
                     "Auto 10DLC trigger failed (non-blocking): %s", str(e),
                 )
 
-        await db.flush()
+        # Commit before invalidating, or a concurrent read re-caches the old row
+        await db.commit()
+
+        from src.services.client_cache import invalidate_client
+        await invalidate_client(client.id)
 
         logger.info("Phone provisioned for %s: %s", client.business_name, phone_number[:6] + "***")
         return {
@@ -3,11 +3,11 @@ Dashboard reports, metrics, activity, compliance, settings, onboarding, and book
 """
 import json
 import logging
-from datetime import datetime, timedelta, timezone
+from datetime import date, datetime, timedelta, timezone
 from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_, func, desc, case, text
+from sqlalchemy import select, and_, func, desc
 
 from src.database import get_db
 from src.api.dash_auth import get_current_client
@@ -23,6 +23,8 @@ from src.schemas.api_responses import (
     ActivityEvent,
     ComplianceSummary,
 )
+from src.services.client_cache import invalidate_client
+from src.services.metrics_rollup import BOOKED_STATES, load_daily_metrics, summarize
 from src.services.reporting import get_dashboard_metrics
 
 logger = logging.getLogger(__name__)
@@ -170,6 +172,7 @@ async def update_settings(
         existing = client.config or {}
         client.config = {**existing, **payload["config"]}
     await db.commit()
+    await invalidate_client(client.id)
     return {"status": "updated"}
 
 
@@ -236,6 +239,7 @@ async def complete_onboarding(
         client.onboarding_status = "in_progress"
 
     await db.commit()
+    await invalidate_client(client.id)
     logger.info(
         "Onboarding %s for client %s",
         "completed" if go_live else "updated",
@@ -442,67 +446,46 @@ async def get_roi_dashboard(
     db: AsyncSession = Depends(get_db),
     client: Client = Depends(get_current_client),
 ):
-    """Get comprehensive ROI dashboard data — the showpiece endpoint."""
+    """
+    Get comprehensive ROI dashboard data — the showpiece endpoint.
+
+    Built from the daily rollups (services/metrics_rollup.py), so the cost
+    does not grow with lead history.
+    """
     if period == "all":
-        since = datetime(2020, 1, 1, tzinfo=timezone.utc)
+        since = date(2020, 1, 1)
     else:
         days = {"7d": 7, "30d": 30, "90d": 90}[period]
-        since = datetime.now(timezone.utc) - timedelta(days=days)
+        since = (datetime.now(timezone.utc) - timedelta(days=days)).date()
 
-    cid = client.id
     config = client.config or {}
     avg_job_value = config.get("avg_job_value") or 500.0
 
-    # --- Hero KPIs (single pass for core counts) ---
-    base_filter = and_(Lead.client_id == cid, Lead.created_at >= since)
-
-    total_leads = (await db.execute(
-        select(func.count(Lead.id)).where(base_filter)
-    )).scalar() or 0
+    cells = await load_daily_metrics(db, client.id, since)
+    totals = summarize(cells)
 
-    leads_booked = (await db.execute(
-        select(func.count(Lead.id)).where(
-            and_(base_filter, Lead.state.in_(["booked", "completed"]))
-        )
-    )).scalar() or 0
+    # --- Hero KPIs ---
+    total_leads = totals["leads"]
+    leads_booked = totals["booked"]
 
     booking_rate = leads_booked / total_leads if total_leads > 0 else 0.0
     estimated_revenue = leads_booked * avg_job_value
 
-    # Cost aggregates
-    cost_row = (await db.execute(
-        select(
-            func.coalesce(func.sum(Lead.total_sms_cost_usd), 0.0),
-            func.coalesce(func.sum(Lead.total_ai_cost_usd), 0.0),
-        ).where(base_filter)
-    )).one()
-    total_sms_cost = float(cost_row[0])
-    total_ai_cost = float(cost_row[1])
+    total_sms_cost = float(totals["sms_cost_usd"])
+    total_ai_cost = float(totals["ai_cost_usd"])
     total_cost = total_sms_cost + total_ai_cost
 
     cost_per_booked = total_cost / leads_booked if leads_booked > 0 else 0.0
     roi_multiplier = estimated_revenue / total_cost if total_cost > 0 else 0.0
 
-    # Average response time
-    avg_response = (await db.execute(
-        select(func.avg(Lead.first_response_ms)).where(
-            and_(base_filter, Lead.first_response_ms.isnot(None))
-        )
-    )).scalar()
-    avg_response_seconds = (float(avg_response) / 1000) if avg_response else 0.0
-
-    # Leads under 10s
-    leads_with_response = (await db.execute(
-        select(func.count(Lead.id)).where(
-            and_(base_filter, Lead.first_response_ms.isnot(None))
-        )
-    )).scalar() or 0
-    leads_under_10s = (await db.execute(
-        select(func.count(Lead.id)).where(
-            and_(base_filter, Lead.first_response_ms.isnot(None), Lead.first_response_ms < 10000)
-        )
-    )).scalar() or 0
-    leads_under_10s_pct = leads_under_10s / leads_with_response if leads_with_response > 0 else 0.0
+    leads_with_response = totals["responded"]
+    avg_response_seconds = (
+        totals["response_ms_total"] / leads_with_response / 1000
+        if leads_with_response > 0 else 0.0
+    )
+    leads_under_10s_pct = (
+        totals["under_10s"] / leads_with_response if leads_with_response > 0 else 0.0
+    )
 
     hero_kpis = {
         "total_leads": total_leads,
@@ -515,58 +498,51 @@ async def get_roi_dashboard(
         "leads_under_10s": round(leads_under_10s_pct, 2),
     }
 
+    # --- Group cells by state, source, month and variant ---
+    funnel_raw: dict[str, int] = {}
+    by_source: dict[str, list[int]] = {}
+    by_month: dict[str, list[int]] = {}
+    by_variant: dict[str, list[int]] = {}
+    for cell in cells:
+        booked = cell.leads if cell.state in BOOKED_STATES else 0
+        funnel_raw[cell.state] = funnel_raw.get(cell.state, 0) + cell.leads
+        groups = [
+            (by_source, cell.source),
+            (by_month, cell.day.strftime("%Y-%m")),
+        ]
+        if cell.qualify_variant:
+            groups.append((by_variant, cell.qualify_variant))
+        for bucket, key in groups:
+            counts = bucket.setdefault(key, [0, 0])
+            counts[0] += cell.leads
+            counts[1] += booked
+
     # --- Funnel ---
-    funnel_result = await db.execute(
-        select(Lead.state, func.count(Lead.id))
-        .where(base_filter)
-        .group_by(Lead.state)
-    )
-    funnel_raw = {row[0]: row[1] for row in funnel_result.all()}
     funnel = {
         state: funnel_raw.get(state, 0)
         for state in ["new", "intake_sent", "qualifying", "qualified", "booking", "booked", "completed"]
     }
 
     # --- Revenue by source ---
-    source_result = await db.execute(
-        select(
-            Lead.source,
-            func.count(Lead.id).label("leads"),
-            func.count(case((Lead.state.in_(["booked", "completed"]), Lead.id))).label("booked"),
-        )
-        .where(base_filter)
-        .group_by(Lead.source)
-        .order_by(desc("leads"))
-    )
     revenue_by_source = [
         {
-            "source": row.source,
-            "leads": row.leads,
-            "booked": row.booked,
-            "revenue": round(row.booked * avg_job_value, 2),
+            "source": source,
+            "leads": leads,
+            "booked": booked,
+            "revenue": round(booked * avg_job_value, 2),
         }
-        for row in source_result.all()
+        for source, (leads, booked) in sorted(by_source.items(), key=lambda kv: (-kv[1][0], kv[0]))
     ]
 
     # --- Revenue by month ---
-    month_result = await db.execute(
-        select(
-            func.to_char(func.date_trunc("month", Lead.created_at), "YYYY-MM").label("month"),
-            func.count(Lead.id).label("leads"),
-            func.count(case((Lead.state.in_(["booked", "completed"]), Lead.id))).label("booked"),
-        )
-        .where(base_filter)
-        .group_by(text("1"))
-        .order_by(text("1"))
-    )
     revenue_by_month = [
         {
-            "month": row.month,
-            "leads": row.leads,
-            "booked": row.booked,
-            "revenue": round(row.booked * avg_job_value, 2),
+            "month": month,
+            "leads": leads,
+            "booked": booked,
+            "revenue": round(booked * avg_job_value, 2),
         }
-        for row in month_result.all()
+        for month, (leads, booked) in sorted(by_month.items())
     ]
 
     # --- Per-lead economics ---
@@ -584,45 +560,26 @@ async def get_roi_dashboard(
     }
 
     # --- Response time distribution ---
-    rt_result = await db.execute(
-        select(Lead.first_response_ms).where(
-            and_(base_filter, Lead.first_response_ms.isnot(None))
-        )
-    )
-    rt_buckets = {"0-5s": 0, "5-10s": 0, "10-30s": 0, "30s+": 0}
-    for (ms,) in rt_result.all():
-        if ms < 5000:
-            rt_buckets["0-5s"] += 1
-        elif ms < 10000:
-            rt_buckets["5-10s"] += 1
-        elif ms < 30000:
-            rt_buckets["10-30s"] += 1
-        else:
-            rt_buckets["30s+"] += 1
+    rt_buckets = {
+        "0-5s": totals["under_5s"],
+        "5-10s": totals["under_10s"] - totals["under_5s"],
+        "10-30s": totals["under_30s"] - totals["under_10s"],
+        "30s+": leads_with_response - totals["under_30s"],
+    }
 
     response_time_distribution = [
         {"bucket": k, "count": v} for k, v in rt_buckets.items()
     ]
 
     # --- Qualify variant performance ---
-    variant_result = await db.execute(
-        select(
-            Lead.qualify_variant,
-            func.count(Lead.id).label("leads"),
-            func.count(case((Lead.state.in_(["booked", "completed"]), Lead.id))).label("booked"),
-        )
-        .where(and_(base_filter, Lead.qualify_variant.isnot(None)))
-        .group_by(Lead.qualify_variant)
-        .order_by(Lead.qualify_variant)
-    )
     qualify_variant_performance = [
         {
-            "variant": row.qualify_variant,
-            "leads": row.leads,
-            "booked": row.booked,
-            "rate": round(row.booked / row.leads, 3) if row.leads > 0 else 0.0,
+            "variant": variant,
+            "leads": leads,
+            "booked": booked,
+            "rate": round(booked / leads, 3) if leads > 0 else 0.0,
         }
-        for row in variant_result.all()
+        for variant, (leads, booked) in sorted(by_variant.items())
     ]
 
     return {
@@ -200,6 +200,7 @@ async def _check_workers() -> dict:
             "leadlock:worker_health:lead_state_manager",
             "leadlock:worker_health:sms_dispatch",
             "leadlock:worker_health:crm_sync",
+            "leadlock:worker_health:inbound_sms",
         ]
 
         for key in worker_keys:
@@ -2,10 +2,12 @@
 Metrics API - lead funnel, deliverability, cost tracking, response times.
 Used by the admin dashboard for real-time monitoring.
 """
+import hmac
 import logging
 import uuid as uuid_mod
 from datetime import datetime, timezone, timedelta
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from fastapi.responses import PlainTextResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func, and_, case
 
@@ -180,6 +182,56 @@ async def get_response_times(
     }
 
 
+@router.get("/latency-budget")
+async def get_latency_budget(admin: Client = Depends(get_current_admin)):
+    """
+    Rolling p50/p95/p99 per stage of the webhook-to-first-SMS path.
+    Shows which stage is eating the lead_response_target_ms budget.
+    """
+    from src.config import get_settings
+    from src.utils.metrics import get_stage_percentiles
+
+    target_ms = get_settings().lead_response_target_ms
+    try:
+        stages = await get_stage_percentiles("new_lead")
+    except Exception as e:
+        logger.error("Failed to load stage latency percentiles: %s", str(e))
+        return {"target_ms": target_ms, "stages": {}, "error": "Failed to load latency samples"}
+
+    return {
+        "target_ms": target_ms,
+        "stages": stages,
+        "slowest_p95_stage": max(
+            (s for s in stages if s != "total"),
+            key=lambda s: stages[s]["p95_ms"],
+            default=None,
+        ),
+    }
+
+
+@router.get("/prometheus", response_class=PlainTextResponse)
+async def get_prometheus_metrics(authorization: str = Header(None)):
+    """
+    Per-stage latency histograms in Prometheus text format.
+    Authenticated with METRICS_SCRAPE_TOKEN as a bearer token. Histograms are
+    per process, so scrape every instance.
+    """
+    from src.config import get_settings
+    from src.utils.metrics import render_prometheus
+
+    token = get_settings().metrics_scrape_token
+    if not token:
+        raise HTTPException(status_code=404, detail="Metrics scraping not enabled")
+    supplied = (authorization or "").removeprefix("Bearer ").strip()
+    if not hmac.compare_digest(supplied.encode(), token.encode()):
+        raise HTTPException(status_code=401, detail="Invalid scrape token")
+
+    return PlainTextResponse(
+        render_prometheus(),
+        media_type="text/plain; version=0.0.4",
+    )
+
+
 @router.get("/costs")
 async def get_cost_metrics(
     client_id: str = Query(None),
@@ -241,8 +293,10 @@ async def get_worker_health(admin: Client = Depends(get_current_admin)):
             "lead_state_manager",
             "crm_sync",
             "sms_dispatch",
+            "inbound_sms",
             "outreach_monitor",
             "registration_poller",
+            "metrics_rollup",
         ]
 
         statuses = {}
@@ -7,12 +7,13 @@ import hashlib
 import logging
 import re
 import uuid
+from collections import Counter
 from datetime import datetime, timedelta, timezone
 from typing import Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Request
 from fastapi.responses import HTMLResponse, Response
-from sqlalchemy import select, and_, func
+from sqlalchemy import select, and_, or_, func
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.database import get_db
@@ -118,28 +119,31 @@ def _sendgrid_message_id_candidates(raw_value: str) -> list[str]:
     return candidates
 
 
-async def _is_duplicate_email_event(redis_client, event: dict) -> bool:
+def _email_event_dedupe_key(event: dict) -> str:
     """
-    Best-effort dedupe for SendGrid events.
+    Redis dedupe key for a SendGrid event.
     Uses sg_event_id/event_id when present; falls back to a stable fingerprint.
     """
+    raw_id = event.get("sg_event_id") or event.get("event_id")
+    if raw_id:
+        event_id = str(raw_id).strip()
+    else:
+        # Fallback fingerprint when provider event ID is missing.
+        parts = [
+            str(event.get("event", "")).strip().lower(),
+            str(event.get("sg_message_id", "")).strip(),
+            str(event.get("outreach_id", "")).strip(),
+            str(event.get("step", "")).strip(),
+            str(event.get("timestamp", "")).strip(),
+        ]
+        event_id = hashlib.sha256("|".join(parts).encode("utf-8")).hexdigest()
+    return f"leadlock:email_event_seen:{event_id}"
+
+
+async def _is_duplicate_email_event(redis_client, event: dict) -> bool:
+    """Best-effort dedupe for SendGrid events (see _email_event_dedupe_key)."""
     try:
-        raw_id = event.get("sg_event_id") or event.get("event_id")
-        if raw_id:
-            event_id = str(raw_id).strip()
-        else:
-            # Fallback fingerprint when provider event ID is missing.
-            parts = [
-                str(event.get("event", "")).strip().lower(),
-                str(event.get("sg_message_id", "")).strip(),
-                str(event.get("outreach_id", "")).strip(),
-                str(event.get("step", "")).strip(),
-                str(event.get("timestamp", "")).strip(),
-            ]
-            event_id = hashlib.sha256("|".join(parts).encode("utf-8")).hexdigest()
-
-        dedupe_key = f"leadlock:email_event_seen:{event_id}"
-        was_set = await redis_client.set(dedupe_key, "1", ex=172800, nx=True)
+        was_set = await redis_client.set(_email_event_dedupe_key(event), "1", ex=172800, nx=True)
         # NX set returns falsy when key already exists.
         return not bool(was_set)
     except Exception as e:
@@ -147,6 +151,24 @@ async def _is_duplicate_email_event(redis_client, event: dict) -> bool:
         return False
 
 
+def _email_signal_dimensions(prospect: Outreach, email_record) -> dict:
+    """Learning-signal dimensions for an email event on a prospect."""
+    from src.services.learning import _time_bucket
+
+    sent_hour = email_record.sent_at.hour if email_record.sent_at else 12
+    sent_day = email_record.sent_at.strftime("%A").lower() if email_record.sent_at else "unknown"
+
+    return {
+        "trade": prospect.prospect_trade_type or "general",
+        "city": prospect.city or "",
+        "state": prospect.state_code or "",
+        "step": str(email_record.sequence_step),
+        "time_bucket": _time_bucket(sent_hour),
+        "day_of_week": sent_day,
+        "cta_variant": getattr(email_record, "cta_variant", None) or "",
+    }
+
+
 async def _record_email_signal(
     signal_type: str,
     prospect: Outreach,
@@ -155,20 +177,9 @@ async def _record_email_signal(
 ) -> None:
     """Record a learning signal from an email event."""
     try:
-        from src.services.learning import record_signal, _time_bucket
-
-        sent_hour = email_record.sent_at.hour if email_record.sent_at else 12
-        sent_day = email_record.sent_at.strftime("%A").lower() if email_record.sent_at else "unknown"
-
-        dimensions = {
-            "trade": prospect.prospect_trade_type or "general",
-            "city": prospect.city or "",
-            "state": prospect.state_code or "",
-            "step": str(email_record.sequence_step),
-            "time_bucket": _time_bucket(sent_hour),
-            "day_of_week": sent_day,
-            "cta_variant": getattr(email_record, "cta_variant", None) or "",
-        }
+        from src.services.learning import record_signal
+
+        dimensions = _email_signal_dimensions(prospect, email_record)
 
         await record_signal(
             signal_type=signal_type,
@@ -637,6 +648,11 @@ async def email_events_webhook(
     """
     SendGrid Event Webhook - tracks opens, clicks, bounces, etc.
     Events are matched by sendgrid_message_id or custom args.
+
+    The whole batch is applied in one transaction: email records and
+    prospects are loaded with one IN query each, state changes are made in
+    memory, and bounce/deferral bookkeeping runs once per batch. A/B counters,
+    learning signals and reputation events are written after the commit.
     """
     try:
         # Verify webhook authenticity
@@ -647,312 +663,71 @@ async def email_events_webhook(
         events = await request.json()
         if not isinstance(events, list):
             events = [events]
+        valid_events = [event for event in events if isinstance(event, dict)]
 
-        for event in events:
-            try:
-                event_type = event.get("event", "")
-                sg_message_id_raw = event.get("sg_message_id", "")
-                sg_message_candidates = _sendgrid_message_id_candidates(sg_message_id_raw)
-                sg_message_id = sg_message_candidates[0] if sg_message_candidates else ""
-                outreach_id = event.get("outreach_id")
-                outreach_uuid = _safe_uuid(outreach_id)
-                timestamp = _safe_event_timestamp(event.get("timestamp"))
-
-                # Find email record
-                email_record = None
-                if sg_message_candidates:
-                    result = await db.execute(
-                        select(OutreachEmail).where(
-                            OutreachEmail.sendgrid_message_id.in_(sg_message_candidates)
-                        ).limit(1)
-                    )
-                    email_record = result.scalar_one_or_none()
-
-                if not email_record and outreach_uuid:
-                    # Fallback: find by outreach_id + step
-                    step = event.get("step")
-                    try:
-                        step_int = int(step) if step is not None else None
-                    except (TypeError, ValueError):
-                        step_int = None
-                    if step_int is not None:
-                        result = await db.execute(
-                            select(OutreachEmail).where(
-                                and_(
-                                    OutreachEmail.outreach_id == outreach_uuid,
-                                    OutreachEmail.sequence_step == step_int,
-                                )
-                            ).limit(1)
-                        )
-                        email_record = result.scalar_one_or_none()
+        records = await _resolve_email_records(db, valid_events)
 
-                if not email_record:
-                    if event_type in ("open", "click", "spam_report", "spamreport"):
+        prospect_ids = {
+            record.outreach_id or _safe_uuid(event.get("outreach_id"))
+            for event, record in zip(valid_events, records)
+            if record is not None
+        }
+        prospect_ids.discard(None)
+        prospects: dict[uuid.UUID, Outreach] = {}
+        if prospect_ids:
+            result = await db.execute(select(Outreach).where(Outreach.id.in_(prospect_ids)))
+            prospects = {p.id: p for p in result.scalars().all()}
+
+        # Get Redis for dedupe and reputation tracking
+        try:
+            from src.utils.dedup import get_redis
+            redis = await get_redis()
+        except Exception as redis_err:
+            logger.debug("Redis unavailable for email reputation: %s", str(redis_err))
+            redis = None
+
+        batch = _EmailEventBatch()
+        for event, email_record in zip(valid_events, records):
+            try:
+                if email_record is None:
+                    if event.get("event", "") in ("open", "click", "spam_report", "spamreport"):
                         logger.warning(
-                            "Email event lookup failed: type=%s sg_message_id=%s normalized=%s outreach_id=%s step=%s",
-                            event_type, sg_message_id_raw, sg_message_id, outreach_id, event.get("step"),
+                            "Email event lookup failed: type=%s sg_message_id=%s outreach_id=%s step=%s",
+                            event.get("event"), event.get("sg_message_id", ""),
+                            event.get("outreach_id"), event.get("step"),
                         )
                     continue
-                prospect_id = email_record.outreach_id or outreach_uuid
-
-                # Get Redis for reputation tracking
-                try:
-                    from src.utils.dedup import get_redis
-                    from src.services.deliverability import record_email_event
-                    redis = await get_redis()
-                except Exception as redis_err:
-                    logger.debug("Redis unavailable for email reputation: %s", str(redis_err))
-                    redis = None
-
-                if redis and await _is_duplicate_email_event(redis, event):
-                    logger.debug(
-                        "Skipping duplicate email event: type=%s sg_message_id=%s",
-                        event_type, sg_message_id,
-                    )
-                    continue
-
-                # Update email record based on event type
-                if event_type == "delivered" and not email_record.delivered_at:
-                    email_record.delivered_at = timestamp
-                    # Record reputation event
-                    if redis:
-                        try:
-                            await record_email_event(redis, "delivered")
-                        except Exception as e:
-                            logger.debug("Redis event recording failed: %s", str(e))
-                elif event_type == "open" and not email_record.opened_at:
-                    email_record.opened_at = timestamp
-                    # Record reputation event
-                    if redis:
-                        try:
-                            await record_email_event(redis, "opened")
-                        except Exception as e:
-                            logger.debug("Redis event recording failed: %s", str(e))
-                    # Track A/B variant open event
-                    if email_record.ab_variant_id:
-                        try:
-                            from src.services.ab_testing import record_event
-                            await record_event(str(email_record.ab_variant_id), "opened")
-                        except Exception as ab_err:
-                            logger.debug("A/B open tracking failed: %s", str(ab_err))
-                    # Also update prospect
-                    if prospect_id:
-                        prospect = await db.get(Outreach, prospect_id)
-                        if prospect:
-                            prospect.last_email_opened_at = timestamp
-                            # Record learning signal
-                            await _record_email_signal(
-                                "email_opened", prospect, email_record, 1.0,
-                            )
-                elif event_type == "click" and not email_record.clicked_at:
-                    email_record.clicked_at = timestamp
-                    # Record reputation event
-                    if redis:
-                        try:
-                            await record_email_event(redis, "clicked")
-                        except Exception as e:
-                            logger.debug("Redis event recording failed: %s", str(e))
-                    # Track A/B variant click event
-                    if email_record.ab_variant_id:
-                        try:
-                            from src.services.ab_testing import record_event
-                            await record_event(str(email_record.ab_variant_id), "clicked")
-                        except Exception as ab_err:
-                            logger.debug("A/B click tracking failed: %s", str(ab_err))
-                    if prospect_id:
-                        prospect = await db.get(Outreach, prospect_id)
-                        if prospect:
-                            prospect.last_email_clicked_at = timestamp
-                            await _record_email_signal(
-                                "email_clicked", prospect, email_record, 1.0,
-                            )
-                elif event_type in ("bounce", "blocked"):
-                    if email_record.bounced_at:
+                if redis:
+                    if await _is_duplicate_email_event(redis, event):
                         logger.debug(
-                            "Skipping duplicate bounce/blocked for email %s",
-                            str(email_record.id)[:8],
+                            "Skipping duplicate email event: type=%s sg_message_id=%s",
+                            event.get("event", ""), event.get("sg_message_id", ""),
                         )
                         continue
-
-                    # Hard bounce or block - count as real bounce
-                    email_record.bounced_at = timestamp
-                    email_record.bounce_type = event.get("type", event_type)
-                    email_record.bounce_reason = event.get("reason", "")
-                    # Record reputation event
-                    if redis:
-                        try:
-                            await record_email_event(redis, "bounced")
-                        except Exception as e:
-                            logger.debug("Redis event recording failed: %s", str(e))
-                    # Hard bounce -> mark prospect as lost, flag email invalid
-                    if event.get("type") == "bounce" or event_type == "bounce":
-                        if prospect_id:
-                            prospect = await db.get(Outreach, prospect_id)
-                            if prospect:
-                                logger.warning(
-                                    "Hard bounce: prospect=%s email_source=%s email_verified=%s to=%s",
-                                    str(prospect.id)[:8],
-                                    prospect.email_source or "unknown",
-                                    prospect.email_verified,
-                                    (prospect.prospect_email or "")[:20] + "***",
-                                )
-                                prospect.email_verified = False
-                                prospect.status = "lost"
-                                prospect.updated_at = timestamp
-                                await _record_email_signal(
-                                    "email_bounced", prospect, email_record, 0.0,
-                                )
-                                # Auto-blacklist email address on hard bounce;
-                                # blacklist domain only after 3+ distinct email bounces
-                                try:
-                                    if prospect.prospect_email and "@" in prospect.prospect_email:
-                                        from src.workers.outreach_sending import normalize_email
-                                        email_addr = normalize_email(prospect.prospect_email)
-                                        domain = email_addr.split("@")[1]
-                                        if domain:
-                                            # Blacklist the individual email address first
-                                            existing_email = await db.execute(
-                                                select(EmailBlacklist).where(
-                                                    and_(
-                                                        EmailBlacklist.entry_type == "email",
-                                                        EmailBlacklist.value == email_addr,
-                                                    )
-                                                ).limit(1)
-                                            )
-                                            if not existing_email.scalar_one_or_none():
-                                                email_blacklist_entry = EmailBlacklist(
-                                                    entry_type="email",
-                                                    value=email_addr,
-                                                    reason="Hard bounce",
-                                                )
-                                                db.add(email_blacklist_entry)
-                                                logger.info(
-                                                    "Auto-blacklisted email %s after hard bounce",
-                                                    email_addr[:20] + "***",
-                                                )
-
-                                            # Blacklist domain only after 3+ distinct bounced emails
-                                            # Never blacklist common email providers (gmail, outlook, etc.)
-                                            if domain in _PROTECTED_DOMAINS:
-                                                logger.debug(
-                                                    "Skipping domain blacklist for protected provider %s",
-                                                    domain,
-                                                )
-                                            else:
-                                                existing_domain = await db.execute(
-                                                    select(EmailBlacklist).where(
-                                                        and_(
-                                                            EmailBlacklist.entry_type == "domain",
-                                                            EmailBlacklist.value == domain,
-                                                        )
-                                                    ).limit(1)
-                                                )
-                                                if not existing_domain.scalar_one_or_none():
-                                                    bounce_count_result = await db.execute(
-                                                        select(func.count()).select_from(EmailBlacklist).where(
-                                                            and_(
-                                                                EmailBlacklist.entry_type == "email",
-                                                                EmailBlacklist.value.like(f"%@{domain}"),
-                                                            )
-                                                        )
-                                                    )
-                                                    bounce_count = bounce_count_result.scalar() or 0
-                                                    if bounce_count >= 3:
-                                                        domain_blacklist_entry = EmailBlacklist(
-                                                            entry_type="domain",
-                                                            value=domain,
-                                                            reason="3+ hard bounces at domain",
-                                                        )
-                                                        db.add(domain_blacklist_entry)
-                                                        logger.info(
-                                                            "Auto-blacklisted domain %s after %d bounces",
-                                                            domain, bounce_count,
-                                                        )
-
-                                            # Temporary domain cooldown after repeated recent bounces.
-                                            if redis and domain not in _PROTECTED_DOMAINS:
-                                                recent_bounces_result = await db.execute(
-                                                    select(func.count()).select_from(OutreachEmail).where(
-                                                        and_(
-                                                            OutreachEmail.to_email.ilike(f"%@{domain}"),
-                                                            OutreachEmail.bounced_at.isnot(None),
-                                                            OutreachEmail.bounced_at >= datetime.now(timezone.utc) - timedelta(hours=24),
-                                                        )
-                                                    )
-                                                )
-                                                recent_bounces = recent_bounces_result.scalar() or 0
-                                                if recent_bounces >= 2:
-                                                    cooldown_key = f"leadlock:email_domain_cooldown:{domain}"
-                                                    await redis.set(cooldown_key, "1", ex=86400)
-                                                    logger.warning(
-                                                        "Domain cooldown enabled for %s after %d bounces in 24h",
-                                                        domain, recent_bounces,
-                                                    )
-
-                                            # Record per-domain bounce for 30-day risk tracking
-                                            # Skip protected providers — they can't be domain-blocked
-                                            if domain not in _PROTECTED_DOMAINS:
-                                                try:
-                                                    from src.services.deliverability import record_domain_bounce
-                                                    await record_domain_bounce(domain)
-                                                except Exception as db_err:
-                                                    logger.debug("Domain bounce recording failed: %s", str(db_err))
-                                except Exception as bl_err:
-                                    logger.warning(
-                                        "Failed to auto-blacklist email/domain: %s", str(bl_err)
-                                    )
-                elif event_type == "deferred":
-                    # Deferred is temporary - do NOT count as bounce
-                    email_record.bounce_type = "deferred"
-                    email_record.bounce_reason = event.get("reason", "")
-                    logger.info(
-                        "Email %s deferred: %s",
-                        str(email_record.id)[:8],
-                        event.get("reason", "unknown"),
-                    )
-                    # Track soft bounces - mark unreachable after 3+ deferrals
-                    if prospect_id:
-                        prospect = await db.get(Outreach, prospect_id)
-                        if prospect and prospect.prospect_email:
-                            deferral_count_result = await db.execute(
-                                select(func.count()).select_from(OutreachEmail).where(
-                                    and_(
-                                        OutreachEmail.outreach_id == prospect.id,
-                                        OutreachEmail.bounce_type == "deferred",
-                                    )
-                                )
-                            )
-                            deferral_count = deferral_count_result.scalar() or 0
-                            if deferral_count >= 3:
-                                prospect.status = "unreachable"
-                                prospect.email_verified = False
-                                prospect.updated_at = timestamp
-                                logger.warning(
-                                    "Prospect %s marked unreachable after %d soft bounces",
-                                    str(prospect.id)[:8], deferral_count,
-                                )
-                elif event_type == "spamreport":
-                    # Record reputation event - spam complaints are CRITICAL
-                    if redis:
-                        try:
-                            await record_email_event(redis, "complained")
-                        except Exception as e:
-                            logger.debug("Redis event recording failed: %s", str(e))
-                    # Treat spam report as unsubscribe
-                    if prospect_id:
-                        prospect = await db.get(Outreach, prospect_id)
-                        if prospect:
-                            prospect.email_unsubscribed = True
-                            prospect.unsubscribed_at = timestamp
-
-                await db.commit()
-
+                    batch.dedupe_keys.append(_email_event_dedupe_key(event))
+                _apply_email_event(event, email_record, prospects, batch)
             except Exception as event_err:
                 logger.error(
                     "Error processing email event %s: %s",
                     event.get("event", "unknown"), str(event_err),
                 )
-                await db.rollback()
+
+        try:
+            await db.flush()
+            bounced_domains = await _blacklist_hard_bounces(db, redis, batch.hard_bounced)
+            await _mark_repeatedly_deferred(db, batch.deferred)
+            await db.commit()
+        except Exception:
+            await db.rollback()
+            # Let SendGrid redeliver the batch instead of dropping it as a duplicate
+            if redis and batch.dedupe_keys:
+                try:
+                    await redis.delete(*batch.dedupe_keys)
+                except Exception as e:
+                    logger.debug("Email event dedupe release failed: %s", str(e))
+            raise
+
+        await _record_email_event_side_effects(redis, batch, bounced_domains)
 
         return {"status": "processed", "events": len(events)}
 
@@ -964,6 +739,331 @@ async def email_events_webhook(
         raise HTTPException(status_code=500, detail="Email event processing error")
 
 
+class _EmailEventBatch:
+    """Work collected while applying one webhook batch, flushed after commit."""
+
+    def __init__(self):
+        self.dedupe_keys: list[str] = []
+        self.reputation_events: list[str] = []
+        self.ab_counts: dict[str, dict[str, int]] = {}
+        self.signals: list[dict] = []
+        self.hard_bounced: list[Outreach] = []
+        self.deferred: dict[uuid.UUID, tuple[Outreach, datetime]] = {}
+
+    def count_ab_event(self, variant_id, event_type: str) -> None:
+        by_type = self.ab_counts.setdefault(str(variant_id), {})
+        by_type[event_type] = by_type.get(event_type, 0) + 1
+
+    def add_signal(self, signal_type: str, prospect: Outreach, email_record, value: float) -> None:
+        self.signals.append({
+            "signal_type": signal_type,
+            "dimensions": _email_signal_dimensions(prospect, email_record),
+            "value": value,
+            "outreach_id": str(prospect.id),
+        })
+
+
+def _event_step(event: dict) -> Optional[int]:
+    step = event.get("step")
+    try:
+        return int(step) if step is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+async def _resolve_email_records(db: AsyncSession, events: list[dict]) -> list[Optional[OutreachEmail]]:
+    """
+    Match every event to its OutreachEmail with at most two queries per batch:
+    one IN over all sg_message_id candidates, then one over outreach_id for
+    events that carry outreach_id + step custom args instead.
+    """
+    candidates = [_sendgrid_message_id_candidates(e.get("sg_message_id", "")) for e in events]
+    all_ids = {c for event_candidates in candidates for c in event_candidates}
+
+    by_message_id: dict[str, OutreachEmail] = {}
+    if all_ids:
+        result = await db.execute(
+            select(OutreachEmail).where(OutreachEmail.sendgrid_message_id.in_(all_ids))
+        )
+        for record in result.scalars().all():
+            by_message_id.setdefault(record.sendgrid_message_id, record)
+
+    records: list[Optional[OutreachEmail]] = []
+    fallback: dict[int, tuple[uuid.UUID, int]] = {}
+    for i, (event, event_candidates) in enumerate(zip(events, candidates)):
+        record = next((by_message_id[c] for c in event_candidates if c in by_message_id), None)
+        records.append(record)
+        if record is None:
+            outreach_uuid = _safe_uuid(event.get("outreach_id"))
+            step = _event_step(event)
+            if outreach_uuid and step is not None:
+                fallback[i] = (outreach_uuid, step)
+
+    if fallback:
+        result = await db.execute(
+            select(OutreachEmail).where(
+                and_(
+                    OutreachEmail.outreach_id.in_({o for o, _ in fallback.values()}),
+                    OutreachEmail.sequence_step.in_({s for _, s in fallback.values()}),
+                )
+            )
+        )
+        by_step: dict[tuple[uuid.UUID, int], OutreachEmail] = {}
+        for record in result.scalars().all():
+            by_step.setdefault((record.outreach_id, record.sequence_step), record)
+        for i, key in fallback.items():
+            records[i] = by_step.get(key)
+
+    return records
+
+
+def _apply_email_event(
+    event: dict,
+    email_record: OutreachEmail,
+    prospects: dict[uuid.UUID, Outreach],
+    batch: _EmailEventBatch,
+) -> None:
+    """Apply one event to the in-memory email record and prospect."""
+    event_type = event.get("event", "")
+    timestamp = _safe_event_timestamp(event.get("timestamp"))
+    prospect_id = email_record.outreach_id or _safe_uuid(event.get("outreach_id"))
+    prospect = prospects.get(prospect_id) if prospect_id else None
+
+    if event_type == "delivered" and not email_record.delivered_at:
+        email_record.delivered_at = timestamp
+        batch.reputation_events.append("delivered")
+    elif event_type == "open" and not email_record.opened_at:
+        email_record.opened_at = timestamp
+        batch.reputation_events.append("opened")
+        if email_record.ab_variant_id:
+            batch.count_ab_event(email_record.ab_variant_id, "opened")
+        if prospect:
+            prospect.last_email_opened_at = timestamp
+            batch.add_signal("email_opened", prospect, email_record, 1.0)
+    elif event_type == "click" and not email_record.clicked_at:
+        email_record.clicked_at = timestamp
+        batch.reputation_events.append("clicked")
+        if email_record.ab_variant_id:
+            batch.count_ab_event(email_record.ab_variant_id, "clicked")
+        if prospect:
+            prospect.last_email_clicked_at = timestamp
+            batch.add_signal("email_clicked", prospect, email_record, 1.0)
+    elif event_type in ("bounce", "blocked"):
+        if email_record.bounced_at:
+            logger.debug(
+                "Skipping duplicate bounce/blocked for email %s",
+                str(email_record.id)[:8],
+            )
+            return
+
+        # Hard bounce or block - count as real bounce
+        email_record.bounced_at = timestamp
+        email_record.bounce_type = event.get("type", event_type)
+        email_record.bounce_reason = event.get("reason", "")
+        batch.reputation_events.append("bounced")
+        # Hard bounce -> mark prospect as lost, flag email invalid
+        if (event.get("type") == "bounce" or event_type == "bounce") and prospect:
+            logger.warning(
+                "Hard bounce: prospect=%s email_source=%s email_verified=%s to=%s",
+                str(prospect.id)[:8],
+                prospect.email_source or "unknown",
+                prospect.email_verified,
+                (prospect.prospect_email or "")[:20] + "***",
+            )
+            prospect.email_verified = False
+            prospect.status = "lost"
+            prospect.updated_at = timestamp
+            batch.add_signal("email_bounced", prospect, email_record, 0.0)
+            batch.hard_bounced.append(prospect)
+    elif event_type == "deferred":
+        # Deferred is temporary - do NOT count as bounce
+        email_record.bounce_type = "deferred"
+        email_record.bounce_reason = event.get("reason", "")
+        logger.info(
+            "Email %s deferred: %s",
+            str(email_record.id)[:8],
+            event.get("reason", "unknown"),
+        )
+        if prospect and prospect.prospect_email:
+            batch.deferred[prospect.id] = (prospect, timestamp)
+    elif event_type == "spamreport":
+        # Spam complaints are CRITICAL for reputation
+        batch.reputation_events.append("complained")
+        # Treat spam report as unsubscribe
+        if prospect:
+            prospect.email_unsubscribed = True
+            prospect.unsubscribed_at = timestamp
+
+
+async def _blacklist_hard_bounces(db: AsyncSession, redis, prospects: list[Outreach]) -> list[str]:
+    """
+    Auto-blacklist hard-bounced addresses; blacklist a domain only after 3+
+    distinct bounced emails, and put it on a 24h cooldown after 2+ recent
+    bounces. One query per check for the whole batch.
+
+    Returns the bounced (non-protected) domains, one per bounce, for the
+    30-day domain risk tracker.
+    """
+    from src.workers.outreach_sending import normalize_email
+
+    addresses: dict[str, str] = {}
+    bounced_domains: list[str] = []
+    for prospect in prospects:
+        if not prospect.prospect_email or "@" not in prospect.prospect_email:
+            continue
+        email_addr = normalize_email(prospect.prospect_email)
+        domain = email_addr.split("@")[1] if "@" in email_addr else ""
+        if not domain:
+            continue
+        addresses[email_addr] = domain
+        # Never blacklist common email providers (gmail, outlook, etc.)
+        if domain not in _PROTECTED_DOMAINS:
+            bounced_domains.append(domain)
+    if not addresses:
+        return []
+
+    # Blacklist the individual email addresses first
+    existing = set((await db.execute(
+        select(EmailBlacklist.value).where(
+            and_(
+                EmailBlacklist.entry_type == "email",
+                EmailBlacklist.value.in_(addresses),
+            )
+        )
+    )).scalars().all())
+    for email_addr in sorted(addresses.keys() - existing):
+        db.add(EmailBlacklist(entry_type="email", value=email_addr, reason="Hard bounce"))
+        logger.info("Auto-blacklisted email %s after hard bounce", email_addr[:20] + "***")
+
+    domains = set(bounced_domains)
+    if not domains:
+        return []
+    await db.flush()
+
+    already_blocked = set((await db.execute(
+        select(EmailBlacklist.value).where(
+            and_(
+                EmailBlacklist.entry_type == "domain",
+                EmailBlacklist.value.in_(domains),
+            )
+        )
+    )).scalars().all())
+    candidates = domains - already_blocked
+    if candidates:
+        blacklisted_emails = (await db.execute(
+            select(EmailBlacklist.value).where(
+                and_(
+                    EmailBlacklist.entry_type == "email",
+                    or_(*[EmailBlacklist.value.like(f"%@{d}") for d in candidates]),
+                )
+            )
+        )).scalars().all()
+        bounce_counts = Counter(value.rsplit("@", 1)[-1] for value in blacklisted_emails)
+        for domain in sorted(candidates):
+            if bounce_counts[domain] >= 3:
+                db.add(EmailBlacklist(
+                    entry_type="domain",
+                    value=domain,
+                    reason="3+ hard bounces at domain",
+                ))
+                logger.info(
+                    "Auto-blacklisted domain %s after %d bounces",
+                    domain, bounce_counts[domain],
+                )
+
+    # Temporary domain cooldown after repeated recent bounces.
+    if redis:
+        recent = (await db.execute(
+            select(OutreachEmail.to_email).where(
+                and_(
+                    OutreachEmail.bounced_at.isnot(None),
+                    OutreachEmail.bounced_at >= datetime.now(timezone.utc) - timedelta(hours=24),
+                    or_(*[OutreachEmail.to_email.ilike(f"%@{d}") for d in domains]),
+                )
+            )
+        )).scalars().all()
+        recent_counts = Counter((to_email or "").rsplit("@", 1)[-1].lower() for to_email in recent)
+        for domain in sorted(domains):
+            if recent_counts[domain] >= 2:
+                try:
+                    await redis.set(f"leadlock:email_domain_cooldown:{domain}", "1", ex=86400)
+                    logger.warning(
+                        "Domain cooldown enabled for %s after %d bounces in 24h",
+                        domain, recent_counts[domain],
+                    )
+                except Exception as e:
+                    logger.debug("Domain cooldown write failed: %s", str(e))
+
+    return bounced_domains
+
+
+async def _mark_repeatedly_deferred(
+    db: AsyncSession,
+    deferred: dict[uuid.UUID, tuple[Outreach, datetime]],
+) -> None:
+    """Mark prospects unreachable after 3+ deferred (soft-bounced) emails."""
+    if not deferred:
+        return
+    result = await db.execute(
+        select(OutreachEmail.outreach_id, func.count())
+        .where(
+            and_(
+                OutreachEmail.outreach_id.in_(deferred),
+                OutreachEmail.bounce_type == "deferred",
+            )
+        )
+        .group_by(OutreachEmail.outreach_id)
+    )
+    for prospect_id, deferral_count in result.all():
+        if deferral_count < 3:
+            continue
+        prospect, timestamp = deferred[prospect_id]
+        prospect.status = "unreachable"
+        prospect.email_verified = False
+        prospect.updated_at = timestamp
+        logger.warning(
+            "Prospect %s marked unreachable after %d soft bounces",
+            str(prospect.id)[:8], deferral_count,
+        )
+
+
+async def _record_email_event_side_effects(
+    redis,
+    batch: _EmailEventBatch,
+    bounced_domains: list[str],
+) -> None:
+    """Reputation events, A/B counters, learning signals and domain bounces for a committed batch."""
+    if redis and batch.reputation_events:
+        from src.services.deliverability import record_email_event
+        for event_name in batch.reputation_events:
+            try:
+                await record_email_event(redis, event_name)
+            except Exception as e:
+                logger.debug("Redis event recording failed: %s", str(e))
+
+    if batch.ab_counts:
+        try:
+            from src.services.ab_testing import record_event_counts
+            await record_event_counts(batch.ab_counts)
+        except Exception as ab_err:
+            logger.debug("A/B event tracking failed: %s", str(ab_err))
+
+    if batch.signals:
+        try:
+            from src.services.learning import record_signals
+            await record_signals(batch.signals)
+        except Exception as e:
+            logger.warning("Failed to record learning signals: %s", str(e))
+
+    if bounced_domains:
+        from src.services.deliverability import record_domain_bounce
+        for domain in bounced_domains:
+            try:
+                await record_domain_bounce(domain)
+            except Exception as db_err:
+                logger.debug("Domain bounce recording failed: %s", str(db_err))
+
+
 async def _do_unsubscribe(prospect_id: str, db: AsyncSession) -> None:
     """Shared unsubscribe logic for GET (browser click) and POST (RFC 8058 one-click)."""
     pid = _safe_uuid(prospect_id)
@@ -30,7 +30,9 @@ from src.schemas.webhook_payloads import (
 )
 from src.schemas.api_responses import WebhookPayloadResponse
 from src.agents.conductor import handle_new_lead, handle_inbound_reply
+from src.services import inbound_queue
 from src.services.phone_validation import normalize_phone
+from src.services.client_cache import get_cached_client
 from src.utils.webhook_signatures import validate_webhook_source, compute_payload_hash
 from src.utils.rate_limiter import check_webhook_rate_limits
 from src.utils.logging import get_correlation_id
@@ -139,6 +141,10 @@ async def twilio_sms_webhook(
     """
     Twilio inbound SMS webhook - handles both new leads and replies.
     Twilio sends form-encoded data, not JSON.
+
+    Validated messages are queued per lead for the inbound_sms worker (see
+    services/inbound_queue.py) so Twilio is acked without waiting on the AI
+    and reply send. Without Redis the conductor runs inline.
     """
     # Rate limit
     await _enforce_rate_limit(request, client_id)
@@ -174,7 +180,7 @@ async def twilio_sms_webhook(
         logger.info("Inbound SMS from %s to client %s", masked, client_id[:8])
 
         # Load client
-        client = await db.get(Client, uuid.UUID(client_id))
+        client = await get_cached_client(client_id, db)
         if not client:
             await _complete_webhook_event(event, "failed", "Client not found")
             raise HTTPException(status_code=404, detail="Client not found")
@@ -185,6 +191,14 @@ async def twilio_sms_webhook(
             await _complete_webhook_event(event, "rejected", gate_result["status"])
             return WebhookPayloadResponse(status=gate_result["status"], message=gate_result["status"])
 
+        # Hand off to the inbound_sms worker and ack Twilio right away. The
+        # event is committed first so the worker can always load it.
+        event.processing_status = "queued"
+        await db.commit()
+        if await inbound_queue.enqueue(event.id, client.id, phone):
+            return WebhookPayloadResponse(status="queued", message="Queued for processing")
+
+        # Redis unavailable: process inline as before
         event.processing_status = "processing"
 
         # Check if this is an existing lead (reply) or new lead
@@ -312,7 +326,7 @@ async def website_form_webhook(
 
     try:
         # Billing / phone gate
-        client = await db.get(Client, uuid.UUID(client_id))
+        client = await get_cached_client(client_id, db)
         gate_result = await _enforce_billing_gate(client, client_id)
         if gate_result:
             await _complete_webhook_event(event, "rejected", gate_result["status"])
@@ -404,7 +418,7 @@ async def google_lsa_webhook(
     )
 
     try:
-        client = await db.get(Client, uuid.UUID(client_id))
+        client = await get_cached_client(client_id, db)
         gate_result = await _enforce_billing_gate(client, client_id)
         if gate_result:
             await _complete_webhook_event(event, "rejected", gate_result["status"])
@@ -460,7 +474,7 @@ async def angi_webhook(
     )
 
     try:
-        client = await db.get(Client, uuid.UUID(client_id))
+        client = await get_cached_client(client_id, db)
         gate_result = await _enforce_billing_gate(client, client_id)
         if gate_result:
             await _complete_webhook_event(event, "rejected", gate_result["status"])
@@ -514,7 +528,7 @@ async def facebook_webhook(
     )
 
     try:
-        client = await db.get(Client, uuid.UUID(client_id))
+        client = await get_cached_client(client_id, db)
         gate_result = await _enforce_billing_gate(client, client_id)
         if gate_result:
             await _complete_webhook_event(event, "rejected", gate_result["status"])
@@ -577,7 +591,7 @@ async def missed_call_webhook(
     )
 
     try:
-        client = await db.get(Client, uuid.UUID(client_id))
+        client = await get_cached_client(client_id, db)
         gate_result = await _enforce_billing_gate(client, client_id)
         if gate_result:
             await _complete_webhook_event(event, "rejected", gate_result["status"])
@@ -638,7 +652,7 @@ async def thumbtack_webhook(
     )
 
     try:
-        client = await db.get(Client, uuid.UUID(client_id))
+        client = await get_cached_client(client_id, db)
         gate_result = await _enforce_billing_gate(client, client_id)
         if gate_result:
             await _complete_webhook_event(event, "rejected", gate_result["status"])
@@ -703,7 +717,7 @@ async def yelp_webhook(
     )
 
     try:
-        client = await db.get(Client, uuid.UUID(client_id))
+        client = await get_cached_client(client_id, db)
         gate_result = await _enforce_billing_gate(client, client_id)
         if gate_result:
             await _complete_webhook_event(event, "rejected", gate_result["status"])
@@ -106,6 +106,9 @@ class Settings(BaseSettings):
     # Alerting
     alert_webhook_url: str = ""  # Discord/Slack webhook URL for critical alerts
 
+    # Prometheus scraping (bearer token for /api/v1/metrics/prometheus; empty = disabled)
+    metrics_scrape_token: str = ""
+
     # Trial
     trial_period_days: int = 14
 
@@ -115,6 +118,10 @@ class Settings(BaseSettings):
     lead_response_deadline_ms: int = 60000
     lead_response_target_ms: int = 10000
 
+    # Learning signals: also append buffered signals to a Redis stream so a
+    # crashed process's unflushed signals are recovered (see signal_buffer)
+    learning_signal_spill_to_redis: bool = False
+
     class Config:
         env_file = ".env"
         env_file_encoding = "utf-8"
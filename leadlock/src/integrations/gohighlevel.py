@@ -9,9 +9,8 @@ import logging
 from datetime import date, time as dt_time, datetime, timezone
 from typing import Optional
 
-import httpx
-
 from src.integrations.crm_base import CRMBase
+from src.utils.http_client import get_http_client
 
 logger = logging.getLogger(__name__)
 
@@ -40,16 +39,17 @@ class GoHighLevelCRM(CRMBase):
         params: Optional[dict] = None,
     ) -> dict:
         """Make an authenticated request to the GoHighLevel API."""
-        async with httpx.AsyncClient(timeout=TIMEOUT) as client:
-            response = await client.request(
-                method,
-                f"{BASE_URL}{path}",
-                headers=self._headers,
-                json=json,
-                params=params,
-            )
-            response.raise_for_status()
-            return response.json()
+        client = get_http_client(BASE_URL)
+        response = await client.request(
+            method,
+            f"{BASE_URL}{path}",
+            headers=self._headers,
+            json=json,
+            params=params,
+            timeout=TIMEOUT,
+        )
+        response.raise_for_status()
+        return response.json()
 
     async def create_customer(
         self,
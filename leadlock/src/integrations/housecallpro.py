@@ -9,9 +9,8 @@ import logging
 from datetime import date, time as dt_time
 from typing import Optional
 
-import httpx
-
 from src.integrations.crm_base import CRMBase
+from src.utils.http_client import get_http_client
 
 logger = logging.getLogger(__name__)
 
@@ -32,15 +31,16 @@ class HousecallProCRM(CRMBase):
 
     async def _request(self, method: str, path: str, json: Optional[dict] = None) -> dict:
         """Make an authenticated request to the Housecall Pro API."""
-        async with httpx.AsyncClient(timeout=TIMEOUT) as client:
-            response = await client.request(
-                method,
-                f"{BASE_URL}{path}",
-                headers=self._headers,
-                json=json,
-            )
-            response.raise_for_status()
-            return response.json()
+        client = get_http_client(BASE_URL)
+        response = await client.request(
+            method,
+            f"{BASE_URL}{path}",
+            headers=self._headers,
+            json=json,
+            timeout=TIMEOUT,
+        )
+        response.raise_for_status()
+        return response.json()
 
     async def create_customer(
         self,
@@ -9,9 +9,8 @@ import logging
 from datetime import date, time as dt_time
 from typing import Optional
 
-import httpx
-
 from src.integrations.crm_base import CRMBase
+from src.utils.http_client import get_http_client
 
 logger = logging.getLogger(__name__)
 
@@ -32,18 +31,19 @@ class JobberCRM(CRMBase):
 
     async def _graphql(self, query: str, variables: Optional[dict] = None) -> dict:
         """Execute a GraphQL query against the Jobber API."""
-        async with httpx.AsyncClient(timeout=TIMEOUT) as client:
-            response = await client.post(
-                GRAPHQL_URL,
-                headers=self._headers,
-                json={"query": query, "variables": variables or {}},
-            )
-            response.raise_for_status()
-            data = response.json()
-            if data.get("errors"):
-                error_msg = data["errors"][0].get("message", "GraphQL error")
-                raise ValueError(f"Jobber API error: {error_msg}")
-            return data.get("data", {})
+        client = get_http_client(GRAPHQL_URL)
+        response = await client.post(
+            GRAPHQL_URL,
+            headers=self._headers,
+            json={"query": query, "variables": variables or {}},
+            timeout=TIMEOUT,
+        )
+        response.raise_for_status()
+        data = response.json()
+        if data.get("errors"):
+            error_msg = data["errors"][0].get("message", "GraphQL error")
+            raise ValueError(f"Jobber API error: {error_msg}")
+        return data.get("data", {})
 
     async def create_customer(
         self,
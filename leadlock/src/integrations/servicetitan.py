@@ -2,19 +2,28 @@
 ServiceTitan V2 CRM integration.
 Uses OAuth 2.0 client credentials flow. Token expires every 15 minutes.
 Requires ST-App-Key header for all requests.
+
+Tokens are shared per (client_id, client_secret) across adapter instances
+in the process, and a refresh is single-flight: concurrent syncs for one
+tenant wait on the same token POST instead of each fetching their own.
 """
+import asyncio
 import logging
 import time
 from datetime import date, time as dt_time
 from typing import Optional
-import httpx
 from src.integrations.crm_base import CRMBase
+from src.utils.http_client import get_http_client
 
 logger = logging.getLogger(__name__)
 
 ST_AUTH_URL = "https://auth.servicetitan.io/connect/token"
 ST_API_BASE = "https://api.servicetitan.io"
 
+# {(client_id, client_secret): (access_token, expires_at)}
+_shared_tokens: dict[tuple[str, str], tuple[str, float]] = {}
+_token_locks: dict[tuple[str, str], asyncio.Lock] = {}
+
 
 class ServiceTitanCRM(CRMBase):
     """ServiceTitan V2 API integration."""
@@ -32,7 +41,15 @@ class ServiceTitanCRM(CRMBase):
         if self._token and time.time() < self._token_expires:
             return self._token
 
-        async with httpx.AsyncClient(timeout=10.0) as client:
+        key = (self.client_id, self.client_secret)
+        async with _token_locks.setdefault(key, asyncio.Lock()):
+            # Another instance may have refreshed while we waited
+            shared = _shared_tokens.get(key)
+            if shared and time.time() < shared[1]:
+                self._token, self._token_expires = shared
+                return self._token
+
+            client = get_http_client(ST_AUTH_URL)
             response = await client.post(
                 ST_AUTH_URL,
                 data={
@@ -40,30 +57,33 @@ class ServiceTitanCRM(CRMBase):
                     "client_id": self.client_id,
                     "client_secret": self.client_secret,
                 },
+                timeout=10.0,
             )
             response.raise_for_status()
             data = response.json()
             self._token = data["access_token"]
             # Refresh 1 minute before expiry
             self._token_expires = time.time() + data.get("expires_in", 900) - 60
-            return self._token
+            _shared_tokens[key] = (self._token, self._token_expires)
+        return self._token
 
     async def _request(self, method: str, path: str, **kwargs) -> dict:
         """Make authenticated request to ServiceTitan API."""
         token = await self._get_token()
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            response = await client.request(
-                method,
-                f"{ST_API_BASE}/v2/tenant/{self.tenant_id}{path}",
-                headers={
-                    "Authorization": f"Bearer {token}",
-                    "ST-App-Key": self.app_key,
-                    "Content-Type": "application/json",
-                },
-                **kwargs,
-            )
-            response.raise_for_status()
-            return response.json()
+        client = get_http_client(ST_API_BASE)
+        response = await client.request(
+            method,
+            f"{ST_API_BASE}/v2/tenant/{self.tenant_id}{path}",
+            headers={
+                "Authorization": f"Bearer {token}",
+                "ST-App-Key": self.app_key,
+                "Content-Type": "application/json",
+            },
+            timeout=10.0,
+            **kwargs,
+        )
+        response.raise_for_status()
+        return response.json()
 
     async def create_customer(
         self, first_name: str, last_name: Optional[str],
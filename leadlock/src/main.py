@@ -18,6 +18,7 @@ from src.utils.logging import (
     set_correlation_id,
     get_correlation_id,
 )
+from src.utils.http_client import close_http_clients
 
 logger = logging.getLogger("leadlock")
 
@@ -88,6 +89,14 @@ async def lifespan(app: FastAPI):
         except Exception as e:
             logger.warning("Sentry initialization failed: %s", str(e))
 
+    # Every process keeps its own client cache LRU in sync with the event bus
+    from src.services.client_cache import run_client_cache_listener
+    cache_listener = asyncio.create_task(run_client_cache_listener())
+
+    # Every process batches its own learning signal writes
+    from src.services.signal_buffer import run_signal_writer, stop_signal_writer
+    signal_writer = asyncio.create_task(run_signal_writer())
+
     # Ensure only one process starts background workers.
     # Gunicorn may run multiple workers; only one should own background jobs.
     worker_lock_fd = _try_acquire_worker_lock()
@@ -99,6 +108,9 @@ async def lifespan(app: FastAPI):
             os.getpid(),
         )
         yield
+        await stop_signal_writer(signal_writer)
+        cache_listener.cancel()
+        await close_http_clients()
         logger.info("LeadLock shutdown complete (no workers owned by this process)")
         return
 
@@ -112,7 +124,7 @@ async def lifespan(app: FastAPI):
         except Exception as mx_err:
             logger.debug("Reply-to MX check skipped: %s", str(mx_err))
 
-    # Start background workers (15 total after consolidation)
+    # Start background workers (16 total after consolidation)
 
     # --- Always-on core workers ---
 
@@ -141,11 +153,21 @@ async def lifespan(app: FastAPI):
     worker_tasks.append(asyncio.create_task(run_sms_dispatch()))
     logger.info("SMS dispatch worker started")
 
+    # Inbound SMS: runs the conductor for texts the Twilio webhook queued
+    from src.workers.inbound_sms import run_inbound_sms
+    worker_tasks.append(asyncio.create_task(run_inbound_sms()))
+    logger.info("Inbound SMS worker started")
+
     # Registration poller
     from src.workers.registration_poller import run_registration_poller
     worker_tasks.append(asyncio.create_task(run_registration_poller()))
     logger.info("Registration poller started")
 
+    # Dashboard metric rollups
+    from src.workers.metrics_rollup import run_metrics_rollup
+    worker_tasks.append(asyncio.create_task(run_metrics_rollup()))
+    logger.info("Metrics rollup worker started")
+
     # Trial reminder (sends email reminders before trial expiry).
     # Explicit opt-in keeps worker counts stable across environments/tests.
     if getattr(settings, "trial_reminder_enabled", False) is True:
@@ -234,6 +256,10 @@ async def lifespan(app: FastAPI):
         if pending:
             await asyncio.gather(*pending, return_exceptions=True)
     _release_worker_lock(worker_lock_fd)
+    # After the workers, so signals they recorded while stopping are flushed
+    await stop_signal_writer(signal_writer)
+    cache_listener.cancel()
+    await close_http_clients()
     logger.info("LeadLock shutdown complete - all %d workers stopped", len(worker_tasks))
 
 
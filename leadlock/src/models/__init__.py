@@ -17,6 +17,8 @@ from src.models.email_blacklist import EmailBlacklist
 from src.models.webhook_event import WebhookEvent
 from src.models.failed_lead import FailedLead
 from src.models.ab_test import ABTestExperiment, ABTestVariant
+from src.models.client_metrics import ClientDailyMetric, ClientDailyMessages
+from src.models.send_time_stat import SendTimeStat
 
 __all__ = [
     "Client",
@@ -36,4 +38,7 @@ __all__ = [
     "FailedLead",
     "ABTestExperiment",
     "ABTestVariant",
+    "ClientDailyMetric",
+    "ClientDailyMessages",
+    "SendTimeStat",
 ]
@@ -4,7 +4,7 @@ Booking model - confirmed appointments with CRM sync tracking.
 import uuid
 from datetime import datetime, timezone, date, time
 from typing import Optional
-from sqlalchemy import String, Text, Boolean, Integer, DateTime, Date, Time, ForeignKey, Index
+from sqlalchemy import String, Text, Boolean, Integer, DateTime, Date, Time, ForeignKey, Index, text
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from src.database import Base
@@ -43,19 +43,23 @@ class Booking(Base):
     crm_customer_id: Mapped[Optional[str]] = mapped_column(String(100))
     crm_sync_status: Mapped[str] = mapped_column(
         String(20), default="pending"
-    )  # pending, synced, failed, not_applicable
+    )  # pending, retrying, synced, failed, not_applicable
     crm_sync_error: Mapped[Optional[str]] = mapped_column(Text)
     crm_synced_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
+    crm_retry_count: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+    crm_next_retry_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
 
     # Status
     status: Mapped[str] = mapped_column(
         String(20), default="confirmed"
-    )  # confirmed, completed, cancelled, no_show, rescheduled
+    )  # confirmed, completed, cancelled, no_show, rescheduled, conflict
     cancellation_reason: Mapped[Optional[str]] = mapped_column(Text)
 
     # Reminders
     reminder_sent: Mapped[bool] = mapped_column(Boolean, default=False)
     reminder_sent_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
+    # Set when quiet hours defer the day-before reminder; may fall on the appointment day
+    reminder_due_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
     same_day_reminder_sent: Mapped[bool] = mapped_column(Boolean, default=False)
 
     # Review tracking
@@ -79,8 +83,19 @@ class Booking(Base):
     __table_args__ = (
         Index("ix_bookings_client_id", "client_id"),
         Index("ix_bookings_appointment_date", "appointment_date"),
+        Index("ix_bookings_client_appointment_date", "client_id", "appointment_date"),
         Index("ix_bookings_status", "status"),
         Index("ix_bookings_crm_sync_status", "crm_sync_status"),
+        Index("ix_bookings_crm_sync_status_next_retry", "crm_sync_status", "crm_next_retry_at"),
+        # Backstop for the slot inventory: one confirmed booking per slot
+        Index(
+            "uq_bookings_client_slot_confirmed",
+            "client_id", "appointment_date", "time_window_start",
+            unique=True,
+            postgresql_where=text("status = 'confirmed'"),
+            # Same partial index in the SQLite test database
+            sqlite_where=text("status = 'confirmed'"),
+        ),
     )
 
     def __repr__(self) -> str:
@@ -0,0 +1,86 @@
+"""
+Client daily metrics - pre-aggregated rollups behind the dashboard and ROI pages.
+
+client_daily_metrics holds one row per client, UTC day of Lead.created_at,
+source, state and qualify variant. client_daily_messages holds the per-day
+conversation count. Both are rebuilt incrementally by the metrics rollup
+worker (src/services/metrics_rollup.py), so dashboard reads scan a handful of
+rows per day instead of every lead.
+"""
+import uuid
+from datetime import date, datetime, timezone
+from sqlalchemy import String, Integer, BigInteger, Float, Date, DateTime, ForeignKey, Index
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+from src.database import Base
+
+
+class ClientDailyMetric(Base):
+    """Lead totals for one (client, day, source, state, qualify_variant) cell."""
+
+    __tablename__ = "client_daily_metrics"
+
+    id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
+    )
+    client_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("clients.id", ondelete="CASCADE"), nullable=False
+    )
+    day: Mapped[date] = mapped_column(Date, nullable=False)  # UTC day of Lead.created_at
+    source: Mapped[str] = mapped_column(String(50), nullable=False)
+    state: Mapped[str] = mapped_column(String(30), nullable=False)
+    qualify_variant: Mapped[str] = mapped_column(
+        String(10), default="", nullable=False
+    )  # "" when the lead has no variant
+
+    leads: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    # Response time: leads with first_response_ms set, their sum, and cumulative buckets
+    responded: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    response_ms_total: Mapped[int] = mapped_column(BigInteger, default=0, nullable=False)
+    responded_under_5s: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    responded_under_10s: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    responded_under_30s: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    responded_under_60s: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+
+    ai_cost_usd: Mapped[float] = mapped_column(Float, default=0.0, nullable=False)
+    sms_cost_usd: Mapped[float] = mapped_column(Float, default=0.0, nullable=False)
+
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=lambda: datetime.now(timezone.utc)
+    )
+
+    __table_args__ = (
+        Index(
+            "ix_client_daily_metrics_cell",
+            "client_id", "day", "source", "state", "qualify_variant",
+            unique=True,
+        ),
+    )
+
+    def __repr__(self) -> str:
+        return f"<ClientDailyMetric {self.day} {self.source}/{self.state}={self.leads}>"
+
+
+class ClientDailyMessages(Base):
+    """Conversation rows per (client, UTC day of Conversation.created_at)."""
+
+    __tablename__ = "client_daily_messages"
+
+    id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
+    )
+    client_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("clients.id", ondelete="CASCADE"), nullable=False
+    )
+    day: Mapped[date] = mapped_column(Date, nullable=False)
+    messages: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=lambda: datetime.now(timezone.utc)
+    )
+
+    __table_args__ = (
+        Index("ix_client_daily_messages_client_day", "client_id", "day", unique=True),
+    )
+
+    def __repr__(self) -> str:
+        return f"<ClientDailyMessages {self.day}={self.messages}>"
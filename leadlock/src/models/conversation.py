@@ -75,6 +75,7 @@ class Conversation(Base):
         Index("ix_conversations_lead_id", "lead_id"),
         Index("ix_conversations_client_id", "client_id"),
         Index("ix_conversations_created_at", "created_at"),
+        Index("ix_conversations_lead_created", "lead_id", "created_at"),
         Index("ix_conversations_sms_sid", "sms_sid"),
     )
 
@@ -135,6 +135,7 @@ class Lead(Base):
         Index("ix_leads_state", "state"),
         Index("ix_leads_source", "source"),
         Index("ix_leads_created_at", "created_at"),
+        Index("ix_leads_updated_at", "updated_at"),
         Index("ix_leads_client_phone", "client_id", "phone"),
         Index("ix_leads_next_followup", "next_followup_at"),
     )
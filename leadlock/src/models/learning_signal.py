@@ -2,11 +2,14 @@
 LearningSignal model - tracks what-works feedback loop.
 Records positive/negative signals from email engagement, replies,
 and bookings to feed back into email generation.
+
+The hot dimensions (trade, state, time_bucket, step, lead_id) are also
+stored as typed, indexed columns so analytics queries don't scan JSONB.
 """
 import uuid
 from datetime import datetime, timezone
 from typing import Optional
-from sqlalchemy import String, Float, DateTime, ForeignKey, Index
+from sqlalchemy import String, Float, Integer, DateTime, ForeignKey, Index
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import Mapped, mapped_column
 from src.database import Base
@@ -28,6 +31,13 @@ class LearningSignal(Base):
         JSONB
     )  # {"trade": "hvac", "city": "Austin", "state": "TX", "step": 1, "time_bucket": "9am-12pm", "day_of_week": "tuesday"}
 
+    # Typed copies of the hot dimensions (see learning.dimension_columns)
+    trade: Mapped[Optional[str]] = mapped_column(String(50))
+    state: Mapped[Optional[str]] = mapped_column(String(10))
+    time_bucket: Mapped[Optional[str]] = mapped_column(String(20))
+    step: Mapped[Optional[int]] = mapped_column(Integer)
+    lead_id: Mapped[Optional[uuid.UUID]] = mapped_column(UUID(as_uuid=True))
+
     value: Mapped[float] = mapped_column(
         Float, nullable=False
     )  # 1.0 positive, 0.0 negative
@@ -42,6 +52,17 @@ class LearningSignal(Base):
 
     __table_args__ = (
         Index("ix_learning_signals_type_created", "signal_type", "created_at"),
+        Index(
+            "ix_learning_signals_type_trade_state_bucket",
+            "signal_type", "trade", "state", "time_bucket",
+            postgresql_include=["value"],
+        ),
+        Index(
+            "ix_learning_signals_type_step",
+            "signal_type", "step",
+            postgresql_include=["value"],
+        ),
+        Index("ix_learning_signals_lead_id", "lead_id"),
     )
 
     def __repr__(self) -> str:
@@ -0,0 +1,49 @@
+"""
+SendTimeStat model - daily email-open rollup behind the send-time model.
+
+One row per UTC day of LearningSignal.created_at, trade, state and time
+bucket for email_opened signals. Rebuilt incrementally by the metrics
+rollup worker (src/services/send_time_model.py); smart send timing reads
+the summed rows into memory instead of grouping learning_signals by JSONB.
+"""
+import uuid
+from datetime import date, datetime, timezone
+from sqlalchemy import String, Integer, Float, Date, DateTime, Index
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+from src.database import Base
+
+
+class SendTimeStat(Base):
+    """Open signals for one (day, trade, state, time_bucket) cell."""
+
+    __tablename__ = "send_time_stats"
+
+    id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
+    )
+    day: Mapped[date] = mapped_column(Date, nullable=False)  # UTC day of the signal
+    trade: Mapped[str] = mapped_column(String(50), nullable=False)
+    state: Mapped[str] = mapped_column(String(10), default="", nullable=False)
+    time_bucket: Mapped[str] = mapped_column(String(20), nullable=False)
+
+    samples: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    value_sum: Mapped[float] = mapped_column(Float, default=0.0, nullable=False)
+
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=lambda: datetime.now(timezone.utc)
+    )
+
+    __table_args__ = (
+        Index(
+            "ix_send_time_stats_cell",
+            "day", "trade", "state", "time_bucket",
+            unique=True,
+        ),
+    )
+
+    def __repr__(self) -> str:
+        return (
+            f"<SendTimeStat {self.day} {self.trade}/{self.state} "
+            f"{self.time_bucket} n={self.samples}>"
+        )
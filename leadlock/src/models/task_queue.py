@@ -1,12 +1,16 @@
 """
 TaskQueue model - event-driven task processing queue.
 Supports delayed/scheduled tasks, retries with exponential backoff,
-and priority-based processing.
+priority-based processing, and lease-based claiming by multiple workers.
+
+task_queue is the hot table: pending and in-flight rows plus recently
+finished ones. The retention compactor moves older terminal rows to
+task_queue_archive and folds them into task_queue_daily_rollups.
 """
 import uuid
-from datetime import datetime, timezone
+from datetime import date, datetime, timezone
 from typing import Optional
-from sqlalchemy import String, Integer, Float, Text, DateTime, Index
+from sqlalchemy import String, Integer, Float, Text, Date, DateTime, Index
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import Mapped, mapped_column
 from src.database import Base
@@ -25,6 +29,10 @@ class TaskQueue(Base):
 
     payload: Mapped[Optional[dict]] = mapped_column(JSONB)
 
+    lane: Mapped[str] = mapped_column(
+        String(20), default="normal", server_default="normal", nullable=False
+    )  # express, normal, bulk (see task_dispatch.TASK_LANES)
+
     status: Mapped[str] = mapped_column(
         String(20), default="pending", nullable=False
     )  # pending, processing, completed, failed
@@ -42,6 +50,11 @@ class TaskQueue(Base):
     )
 
     started_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
+
+    # Lease held by the worker executing the task; expired leases are reclaimed
+    worker_id: Mapped[Optional[str]] = mapped_column(String(64))
+    lease_expires_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
+
     completed_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
     error_message: Mapped[Optional[str]] = mapped_column(Text)
     result_data: Mapped[Optional[dict]] = mapped_column(JSONB)
@@ -52,7 +65,79 @@ class TaskQueue(Base):
 
     __table_args__ = (
         Index("ix_task_queue_processing", "status", "scheduled_at", "priority"),
+        # Dispatch only ever touches the small set of pending rows
+        Index(
+            "ix_task_queue_pending",
+            "lane",
+            "scheduled_at",
+            "priority",
+            postgresql_where="status = 'pending'",
+        ),
+        Index(
+            "ix_task_queue_lease",
+            "lease_expires_at",
+            postgresql_where="status = 'processing'",
+        ),
     )
 
     def __repr__(self) -> str:
         return f"<TaskQueue {self.task_type} ({self.status})>"
+
+
+class TaskQueueArchive(Base):
+    """Terminal task_queue rows moved out of the hot table by the compactor."""
+
+    __tablename__ = "task_queue_archive"
+
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True)
+    task_type: Mapped[str] = mapped_column(String(50), nullable=False)
+    lane: Mapped[str] = mapped_column(String(20), default="normal", nullable=False)
+    status: Mapped[str] = mapped_column(String(20), nullable=False)  # completed, failed
+    priority: Mapped[int] = mapped_column(Integer, default=5)
+    retry_count: Mapped[int] = mapped_column(Integer, default=0)
+    payload: Mapped[Optional[dict]] = mapped_column(JSONB)
+    result_data: Mapped[Optional[dict]] = mapped_column(JSONB)
+    error_message: Mapped[Optional[str]] = mapped_column(Text)
+    scheduled_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
+    started_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
+    completed_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
+    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
+    archived_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=lambda: datetime.now(timezone.utc)
+    )
+
+    __table_args__ = (
+        Index("ix_task_queue_archive_type_completed", "task_type", "completed_at"),
+        Index("ix_task_queue_archive_archived_at", "archived_at"),
+    )
+
+    def __repr__(self) -> str:
+        return f"<TaskQueueArchive {self.task_type} ({self.status})>"
+
+
+class TaskQueueDailyRollup(Base):
+    """Per-day, per-type, per-status totals for archived tasks (fleet dashboard)."""
+
+    __tablename__ = "task_queue_daily_rollups"
+
+    id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
+    )
+    day: Mapped[date] = mapped_column(Date, nullable=False)  # UTC day of completed_at
+    task_type: Mapped[str] = mapped_column(String(50), nullable=False)
+    status: Mapped[str] = mapped_column(String(20), nullable=False)
+    task_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    retry_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    total_duration_s: Mapped[float] = mapped_column(Float, default=0.0, nullable=False)
+    timed_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    max_duration_s: Mapped[float] = mapped_column(Float, default=0.0, nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=lambda: datetime.now(timezone.utc)
+    )
+
+    __table_args__ = (
+        Index("ix_task_queue_rollups_day_type_status", "day", "task_type", "status", unique=True),
+    )
+
+    def __repr__(self) -> str:
+        return f"<TaskQueueDailyRollup {self.day} {self.task_type} {self.status}={self.task_count}>"
@@ -1,10 +1,15 @@
 """
 Webhook event audit trail - every incoming webhook is recorded before processing.
 Enables debugging, replay, and compliance auditing.
+
+processing_status: received -> queued (inbound SMS waiting for the
+inbound_sms worker) -> processing -> completed | failed | rejected.
+claimed_at is when the inbound_sms worker moved a queued event to
+processing; an event stuck there past its lease is claimed again.
 """
 import uuid
 from datetime import datetime, timezone
-from sqlalchemy import Column, String, DateTime, Text, ForeignKey
+from sqlalchemy import Column, String, DateTime, Text, ForeignKey, Index
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from src.database import Base
 
@@ -24,4 +29,20 @@ class WebhookEvent(Base):
     )
     error_message = Column(Text, nullable=True)
     processed_at = Column(DateTime(timezone=True), nullable=True)
+    claimed_at = Column(DateTime(timezone=True), nullable=True)
     correlation_id = Column(String(64), nullable=True, index=True)
+
+    __table_args__ = (
+        # inbound_sms sweeps the few events still waiting on the queue
+        Index(
+            "ix_webhook_events_queued",
+            "received_at",
+            postgresql_where="processing_status = 'queued'",
+        ),
+        # ...and reclaims the ones a worker claimed but never finished
+        Index(
+            "ix_webhook_events_processing_claimed",
+            "claimed_at",
+            postgresql_where="processing_status = 'processing' AND claimed_at IS NOT NULL",
+        ),
+    )
@@ -73,6 +73,7 @@ class SchedulingConfig(BaseModel):
     buffer_minutes: int = 30
     max_daily_bookings: int = 8
     advance_booking_days: int = 14
+    crm_availability: bool = False  # also limit slots to CRM-reported availability
 
 
 class ClientConfig(BaseModel):
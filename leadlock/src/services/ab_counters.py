@@ -0,0 +1,140 @@
+"""
+A/B variant counters - sent/opened/replied deltas kept in Redis.
+
+Every email send and webhook event used to read the ABTestVariant row,
+bump a counter in Python and commit, so concurrent writers lost updates
+and all contended on the same few rows. Events now HINCRBY a per-variant
+hash and mark the variant dirty:
+
+    leadlock:ab_counts:{variant_id} -> {"sent": n, "opened": n, "replied": n}
+    leadlock:ab_counts:dirty        -> {variant_id, ...}
+
+fold() periodically moves the deltas into ab_test_variants with
+`total = total + delta` UPDATEs (ab_testing.apply_event_counts) and then
+subtracts exactly what it applied, so increments racing with a fold are
+kept for the next one. Readers add pending() to the DB totals.
+
+If the process dies between the DB commit and the subtraction, that
+fold's deltas are applied again on the next run.
+"""
+import logging
+from typing import Awaitable, Callable
+
+logger = logging.getLogger(__name__)
+
+COUNTS_KEY_PREFIX = "leadlock:ab_counts"
+DIRTY_KEY = f"{COUNTS_KEY_PREFIX}:dirty"
+FOLD_LOCK_KEY = "leadlock:lock:ab_counts_fold"
+FOLD_LOCK_TTL = 120  # seconds
+
+EVENT_TYPES = ("sent", "opened", "replied")
+
+
+def _counts_key(variant_id: str) -> str:
+    return f"{COUNTS_KEY_PREFIX}:{variant_id}"
+
+
+def _clean(counts: dict[str, dict[str, int]]) -> dict[str, dict[str, int]]:
+    """Drop unknown event types and zero deltas."""
+    cleaned = {}
+    for variant_id, by_type in counts.items():
+        by_type = {
+            event_type: int(n)
+            for event_type, n in by_type.items()
+            if event_type in EVENT_TYPES and n
+        }
+        if by_type:
+            cleaned[str(variant_id)] = by_type
+    return cleaned
+
+
+async def increment(counts: dict[str, dict[str, int]]) -> bool:
+    """
+    Add {variant_id: {event_type: n}} to the Redis counters in one round
+    trip. Returns False if Redis is unavailable (nothing was recorded).
+    """
+    counts = _clean(counts)
+    if not counts:
+        return True
+    try:
+        from src.utils.dedup import get_redis
+        redis = await get_redis()
+        pipe = redis.pipeline()
+        for variant_id, by_type in counts.items():
+            for event_type, n in by_type.items():
+                pipe.hincrby(_counts_key(variant_id), event_type, n)
+        pipe.sadd(DIRTY_KEY, *counts.keys())
+        await pipe.execute()
+        return True
+    except Exception as e:
+        logger.debug("A/B counter increment failed: %s", str(e))
+        return False
+
+
+async def _read(redis, variant_ids: list[str]) -> dict[str, dict[str, int]]:
+    pipe = redis.pipeline()
+    for variant_id in variant_ids:
+        pipe.hgetall(_counts_key(variant_id))
+    raw = await pipe.execute()
+    return _clean({
+        variant_id: {event_type: int(n) for event_type, n in (fields or {}).items()}
+        for variant_id, fields in zip(variant_ids, raw)
+    })
+
+
+async def pending(variant_ids) -> dict[str, dict[str, int]]:
+    """Deltas not yet folded into the DB. Empty if Redis is unavailable."""
+    variant_ids = [str(v) for v in variant_ids]
+    if not variant_ids:
+        return {}
+    try:
+        from src.utils.dedup import get_redis
+        redis = await get_redis()
+        return await _read(redis, variant_ids)
+    except Exception as e:
+        logger.debug("A/B pending counts unavailable: %s", str(e))
+        return {}
+
+
+async def fold(apply: Callable[[dict[str, dict[str, int]]], Awaitable[None]]) -> int:
+    """
+    Hand every dirty variant's deltas to `apply` (one DB transaction), then
+    subtract them from Redis. Returns variants folded; 0 if Redis is
+    unavailable or another process is folding.
+    """
+    try:
+        from src.utils.dedup import get_redis
+        redis = await get_redis()
+        if not await redis.set(FOLD_LOCK_KEY, "1", nx=True, ex=FOLD_LOCK_TTL):
+            return 0
+    except Exception as e:
+        logger.debug("A/B counter fold skipped, Redis unavailable: %s", str(e))
+        return 0
+
+    try:
+        variant_ids = sorted(await redis.smembers(DIRTY_KEY) or ())
+        if not variant_ids:
+            return 0
+        # Clear the flags first: an increment from here on re-marks its variant
+        await redis.srem(DIRTY_KEY, *variant_ids)
+        counts = await _read(redis, variant_ids)
+        if not counts:
+            return 0
+
+        try:
+            await apply(counts)
+        except Exception:
+            await redis.sadd(DIRTY_KEY, *counts.keys())
+            raise
+
+        pipe = redis.pipeline()
+        for variant_id, by_type in counts.items():
+            for event_type, n in by_type.items():
+                pipe.hincrby(_counts_key(variant_id), event_type, -n)
+        await pipe.execute()
+        return len(counts)
+    finally:
+        try:
+            await redis.delete(FOLD_LOCK_KEY)
+        except Exception as e:
+            logger.debug("A/B counter fold lock release failed: %s", str(e))
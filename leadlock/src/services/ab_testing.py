@@ -5,7 +5,9 @@ One-Writer for ab_test_experiments/variants tables.
 Experiment lifecycle:
 1. create_experiment() generates 2-3 subject line variants via AI
 2. assign_variant() deterministically assigns a variant to each email send
-3. record_event() increments open/reply counters
+3. record_event() / record_event_counts() increment sent/open/reply counters
+   in Redis (services/ab_counters.py); fold_event_counts() moves them into
+   the variant rows, and readers add the pending deltas to the DB totals
 4. check_winner() declares a winner when one variant beats others by >20% with n>=30
 """
 import logging
@@ -14,11 +16,13 @@ import uuid
 from datetime import datetime, timezone
 from typing import Optional
 
-from sqlalchemy import select, and_
+from sqlalchemy import select, case, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.database import async_session_factory
 from src.models.ab_test import ABTestExperiment, ABTestVariant
+from src.services import ab_counters
+from src.services.experiment_registry import find_experiment, invalidate_registry
 from src.services.ai import generate_response, parse_json_content
 from src.utils.agent_cost import track_agent_cost
 
@@ -138,6 +142,7 @@ async def create_experiment(
             })
 
         await db.commit()
+        invalidate_registry()
 
         logger.info(
             "Created A/B experiment: %s with %d variants (step=%d, trade=%s)",
@@ -159,45 +164,11 @@ async def get_active_experiment(
     """
     Find an active experiment for a given step and trade.
     Returns experiment with variants or None if no active experiment.
+
+    Served from the per-process experiment registry, so per-email calls
+    don't query the A/B tables.
     """
-    async with async_session_factory() as db:
-        # Look for trade-specific experiment first, then general
-        for trade_filter in [trade_type, None]:
-            query = select(ABTestExperiment).where(
-                and_(
-                    ABTestExperiment.status == "active",
-                    ABTestExperiment.sequence_step == sequence_step,
-                    ABTestExperiment.target_trade == trade_filter
-                    if trade_filter
-                    else ABTestExperiment.target_trade.is_(None),
-                )
-            ).limit(1)
-
-            result = await db.execute(query)
-            experiment = result.scalar_one_or_none()
-
-            if experiment:
-                variants_result = await db.execute(
-                    select(ABTestVariant).where(
-                        ABTestVariant.experiment_id == experiment.id
-                    )
-                )
-                variants = variants_result.scalars().all()
-
-                return {
-                    "experiment_id": str(experiment.id),
-                    "variants": [
-                        {
-                            "id": str(v.id),
-                            "label": v.variant_label,
-                            "instruction": v.subject_instruction,
-                            "total_sent": v.total_sent,
-                        }
-                        for v in variants
-                    ],
-                }
-
-    return None
+    return await find_experiment(sequence_step, trade_type)
 
 
 def assign_variant(variants: list[dict]) -> dict:
@@ -216,37 +187,91 @@ def assign_variant(variants: list[dict]) -> dict:
     return random.choice(variants)
 
 
+def _merged_totals(variant: ABTestVariant, pending: dict) -> tuple[int, int, int, float]:
+    """(sent, opened, replied, open_rate) including deltas not yet folded."""
+    delta = pending.get(str(variant.id), {})
+    sent = variant.total_sent + delta.get("sent", 0)
+    opened = variant.total_opened + delta.get("opened", 0)
+    replied = variant.total_replied + delta.get("replied", 0)
+    open_rate = opened / sent if sent > 0 else variant.open_rate
+    return sent, opened, replied, open_rate
+
+
 async def record_event(
     variant_id: str,
     event_type: str,
 ) -> None:
     """
-    Record an open or reply event for a variant.
+    Record a send, open or reply event for a variant.
 
     Args:
         variant_id: UUID of the variant
         event_type: "sent", "opened", or "replied"
     """
-    async with async_session_factory() as db:
-        variant = await db.get(ABTestVariant, uuid.UUID(variant_id))
-        if not variant:
-            logger.warning("A/B variant not found: %s", variant_id[:8])
-            return
-
-        if event_type == "sent":
-            variant.total_sent = variant.total_sent + 1
-        elif event_type == "opened":
-            variant.total_opened = variant.total_opened + 1
-        elif event_type == "replied":
-            variant.total_replied = variant.total_replied + 1
-
-        # Recalculate open rate
-        if variant.total_sent > 0:
-            variant.open_rate = variant.total_opened / variant.total_sent
+    await record_event_counts({variant_id: {event_type: 1}})
+
+
+async def record_event_counts(counts: dict[str, dict[str, int]]) -> None:
+    """
+    Record batched event counts. Increments the Redis counters, or updates
+    the variant rows directly if Redis is unavailable.
+
+    Args:
+        counts: {variant_id: {"sent" | "opened" | "replied": n}}. Other
+            event types are ignored.
+    """
+    if not counts:
+        return
+    if await ab_counters.increment(counts):
+        return
+    await apply_event_counts(counts)
+
 
+async def apply_event_counts(counts: dict[str, dict[str, int]]) -> None:
+    """
+    Add event counts to the variant rows, one UPDATE per variant, in a
+    single transaction.
+
+    Counters are incremented in SQL, so concurrent writers never lose updates.
+    """
+    columns = {
+        "sent": ABTestVariant.total_sent,
+        "opened": ABTestVariant.total_opened,
+        "replied": ABTestVariant.total_replied,
+    }
+    if not counts:
+        return
+    async with async_session_factory() as db:
+        for variant_id, by_type in counts.items():
+            values = {
+                columns[event_type].key: columns[event_type] + n
+                for event_type, n in by_type.items()
+                if event_type in columns and n
+            }
+            if not values:
+                continue
+            sent = ABTestVariant.total_sent + by_type.get("sent", 0)
+            opened = ABTestVariant.total_opened + by_type.get("opened", 0)
+            values["open_rate"] = case(
+                (sent > 0, opened * 1.0 / sent),
+                else_=ABTestVariant.open_rate,
+            )
+            await db.execute(
+                update(ABTestVariant)
+                .where(ABTestVariant.id == uuid.UUID(str(variant_id)))
+                .values(**values)
+            )
         await db.commit()
 
 
+async def fold_event_counts() -> int:
+    """Move pending Redis counters into ab_test_variants. Returns variants updated."""
+    folded = await ab_counters.fold(apply_event_counts)
+    if folded:
+        logger.debug("Folded A/B counters for %d variants", folded)
+    return folded
+
+
 async def check_and_declare_winner(experiment_id: str) -> Optional[dict]:
     """
     Check if an experiment has a winner. A variant wins when:
@@ -271,22 +296,26 @@ async def check_and_declare_winner(experiment_id: str) -> Optional[dict]:
         if len(variants) < 2:
             return None
 
+        pending = await ab_counters.pending(v.id for v in variants)
+        totals = {v.id: _merged_totals(v, pending) for v in variants}
+
         # Check minimum sample size
         min_sample = experiment.min_sample_per_variant
-        if any(v.total_sent < min_sample for v in variants):
+        if any(totals[v.id][0] < min_sample for v in variants):
             return None
 
         # Find best variant by open rate
-        sorted_variants = sorted(variants, key=lambda v: v.open_rate, reverse=True)
+        sorted_variants = sorted(variants, key=lambda v: totals[v.id][3], reverse=True)
         best = sorted_variants[0]
-        second_best = sorted_variants[1]
+        best_sent, _, best_replied, best_rate = totals[best.id]
+        second_rate = totals[sorted_variants[1].id][3]
 
         # Winner must beat second-best by 20% relative
-        if second_best.open_rate > 0:
-            improvement = (best.open_rate - second_best.open_rate) / second_best.open_rate
+        if second_rate > 0:
+            improvement = (best_rate - second_rate) / second_rate
         else:
             # If second best has 0 open rate, any opens = winner
-            improvement = 1.0 if best.open_rate > 0 else 0.0
+            improvement = 1.0 if best_rate > 0 else 0.0
 
         if improvement < 0.20:
             return None  # No clear winner yet
@@ -299,11 +328,12 @@ async def check_and_declare_winner(experiment_id: str) -> Optional[dict]:
         experiment.completed_at = now
 
         await db.commit()
+        invalidate_registry()
 
         logger.info(
             "A/B test winner: experiment=%s variant=%s open_rate=%.1f%% (beat next by %.0f%%)",
             str(experiment.id)[:8], best.variant_label,
-            best.open_rate * 100, improvement * 100,
+            best_rate * 100, improvement * 100,
         )
 
         # Store winning pattern for intelligence loop
@@ -315,17 +345,25 @@ async def check_and_declare_winner(experiment_id: str) -> Optional[dict]:
                 instruction_text=best.subject_instruction,
                 trade=experiment.target_trade,
                 step=experiment.sequence_step,
-                open_rate=best.open_rate,
-                reply_rate=(best.total_replied / best.total_sent) if best.total_sent > 0 else 0.0,
-                sample_size=best.total_sent,
+                open_rate=best_rate,
+                reply_rate=(best_replied / best_sent) if best_sent > 0 else 0.0,
+                sample_size=best_sent,
                 source_id=str(experiment.id),
             )
         except Exception as wp_err:
             logger.warning("Failed to store winning pattern: %s", str(wp_err))
 
+        # Other processes drop their experiment registry
+        from src.services.event_bus import publish_event
+        await publish_event("ab_test_winner", {
+            "experiment_id": str(experiment.id),
+            "sequence_step": experiment.sequence_step,
+            "target_trade": experiment.target_trade,
+        })
+
         return {
             "winner_label": best.variant_label,
             "winner_instruction": best.subject_instruction,
-            "winner_open_rate": best.open_rate,
+            "winner_open_rate": best_rate,
             "improvement_pct": improvement,
         }
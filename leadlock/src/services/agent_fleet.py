@@ -10,7 +10,7 @@ from __future__ import annotations
 import asyncio
 import json
 import logging
-from datetime import datetime, timedelta, timezone
+from datetime import date, datetime, timedelta, timezone
 from pathlib import Path
 from typing import Any
 
@@ -153,11 +153,11 @@ AGENT_REGISTRY: dict[str, dict[str, Any]] = {
     "sms_dispatch": {
         "display_name": "SMS Dispatch",
         "description": "Sends follow-up messages and booking reminders with compliance checks",
-        "schedule": "Every 60s",
+        "schedule": "When due (idle max 3 min)",
         "icon": "send",
         "color": "sky",
         "uses_ai": False,
-        "poll_interval": 60,
+        "poll_interval": 180,
         "task_types": ["schedule_followup", "send_booking_reminder"],
         "tier": TIER_CORE_OPS,
     },
@@ -175,11 +175,11 @@ AGENT_REGISTRY: dict[str, dict[str, Any]] = {
     "crm_sync": {
         "display_name": "CRM Sync",
         "description": "Synchronizes lead and appointment data with external CRMs",
-        "schedule": "Every 30s",
+        "schedule": "When due (idle max 3 min)",
         "icon": "database",
         "color": "orange",
         "uses_ai": False,
-        "poll_interval": 30,
+        "poll_interval": 180,
         "task_types": ["sync_crm"],
         "tier": TIER_CORE_OPS,
     },
@@ -472,6 +472,10 @@ async def get_agent_activity(name: str, limit: int = 20) -> dict:
                             TaskQueue.completed_at.isnot(None),
                             TaskQueue.started_at.isnot(None),
                         ),
+                        func.count(TaskQueue.id).filter(
+                            TaskQueue.completed_at.isnot(None),
+                            TaskQueue.started_at.isnot(None),
+                        ),
                     ).where(
                         and_(
                             TaskQueue.task_type.in_(task_types),
@@ -483,6 +487,19 @@ async def get_agent_activity(name: str, limit: int = 20) -> dict:
                 total = week_rows[0] or 0
                 success = week_rows[1] or 0
                 avg_dur = float(week_rows[2]) if week_rows[2] else 0.0
+
+                # Older finished tasks live in the daily rollups, not the hot table
+                from src.services.task_retention import get_rollup_totals
+                archived = await get_rollup_totals(seven_days_ago.date(), task_types)
+                archived_total = sum(a["count"] for a in archived.values())
+                archived_timed = sum(a["timed_count"] for a in archived.values())
+                if archived_total:
+                    hot_timed = week_rows[3] or 0
+                    archived_duration = sum(a["total_duration_s"] for a in archived.values())
+                    if hot_timed + archived_timed:
+                        avg_dur = (avg_dur * hot_timed + archived_duration) / (hot_timed + archived_timed)
+                    total += archived_total
+                    success += archived.get("completed", {}).get("count", 0)
                 metrics_7d = {
                     "total_tasks": total,
                     "success_rate": round(success / total, 4) if total else 0.0,
@@ -585,6 +602,7 @@ async def get_task_queue(
                 tasks.append({
                     "id": str(t.id),
                     "task_type": t.task_type,
+                    "lane": t.lane,
                     "status": t.status,
                     "priority": t.priority,
                     "retry_count": t.retry_count,
@@ -609,6 +627,17 @@ async def get_task_queue(
             "status_counts": {},
         }
 
+    # Finished tasks older than the retention window are only in the rollups
+    archived_counts: dict[str, int] = {}
+    try:
+        from src.services.task_retention import get_rollup_totals
+        archived_counts = {
+            s: totals["count"]
+            for s, totals in (await get_rollup_totals(date.min, _ALL_TASK_TYPES)).items()
+        }
+    except Exception as e:
+        logger.warning("Failed to query task rollups: %s", str(e))
+
     return {
         "tasks": tasks,
         "pagination": {
@@ -618,9 +647,53 @@ async def get_task_queue(
             "total_pages": max(1, -(-total // per_page)),
         },
         "status_counts": status_counts,
+        "archived_counts": archived_counts,
+        "lanes": await get_lane_gauges(),
     }
 
 
+async def get_lane_gauges() -> dict[str, dict]:
+    """
+    Merge the per-lane gauges published by every live task executor.
+
+    Depth and oldest wait are queue-wide, so the freshest value wins;
+    in-flight counts and budgets are summed across executors.
+    """
+    from src.workers.task_processor import LANE_GAUGE_KEY, LANE_GAUGE_TTL_SECONDS
+
+    merged: dict[str, dict] = {}
+    try:
+        redis = await get_redis()
+        raw = await redis.hgetall(LANE_GAUGE_KEY) or {}
+    except Exception as e:
+        logger.debug("Lane gauge read failed: %s", str(e))
+        return merged
+
+    cutoff = datetime.now(timezone.utc) - timedelta(seconds=LANE_GAUGE_TTL_SECONDS)
+    snapshots = []
+    for value in raw.values():
+        try:
+            snap = json.loads(value)
+            updated_at = datetime.fromisoformat(snap["updated_at"])
+        except (ValueError, KeyError, TypeError):
+            continue
+        if updated_at >= cutoff:
+            snapshots.append((updated_at, snap.get("lanes", {})))
+
+    for _, lanes in sorted(snapshots, key=lambda item: item[0]):
+        for lane, stats in lanes.items():
+            current = merged.setdefault(lane, {"in_flight": 0, "budget": 0})
+            current["depth"] = stats.get("depth", 0)
+            current["oldest_wait_s"] = stats.get("oldest_wait_s", 0.0)
+            current["avg_claim_wait_ms"] = max(
+                current.get("avg_claim_wait_ms", 0), stats.get("avg_claim_wait_ms", 0),
+            )
+            current["in_flight"] += stats.get("in_flight", 0)
+            current["budget"] += stats.get("budget", 0)
+
+    return merged
+
+
 # ---------------------------------------------------------------------------
 # Cost breakdown
 # ---------------------------------------------------------------------------
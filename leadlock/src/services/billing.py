@@ -271,6 +271,9 @@ async def _handle_checkout_completed(session: dict) -> None:
 
         await db.commit()
 
+    from src.services.client_cache import invalidate_client
+    await invalidate_client(client_uuid)
+
     logger.info(
         "Subscription %s for client %s",
         "trial started" if billing_status == "trial" else "activated",
@@ -313,6 +316,9 @@ async def _handle_invoice_paid(invoice: dict) -> None:
             await db.commit()
             logger.info("Payment received, billing status set to active for %s", client.business_name)
 
+            from src.services.client_cache import invalidate_client
+            await invalidate_client(client.id)
+
 
 async def _handle_payment_failed(invoice: dict) -> None:
     """Handle failed payment - notify client."""
@@ -345,6 +351,9 @@ async def _handle_payment_failed(invoice: dict) -> None:
 
         await db.commit()
 
+    from src.services.client_cache import invalidate_client
+    await invalidate_client(client_id)
+
     logger.warning("Payment failed for client %s", business_name)
 
     # Send failure notification (using captured values, session is closed)
@@ -425,6 +434,9 @@ async def _handle_subscription_updated(subscription: dict) -> None:
                 "Subscription updated for %s: %s", client.business_name, new_status,
             )
 
+            from src.services.client_cache import invalidate_client
+            await invalidate_client(client.id)
+
     # Send trial-expired notification when trial converts to active
     if was_trial and dashboard_email:
         from src.services.transactional_email import send_trial_expired
@@ -451,3 +463,6 @@ async def _handle_subscription_deleted(subscription: dict) -> None:
             client.stripe_subscription_id = None
             await db.commit()
             logger.info("Subscription canceled for %s", client.business_name)
+
+            from src.services.client_cache import invalidate_client
+            await invalidate_client(client.id)
@@ -0,0 +1,254 @@
+"""
+Client cache — keeps webhook handlers off the clients table.
+
+Every inbound webhook used to load the Client row and then re-validate
+ClientConfig(**client.config) once per message. This module holds a read-only
+snapshot of the columns the lead pipeline reads, plus the already-parsed
+ClientConfig, in two tiers:
+
+1. An in-process LRU (LOCAL_TTL seconds) - a dict lookup per webhook.
+2. Redis (REDIS_TTL seconds) - shared by every process, one GET on a local miss.
+
+The DB is only hit when both tiers miss. Dashboard settings updates call
+invalidate_client(), which clears Redis and publishes config_changed on the
+event bus; every process runs run_client_cache_listener() to evict its LRU
+entry. LOCAL_TTL bounds staleness if a pub/sub message is ever missed.
+
+Secrets (dashboard password hash, CRM API key) are never cached.
+"""
+import asyncio
+import json
+import logging
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Optional
+
+from src.schemas.client_config import ClientConfig
+
+logger = logging.getLogger(__name__)
+
+CACHE_KEY_PREFIX = "leadlock:client_cache"
+REDIS_TTL = 300  # seconds
+LOCAL_TTL = 30  # seconds
+LOCAL_MAX_ENTRIES = 1024
+
+# Client columns the webhook -> conductor -> agent path reads
+CACHED_FIELDS = (
+    "business_name",
+    "trade_type",
+    "tier",
+    "twilio_phone",
+    "twilio_messaging_service_sid",
+    "billing_status",
+    "is_active",
+    "config",
+)
+
+# {client_id: (expires_at_monotonic, CachedClient)}
+_local: "OrderedDict[str, tuple[float, CachedClient]]" = OrderedDict()
+
+
+class CachedClient:
+    """
+    Read-only stand-in for a Client row on the lead pipeline hot path.
+
+    Exposes the same attribute names as the ORM model for CACHED_FIELDS, plus
+    client_config (the validated ClientConfig, parsed once on first access).
+    Not attached to any session: code that needs to write to the client must
+    load the ORM row.
+    """
+
+    __slots__ = ("id", "_client_config") + CACHED_FIELDS
+
+    def __init__(self, client_id: uuid.UUID, fields: dict[str, Any]):
+        self.id = client_id
+        for name in CACHED_FIELDS:
+            setattr(self, name, fields.get(name))
+        self.config = self.config or {}
+        self._client_config: Optional[ClientConfig] = None
+
+    @property
+    def client_config(self) -> ClientConfig:
+        if self._client_config is None:
+            self._client_config = ClientConfig(**self.config) if self.config else ClientConfig()
+        return self._client_config
+
+    @classmethod
+    def from_model(cls, client) -> "CachedClient":
+        return cls(client.id, {name: getattr(client, name, None) for name in CACHED_FIELDS})
+
+    def to_json(self) -> str:
+        return json.dumps({name: getattr(self, name) for name in CACHED_FIELDS})
+
+    def __repr__(self) -> str:
+        return f"<CachedClient {self.business_name} ({self.trade_type})>"
+
+
+def get_client_config(client) -> ClientConfig:
+    """Parsed ClientConfig for a CachedClient (no re-validation) or an ORM Client."""
+    if isinstance(client, CachedClient):
+        return client.client_config
+    return ClientConfig(**client.config) if client.config else ClientConfig()
+
+
+def _cache_key(client_id: str) -> str:
+    return f"{CACHE_KEY_PREFIX}:{client_id}"
+
+
+def _local_get(client_id: str) -> Optional[CachedClient]:
+    entry = _local.get(client_id)
+    if entry is None:
+        return None
+    expires_at, snapshot = entry
+    if expires_at < time.monotonic():
+        _local.pop(client_id, None)
+        return None
+    _local.move_to_end(client_id)
+    return snapshot
+
+
+def _local_put(client_id: str, snapshot: CachedClient) -> None:
+    _local[client_id] = (time.monotonic() + LOCAL_TTL, snapshot)
+    _local.move_to_end(client_id)
+    while len(_local) > LOCAL_MAX_ENTRIES:
+        _local.popitem(last=False)
+
+
+def evict_local(client_id: Optional[str] = None) -> None:
+    """Drop one client (or every client) from this process's LRU."""
+    if client_id is None:
+        _local.clear()
+    else:
+        _local.pop(str(client_id), None)
+
+
+async def get_cached_client(client_id: uuid.UUID | str, db=None) -> Optional[CachedClient]:
+    """
+    Return the CachedClient for client_id, or None if the client doesn't exist.
+
+    Args:
+        client_id: Client UUID (string or UUID). Invalid strings raise ValueError.
+        db: Optional session to load through on a full miss; a short-lived
+            session is opened otherwise.
+    """
+    cid = uuid.UUID(str(client_id))
+    key = str(cid)
+
+    snapshot = _local_get(key)
+    if snapshot is not None:
+        return snapshot
+
+    redis = None
+    try:
+        from src.utils.dedup import get_redis
+        redis = await get_redis()
+        cached = await redis.get(_cache_key(key))
+        if isinstance(cached, (str, bytes)) and cached:
+            snapshot = CachedClient(cid, json.loads(cached))
+            _local_put(key, snapshot)
+            return snapshot
+    except Exception as e:
+        logger.debug("Client cache read failed for %s: %s", key[:8], str(e))
+
+    client = await _load_from_db(cid, db)
+    if client is None:
+        return None
+
+    snapshot = CachedClient.from_model(client)
+    _local_put(key, snapshot)
+    if redis is not None:
+        try:
+            await redis.set(_cache_key(key), snapshot.to_json(), ex=REDIS_TTL)
+        except Exception as e:
+            logger.debug("Client cache write failed for %s: %s", key[:8], str(e))
+    return snapshot
+
+
+async def _load_from_db(client_id: uuid.UUID, db=None):
+    """Load the Client row, through the caller's session when one is given."""
+    from src.models.client import Client
+
+    if db is not None:
+        return await db.get(Client, client_id)
+
+    from src.database import async_session_factory
+    async with async_session_factory() as session:
+        return await session.get(Client, client_id)
+
+
+async def invalidate_client(client_id: uuid.UUID | str) -> None:
+    """
+    Drop a client from every cache tier. Call after any change to the row.
+
+    Clears the local LRU and Redis, then publishes config_changed so other
+    processes evict their LRU entry.
+    """
+    key = str(client_id)
+    evict_local(key)
+    try:
+        from src.utils.dedup import get_redis
+        redis = await get_redis()
+        await redis.delete(_cache_key(key))
+    except Exception as e:
+        logger.warning("Failed to invalidate client cache for %s: %s", key[:8], str(e))
+
+    from src.services.event_bus import publish_event
+    await publish_event("config_changed", {"client_id": key})
+
+
+async def run_client_cache_listener() -> None:
+    """
+    Evict LRU entries on config_changed events. Runs in every web process.
+    Also drops the A/B experiment registry on ab_test_winner events.
+
+    Uses the event bus pub/sub channel (not the pending list, which only one
+    worker drains). Reconnects with backoff if Redis drops.
+    """
+    from src.services.event_bus import CHANNEL
+    from src.utils.dedup import get_redis
+
+    backoff = 1
+    while True:
+        pubsub = None
+        try:
+            redis = await get_redis()
+            pubsub = redis.pubsub()
+            await pubsub.subscribe(CHANNEL)
+            backoff = 1
+            async for message in pubsub.listen():
+                if message.get("type") != "message":
+                    continue
+                _handle_bus_message(message.get("data"))
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning("Client cache listener error, retrying in %ds: %s", backoff, str(e))
+            # Anything published while disconnected is missed; start cold.
+            evict_local()
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, 60)
+        finally:
+            if pubsub is not None:
+                try:
+                    await pubsub.aclose()
+                except Exception:
+                    pass
+
+
+def _handle_bus_message(raw) -> None:
+    """Apply one event-bus payload to the local LRU."""
+    try:
+        payload = raw if isinstance(raw, str) else raw.decode()
+        event = json.loads(payload)
+    except (AttributeError, UnicodeDecodeError, json.JSONDecodeError):
+        return
+    if event.get("type") == "ab_test_winner":
+        from src.services.experiment_registry import invalidate_registry
+        invalidate_registry()
+        return
+    if event.get("type") != "config_changed":
+        return
+    client_id = (event.get("data") or {}).get("client_id")
+    if client_id:
+        evict_local(client_id)
@@ -14,7 +14,8 @@ Checks performed:
 6. Emergency bypass (life safety exception)
 """
 import logging
-from datetime import datetime, time
+from datetime import date, datetime, time, timedelta, timezone
+from functools import lru_cache
 from typing import Optional
 from zoneinfo import ZoneInfo
 
@@ -160,6 +161,15 @@ def check_consent(
     return ComplianceResult(True, "Consent verified")
 
 
+def _resolve_timezone(state_code: Optional[str], timezone_str: Optional[str]) -> ZoneInfo:
+    if timezone_str:
+        return ZoneInfo(timezone_str)
+    if state_code and state_code in STATE_TIMEZONES:
+        return ZoneInfo(STATE_TIMEZONES[state_code])
+    # Default to Eastern (most restrictive common timezone)
+    return ZoneInfo("America/New_York")
+
+
 def check_quiet_hours(
     state_code: Optional[str] = None,
     timezone_str: Optional[str] = None,
@@ -178,14 +188,7 @@ def check_quiet_hours(
     if is_emergency:
         return ComplianceResult(True, "Emergency bypass - life safety exception")
 
-    # Determine timezone
-    if timezone_str:
-        tz = ZoneInfo(timezone_str)
-    elif state_code and state_code in STATE_TIMEZONES:
-        tz = ZoneInfo(STATE_TIMEZONES[state_code])
-    else:
-        # Default to Eastern (most restrictive common timezone)
-        tz = ZoneInfo("America/New_York")
+    tz = _resolve_timezone(state_code, timezone_str)
 
     if now is None:
         now = datetime.now(tz)
@@ -234,6 +237,63 @@ def check_quiet_hours(
     return ComplianceResult(True, "Within allowed hours")
 
 
+# Quiet-hours rules: a send blocked by one of these is legal later, not never
+QUIET_HOURS_RULES = frozenset({
+    "tcpa_quiet_hours",
+    "fl_ftsa_hours",
+    "fl_ftsa_holiday",
+    "tx_sb140_sunday",
+})
+
+# Every window in check_quiet_hours opens at one of these local times
+_WINDOW_OPENINGS = (time(8, 0), time(12, 0))
+_MAX_LOOKAHEAD_DAYS = 14
+
+
+@lru_cache(maxsize=4096)
+def _first_opening(state_code: Optional[str], tz_name: str, local_date: date) -> Optional[time]:
+    """Earliest local time on `local_date` that check_quiet_hours allows, or None."""
+    tz = ZoneInfo(tz_name)
+    for opening in _WINDOW_OPENINGS:
+        if check_quiet_hours(state_code, tz_name, now=datetime.combine(local_date, opening, tzinfo=tz)):
+            return opening
+    return None
+
+
+def next_permissible_send(
+    state_code: Optional[str] = None,
+    timezone_str: Optional[str] = None,
+    now: Optional[datetime] = None,
+) -> datetime:
+    """
+    Earliest instant (UTC) at or after `now` when check_quiet_hours allows
+    a non-emergency send to this state.
+
+    Each day's opening time is computed once per (state, timezone, date).
+    """
+    tz = _resolve_timezone(state_code, timezone_str)
+    if now is None:
+        now = datetime.now(timezone.utc)
+    elif now.tzinfo is None:
+        now = now.replace(tzinfo=tz)
+
+    if check_quiet_hours(state_code, tz.key, now=now):
+        return now.astimezone(timezone.utc)
+
+    local_now = now.astimezone(tz)
+    for offset in range(_MAX_LOOKAHEAD_DAYS):
+        local_date = local_now.date() + timedelta(days=offset)
+        opening = _first_opening(state_code, tz.key, local_date)
+        if opening is None:
+            continue
+        candidate = datetime.combine(local_date, opening, tzinfo=tz)
+        if candidate > local_now:
+            return candidate.astimezone(timezone.utc)
+
+    # Unreachable with the current rules; fail safe to a day later
+    return (now + timedelta(days=1)).astimezone(timezone.utc)
+
+
 def check_message_limits(
     cold_outreach_count: int,
     max_cold_followups: int = 3,
@@ -0,0 +1,108 @@
+"""
+Due index - event-driven wakeup for polling workers.
+
+Workers like sms_dispatch and crm_sync used to sleep a fixed interval,
+adding up to a minute of latency to work that was due right away and
+polling an empty table all night. This generalises the BRPOP notify
+pattern of task_dispatch.enqueue_task / run_task_processor with a
+"next due at" index per worker:
+
+    leadlock:due:{worker}          sorted set  member -> due unix time
+    leadlock:due:{worker}:notify   list        pushed by schedule()
+
+Producers call schedule() after committing the row that makes work due
+(a booking, a followup task, a CRM retry). The worker loop is:
+
+    await due_index.consume(worker)   # the cycle below covers what is due
+    ...one DB cycle...
+    await due_index.wait(worker, max_wait, fallback_seconds)
+
+wait() returns when the earliest entry comes due, when schedule() pushes
+a notification, or after max_wait. The index is only a hint - the DB query
+stays the source of truth - so a lost entry costs latency, never work.
+Without Redis, wait() sleeps fallback_seconds like the old fixed poll.
+"""
+import asyncio
+import logging
+import math
+import time
+from datetime import datetime, timezone
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+DUE_KEY_PREFIX = "leadlock:due"
+
+
+def _due_key(worker: str) -> str:
+    return f"{DUE_KEY_PREFIX}:{worker}"
+
+
+def _notify_key(worker: str) -> str:
+    return f"{DUE_KEY_PREFIX}:{worker}:notify"
+
+
+def _score(due_at: Optional[datetime], now: float) -> float:
+    if due_at is None:
+        return now
+    if due_at.tzinfo is None:
+        due_at = due_at.replace(tzinfo=timezone.utc)
+    return due_at.timestamp()
+
+
+async def schedule(worker: str, items: dict[str, Optional[datetime]]) -> None:
+    """
+    Record {member: due_at} (None = due now) for a worker and wake it so it
+    can recompute its wait. Best-effort: failures are logged and ignored.
+    """
+    if not items:
+        return
+    now = time.time()
+    try:
+        from src.utils.dedup import get_redis
+        redis = await get_redis()
+        pipe = redis.pipeline()
+        pipe.zadd(_due_key(worker), {member: _score(due_at, now) for member, due_at in items.items()})
+        pipe.lpush(_notify_key(worker), "1")
+        pipe.ltrim(_notify_key(worker), 0, 0)  # one pending wakeup is enough
+        await pipe.execute()
+    except Exception as e:
+        logger.debug("Due index schedule failed for %s: %s", worker, str(e))
+
+
+async def consume(worker: str) -> int:
+    """Drop entries due by now - the cycle about to run handles them. Returns how many."""
+    try:
+        from src.utils.dedup import get_redis
+        redis = await get_redis()
+        return int(await redis.zremrangebyscore(_due_key(worker), "-inf", time.time()) or 0)
+    except Exception as e:
+        logger.debug("Due index consume failed for %s: %s", worker, str(e))
+        return 0
+
+
+async def wait(worker: str, max_wait: float, fallback_seconds: Optional[float] = None) -> None:
+    """
+    Block until the worker's earliest entry is due, schedule() notifies it,
+    or max_wait seconds pass. Sleeps fallback_seconds (default max_wait)
+    if Redis is unavailable.
+    """
+    try:
+        from src.utils.dedup import get_redis
+        redis = await get_redis()
+
+        timeout = max_wait
+        earliest = await redis.zrange(_due_key(worker), 0, 0, withscores=True)
+        if earliest:
+            timeout = min(max_wait, earliest[0][1] - time.time())
+        if timeout <= 0:
+            # Already due; a pending notification would only add an empty cycle
+            await redis.delete(_notify_key(worker))
+            return
+
+        # BRPOP blocks until a notification arrives or the timeout expires
+        if await redis.brpop(_notify_key(worker), timeout=max(1, math.ceil(timeout))):
+            await redis.delete(_notify_key(worker))
+    except Exception as e:
+        logger.debug("Due index unavailable for %s, falling back to sleep: %s", worker, str(e))
+        await asyncio.sleep(max_wait if fallback_seconds is None else fallback_seconds)
@@ -28,6 +28,7 @@ from src.services.enrichment import (
     guess_email_patterns,
 )
 
+from src.utils.crawl import crawl
 from src.utils.email_constants import GENERIC_EMAIL_PREFIXES
 
 logger = logging.getLogger(__name__)
@@ -95,6 +96,9 @@ _SKIP_LINK_PATTERNS = re.compile(
     re.IGNORECASE,
 )
 
+# mailto: link extraction (highest-confidence source)
+_MAILTO_PATTERN = re.compile(r'mailto:([a-zA-Z0-9._%+\-]+@[a-zA-Z0-9.\-]+\.[a-zA-Z]{2,})')
+
 # JSON-LD email extraction
 _JSON_LD_PATTERN = re.compile(
     r'<script[^>]*type=["\']application/ld\+json["\'][^>]*>(.*?)</script>',
@@ -267,58 +271,75 @@ async def deep_scrape_website(website: str) -> list[str]:
     if not candidates:
         return []
 
+    # One session for every candidate base: keeps connections to the
+    # site alive across the www/apex and https/http fallbacks
     safe_checked = 0
-    for base in candidates:
-        if not await _is_safe_url(base):
-            logger.debug("Skipping unsafe/unresolvable scrape base: %s", base)
-            continue
-        safe_checked += 1
-
-        target_domain = extract_domain(base)
-        found_emails: list[str] = []
-        seen: set[str] = set()
-        pages_fetched = 0
-
-        async with AsyncSession(impersonate="chrome") as session:
-            # Phase 1: Scrape extended paths
-            for path in _EXTENDED_PATHS:
-                if pages_fetched >= _MAX_PAGES:
-                    break
-                url = f"{base}{path}" if path != "/" else base
-                emails = await _fetch_and_extract(session, url, target_domain)
-                pages_fetched += 1
-                for email in emails:
-                    if email not in seen:
-                        found_emails.append(email)
-                        seen.add(email)
-
-            # Phase 2: Crawl internal links from homepage (find pages we missed)
-            if pages_fetched < _MAX_PAGES:
-                homepage_html = await _fetch_html(session, base)
-                if homepage_html:
-                    internal_links = _extract_internal_links(homepage_html, base)
-                    for link_url in internal_links[:_MAX_INTERNAL_LINKS]:
-                        if pages_fetched >= _MAX_PAGES:
-                            break
-                        link_emails = await _fetch_and_extract(session, link_url, target_domain)
-                        pages_fetched += 1
-                        for email in link_emails:
-                            if email not in seen:
-                                found_emails.append(email)
-                                seen.add(email)
-
-        if found_emails:
-            logger.info(
-                "Deep scrape found %d email(s) for %s across %d pages (base=%s)",
-                len(found_emails), target_domain or website, pages_fetched, base,
-            )
-            return found_emails
+    async with AsyncSession(impersonate="chrome") as session:
+        for base in candidates:
+            if not await _is_safe_url(base):
+                logger.debug("Skipping unsafe/unresolvable scrape base: %s", base)
+                continue
+            safe_checked += 1
+
+            found_emails, pages_fetched = await _scrape_base(session, base)
+            if found_emails:
+                logger.info(
+                    "Deep scrape found %d email(s) for %s across %d pages (base=%s)",
+                    len(found_emails), extract_domain(base) or website, pages_fetched, base,
+                )
+                return found_emails
 
     if safe_checked == 0:
         logger.warning("SSRF protection blocked all candidate URLs: %s", website)
     return []
 
 
+async def _scrape_base(session: AsyncSession, base: str) -> tuple[list[str], int]:
+    """
+    Crawl one candidate base URL. Pages are fetched concurrently; the crawl
+    stops at the first page (in priority order) with a mailto: address.
+
+    Returns (emails ordered by page priority, pages fetched).
+    """
+    target_domain = extract_domain(base)
+    found_emails: list[str] = []
+    seen: set[str] = set()
+
+    async def _fetch(url: str) -> Optional[str]:
+        return await _fetch_html(session, url)
+
+    def _has_mailto(html: Optional[str]) -> bool:
+        return bool(html) and bool(_extract_mailto_emails(html, target_domain))
+
+    def _collect(pages: list[Optional[str]]):
+        for html in pages:
+            if not html:
+                continue
+            for email in _extract_all_emails(html, target_domain):
+                if email not in seen:
+                    found_emails.append(email)
+                    seen.add(email)
+
+    # Phase 1: Scrape extended paths
+    urls = [f"{base}{path}" if path != "/" else base for path in _EXTENDED_PATHS[:_MAX_PAGES]]
+    pages = await crawl(urls, _fetch, stop=_has_mailto)
+    _collect(pages)
+    pages_fetched = len(pages)
+    if _has_mailto(pages[-1]) or pages_fetched >= _MAX_PAGES:
+        return found_emails, pages_fetched
+
+    # Phase 2: Crawl internal links from homepage (find pages we missed)
+    homepage_html = pages[urls.index(base)] if base in urls else await _fetch_html(session, base)
+    if homepage_html:
+        internal_links = _extract_internal_links(homepage_html, base)
+        budget = min(_MAX_INTERNAL_LINKS, _MAX_PAGES - pages_fetched)
+        link_pages = await crawl(internal_links[:budget], _fetch, stop=_has_mailto)
+        _collect(link_pages)
+        pages_fetched += len(link_pages)
+
+    return found_emails, pages_fetched
+
+
 def _candidate_base_urls(website: str) -> list[str]:
     """Build ordered website base candidates, including www/apex fallback."""
     if not website:
@@ -369,18 +390,6 @@ async def _fetch_html(session: AsyncSession, url: str) -> Optional[str]:
         return None
 
 
-async def _fetch_and_extract(
-    session: AsyncSession,
-    url: str,
-    target_domain: Optional[str],
-) -> list[str]:
-    """Fetch a page and extract all emails using multiple strategies."""
-    html = await _fetch_html(session, url)
-    if not html:
-        return []
-    return _extract_all_emails(html, target_domain)
-
-
 def _extract_all_emails(html: str, target_domain: Optional[str]) -> list[str]:
     """
     Extract emails from HTML using all available strategies:
@@ -403,9 +412,7 @@ def _extract_all_emails(html: str, target_domain: Optional[str]) -> list[str]:
             seen.add(email_clean)
 
     # 1. mailto: links (highest confidence)
-    for email in re.findall(
-        r'mailto:([a-zA-Z0-9._%+\-]+@[a-zA-Z0-9.\-]+\.[a-zA-Z]{2,})', html
-    ):
+    for email in _MAILTO_PATTERN.findall(html):
         _add(email)
 
     # 2. JSON-LD structured data
@@ -423,6 +430,16 @@ def _extract_all_emails(html: str, target_domain: Optional[str]) -> list[str]:
     return found
 
 
+def _extract_mailto_emails(html: str, target_domain: Optional[str]) -> list[str]:
+    """Valid business emails from mailto: links - the crawl's stop signal."""
+    emails: list[str] = []
+    for email in _MAILTO_PATTERN.findall(html):
+        email_clean = unquote(email).lower().strip()
+        if " " not in email_clean and _is_valid_business_email(email_clean, target_domain):
+            emails.append(email_clean)
+    return emails
+
+
 def _extract_json_ld_emails(html: str, target_domain: Optional[str]) -> list[str]:
     """Extract emails from schema.org JSON-LD blocks (LocalBusiness, Organization, etc.)."""
     emails: list[str] = []
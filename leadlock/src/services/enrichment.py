@@ -13,6 +13,9 @@ from urllib.parse import urlparse
 
 import httpx
 
+from src.utils.crawl import crawl
+from src.utils.http_client import get_http_client
+
 logger = logging.getLogger(__name__)
 
 # Regex to find email addresses in page content.
@@ -240,11 +243,22 @@ def _is_valid_business_email(email: str, target_domain: Optional[str] = None) ->
     return True
 
 
+_SCRAPE_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (compatible; LeadLock/1.0; business contact lookup)",
+    "Accept": "text/html,application/xhtml+xml",
+}
+_REDIRECT_CODES = frozenset({301, 302, 303, 307, 308})
+_MAX_REDIRECTS = 3
+
+_MAILTO_REGEX = re.compile(r'mailto:([a-zA-Z0-9._%+\-]+@[a-zA-Z0-9.\-]+\.[a-zA-Z]{2,})')
+
+
 async def scrape_contact_emails(website: str) -> list[str]:
     """
     Scrape a business website for contact email addresses.
-    Fetches /contact, /about, and / pages, extracts emails from
-    mailto: links and visible text via regex. 10s timeout per page.
+    Fetches /contact, /about, and / pages concurrently, extracts emails from
+    mailto: links and visible text via regex. 10s timeout per page. Stops at
+    the first page (in priority order) with a mailto: address.
 
     Args:
         website: Business website URL
@@ -268,71 +282,35 @@ async def scrape_contact_emails(website: str) -> list[str]:
     found_emails: list[str] = []
     seen: set[str] = set()
 
-    headers = {
-        "User-Agent": "Mozilla/5.0 (compatible; LeadLock/1.0; business contact lookup)",
-        "Accept": "text/html,application/xhtml+xml",
-    }
-
-    _REDIRECT_CODES = {301, 302, 303, 307, 308}
-    _MAX_REDIRECTS = 3
+    def _has_mailto(text: Optional[str]) -> bool:
+        return bool(text) and any(
+            _is_valid_business_email(email.lower(), target_domain)
+            for email in _MAILTO_REGEX.findall(text)
+        )
 
-    async with httpx.AsyncClient(
-        timeout=10.0,
-        follow_redirects=False,
-        headers=headers,
-    ) as client:
-        for path in _CONTACT_PATHS:
-            url = f"{base}{path}" if path != "/" else base
-            try:
-                # Follow redirects manually, re-checking SSRF on each hop
-                current_url = url
-                response = await client.get(current_url)
-                for _ in range(_MAX_REDIRECTS):
-                    if response.status_code not in _REDIRECT_CODES:
-                        break
-                    location = response.headers.get("location", "")
-                    if not location:
-                        response = None
-                        break
-                    # Resolve relative redirects against the current URL
-                    if location.startswith("/"):
-                        parsed_current = urlparse(current_url)
-                        location = f"{parsed_current.scheme}://{parsed_current.netloc}{location}"
-                    if not await _is_safe_url(location):
-                        logger.warning("SSRF redirect blocked: %s -> %s", current_url, location)
-                        response = None
-                        break
-                    current_url = location
-                    response = await client.get(current_url)
-
-                if response is None or response.status_code != 200:
-                    continue
-
-                content_type = response.headers.get("content-type", "")
-                if "text/html" not in content_type and "text/plain" not in content_type:
-                    continue
-
-                text = response.text
-
-                # Extract from mailto: links first (higher confidence)
-                mailto_emails = re.findall(r'mailto:([a-zA-Z0-9._%+\-]+@[a-zA-Z0-9.\-]+\.[a-zA-Z]{2,})', text)
-                for email in mailto_emails:
-                    email_lower = email.lower()
-                    if email_lower not in seen and _is_valid_business_email(email_lower, target_domain):
-                        found_emails.append(email_lower)
-                        seen.add(email_lower)
-
-                # Extract from page text
-                text_emails = _EMAIL_REGEX.findall(text)
-                for email in text_emails:
-                    email_lower = email.lower()
-                    if email_lower not in seen and _is_valid_business_email(email_lower, target_domain):
-                        found_emails.append(email_lower)
-                        seen.add(email_lower)
-
-            except (httpx.HTTPError, httpx.InvalidURL, Exception) as e:
-                logger.debug("Failed to scrape %s: %s", url, str(e))
-                continue
+    client = get_http_client("web")
+    urls = [f"{base}{path}" if path != "/" else base for path in _CONTACT_PATHS]
+    pages = await crawl(urls, lambda url: _fetch_contact_page(client, url), stop=_has_mailto)
+
+    for text in pages:
+        if not text:
+            continue
+
+        # Extract from mailto: links first (higher confidence)
+        mailto_emails = _MAILTO_REGEX.findall(text)
+        for email in mailto_emails:
+            email_lower = email.lower()
+            if email_lower not in seen and _is_valid_business_email(email_lower, target_domain):
+                found_emails.append(email_lower)
+                seen.add(email_lower)
+
+        # Extract from page text
+        text_emails = _EMAIL_REGEX.findall(text)
+        for email in text_emails:
+            email_lower = email.lower()
+            if email_lower not in seen and _is_valid_business_email(email_lower, target_domain):
+                found_emails.append(email_lower)
+                seen.add(email_lower)
 
     if found_emails:
         logger.info(
@@ -343,6 +321,45 @@ async def scrape_contact_emails(website: str) -> list[str]:
     return found_emails
 
 
+async def _fetch_contact_page(client: httpx.AsyncClient, url: str) -> Optional[str]:
+    """Fetch one page as text, following redirects manually with an SSRF re-check per hop."""
+    try:
+        current_url = url
+        response = await client.get(
+            current_url, headers=_SCRAPE_HEADERS, follow_redirects=False, timeout=10.0,
+        )
+        for _ in range(_MAX_REDIRECTS):
+            if response.status_code not in _REDIRECT_CODES:
+                break
+            location = response.headers.get("location", "")
+            if not location:
+                return None
+            # Resolve relative redirects against the current URL
+            if location.startswith("/"):
+                parsed_current = urlparse(current_url)
+                location = f"{parsed_current.scheme}://{parsed_current.netloc}{location}"
+            if not await _is_safe_url(location):
+                logger.warning("SSRF redirect blocked: %s -> %s", current_url, location)
+                return None
+            current_url = location
+            response = await client.get(
+                current_url, headers=_SCRAPE_HEADERS, follow_redirects=False, timeout=10.0,
+            )
+
+        if response.status_code != 200:
+            return None
+
+        content_type = response.headers.get("content-type", "")
+        if "text/html" not in content_type and "text/plain" not in content_type:
+            return None
+
+        return response.text
+
+    except (httpx.HTTPError, httpx.InvalidURL, Exception) as e:
+        logger.debug("Failed to scrape %s: %s", url, str(e))
+        return None
+
+
 async def enrich_prospect_email(
     website: str,
     company_name: str,
@@ -6,8 +6,10 @@ pending events. Publishers call publish_event() to notify the fleet.
 
 Key events:
 - config_changed: Dashboard updates config → workers invalidate cache
+  (data.client_id set → every process evicts that client from client_cache)
 - reputation_critical: system_health detects danger → outreach pauses
-- ab_test_winner: A/B engine declares winner → sequencer picks it up
+- ab_test_winner: A/B engine declares winner → every process drops its
+  experiment registry (services/experiment_registry.py)
 """
 import json
 import logging
@@ -85,6 +87,13 @@ async def handle_events(events: list[dict[str, Any]]) -> None:
         event_type = event.get("type", "")
 
         if event_type == "config_changed":
+            client_id = (event.get("data") or {}).get("client_id")
+            if client_id:
+                # Client settings change - not a sales engine config change
+                from src.services.client_cache import evict_local
+                evict_local(client_id)
+                continue
+
             from src.services.config_cache import invalidate_sales_config
             tenant_id = (event.get("data") or {}).get("tenant_id")
             await invalidate_sales_config(tenant_id)
@@ -92,3 +101,7 @@ async def handle_events(events: list[dict[str, Any]]) -> None:
                 "Config cache invalidated via event bus%s",
                 f" tenant={str(tenant_id)[:8]}" if tenant_id else "",
             )
+
+        elif event_type == "ab_test_winner":
+            from src.services.experiment_registry import invalidate_registry
+            invalidate_registry()
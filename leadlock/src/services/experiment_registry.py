@@ -0,0 +1,104 @@
+"""
+Experiment registry - active A/B experiments, cached per process.
+
+The sequencer asks for the active experiment of every email it generates.
+Instead of querying ab_test_experiments / ab_test_variants per send, this
+module loads every active experiment with its variants in two queries and
+indexes them by (sequence_step, target_trade):
+
+    {(1, "hvac"): {"experiment_id": ..., "variants": [...]},
+     (1, None):   {...}}  # general experiment for step 1
+
+The registry is reloaded at most every REGISTRY_TTL_SECONDS. It is dropped
+right away when this process creates an experiment or declares a winner,
+and when an ab_test_winner event arrives on the event bus from another
+process (see client_cache.run_client_cache_listener).
+"""
+import asyncio
+import logging
+import time
+from typing import Optional
+
+from sqlalchemy import select
+
+from src.database import async_session_factory
+from src.models.ab_test import ABTestExperiment, ABTestVariant
+
+logger = logging.getLogger(__name__)
+
+REGISTRY_TTL_SECONDS = 60
+
+_registry: dict[tuple[int, Optional[str]], dict] = {}
+_loaded_at = 0.0  # time.monotonic() of the last load; 0 = never / invalidated
+_lock = asyncio.Lock()
+
+
+async def load_registry(db) -> dict[tuple[int, Optional[str]], dict]:
+    """Every active experiment with its variants, keyed by (step, trade)."""
+    from src.services import ab_counters
+    from src.services.ab_testing import _merged_totals
+
+    experiments = (await db.execute(
+        select(ABTestExperiment)
+        .where(ABTestExperiment.status == "active")
+        .order_by(ABTestExperiment.created_at)
+    )).scalars().all()
+    if not experiments:
+        return {}
+
+    variants = (await db.execute(
+        select(ABTestVariant)
+        .where(ABTestVariant.experiment_id.in_([e.id for e in experiments]))
+        .order_by(ABTestVariant.variant_label)
+    )).scalars().all()
+    pending = await ab_counters.pending(v.id for v in variants)
+
+    by_experiment: dict = {}
+    for v in variants:
+        by_experiment.setdefault(v.experiment_id, []).append({
+            "id": str(v.id),
+            "label": v.variant_label,
+            "instruction": v.subject_instruction,
+            "total_sent": _merged_totals(v, pending)[0],
+        })
+
+    registry: dict[tuple[int, Optional[str]], dict] = {}
+    for experiment in experiments:
+        # Oldest active experiment wins if a step/trade somehow has two
+        registry.setdefault((experiment.sequence_step, experiment.target_trade), {
+            "experiment_id": str(experiment.id),
+            "variants": by_experiment.get(experiment.id, []),
+        })
+    return registry
+
+
+async def get_registry() -> dict[tuple[int, Optional[str]], dict]:
+    """The in-memory registry, reloaded once it is stale."""
+    global _registry, _loaded_at
+
+    if _loaded_at and time.monotonic() - _loaded_at < REGISTRY_TTL_SECONDS:
+        return _registry
+
+    async with _lock:
+        if _loaded_at and time.monotonic() - _loaded_at < REGISTRY_TTL_SECONDS:
+            return _registry
+        async with async_session_factory() as db:
+            _registry = await load_registry(db)
+        _loaded_at = time.monotonic()
+    return _registry
+
+
+def invalidate_registry() -> None:
+    """Force the next lookup to reload active experiments."""
+    global _loaded_at
+    _loaded_at = 0.0
+
+
+async def find_experiment(sequence_step: int, trade_type: Optional[str] = None) -> Optional[dict]:
+    """Trade-specific active experiment for the step, else the general one."""
+    registry = await get_registry()
+    if trade_type:
+        experiment = registry.get((sequence_step, trade_type))
+        if experiment:
+            return experiment
+    return registry.get((sequence_step, None))
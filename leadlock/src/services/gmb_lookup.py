@@ -8,12 +8,11 @@ import logging
 import re
 from urllib.parse import unquote_plus, urlparse, parse_qs
 
-import httpx
-
 from src.services.scraping import (
     normalize_biz_name,
     parse_address_components,
 )
+from src.utils.http_client import get_http_client
 
 logger = logging.getLogger(__name__)
 
@@ -173,13 +172,13 @@ async def resolve_short_url(url: str) -> str:
         return url
 
     try:
-        async with httpx.AsyncClient(timeout=10.0, follow_redirects=True) as client:
-            resp = await client.head(url)
-            final = urlparse(str(resp.url))
-            if not (final.hostname or "").endswith("google.com"):
-                logger.warning("Redirect resolved to unexpected host: %s", final.hostname)
-                return url
-            return str(resp.url)
+        client = get_http_client("web")
+        resp = await client.head(url, follow_redirects=True, timeout=10.0)
+        final = urlparse(str(resp.url))
+        if not (final.hostname or "").endswith("google.com"):
+            logger.warning("Redirect resolved to unexpected host: %s", final.hostname)
+            return url
+        return str(resp.url)
     except Exception as exc:
         logger.warning("Failed to resolve short URL %s: %s", url, exc)
         return url
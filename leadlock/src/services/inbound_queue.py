@@ -0,0 +1,114 @@
+"""
+Inbound SMS queue - per-lead ordered hand-off from the Twilio webhook.
+
+The webhook used to run the conductor inline (lead lock, AI call, reply
+send) while Twilio held its request open. Now it records the WebhookEvent
+as "queued", commits, adds the event id here and acks. The inbound_sms
+worker runs the conductor.
+
+Messages are spread over PARTITIONS Redis streams by a hash of
+(client_id, phone) - the key the webhook resolves a lead by, and one that
+exists before a brand-new lead has an id:
+
+    leadlock:inbound_sms:{partition}   stream  {"event_id": ...}
+
+Each partition has exactly one consumer in the worker, reading in order,
+so texts from one lead are handled in arrival order while different leads
+run in parallel. Entries stay pending in the consumer group until ack(),
+so a crashed worker re-reads them on restart. webhook_events remains the
+source of truth: process_queued_event claims an event by moving it from
+"queued" to "processing", so a re-delivered entry is a no-op while the
+claim is live. A pending entry re-read after a crash reclaims its event.
+"""
+import logging
+import zlib
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+STREAM_KEY_PREFIX = "leadlock:inbound_sms"
+PARTITIONS = 16
+CONSUMER_GROUP = "conductor"
+STREAM_MAXLEN = 10000  # per partition, approximate
+
+
+def partition_for(client_id, phone: str) -> int:
+    """Stable partition for a client's lead phone number."""
+    return zlib.crc32(f"{client_id}:{phone}".encode()) % PARTITIONS
+
+
+def stream_key(partition: int) -> str:
+    return f"{STREAM_KEY_PREFIX}:{partition}"
+
+
+def consumer_name(partition: int) -> str:
+    # Fixed per partition: a restarted worker inherits its predecessor's
+    # pending entries instead of leaving them to a dead consumer
+    return f"partition-{partition}"
+
+
+async def enqueue(event_id, client_id, phone: str) -> bool:
+    """
+    Queue a recorded webhook event for the inbound_sms worker. Returns
+    False if Redis is unavailable - the caller then processes inline.
+    """
+    try:
+        from src.utils.dedup import get_redis
+        redis = await get_redis()
+        await redis.xadd(
+            stream_key(partition_for(client_id, phone)),
+            {"event_id": str(event_id)},
+            maxlen=STREAM_MAXLEN,
+            approximate=True,
+        )
+        return True
+    except Exception as e:
+        logger.warning("Inbound SMS enqueue failed, processing inline: %s", str(e))
+        return False
+
+
+async def ensure_group(partition: int) -> None:
+    """Create the consumer group on a partition stream (idempotent)."""
+    from src.utils.dedup import get_redis
+    redis = await get_redis()
+    try:
+        await redis.xgroup_create(stream_key(partition), CONSUMER_GROUP, id="0", mkstream=True)
+    except Exception as e:
+        if "BUSYGROUP" not in str(e):
+            raise
+
+
+async def read(
+    partition: int,
+    pending: bool = False,
+    count: int = 10,
+    block_ms: Optional[int] = None,
+) -> list[tuple[str, str]]:
+    """
+    Next (entry_id, event_id) pairs for a partition's consumer. With
+    pending=True, re-read entries delivered before but never acked.
+    """
+    from src.utils.dedup import get_redis
+    redis = await get_redis()
+    response = await redis.xreadgroup(
+        CONSUMER_GROUP,
+        consumer_name(partition),
+        {stream_key(partition): "0" if pending else ">"},
+        count=count,
+        block=None if pending else block_ms,
+    )
+    entries = []
+    for _, messages in response or ():
+        for entry_id, fields in messages:
+            entries.append((entry_id, (fields or {}).get("event_id", "")))
+    return entries
+
+
+async def ack(partition: int, entry_id: str) -> None:
+    """Acknowledge and drop a processed entry."""
+    from src.utils.dedup import get_redis
+    redis = await get_redis()
+    pipe = redis.pipeline()
+    pipe.xack(stream_key(partition), CONSUMER_GROUP, entry_id)
+    pipe.xdel(stream_key(partition), entry_id)
+    await pipe.execute()
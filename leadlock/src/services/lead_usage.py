@@ -0,0 +1,137 @@
+"""
+Monthly lead usage counters - O(1) plan-limit enforcement on the first-response path.
+
+Each client has one Redis counter per UTC calendar month:
+
+    leadlock:lead_usage:{client_id}:{YYYY-MM}
+
+handle_new_lead reserves a slot with reserve_monthly_lead() before creating the
+lead. A Lua script does the check and the increment as one step, so concurrent
+webhooks can never push a client past its limit. A missing counter (new month,
+Redis flush, evicted key) is seeded from a COUNT(*) over this month's leads
+before the reservation. That query runs at most once per client per month.
+
+Reconciliation: the lead state manager calls reconcile_monthly_lead_counts()
+every cycle (5 minutes). It rebuilds every counter for the current month from a
+single GROUP BY. A counter can be off by at most the leads reserved but not
+committed (crashed webhooks), plus any created while the job runs. It
+converges on the next run, so drift lasts at most one reconciliation window.
+
+If Redis is unavailable the check falls back to the COUNT(*) query.
+"""
+import logging
+import uuid
+from datetime import datetime, timezone
+from typing import Optional
+
+from sqlalchemy import and_, func, select
+
+logger = logging.getLogger(__name__)
+
+USAGE_KEY_PREFIX = "leadlock:lead_usage"
+USAGE_KEY_TTL_SECONDS = 40 * 86400  # Outlives the month it counts
+
+# Returns {allowed, count}; allowed = -1 when the counter must be seeded first
+_RESERVE_SCRIPT = """
+local current = redis.call('get', KEYS[1])
+if not current then
+    return {-1, 0}
+end
+current = tonumber(current)
+if current >= tonumber(ARGV[1]) then
+    return {0, current}
+end
+return {1, redis.call('incr', KEYS[1])}
+"""
+
+
+def month_start(now: Optional[datetime] = None) -> datetime:
+    """First instant of the current UTC month."""
+    now = now or datetime.now(timezone.utc)
+    return now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def usage_key(client_id: uuid.UUID | str, now: Optional[datetime] = None) -> str:
+    """Redis key for a client's lead counter in the month containing `now`."""
+    now = now or datetime.now(timezone.utc)
+    return f"{USAGE_KEY_PREFIX}:{client_id}:{now.strftime('%Y-%m')}"
+
+
+async def count_leads_this_month(db, client_id: uuid.UUID) -> int:
+    """Authoritative count from the leads table (seeding + fallback path)."""
+    from src.models.lead import Lead
+
+    return (await db.execute(
+        select(func.count(Lead.id)).where(
+            and_(Lead.client_id == client_id, Lead.created_at >= month_start())
+        )
+    )).scalar() or 0
+
+
+async def reserve_monthly_lead(db, client_id: uuid.UUID, limit: int) -> tuple[bool, int]:
+    """
+    Atomically take one lead slot for this month if the client is under `limit`.
+
+    Returns:
+        (allowed, count) - count includes the reserved lead when allowed,
+        otherwise it is the current usage.
+    """
+    try:
+        from src.utils.dedup import get_redis
+        redis = await get_redis()
+        key = usage_key(client_id)
+
+        allowed, count = await redis.eval(_RESERVE_SCRIPT, 1, key, limit)
+        if allowed == -1:
+            seeded = await count_leads_this_month(db, client_id)
+            await redis.set(key, seeded, ex=USAGE_KEY_TTL_SECONDS, nx=True)
+            allowed, count = await redis.eval(_RESERVE_SCRIPT, 1, key, limit)
+        return allowed == 1, int(count)
+    except Exception as e:
+        logger.warning(
+            "Lead usage counter unavailable for %s, counting from DB: %s",
+            str(client_id)[:8], str(e),
+        )
+        count = await count_leads_this_month(db, client_id)
+        if count >= limit:
+            return False, count
+        return True, count + 1
+
+
+async def reconcile_monthly_lead_counts() -> int:
+    """
+    Rebuild every client's counter for the current month from the leads table.
+    Returns the number of counters that had drifted and were corrected.
+    """
+    from src.database import async_session_factory
+    from src.models.lead import Lead
+    from src.utils.dedup import get_redis
+
+    async with async_session_factory() as db:
+        rows = (await db.execute(
+            select(Lead.client_id, func.count(Lead.id))
+            .where(Lead.created_at >= month_start())
+            .group_by(Lead.client_id)
+        )).all()
+
+    if not rows:
+        return 0
+
+    redis = await get_redis()
+    keys = [usage_key(client_id) for client_id, _ in rows]
+    current = await redis.mget(keys)
+
+    corrected = 0
+    pipe = redis.pipeline()
+    for key, (client_id, count), cached in zip(keys, rows, current):
+        if cached is not None and int(cached) == count:
+            continue
+        if cached is not None:
+            logger.info(
+                "Lead usage drift for %s: counter=%s actual=%d",
+                str(client_id)[:8], cached, count,
+            )
+            corrected += 1
+        pipe.set(key, count, ex=USAGE_KEY_TTL_SECONDS)
+    await pipe.execute()
+    return corrected
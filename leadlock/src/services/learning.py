@@ -30,6 +30,70 @@ def _time_bucket(hour: int) -> str:
         return "evening"
 
 
+def dimension_columns(dimensions: Optional[dict]) -> dict:
+    """
+    Typed LearningSignal column values for the hot dimensions.
+
+    trade, state and time_bucket are copied as strings, step as an int and
+    lead_id as a UUID; anything missing or unparseable is left as None.
+    """
+    if not isinstance(dimensions, dict):
+        dimensions = {}
+
+    def _text(key: str, length: int) -> Optional[str]:
+        value = dimensions.get(key)
+        return str(value)[:length] if value not in (None, "") else None
+
+    step = None
+    try:
+        if dimensions.get("step") not in (None, ""):
+            step = int(dimensions["step"])
+    except (ValueError, TypeError):
+        pass
+
+    lead_id = None
+    try:
+        if dimensions.get("lead_id"):
+            lead_id = uuid.UUID(str(dimensions["lead_id"]))
+    except (ValueError, TypeError):
+        pass
+
+    return {
+        "trade": _text("trade", 50),
+        "state": _text("state", 10),
+        "time_bucket": _text("time_bucket", 20),
+        "step": step,
+        "lead_id": lead_id,
+    }
+
+
+def _outreach_uuid(outreach_id) -> Optional[uuid.UUID]:
+    if not outreach_id:
+        return None
+    try:
+        return uuid.UUID(str(outreach_id))
+    except (ValueError, TypeError):
+        return None
+
+
+def _signal_row(
+    signal_type: str,
+    dimensions: Optional[dict],
+    value: float,
+    outreach_id: Optional[str] = None,
+) -> dict:
+    """Column values for one LearningSignal insert."""
+    return {
+        "id": uuid.uuid4(),
+        "signal_type": signal_type,
+        "dimensions": dimensions,
+        "value": value,
+        "outreach_id": _outreach_uuid(outreach_id),
+        "created_at": datetime.now(timezone.utc),
+        **dimension_columns(dimensions),
+    }
+
+
 async def record_signal(
     signal_type: str,
     dimensions: dict,
@@ -39,29 +103,25 @@ async def record_signal(
     """
     Record a learning signal for the feedback loop.
 
+    When this process runs the signal writer (see services/signal_buffer.py)
+    the signal is buffered and written in a batch; otherwise it is written
+    immediately.
+
     Args:
         signal_type: email_opened, email_clicked, email_replied, email_bounced, demo_booked
         dimensions: Contextual data (trade, city, state, step, time_bucket, day_of_week)
         value: 1.0 for positive signal, 0.0 for negative
         outreach_id: Related outreach record ID
     """
-    outreach_uuid = None
-    if outreach_id:
-        try:
-            outreach_uuid = uuid.UUID(outreach_id)
-        except (ValueError, TypeError):
-            pass
-
-    signal = LearningSignal(
-        signal_type=signal_type,
-        dimensions=dimensions,
-        value=value,
-        outreach_id=outreach_uuid,
-    )
+    from src.services import signal_buffer
 
-    async with async_session_factory() as db:
-        db.add(signal)
-        await db.commit()
+    row = _signal_row(signal_type, dimensions, value, outreach_id)
+    if signal_buffer.is_running():
+        await signal_buffer.enqueue(row)
+    else:
+        async with async_session_factory() as db:
+            db.add(LearningSignal(**row))
+            await db.commit()
 
     logger.debug(
         "Learning signal recorded: type=%s value=%.1f dims=%s",
@@ -69,6 +129,38 @@ async def record_signal(
     )
 
 
+async def record_signals(signals: list[dict]) -> int:
+    """
+    Record many learning signals in one transaction.
+
+    Args:
+        signals: Dicts with the record_signal() keyword arguments
+            (signal_type, dimensions, value, optional outreach_id).
+
+    Returns:
+        Number of signals written.
+    """
+    if not signals:
+        return 0
+
+    rows = [
+        LearningSignal(**_signal_row(
+            signal["signal_type"],
+            signal.get("dimensions"),
+            signal["value"],
+            signal.get("outreach_id"),
+        ))
+        for signal in signals
+    ]
+
+    async with async_session_factory() as db:
+        db.add_all(rows)
+        await db.commit()
+
+    logger.debug("Recorded %d learning signals", len(rows))
+    return len(rows)
+
+
 async def record_lead_signal(
     lead_id: str,
     signal_type: str,
@@ -104,7 +196,9 @@ async def record_lead_signal(
 
 async def get_best_send_time(trade: str, state: str) -> Optional[str]:
     """
-    Query the best time bucket for email sends based on open rate signals.
+    Best time bucket for email sends based on open rate signals.
+    Served from the in-memory send-time model (services/send_time_model.py),
+    so per-prospect calls don't touch learning_signals.
 
     Args:
         trade: Trade type (hvac, plumbing, etc)
@@ -113,36 +207,17 @@ async def get_best_send_time(trade: str, state: str) -> Optional[str]:
     Returns:
         Best time bucket string (e.g., "9am-12pm") or None if insufficient data
     """
-    async with async_session_factory() as db:
-        # Query open signals grouped by time bucket
-        result = await db.execute(
-            select(
-                func.jsonb_extract_path_text(LearningSignal.dimensions, "time_bucket").label("time_bucket"),
-                func.avg(LearningSignal.value).label("avg_value"),
-                func.count().label("sample_count"),
-            )
-            .where(
-                and_(
-                    LearningSignal.signal_type == "email_opened",
-                    func.jsonb_extract_path_text(LearningSignal.dimensions, "trade") == trade,
-                    func.jsonb_extract_path_text(LearningSignal.dimensions, "state") == state,
-                )
-            )
-            .group_by(text("time_bucket"))
-            .having(func.count() >= 5)  # Minimum sample size
-            .order_by(text("avg_value DESC"))
-            .limit(1)
-        )
+    from src.services.send_time_model import best_send_time
 
-        row = result.first()
-        if row:
-            logger.info(
-                "Best send time for %s in %s: %s (avg=%.2f, n=%d)",
-                trade, state, row.time_bucket, row.avg_value, row.sample_count,
-            )
-            return row.time_bucket
+    best = await best_send_time(trade, state)
+    if best is None:
+        return None
 
-    return None
+    logger.debug(
+        "Best send time for %s in %s: %s (rate=%.2f, n=%d)",
+        trade, state, best.time_bucket, best.open_rate, best.samples,
+    )
+    return best.time_bucket
 
 
 async def get_open_rate_by_dimension(dimension: str, value: str) -> float:
@@ -156,13 +231,24 @@ async def get_open_rate_by_dimension(dimension: str, value: str) -> float:
     Returns:
         Open rate as a float (0.0-1.0)
     """
+    if dimension in ("trade", "state", "time_bucket"):
+        condition = getattr(LearningSignal, dimension) == value
+    elif dimension == "step":
+        try:
+            condition = LearningSignal.step == int(value)
+        except (ValueError, TypeError):
+            return 0.0
+    else:
+        # Not promoted to a column (city, day_of_week, ...)
+        condition = func.jsonb_extract_path_text(LearningSignal.dimensions, dimension) == value
+
     async with async_session_factory() as db:
         result = await db.execute(
             select(func.avg(LearningSignal.value))
             .where(
                 and_(
                     LearningSignal.signal_type == "email_opened",
-                    func.jsonb_extract_path_text(LearningSignal.dimensions, dimension) == value,
+                    condition,
                 )
             )
         )
@@ -184,7 +270,7 @@ async def get_insights_summary() -> dict:
         # Open rate by trade
         trade_result = await db.execute(
             select(
-                func.jsonb_extract_path_text(LearningSignal.dimensions, "trade").label("trade"),
+                LearningSignal.trade.label("trade"),
                 func.avg(LearningSignal.value).label("avg_rate"),
                 func.count().label("count"),
             )
@@ -194,7 +280,7 @@ async def get_insights_summary() -> dict:
                     LearningSignal.created_at >= since,
                 )
             )
-            .group_by(text("trade"))
+            .group_by(LearningSignal.trade)
             .order_by(text("avg_rate DESC"))
         )
         by_trade = [
@@ -206,7 +292,7 @@ async def get_insights_summary() -> dict:
         # Open rate by time bucket
         time_result = await db.execute(
             select(
-                func.jsonb_extract_path_text(LearningSignal.dimensions, "time_bucket").label("time_bucket"),
+                LearningSignal.time_bucket.label("time_bucket"),
                 func.avg(LearningSignal.value).label("avg_rate"),
                 func.count().label("count"),
             )
@@ -216,7 +302,7 @@ async def get_insights_summary() -> dict:
                     LearningSignal.created_at >= since,
                 )
             )
-            .group_by(text("time_bucket"))
+            .group_by(LearningSignal.time_bucket)
             .order_by(text("avg_rate DESC"))
         )
         by_time = [
@@ -228,7 +314,7 @@ async def get_insights_summary() -> dict:
         # Open rate by sequence step
         step_result = await db.execute(
             select(
-                func.jsonb_extract_path_text(LearningSignal.dimensions, "step").label("step"),
+                LearningSignal.step.label("step"),
                 func.avg(LearningSignal.value).label("avg_rate"),
                 func.count().label("count"),
             )
@@ -238,19 +324,19 @@ async def get_insights_summary() -> dict:
                     LearningSignal.created_at >= since,
                 )
             )
-            .group_by(text("step"))
-            .order_by(text("step"))
+            .group_by(LearningSignal.step)
+            .order_by(LearningSignal.step)
         )
         by_step = [
-            {"step": row.step, "open_rate": round(float(row.avg_rate), 3), "count": row.count}
+            {"step": str(row.step), "open_rate": round(float(row.avg_rate), 3), "count": row.count}
             for row in step_result.all()
-            if row.step
+            if row.step is not None
         ]
 
         # Reply rate by trade
         reply_result = await db.execute(
             select(
-                func.jsonb_extract_path_text(LearningSignal.dimensions, "trade").label("trade"),
+                LearningSignal.trade.label("trade"),
                 func.avg(LearningSignal.value).label("avg_rate"),
                 func.count().label("count"),
             )
@@ -260,7 +346,7 @@ async def get_insights_summary() -> dict:
                     LearningSignal.created_at >= since,
                 )
             )
-            .group_by(text("trade"))
+            .group_by(LearningSignal.trade)
             .order_by(text("avg_rate DESC"))
         )
         reply_by_trade = [
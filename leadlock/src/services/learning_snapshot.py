@@ -0,0 +1,133 @@
+"""
+Learning snapshots - precomputed learning context for outreach emails.
+
+generate_outreach_email used to build its "Writing instructions from past
+performance" block (sales_outreach._get_learning_context) for every email:
+open rates by trade and step, reply rate, best day, best send time, winning
+patterns and content intelligence - about seven analytical queries over
+learning_signals and outreach_emails whose answers move slowly.
+
+The metrics rollup worker now precomputes the block for every (trade,
+state, step) the pipeline is about to email and stores it in Redis:
+
+    leadlock:learning_snapshot:{trade}:{state}:{step}
+        {"version": SNAPSHOT_VERSION, "computed_at": iso, "context": str}
+
+so generation reads it in one GET. A snapshot with another version (the
+block format changed in a deploy) counts as a miss. A miss computes the
+block live and stores it, so a combination the refresh didn't cover costs
+the queries once per SNAPSHOT_TTL_SECONDS rather than once per email.
+"""
+import json
+import logging
+from datetime import datetime, timezone
+
+from sqlalchemy import and_, func, select
+
+from src.database import async_session_factory
+from src.models.outreach import Outreach
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_KEY_PREFIX = "leadlock:learning_snapshot"
+SNAPSHOT_VERSION = 1  # bump when _get_learning_context changes the block format
+REFRESH_INTERVAL_SECONDS = 900
+SNAPSHOT_TTL_SECONDS = 3 * REFRESH_INTERVAL_SECONDS  # survives a missed refresh
+MAX_SNAPSHOTS_PER_RUN = 200
+MAX_STEP = 3  # generate_outreach_email clamps steps to 1-3
+
+# Set NX with the refresh interval as TTL and never deleted: both the
+# cross-process lock and the schedule for refresh_learning_snapshots()
+REFRESH_GATE_KEY = "leadlock:lock:learning_snapshot"
+
+
+def snapshot_key(trade_type: str, state: str, step: int) -> str:
+    return f"{SNAPSHOT_KEY_PREFIX}:{trade_type}:{state}:{step}"
+
+
+def _encode(context: str) -> str:
+    return json.dumps({
+        "version": SNAPSHOT_VERSION,
+        "computed_at": datetime.now(timezone.utc).isoformat(),
+        "context": context,
+    })
+
+
+async def _compute(trade_type: str, state: str, step: int) -> str:
+    from src.agents import sales_outreach
+    return await sales_outreach._get_learning_context(trade_type, state, step)
+
+
+async def get_learning_context(trade_type: str, state: str, step: int = 1) -> str:
+    """
+    Learning context block for an outreach email - from the snapshot if
+    present, otherwise computed live and stored for the next caller.
+    """
+    key = snapshot_key(trade_type, state, step)
+    redis = None
+    try:
+        from src.utils.dedup import get_redis
+        redis = await get_redis()
+        cached = await redis.get(key)
+        if cached:
+            snapshot = json.loads(cached)
+            if snapshot.get("version") == SNAPSHOT_VERSION:
+                return snapshot.get("context") or ""
+    except Exception as e:
+        logger.debug("Learning snapshot read failed for %s: %s", key, str(e))
+
+    context = await _compute(trade_type, state, step)
+
+    if redis is not None:
+        try:
+            await redis.set(key, _encode(context), ex=SNAPSHOT_TTL_SECONDS)
+        except Exception as e:
+            logger.debug("Learning snapshot write failed for %s: %s", key, str(e))
+    return context
+
+
+async def _upcoming_combinations() -> list[tuple[str, str, int]]:
+    """(trade, state, step) of prospects still in a sequence, busiest first."""
+    trade = func.coalesce(func.nullif(Outreach.prospect_trade_type, ""), "general")
+    state = func.coalesce(Outreach.state_code, "")
+    async with async_session_factory() as db:
+        rows = (await db.execute(
+            select(trade, state, Outreach.outreach_sequence_step)
+            .where(and_(
+                Outreach.status.in_(["cold", "contacted"]),
+                Outreach.email_unsubscribed == False,  # noqa: E712
+                Outreach.last_email_replied_at.is_(None),
+                Outreach.outreach_sequence_step < MAX_STEP,
+            ))
+            .group_by(trade, state, Outreach.outreach_sequence_step)
+            .order_by(func.count().desc())
+            .limit(MAX_SNAPSHOTS_PER_RUN)
+        )).all()
+    return [(row[0], row[1], (row[2] or 0) + 1) for row in rows]
+
+
+async def refresh_learning_snapshots() -> dict:
+    """
+    Recompute snapshots for the combinations the sequencer will email next.
+    Runs at most once per REFRESH_INTERVAL_SECONDS across processes; skips
+    the run if Redis is unavailable.
+    """
+    try:
+        from src.utils.dedup import get_redis
+        redis = await get_redis()
+        if not await redis.set(REFRESH_GATE_KEY, "1", nx=True, ex=REFRESH_INTERVAL_SECONDS):
+            return {"skipped": True}
+    except Exception as e:
+        logger.debug("Learning snapshot refresh skipped, Redis unavailable: %s", str(e))
+        return {"skipped": True}
+
+    combinations = await _upcoming_combinations()
+    pipe = redis.pipeline()
+    for trade_type, state, step in combinations:
+        context = await _compute(trade_type, state, step)
+        pipe.set(snapshot_key(trade_type, state, step), _encode(context), ex=SNAPSHOT_TTL_SECONDS)
+    if combinations:
+        await pipe.execute()
+        logger.info("Learning snapshots refreshed: %d", len(combinations))
+
+    return {"skipped": False, "refreshed": len(combinations)}
@@ -0,0 +1,300 @@
+"""
+Metrics rollup - incrementally maintains the dashboard's daily rollups.
+
+client_daily_metrics (per client, UTC day, source, state, qualify variant)
+and client_daily_messages (per client, UTC day) let the dashboard and ROI
+pages read a few rows per day instead of aggregating every lead.
+
+The metrics rollup worker calls refresh_rollups() every minute. Each run
+scans only rows changed since the last watermark, in keyset order:
+
+- leads by (updated_at, id) - any lead change can move it between cells
+- conversations by (created_at, id) - append-only
+
+and rebuilds every (client, day) those rows touch: delete the day's rows,
+re-aggregate from the source table, insert. Rebuilding whole days keeps
+runs idempotent, so reprocessing after a crash is harmless.
+
+Watermarks live in Redis. Rows newer than SETTLE_SECONDS are left for the
+next run so transactions still in flight are not skipped. If a watermark is
+lost, the worker re-scans the last COLD_START_LOOKBACK; the full history is
+backfilled by migration 036.
+"""
+import logging
+import uuid
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Optional
+
+from sqlalchemy import and_, case, delete, func, or_, select
+
+from src.database import async_session_factory
+from src.models.client_metrics import ClientDailyMessages, ClientDailyMetric
+from src.models.conversation import Conversation
+from src.models.lead import Lead
+
+logger = logging.getLogger(__name__)
+
+BOOKED_STATES = ("booked", "completed")
+
+SCAN_BATCH_SIZE = 2000
+MAX_BATCHES_PER_RUN = 10
+SETTLE_SECONDS = 30
+COLD_START_LOOKBACK = timedelta(days=1)
+
+WATERMARK_KEY_PREFIX = "leadlock:metrics_rollup:watermark"
+ROLLUP_LOCK_KEY = "leadlock:lock:metrics_rollup"
+ROLLUP_LOCK_TTL = 300  # seconds
+
+_MIN_ID = uuid.UUID(int=0)
+
+
+def _as_utc(value: Optional[datetime]) -> Optional[datetime]:
+    if value is not None and value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+def _day_bounds(day: date) -> tuple[datetime, datetime]:
+    start = datetime.combine(day, time.min, tzinfo=timezone.utc)
+    return start, start + timedelta(days=1)
+
+
+# ---------------------------------------------------------------------------
+# Writes
+# ---------------------------------------------------------------------------
+
+async def rebuild_lead_day(db, client_id: uuid.UUID, day: date) -> int:
+    """Recompute one client's client_daily_metrics rows for `day`. Returns cells written."""
+    start, end = _day_bounds(day)
+    variant = func.coalesce(Lead.qualify_variant, "")
+    ms = Lead.first_response_ms
+
+    rows = (await db.execute(
+        select(
+            Lead.source,
+            Lead.state,
+            variant,
+            func.count(Lead.id),
+            func.count(ms),
+            func.coalesce(func.sum(ms), 0),
+            func.count(case((ms < 5000, Lead.id))),
+            func.count(case((ms < 10000, Lead.id))),
+            func.count(case((ms < 30000, Lead.id))),
+            func.count(case((ms < 60000, Lead.id))),
+            func.coalesce(func.sum(Lead.total_ai_cost_usd), 0.0),
+            func.coalesce(func.sum(Lead.total_sms_cost_usd), 0.0),
+        )
+        .where(and_(
+            Lead.client_id == client_id,
+            Lead.created_at >= start,
+            Lead.created_at < end,
+        ))
+        .group_by(Lead.source, Lead.state, variant)
+    )).all()
+
+    await db.execute(
+        delete(ClientDailyMetric).where(and_(
+            ClientDailyMetric.client_id == client_id,
+            ClientDailyMetric.day == day,
+        ))
+    )
+    now = datetime.now(timezone.utc)
+    for row in rows:
+        db.add(ClientDailyMetric(
+            client_id=client_id,
+            day=day,
+            source=row[0],
+            state=row[1],
+            qualify_variant=row[2],
+            leads=row[3],
+            responded=row[4],
+            response_ms_total=int(row[5]),
+            responded_under_5s=row[6],
+            responded_under_10s=row[7],
+            responded_under_30s=row[8],
+            responded_under_60s=row[9],
+            ai_cost_usd=float(row[10]),
+            sms_cost_usd=float(row[11]),
+            updated_at=now,
+        ))
+    return len(rows)
+
+
+async def rebuild_message_day(db, client_id: uuid.UUID, day: date) -> None:
+    """Recompute one client's conversation count for `day`."""
+    start, end = _day_bounds(day)
+    count = (await db.execute(
+        select(func.count(Conversation.id)).where(and_(
+            Conversation.client_id == client_id,
+            Conversation.created_at >= start,
+            Conversation.created_at < end,
+        ))
+    )).scalar() or 0
+
+    await db.execute(
+        delete(ClientDailyMessages).where(and_(
+            ClientDailyMessages.client_id == client_id,
+            ClientDailyMessages.day == day,
+        ))
+    )
+    if count:
+        db.add(ClientDailyMessages(
+            client_id=client_id, day=day, messages=count,
+            updated_at=datetime.now(timezone.utc),
+        ))
+
+
+# (model, change-tracking column, per-day rebuild)
+_SOURCES = {
+    "leads": (Lead, Lead.updated_at, rebuild_lead_day),
+    "conversations": (Conversation, Conversation.created_at, rebuild_message_day),
+}
+
+
+async def _load_watermark(redis, name: str) -> tuple[datetime, uuid.UUID]:
+    raw = await redis.get(f"{WATERMARK_KEY_PREFIX}:{name}")
+    if raw:
+        ts, _, row_id = raw.partition("|")
+        return _as_utc(datetime.fromisoformat(ts)), uuid.UUID(row_id)
+    return datetime.now(timezone.utc) - COLD_START_LOOKBACK, _MIN_ID
+
+
+async def _save_watermark(redis, name: str, ts: datetime, row_id: uuid.UUID) -> None:
+    await redis.set(f"{WATERMARK_KEY_PREFIX}:{name}", f"{ts.isoformat()}|{row_id}")
+
+
+async def _process_batch(name: str, watermark: tuple[datetime, uuid.UUID], cutoff: datetime):
+    """
+    Rebuild the (client, day) pairs touched by the next batch of changed rows.
+    Returns (rows scanned, pairs rebuilt, last (ts, id) seen).
+    """
+    model, changed_col, rebuild = _SOURCES[name]
+    wm_ts, wm_id = watermark
+
+    async with async_session_factory() as db:
+        rows = (await db.execute(
+            select(model.id, model.client_id, model.created_at, changed_col)
+            .where(and_(
+                or_(changed_col > wm_ts, and_(changed_col == wm_ts, model.id > wm_id)),
+                changed_col <= cutoff,
+            ))
+            .order_by(changed_col, model.id)
+            .limit(SCAN_BATCH_SIZE)
+        )).all()
+        if not rows:
+            return 0, 0, watermark
+
+        pairs = {
+            (row.client_id, _as_utc(row.created_at).date())
+            for row in rows
+            if row.created_at is not None
+        }
+        for client_id, day in sorted(pairs, key=lambda p: (str(p[0]), p[1])):
+            await rebuild(db, client_id, day)
+        await db.commit()
+
+    last = rows[-1]
+    return len(rows), len(pairs), (_as_utc(last[3]), last.id)
+
+
+async def refresh_rollups() -> dict:
+    """
+    Fold every change since the last watermark into the daily rollups.
+    Skips the run if Redis (watermarks + lock) is unavailable or another
+    process holds the lock.
+    """
+    try:
+        from src.utils.dedup import get_redis
+        redis = await get_redis()
+        if not await redis.set(ROLLUP_LOCK_KEY, "1", nx=True, ex=ROLLUP_LOCK_TTL):
+            return {"skipped": True}
+    except Exception as e:
+        logger.debug("Metrics rollup skipped, Redis unavailable: %s", str(e))
+        return {"skipped": True}
+
+    stats = {"skipped": False}
+    try:
+        cutoff = datetime.now(timezone.utc) - timedelta(seconds=SETTLE_SECONDS)
+        for name in _SOURCES:
+            watermark = await _load_watermark(redis, name)
+            scanned_total = rebuilt_total = 0
+            for _ in range(MAX_BATCHES_PER_RUN):
+                scanned, rebuilt, watermark = await _process_batch(name, watermark, cutoff)
+                if scanned:
+                    await _save_watermark(redis, name, *watermark)
+                scanned_total += scanned
+                rebuilt_total += rebuilt
+                if scanned < SCAN_BATCH_SIZE:
+                    break
+            stats[name] = {"scanned": scanned_total, "days_rebuilt": rebuilt_total}
+    finally:
+        try:
+            await redis.delete(ROLLUP_LOCK_KEY)
+        except Exception as e:
+            logger.debug("Metrics rollup lock release failed: %s", str(e))
+
+    if stats["leads"]["scanned"] or stats["conversations"]["scanned"]:
+        logger.info(
+            "Metrics rollup: leads=%d conversations=%d days_rebuilt=%d",
+            stats["leads"]["scanned"],
+            stats["conversations"]["scanned"],
+            stats["leads"]["days_rebuilt"] + stats["conversations"]["days_rebuilt"],
+        )
+    return stats
+
+
+# ---------------------------------------------------------------------------
+# Reads
+# ---------------------------------------------------------------------------
+
+async def load_daily_metrics(db, client_id, since: date) -> list[ClientDailyMetric]:
+    """Every rollup cell for a client from `since` (inclusive), oldest day first."""
+    result = await db.execute(
+        select(ClientDailyMetric)
+        .where(and_(
+            ClientDailyMetric.client_id == client_id,
+            ClientDailyMetric.day >= since,
+        ))
+        .order_by(ClientDailyMetric.day)
+    )
+    return list(result.scalars().all())
+
+
+async def count_messages(db, client_id, since: date) -> int:
+    """Conversation rows for a client from `since` (inclusive)."""
+    result = await db.execute(
+        select(func.coalesce(func.sum(ClientDailyMessages.messages), 0)).where(and_(
+            ClientDailyMessages.client_id == client_id,
+            ClientDailyMessages.day >= since,
+        ))
+    )
+    return int(result.scalar() or 0)
+
+
+def summarize(cells: list[ClientDailyMetric]) -> dict:
+    """Add up a list of rollup cells into window totals."""
+    totals = {
+        "leads": 0,
+        "booked": 0,
+        "responded": 0,
+        "response_ms_total": 0,
+        "under_5s": 0,
+        "under_10s": 0,
+        "under_30s": 0,
+        "under_60s": 0,
+        "ai_cost_usd": 0.0,
+        "sms_cost_usd": 0.0,
+    }
+    for cell in cells:
+        totals["leads"] += cell.leads
+        if cell.state in BOOKED_STATES:
+            totals["booked"] += cell.leads
+        totals["responded"] += cell.responded
+        totals["response_ms_total"] += cell.response_ms_total
+        totals["under_5s"] += cell.responded_under_5s
+        totals["under_10s"] += cell.responded_under_10s
+        totals["under_30s"] += cell.responded_under_30s
+        totals["under_60s"] += cell.responded_under_60s
+        totals["ai_cost_usd"] += cell.ai_cost_usd
+        totals["sms_cost_usd"] += cell.sms_cost_usd
+    return totals
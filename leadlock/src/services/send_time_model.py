@@ -0,0 +1,252 @@
+"""
+Send-time model - which time bucket gets the best opens per trade and state.
+
+Smart timing asks get_best_send_time(trade, state) for every prospect the
+sequencer plans. Rather than grouping learning_signals by JSONB dimensions
+on each call, the metrics rollup worker folds new email_opened signals into
+send_time_stats (one row per UTC day, trade, state, time bucket), and this
+module keeps the summed model in process memory:
+
+    {(trade, state): [BucketStat, ...]}  # best bucket first
+
+reloaded at most every MODEL_TTL_SECONDS, so a lookup is a dict access.
+
+Like services/metrics_rollup.py, refreshes scan signals past a Redis
+watermark and rebuild the whole UTC day each touched, so reprocessing
+after a crash is harmless. History is backfilled by migration 037.
+"""
+import asyncio
+import logging
+import math
+import time
+from collections import defaultdict
+from datetime import date, datetime, timedelta, timezone
+from typing import Optional
+
+from sqlalchemy import and_, delete, func, or_, select
+
+from src.database import async_session_factory
+from src.models.learning_signal import LearningSignal
+from src.models.send_time_stat import SendTimeStat
+from src.services.metrics_rollup import (
+    _as_utc,
+    _day_bounds,
+    _load_watermark,
+    _save_watermark,
+)
+
+logger = logging.getLogger(__name__)
+
+OPEN_SIGNAL = "email_opened"
+MIN_SAMPLES = 5  # buckets with fewer opens are never recommended
+MODEL_TTL_SECONDS = 300
+
+SCAN_BATCH_SIZE = 2000
+MAX_BATCHES_PER_RUN = 10
+SETTLE_SECONDS = 30
+
+WATERMARK_NAME = "send_time"
+REFRESH_LOCK_KEY = "leadlock:lock:send_time_model"
+REFRESH_LOCK_TTL = 300  # seconds
+
+
+class BucketStat:
+    """Open statistics for one time bucket of a (trade, state) pair."""
+
+    __slots__ = ("time_bucket", "samples", "open_rate", "confidence")
+
+    def __init__(self, time_bucket: str, samples: int, open_rate: float, confidence: float):
+        self.time_bucket = time_bucket
+        self.samples = samples
+        self.open_rate = open_rate
+        # Wilson lower bound of open_rate at 95% - discounts small samples
+        self.confidence = confidence
+
+    def __repr__(self) -> str:
+        return (
+            f"<BucketStat {self.time_bucket} rate={self.open_rate:.2f} "
+            f"n={self.samples} conf={self.confidence:.2f}>"
+        )
+
+
+def _wilson_lower_bound(rate: float, samples: int, z: float = 1.96) -> float:
+    if samples <= 0:
+        return 0.0
+    rate = min(max(rate, 0.0), 1.0)
+    denominator = 1 + z * z / samples
+    centre = rate + z * z / (2 * samples)
+    margin = z * math.sqrt(rate * (1 - rate) / samples + z * z / (4 * samples * samples))
+    return max(0.0, (centre - margin) / denominator)
+
+
+# ---------------------------------------------------------------------------
+# Writes
+# ---------------------------------------------------------------------------
+
+async def rebuild_send_time_day(db, day: date) -> int:
+    """Recompute send_time_stats rows for `day`. Returns cells written."""
+    start, end = _day_bounds(day)
+    state = func.coalesce(LearningSignal.state, "")
+    rows = (await db.execute(
+        select(
+            LearningSignal.trade,
+            state,
+            LearningSignal.time_bucket,
+            func.count(LearningSignal.id),
+            func.coalesce(func.sum(LearningSignal.value), 0.0),
+        )
+        .where(and_(
+            LearningSignal.signal_type == OPEN_SIGNAL,
+            LearningSignal.created_at >= start,
+            LearningSignal.created_at < end,
+            LearningSignal.trade.isnot(None),
+            LearningSignal.time_bucket.isnot(None),
+        ))
+        .group_by(LearningSignal.trade, state, LearningSignal.time_bucket)
+    )).all()
+
+    await db.execute(delete(SendTimeStat).where(SendTimeStat.day == day))
+    now = datetime.now(timezone.utc)
+    for trade, state_code, time_bucket, samples, value_sum in rows:
+        db.add(SendTimeStat(
+            day=day,
+            trade=trade,
+            state=state_code,
+            time_bucket=time_bucket,
+            samples=samples,
+            value_sum=float(value_sum),
+            updated_at=now,
+        ))
+    return len(rows)
+
+
+async def refresh_send_time_stats() -> dict:
+    """
+    Fold open signals recorded since the last watermark into send_time_stats.
+    Skips the run if Redis (watermark + lock) is unavailable or another
+    process holds the lock.
+    """
+    try:
+        from src.utils.dedup import get_redis
+        redis = await get_redis()
+        if not await redis.set(REFRESH_LOCK_KEY, "1", nx=True, ex=REFRESH_LOCK_TTL):
+            return {"skipped": True}
+    except Exception as e:
+        logger.debug("Send-time refresh skipped, Redis unavailable: %s", str(e))
+        return {"skipped": True}
+
+    try:
+        watermark = await _load_watermark(redis, WATERMARK_NAME)
+        cutoff = datetime.now(timezone.utc) - timedelta(seconds=SETTLE_SECONDS)
+        scanned = 0
+        days: set[date] = set()
+
+        async with async_session_factory() as db:
+            # Collect the touched days first so each is rebuilt once per run
+            for _ in range(MAX_BATCHES_PER_RUN):
+                wm_ts, wm_id = watermark
+                rows = (await db.execute(
+                    select(LearningSignal.id, LearningSignal.created_at)
+                    .where(and_(
+                        LearningSignal.signal_type == OPEN_SIGNAL,
+                        or_(
+                            LearningSignal.created_at > wm_ts,
+                            and_(LearningSignal.created_at == wm_ts, LearningSignal.id > wm_id),
+                        ),
+                        LearningSignal.created_at <= cutoff,
+                    ))
+                    .order_by(LearningSignal.created_at, LearningSignal.id)
+                    .limit(SCAN_BATCH_SIZE)
+                )).all()
+                if not rows:
+                    break
+                scanned += len(rows)
+                days.update(_as_utc(row.created_at).date() for row in rows)
+                watermark = (_as_utc(rows[-1].created_at), rows[-1].id)
+                if len(rows) < SCAN_BATCH_SIZE:
+                    break
+
+            for day in sorted(days):
+                await rebuild_send_time_day(db, day)
+            await db.commit()
+
+        if scanned:
+            await _save_watermark(redis, WATERMARK_NAME, *watermark)
+            invalidate_send_time_model()
+            logger.info(
+                "Send-time model: signals=%d days_rebuilt=%d", scanned, len(days),
+            )
+    finally:
+        try:
+            await redis.delete(REFRESH_LOCK_KEY)
+        except Exception as e:
+            logger.debug("Send-time refresh lock release failed: %s", str(e))
+
+    return {"skipped": False, "scanned": scanned, "days_rebuilt": len(days)}
+
+
+# ---------------------------------------------------------------------------
+# Reads
+# ---------------------------------------------------------------------------
+
+_model: dict[tuple[str, str], list[BucketStat]] = {}
+_model_loaded_at = 0.0  # time.monotonic() of the last load; 0 = never / invalidated
+_model_lock = asyncio.Lock()
+
+
+async def load_send_time_model(db) -> dict[tuple[str, str], list[BucketStat]]:
+    """Sum send_time_stats into {(trade, state): [BucketStat, ...]}, best bucket first."""
+    rows = (await db.execute(
+        select(
+            SendTimeStat.trade,
+            SendTimeStat.state,
+            SendTimeStat.time_bucket,
+            func.sum(SendTimeStat.samples),
+            func.sum(SendTimeStat.value_sum),
+        )
+        .group_by(SendTimeStat.trade, SendTimeStat.state, SendTimeStat.time_bucket)
+    )).all()
+
+    model: dict[tuple[str, str], list[BucketStat]] = defaultdict(list)
+    for trade, state, time_bucket, samples, value_sum in rows:
+        samples = int(samples or 0)
+        if samples <= 0:
+            continue
+        open_rate = float(value_sum or 0.0) / samples
+        model[(trade, state)].append(BucketStat(
+            time_bucket, samples, open_rate, _wilson_lower_bound(open_rate, samples),
+        ))
+    for stats in model.values():
+        stats.sort(key=lambda s: (s.open_rate, s.confidence), reverse=True)
+    return dict(model)
+
+
+async def get_send_time_model() -> dict[tuple[str, str], list[BucketStat]]:
+    """The in-memory model, reloaded from send_time_stats once it is stale."""
+    global _model, _model_loaded_at
+
+    if _model_loaded_at and time.monotonic() - _model_loaded_at < MODEL_TTL_SECONDS:
+        return _model
+
+    async with _model_lock:
+        if _model_loaded_at and time.monotonic() - _model_loaded_at < MODEL_TTL_SECONDS:
+            return _model
+        async with async_session_factory() as db:
+            _model = await load_send_time_model(db)
+        _model_loaded_at = time.monotonic()
+    return _model
+
+
+def invalidate_send_time_model() -> None:
+    """Force the next lookup to reload the model."""
+    global _model_loaded_at
+    _model_loaded_at = 0.0
+
+
+async def best_send_time(trade: str, state: str) -> Optional[BucketStat]:
+    """Best-performing time bucket with at least MIN_SAMPLES opens, or None."""
+    model = await get_send_time_model()
+    for stat in model.get((trade, state), ()):
+        if stat.samples >= MIN_SAMPLES:
+            return stat
+    return None
@@ -0,0 +1,265 @@
+"""
+Signal buffer - batches learning_signals writes per process.
+
+record_signal() used to open a session and commit one row per call, and it
+is fired for every lead transition and every email open/click. Instead,
+while this process runs the signal writer (started in lifespan), signals
+are appended to an in-memory queue and written with one multi-row INSERT
+when FLUSH_BATCH_SIZE are waiting or FLUSH_INTERVAL_SECONDS have passed.
+
+The queue holds at most MAX_QUEUE_SIZE signals; past that, new signals are
+dropped (they are analytics, not lead state). Shutdown drains the queue
+before the process exits.
+
+With settings.learning_signal_spill_to_redis on, every buffered signal is
+also appended to a Redis stream and deleted once its batch commits. Entries
+older than ORPHAN_AGE_SECONDS belong to a process that died (or overflowed)
+before flushing; the writer re-inserts them, so delivery is at-least-once.
+Inserts skip ids already written, so an entry recovered while its own
+process still flushes it lands once. Recovered rows are stamped with the
+recovery time: their original created_at is already behind the rollup
+watermarks (SETTLE_SECONDS < ORPHAN_AGE_SECONDS), so it would never be
+counted.
+"""
+import asyncio
+import json
+import logging
+import time
+import uuid
+from collections import deque
+from datetime import datetime, timezone
+from typing import Any, Optional
+
+from sqlalchemy.dialects.postgresql import insert
+
+from src.database import async_session_factory
+from src.models.learning_signal import LearningSignal
+
+logger = logging.getLogger(__name__)
+
+FLUSH_BATCH_SIZE = 200
+FLUSH_INTERVAL_SECONDS = 2.0
+MAX_QUEUE_SIZE = 10000
+DRAIN_TIMEOUT_SECONDS = 5.0
+
+SPILL_STREAM_KEY = "leadlock:learning_signals:spill"
+ORPHAN_AGE_SECONDS = 120
+RECOVER_INTERVAL_SECONDS = 60
+RECOVER_LOCK_KEY = "leadlock:lock:learning_signal_recovery"
+RECOVER_LOCK_TTL = 120  # seconds
+
+# (row values for LearningSignal, spill stream entry id or None)
+_queue: "deque[tuple[dict[str, Any], Optional[str]]]" = deque()
+_wake: Optional[asyncio.Event] = None
+_running = False
+_stopping = False
+_dropped = 0
+
+
+def _spill_enabled() -> bool:
+    from src.config import get_settings
+    return getattr(get_settings(), "learning_signal_spill_to_redis", False) is True
+
+
+def _encode(row: dict[str, Any]) -> str:
+    return json.dumps({
+        key: str(value) if isinstance(value, uuid.UUID)
+        else value.isoformat() if isinstance(value, datetime)
+        else value
+        for key, value in row.items()
+    })
+
+
+def _decode(payload: str) -> dict[str, Any]:
+    row = json.loads(payload)
+    for key in ("id", "outreach_id", "lead_id"):
+        if row.get(key):
+            row[key] = uuid.UUID(row[key])
+    if row.get("created_at"):
+        row["created_at"] = datetime.fromisoformat(row["created_at"])
+    return row
+
+
+def is_running() -> bool:
+    """True while this process's signal writer is accepting signals."""
+    return _running and not _stopping
+
+
+def pending_count() -> int:
+    return len(_queue)
+
+
+async def enqueue(row: dict[str, Any]) -> bool:
+    """
+    Buffer one LearningSignal row (column -> value, including id and
+    created_at). Returns False if the queue is full and the signal was
+    not kept in memory.
+    """
+    global _dropped
+
+    entry_id = None
+    if _spill_enabled():
+        try:
+            from src.utils.dedup import get_redis
+            redis = await get_redis()
+            entry_id = await redis.xadd(SPILL_STREAM_KEY, {"row": _encode(row)})
+        except Exception as e:
+            logger.debug("Signal spill write failed: %s", str(e))
+
+    if len(_queue) >= MAX_QUEUE_SIZE:
+        _dropped += 1
+        if _dropped == 1 or _dropped % 1000 == 0:
+            logger.warning(
+                "Signal buffer full (%d): %d signals dropped%s",
+                MAX_QUEUE_SIZE, _dropped,
+                " (kept in Redis stream)" if entry_id else "",
+            )
+        return False
+
+    _queue.append((row, entry_id))
+    if len(_queue) >= FLUSH_BATCH_SIZE and _wake is not None:
+        _wake.set()
+    return True
+
+
+async def _insert_rows(rows: list[dict[str, Any]]) -> None:
+    async with async_session_factory() as db:
+        await db.execute(
+            insert(LearningSignal).on_conflict_do_nothing(index_elements=["id"]),
+            rows,
+        )
+        await db.commit()
+
+
+async def _delete_spilled(entry_ids: list[str]) -> None:
+    if not entry_ids:
+        return
+    try:
+        from src.utils.dedup import get_redis
+        redis = await get_redis()
+        await redis.xdel(SPILL_STREAM_KEY, *entry_ids)
+    except Exception as e:
+        logger.debug("Signal spill cleanup failed: %s", str(e))
+
+
+async def flush() -> int:
+    """Write up to FLUSH_BATCH_SIZE buffered signals. Returns rows written."""
+    if not _queue:
+        return 0
+
+    batch = [_queue.popleft() for _ in range(min(FLUSH_BATCH_SIZE, len(_queue)))]
+    try:
+        await _insert_rows([row for row, _ in batch])
+    except Exception as e:
+        # Put the batch back in order; anything past the cap is dropped
+        # (and still recoverable from the spill stream, if enabled)
+        room = MAX_QUEUE_SIZE - len(_queue)
+        _queue.extendleft(reversed(batch[:max(room, 0)]))
+        logger.error("Signal buffer flush failed (%d signals): %s", len(batch), str(e))
+        return 0
+
+    await _delete_spilled([entry_id for _, entry_id in batch if entry_id])
+    logger.debug("Flushed %d learning signals", len(batch))
+    return len(batch)
+
+
+async def recover_spilled(max_batches: int = 10) -> int:
+    """
+    Insert spill-stream entries older than ORPHAN_AGE_SECONDS - signals a
+    dead process buffered but never flushed - stamped with the current
+    time. Ids already written are skipped. Returns rows recovered.
+    """
+    try:
+        from src.utils.dedup import get_redis
+        redis = await get_redis()
+        if not await redis.set(RECOVER_LOCK_KEY, "1", nx=True, ex=RECOVER_LOCK_TTL):
+            return 0
+    except Exception as e:
+        logger.debug("Signal recovery skipped, Redis unavailable: %s", str(e))
+        return 0
+
+    recovered = 0
+    try:
+        max_id = str(int((time.time() - ORPHAN_AGE_SECONDS) * 1000))
+        for _ in range(max_batches):
+            entries = await redis.xrange(SPILL_STREAM_KEY, min="-", max=max_id, count=FLUSH_BATCH_SIZE)
+            if not entries:
+                break
+            rows = []
+            for _, fields in entries:
+                try:
+                    rows.append(_decode(fields["row"]))
+                except (KeyError, ValueError, TypeError):
+                    continue
+            # Re-stamp so the rollups, already past the original time, see them
+            now = datetime.now(timezone.utc)
+            for row in rows:
+                row["created_at"] = now
+            if rows:
+                await _insert_rows(rows)
+            await redis.xdel(SPILL_STREAM_KEY, *[entry_id for entry_id, _ in entries])
+            recovered += len(rows)
+            if len(entries) < FLUSH_BATCH_SIZE:
+                break
+    except Exception as e:
+        logger.error("Signal recovery failed: %s", str(e))
+    finally:
+        try:
+            await redis.delete(RECOVER_LOCK_KEY)
+        except Exception as e:
+            logger.debug("Signal recovery lock release failed: %s", str(e))
+
+    if recovered:
+        logger.info("Recovered %d spilled learning signals", recovered)
+    return recovered
+
+
+async def run_signal_writer():
+    """Per-process loop - flush the buffer by size or time until stopped."""
+    global _wake, _running, _stopping
+
+    _wake = asyncio.Event()
+    _running = True
+    _stopping = False
+    last_recovery = 0.0
+    logger.info("Signal writer started (batch=%d, every %.1fs)", FLUSH_BATCH_SIZE, FLUSH_INTERVAL_SECONDS)
+
+    try:
+        while not _stopping:
+            try:
+                await asyncio.wait_for(_wake.wait(), timeout=FLUSH_INTERVAL_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+            _wake.clear()
+
+            try:
+                while await flush() == FLUSH_BATCH_SIZE and not _stopping:
+                    pass
+                if _spill_enabled() and time.monotonic() - last_recovery >= RECOVER_INTERVAL_SECONDS:
+                    last_recovery = time.monotonic()
+                    await recover_spilled()
+            except Exception as e:
+                logger.error("Signal writer error: %s", str(e))
+
+        # Shutdown: drain what is left, stop at the first failed batch
+        while _queue and await flush():
+            pass
+        if _queue:
+            logger.warning("Signal writer stopped with %d signals unflushed", len(_queue))
+    finally:
+        _running = False
+
+
+async def stop_signal_writer(task: asyncio.Task) -> None:
+    """Ask the writer to drain and exit; cancel it after DRAIN_TIMEOUT_SECONDS."""
+    global _stopping
+
+    if not _running:
+        task.cancel()
+        return
+    _stopping = True
+    if _wake is not None:
+        _wake.set()
+    _, pending = await asyncio.wait({task}, timeout=DRAIN_TIMEOUT_SECONDS)
+    if pending:
+        task.cancel()
@@ -0,0 +1,461 @@
+"""
+Appointment slot inventory - what the booking agent may offer, and atomic
+reservations so two conversations can never take the same slot.
+
+process_booking used to rebuild 14 days of slots in Python on every
+booking turn without looking at existing bookings, so every lead was
+offered the same times. Now a client's open slots are:
+
+    weekday template   the slots ClientConfig hours/scheduling give a
+                       weekday (scheduling.generate_available_slots),
+                       memoized per config
+  - day usage          one Redis hash per client and day
+
+    leadlock:slots:{client_id}:{YYYY-MM-DD}   hash  {"_day": n, "HH:MM": n, ...}
+
+so a lookup is one pipelined HGETALL per day. _day counts confirmed
+bookings against scheduling.max_daily_bookings; "HH:MM" counts bookings
+starting at that time against SLOT_CAPACITY.
+
+reserve() checks both limits and increments them in one Lua script, and
+_route_to_book reserves before it creates the Booking. release() gives
+the slot back (a booking cancelled, or a reservation whose commit
+failed). A missing day hash (first lookup, Redis flush) is seeded from a
+GROUP BY over that day's confirmed bookings, as lead_usage seeds its
+counters.
+
+Reconciliation: the lead state manager calls reconcile_slot_inventory()
+every cycle. It rebuilds every seeded day in the booking horizon from the
+bookings table, which fixes reservations whose commit never happened and
+bookings cancelled outside the app. A reservation is counted in Redis
+before its Booking commits (the reply is sent in between), so reserve()
+stamps the day with _reserved_at and the rebuild leaves a day alone until
+RESERVATION_GRACE_SECONDS after its last reservation - checked inside the
+rebuild script, so a reservation racing the job is never wiped. The
+partial unique index on confirmed bookings per (client, date, start) is
+the backstop if the inventory is ever wrong.
+
+If Redis is unavailable, lookups and reservations count from the DB -
+correct for one conversation, but not atomic across concurrent ones.
+
+With scheduling.crm_availability on, slots are also filtered to the
+windows CRMBase.get_availability reports (cached CRM_AVAILABILITY_TTL_SECONDS).
+"""
+import json
+import logging
+import uuid
+from collections import defaultdict
+from datetime import date, datetime, time, timedelta, timezone
+from functools import lru_cache
+from typing import Optional
+
+from sqlalchemy import and_, func, select
+
+from src.models.booking import Booking
+from src.schemas.client_config import ClientConfig
+from src.services.scheduling import TimeSlot, generate_available_slots
+
+logger = logging.getLogger(__name__)
+
+SLOT_KEY_PREFIX = "leadlock:slots"
+SEEDED_DAYS_KEY = "leadlock:slots:seeded"  # set of "{client_id}:{YYYY-MM-DD}"
+DAY_FIELD = "_day"
+RESERVED_AT_FIELD = "_reserved_at"  # unix time of the day's last reservation
+RESERVATION_GRACE_SECONDS = 600  # reserve -> reply sent -> Booking committed
+SLOT_CAPACITY = 1  # bookings per start time; the template already spreads techs
+CRM_AVAILABILITY_TTL_SECONDS = 300
+ACTIVE_STATUS = "confirmed"
+
+# ARGV: expire-at unix time, then field/value pairs. Only seeds a missing hash.
+_SEED_SCRIPT = """
+if redis.call('exists', KEYS[1]) == 1 then
+    return 0
+end
+for i = 2, #ARGV, 2 do
+    redis.call('hset', KEYS[1], ARGV[i], ARGV[i + 1])
+end
+redis.call('expireat', KEYS[1], ARGV[1])
+return 1
+"""
+
+# ARGV: day capacity, slot field ('' = none), slot capacity, unix now.
+# Returns 1 reserved, 0 full, -1 when the day must be seeded first.
+_RESERVE_SCRIPT = """
+if redis.call('exists', KEYS[1]) == 0 then
+    return -1
+end
+if tonumber(redis.call('hget', KEYS[1], '_day') or '0') >= tonumber(ARGV[1]) then
+    return 0
+end
+if ARGV[2] ~= '' and tonumber(redis.call('hget', KEYS[1], ARGV[2]) or '0') >= tonumber(ARGV[3]) then
+    return 0
+end
+redis.call('hincrby', KEYS[1], '_day', 1)
+if ARGV[2] ~= '' then
+    redis.call('hincrby', KEYS[1], ARGV[2], 1)
+end
+redis.call('hset', KEYS[1], '_reserved_at', ARGV[4])
+return 1
+"""
+
+# ARGV: grace cutoff unix time, expire-at unix time, then field/value pairs.
+# Replaces the hash unless it took a reservation after the cutoff, which
+# may not have committed yet. Returns 1 rebuilt, 0 skipped.
+_RESEED_SCRIPT = """
+if tonumber(redis.call('hget', KEYS[1], '_reserved_at') or '0') > tonumber(ARGV[1]) then
+    return 0
+end
+redis.call('del', KEYS[1])
+for i = 3, #ARGV, 2 do
+    redis.call('hset', KEYS[1], ARGV[i], ARGV[i + 1])
+end
+redis.call('expireat', KEYS[1], ARGV[2])
+return 1
+"""
+
+# ARGV: slot field ('' = none). Counters never go below zero.
+_RELEASE_SCRIPT = """
+if redis.call('exists', KEYS[1]) == 0 then
+    return 0
+end
+if tonumber(redis.call('hget', KEYS[1], '_day') or '0') > 0 then
+    redis.call('hincrby', KEYS[1], '_day', -1)
+end
+if ARGV[1] ~= '' and tonumber(redis.call('hget', KEYS[1], ARGV[1]) or '0') > 0 then
+    redis.call('hincrby', KEYS[1], ARGV[1], -1)
+end
+return 1
+"""
+
+
+def day_key(client_id: uuid.UUID | str, day: date) -> str:
+    return f"{SLOT_KEY_PREFIX}:{client_id}:{day.isoformat()}"
+
+
+def _slot_field(start: Optional[time]) -> str:
+    return start.strftime("%H:%M") if start else ""
+
+
+def _expire_at(day: date) -> int:
+    # Keep a day's usage until the day after the appointment
+    return int(datetime.combine(day + timedelta(days=2), time(0), tzinfo=timezone.utc).timestamp())
+
+
+# ---------------------------------------------------------------------------
+# Weekday templates
+# ---------------------------------------------------------------------------
+
+_MONDAY = date(2024, 1, 1)
+
+
+def _template_params(config: ClientConfig) -> tuple:
+    hours = config.hours
+    scheduling = config.scheduling
+    saturday = (hours.saturday.start, hours.saturday.end) if hours.saturday else None
+    techs = tuple(t.name for t in config.team if t.active)
+    return (
+        hours.business.start, hours.business.end, saturday,
+        scheduling.slot_duration_minutes, scheduling.buffer_minutes,
+        scheduling.max_daily_bookings, techs,
+    )
+
+
+@lru_cache(maxsize=1024)
+def _weekday_template(params: tuple, weekday: int) -> tuple[tuple[time, time, Optional[str]], ...]:
+    """(start, end, tech) slots for a weekday - same rules as process_booking always used."""
+    start, end, saturday, duration, buffer, max_daily, techs = params
+    slots = generate_available_slots(
+        start_date=_MONDAY + timedelta(days=weekday),
+        days_ahead=1,
+        business_hours_start=start,
+        business_hours_end=end,
+        slot_duration_minutes=duration,
+        buffer_minutes=buffer,
+        max_daily_bookings=max_daily,
+        team_members=[{"name": name} for name in techs],
+        saturday_hours={"start": saturday[0], "end": saturday[1]} if saturday else None,
+    )
+    return tuple((slot.start, slot.end, slot.tech_name) for slot in slots)
+
+
+def day_template(config: ClientConfig, day: date) -> list[TimeSlot]:
+    """All slots the client's hours and scheduling allow on `day`, booked or not."""
+    return [
+        TimeSlot(day, start, end, tech)
+        for start, end, tech in _weekday_template(_template_params(config), day.weekday())
+    ]
+
+
+# ---------------------------------------------------------------------------
+# Usage
+# ---------------------------------------------------------------------------
+
+async def count_bookings(db, client_id: uuid.UUID, days: list[date]) -> dict[date, dict[str, int]]:
+    """Authoritative {day: {"_day": n, "HH:MM": n}} from confirmed bookings (seeding + fallback)."""
+    usage: dict[date, dict[str, int]] = {day: {DAY_FIELD: 0} for day in days}
+    if not days:
+        return usage
+    rows = (await db.execute(
+        select(Booking.appointment_date, Booking.time_window_start, func.count(Booking.id))
+        .where(and_(
+            Booking.client_id == client_id,
+            Booking.appointment_date.in_(days),
+            Booking.status == ACTIVE_STATUS,
+        ))
+        .group_by(Booking.appointment_date, Booking.time_window_start)
+    )).all()
+    for day, start, count in rows:
+        counts = usage.setdefault(day, {DAY_FIELD: 0})
+        counts[DAY_FIELD] += count
+        if start is not None:
+            field = _slot_field(start)
+            counts[field] = counts.get(field, 0) + count
+    return usage
+
+
+def _seed_args(day: date, counts: dict[str, int]) -> list:
+    args: list = [_expire_at(day)]
+    for field, count in counts.items():
+        args.extend((field, count))
+    return args
+
+
+async def _seed(redis, client_id: uuid.UUID, usage: dict[date, dict[str, int]]) -> None:
+    pipe = redis.pipeline()
+    for day, counts in usage.items():
+        pipe.eval(_SEED_SCRIPT, 1, day_key(client_id, day), *_seed_args(day, counts))
+        pipe.sadd(SEEDED_DAYS_KEY, f"{client_id}:{day.isoformat()}")
+    await pipe.execute()
+
+
+async def _load_usage(db, client_id: uuid.UUID, days: list[date]) -> dict[date, dict[str, int]]:
+    try:
+        from src.utils.dedup import get_redis
+        redis = await get_redis()
+        pipe = redis.pipeline()
+        for day in days:
+            pipe.hgetall(day_key(client_id, day))
+        cached = await pipe.execute()
+    except Exception as e:
+        logger.warning(
+            "Slot inventory unavailable for %s, counting from DB: %s",
+            str(client_id)[:8], str(e),
+        )
+        return await count_bookings(db, client_id, days)
+
+    usage = {
+        day: {field: int(count) for field, count in counts.items()}
+        for day, counts in zip(days, cached) if counts
+    }
+    missing = [day for day in days if day not in usage]
+    if missing:
+        seeded = await count_bookings(db, client_id, missing)
+        try:
+            await _seed(redis, client_id, seeded)
+        except Exception as e:
+            logger.debug("Slot inventory seed failed for %s: %s", str(client_id)[:8], str(e))
+        usage.update(seeded)
+    return usage
+
+
+async def available_slots(
+    db,
+    client,
+    config: ClientConfig,
+    start_date: Optional[date] = None,
+) -> list[TimeSlot]:
+    """Open slots for the client's booking horizon, earliest first."""
+    start_date = start_date or date.today()
+    scheduling = config.scheduling
+    days = [start_date + timedelta(days=n) for n in range(scheduling.advance_booking_days)]
+    templates = {day: day_template(config, day) for day in days}
+    open_days = [day for day in days if templates[day]]
+    usage = await _load_usage(db, client.id, open_days)
+
+    crm_windows = None
+    if scheduling.crm_availability and open_days:
+        crm_windows = await _crm_windows(client, open_days[0], open_days[-1])
+
+    slots = []
+    for day in open_days:
+        counts = usage.get(day, {})
+        remaining = scheduling.max_daily_bookings - counts.get(DAY_FIELD, 0)
+        for slot in templates[day]:
+            if remaining <= 0:
+                break
+            if counts.get(_slot_field(slot.start), 0) >= SLOT_CAPACITY:
+                continue
+            if crm_windows is not None and not _within(crm_windows.get(day, ()), slot):
+                continue
+            slots.append(slot)
+            remaining -= 1
+    return slots
+
+
+# ---------------------------------------------------------------------------
+# Reservations
+# ---------------------------------------------------------------------------
+
+async def reserve(
+    db,
+    client_id: uuid.UUID,
+    config: ClientConfig,
+    day: date,
+    start: Optional[time],
+) -> bool:
+    """
+    Atomically take a slot (or, without a start time, a place in the day).
+    Returns False if the day or the slot is already full.
+    """
+    max_daily = config.scheduling.max_daily_bookings
+    field = _slot_field(start)
+    try:
+        from src.utils.dedup import get_redis
+        redis = await get_redis()
+        key = day_key(client_id, day)
+
+        now = int(datetime.now(timezone.utc).timestamp())
+        reserved = await redis.eval(_RESERVE_SCRIPT, 1, key, max_daily, field, SLOT_CAPACITY, now)
+        if reserved == -1:
+            await _seed(redis, client_id, await count_bookings(db, client_id, [day]))
+            reserved = await redis.eval(_RESERVE_SCRIPT, 1, key, max_daily, field, SLOT_CAPACITY, now)
+        return reserved == 1
+    except Exception as e:
+        logger.warning(
+            "Slot inventory unavailable for %s, checking DB: %s",
+            str(client_id)[:8], str(e),
+        )
+        counts = (await count_bookings(db, client_id, [day]))[day]
+        if counts[DAY_FIELD] >= max_daily:
+            return False
+        return not field or counts.get(field, 0) < SLOT_CAPACITY
+
+
+async def release(client_id: uuid.UUID, day: date, start: Optional[time]) -> None:
+    """Give back a reserved slot. Best-effort; reconciliation fixes a missed release."""
+    try:
+        from src.utils.dedup import get_redis
+        redis = await get_redis()
+        await redis.eval(_RELEASE_SCRIPT, 1, day_key(client_id, day), _slot_field(start))
+    except Exception as e:
+        logger.debug("Slot release failed for %s: %s", str(client_id)[:8], str(e))
+
+
+async def reconcile_slot_inventory() -> int:
+    """
+    Rebuild every seeded day from today on from the bookings table, and
+    forget past days. Days with a reservation in the last
+    RESERVATION_GRACE_SECONDS are left for a later run. Returns the number
+    of day hashes rebuilt.
+    """
+    from src.database import async_session_factory
+    from src.utils.dedup import get_redis
+
+    redis = await get_redis()
+    members = await redis.smembers(SEEDED_DAYS_KEY)
+    if not members:
+        return 0
+
+    today = date.today()
+    seeded: dict[uuid.UUID, list[date]] = defaultdict(list)
+    expired = []
+    for member in members:
+        client_id, _, day_str = member.rpartition(":")
+        day = date.fromisoformat(day_str)
+        if day < today:
+            expired.append(member)
+        else:
+            seeded[uuid.UUID(client_id)].append(day)
+    if expired:
+        await redis.srem(SEEDED_DAYS_KEY, *expired)
+
+    grace_cutoff = int(datetime.now(timezone.utc).timestamp()) - RESERVATION_GRACE_SECONDS
+    corrected = 0
+    async with async_session_factory() as db:
+        for client_id, days in seeded.items():
+            actual = await count_bookings(db, client_id, days)
+            pipe = redis.pipeline()
+            for day in days:
+                pipe.hgetall(day_key(client_id, day))
+            cached = await pipe.execute()
+
+            pipe = redis.pipeline()
+            drifted = []
+            for day, counts in zip(days, cached):
+                counts = {field: int(count) for field, count in (counts or {}).items()}
+                if counts.pop(RESERVED_AT_FIELD, 0) > grace_cutoff:
+                    continue  # a reservation may still be committing
+                expected = {field: count for field, count in actual[day].items() if count}
+                current = {field: count for field, count in counts.items() if count}
+                if current == expected:
+                    continue
+                logger.info(
+                    "Slot inventory drift for %s on %s: cached=%s actual=%s",
+                    str(client_id)[:8], day, current, expected,
+                )
+                drifted.append(day)
+                pipe.eval(
+                    _RESEED_SCRIPT, 1, day_key(client_id, day),
+                    grace_cutoff, *_seed_args(day, actual[day]),
+                )
+            if drifted:
+                corrected += sum(1 for rebuilt in await pipe.execute() if rebuilt == 1)
+    return corrected
+
+
+# ---------------------------------------------------------------------------
+# CRM availability
+# ---------------------------------------------------------------------------
+
+def _within(windows, slot: TimeSlot) -> bool:
+    return any(start <= slot.start and slot.end <= end for start, end in windows)
+
+
+def _parse_windows(entries: list[dict]) -> dict[date, list[tuple[time, time]]]:
+    windows: dict[date, list[tuple[time, time]]] = defaultdict(list)
+    for entry in entries:
+        try:
+            day = date.fromisoformat(str(entry["date"])[:10])
+            start = time.fromisoformat(str(entry["start"])[:5])
+            end = time.fromisoformat(str(entry["end"])[:5])
+        except (KeyError, TypeError, ValueError):
+            continue
+        windows[day].append((start, end))
+    return windows
+
+
+async def _crm_windows(client, first: date, last: date) -> Optional[dict[date, list[tuple[time, time]]]]:
+    """
+    Available windows the client's CRM reports, or None when there is no CRM
+    or it returned nothing usable (slots are then not filtered).
+    """
+    cache_key = f"{SLOT_KEY_PREFIX}:{client.id}:crm:{first.isoformat()}"
+    entries = None
+    redis = None
+    try:
+        from src.utils.dedup import get_redis
+        redis = await get_redis()
+        cached = await redis.get(cache_key)
+        if cached:
+            entries = json.loads(cached)
+    except Exception as e:
+        logger.debug("CRM availability cache read failed: %s", str(e))
+
+    if entries is None:
+        from src.workers.crm_sync import get_crm_for_client
+        crm = get_crm_for_client(client)
+        if not crm:
+            return None
+        try:
+            entries = await crm.get_availability(first, last)
+        except Exception as e:
+            logger.warning("CRM availability failed for %s: %s", str(client.id)[:8], str(e))
+            return None
+        if redis is not None:
+            try:
+                await redis.set(cache_key, json.dumps(entries, default=str), ex=CRM_AVAILABILITY_TTL_SECONDS)
+            except Exception as e:
+                logger.debug("CRM availability cache write failed: %s", str(e))
+
+    windows = _parse_windows(entries or [])
+    return windows or None
@@ -33,6 +33,8 @@ TWILIO_OUTBOUND_COST = 0.0079
 TWILIO_INBOUND_COST = 0.0075
 TELNYX_OUTBOUND_COST = 0.0040
 
+TELNYX_MESSAGES_URL = "https://api.telnyx.com/v2/messages"
+
 # Retry configuration
 MAX_RETRIES = 3
 RETRY_DELAYS_SECONDS = [5, 15, 45]
@@ -61,19 +63,41 @@ INVALID_NUMBER_ERRORS = {"21211", "21612"}
 # Twilio client timeout
 TWILIO_CLIENT_TIMEOUT = 10
 
+# Messages are sent straight to the REST API over the shared pooled client;
+# the sync SDK is kept for low-volume number provisioning only.
+TWILIO_API_BASE = "https://api.twilio.com/2010-04-01"
+
+# Max in-flight Twilio sends per process. Extra sends wait here instead of
+# piling onto the connection pool and eating into their request timeout.
+TWILIO_MAX_CONCURRENT_SENDS = 25
+
+_twilio_client = None
+_twilio_send_semaphore: Optional[asyncio.Semaphore] = None
+
 
 def _get_twilio_client():
     """Get a Twilio REST client with configured timeout (cached per process)."""
-    from twilio.rest import Client as TwilioClient
-    from twilio.http.http_client import TwilioHttpClient
-    from src.config import get_settings
-    settings = get_settings()
-    http_client = TwilioHttpClient(timeout=TWILIO_CLIENT_TIMEOUT)
-    return TwilioClient(
-        settings.twilio_account_sid,
-        settings.twilio_auth_token,
-        http_client=http_client,
-    )
+    global _twilio_client
+    if _twilio_client is None:
+        from twilio.rest import Client as TwilioClient
+        from twilio.http.http_client import TwilioHttpClient
+        from src.config import get_settings
+        settings = get_settings()
+        http_client = TwilioHttpClient(timeout=TWILIO_CLIENT_TIMEOUT)
+        _twilio_client = TwilioClient(
+            settings.twilio_account_sid,
+            settings.twilio_auth_token,
+            http_client=http_client,
+        )
+    return _twilio_client
+
+
+def _get_send_semaphore() -> asyncio.Semaphore:
+    """Get the process-wide semaphore bounding concurrent Twilio sends."""
+    global _twilio_send_semaphore
+    if _twilio_send_semaphore is None:
+        _twilio_send_semaphore = asyncio.Semaphore(TWILIO_MAX_CONCURRENT_SENDS)
+    return _twilio_send_semaphore
 
 
 async def _run_sync(func, *args, **kwargs):
@@ -478,44 +502,75 @@ async def _send_twilio(
     from_phone: Optional[str] = None,
     messaging_service_sid: Optional[str] = None,
 ) -> dict:
-    """Send via Twilio REST API (non-blocking)."""
+    """
+    Send via the Twilio Messages REST API on the event loop.
+
+    Uses the shared pooled HTTP client, so sends reuse warm TLS connections and
+    are bounded by TWILIO_MAX_CONCURRENT_SENDS rather than the thread pool.
+    Error responses raise TwilioRestException carrying the Twilio error code.
+    """
+    from twilio.base.exceptions import TwilioRestException
     from src.config import get_settings
+    from src.utils.http_client import get_http_client
     settings = get_settings()
-    client = _get_twilio_client()
 
-    kwargs = {"to": to, "body": body}
+    data = {"To": to, "Body": body}
     if messaging_service_sid or settings.twilio_messaging_service_sid:
-        kwargs["messaging_service_sid"] = (
+        data["MessagingServiceSid"] = (
             messaging_service_sid or settings.twilio_messaging_service_sid
         )
     elif from_phone:
-        kwargs["from_"] = from_phone
+        data["From"] = from_phone
     else:
         raise ValueError("Either from_phone or messaging_service_sid required")
 
-    message = await _run_sync(client.messages.create, **kwargs)
-    return {"sid": message.sid, "status": message.status}
+    url = f"{TWILIO_API_BASE}/Accounts/{settings.twilio_account_sid}/Messages.json"
+    client = get_http_client(url)
+    async with _get_send_semaphore():
+        response = await client.post(
+            url,
+            data=data,
+            auth=(settings.twilio_account_sid, settings.twilio_auth_token),
+            timeout=TWILIO_CLIENT_TIMEOUT,
+        )
+
+    if response.status_code >= 400:
+        try:
+            error = response.json()
+        except ValueError:
+            error = {}
+        raise TwilioRestException(
+            response.status_code,
+            url,
+            msg=error.get("message", response.text),
+            code=error.get("code"),
+            method="POST",
+        )
+
+    message = response.json()
+    return {"sid": message.get("sid"), "status": message.get("status")}
 
 
 async def _send_telnyx(to: str, body: str) -> dict:
     """Send via Telnyx API."""
-    import httpx
     from src.config import get_settings
+    from src.utils.http_client import get_http_client
     settings = get_settings()
-    async with httpx.AsyncClient(timeout=10.0) as client:
-        response = await client.post(
-            "https://api.telnyx.com/v2/messages",
-            headers={
-                "Authorization": f"Bearer {settings.telnyx_api_key}",
-                "Content-Type": "application/json",
-            },
-            json={
-                "from": settings.telnyx_messaging_profile_id,
-                "to": to,
-                "text": body,
-                "messaging_profile_id": settings.telnyx_messaging_profile_id,
-            },
-        )
-        response.raise_for_status()
-        data = response.json()
-        return {"id": data.get("data", {}).get("id")}
+    client = get_http_client(TELNYX_MESSAGES_URL)
+    response = await client.post(
+        TELNYX_MESSAGES_URL,
+        headers={
+            "Authorization": f"Bearer {settings.telnyx_api_key}",
+            "Content-Type": "application/json",
+        },
+        json={
+            "from": settings.telnyx_messaging_profile_id,
+            "to": to,
+            "text": body,
+            "messaging_profile_id": settings.telnyx_messaging_profile_id,
+        },
+        timeout=10.0,
+    )
+    response.raise_for_status()
+    data = response.json()
+    return {"id": data.get("data", {}).get("id")}
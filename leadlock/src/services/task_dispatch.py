@@ -4,6 +4,10 @@ Central helper for creating tasks in the task queue.
 
 Also pushes a notification to Redis so the task processor can wake
 immediately via BRPOP instead of polling every 10 seconds.
+
+Every task is assigned a scheduling lane from its task_type. The executor
+gives each lane its own worker budget, so lead-response SMS work in the
+express lane never waits behind a backlog of bulk enrichment.
 """
 import logging
 from datetime import datetime, timedelta, timezone
@@ -16,6 +20,26 @@ logger = logging.getLogger(__name__)
 
 TASK_NOTIFY_KEY = "leadlock:task_notify"
 
+# Scheduling lanes. Unlisted task types run in the normal lane.
+LANES = ("express", "normal", "bulk")
+DEFAULT_LANE = "normal"
+TASK_LANES: dict[str, str] = {
+    # Lead-response path: must never queue behind sales-engine backfill
+    "sms_retry": "express",
+    "send_sms_followup": "express",
+    # Slow AI / crawling work produced in bulk by the scraper and agents
+    "enrich_prospect": "bulk",
+    "enrich_email": "bulk",
+    "generate_content": "bulk",
+    "generate_ab_variants": "bulk",
+    "send_winback_email": "bulk",
+}
+
+
+def lane_for_task(task_type: str) -> str:
+    """Return the scheduling lane for a task type."""
+    return TASK_LANES.get(task_type, DEFAULT_LANE)
+
 
 async def enqueue_task(
     task_type: str,
@@ -43,6 +67,7 @@ async def enqueue_task(
 
     task = TaskQueue(
         task_type=task_type,
+        lane=lane_for_task(task_type),
         payload=payload or {},
         priority=priority,
         max_retries=max_retries,
@@ -55,8 +80,8 @@ async def enqueue_task(
         task_id = str(task.id)
 
     logger.info(
-        "Task enqueued: type=%s priority=%d delay=%ds id=%s",
-        task_type, priority, delay_seconds, task_id[:8],
+        "Task enqueued: type=%s lane=%s priority=%d delay=%ds id=%s",
+        task_type, task.lane, priority, delay_seconds, task_id[:8],
     )
 
     # Notify task processor to wake immediately (non-blocking, best-effort)
@@ -0,0 +1,268 @@
+"""
+Task queue retention - keeps the hot task_queue table small.
+
+Terminal rows (completed / failed) older than TASK_RETENTION_DAYS are
+moved in batches to task_queue_archive and folded into per-day, per-type
+rollups (task_queue_daily_rollups) in the same transaction, so dashboard
+totals never double count. Archive rows older than ARCHIVE_RETENTION_DAYS
+are purged; rollups are kept indefinitely.
+
+Run by the task processor roughly once an hour, in a task of its own so
+a long purge never holds up claiming. A Redis lock keeps concurrent
+executors from compacting at the same time.
+"""
+import logging
+import uuid
+from collections import defaultdict
+from datetime import date, datetime, timedelta, timezone
+from typing import Optional
+
+from sqlalchemy import select, delete, func, and_, or_, case
+from sqlalchemy.dialects.postgresql import insert
+
+from src.database import async_session_factory
+from src.models.task_queue import TaskQueue, TaskQueueArchive, TaskQueueDailyRollup
+
+logger = logging.getLogger(__name__)
+
+TASK_RETENTION_DAYS = 3
+ARCHIVE_RETENTION_DAYS = 90
+COMPACT_BATCH_SIZE = 500
+MAX_BATCHES_PER_RUN = 20
+COMPACT_LOCK_KEY = "leadlock:lock:task_compactor"
+COMPACT_LOCK_TTL = 600  # seconds
+
+TERMINAL_STATUSES = ("completed", "failed")
+
+# Delete the lock only if this run still holds it; a run that outlived the
+# TTL must not drop the lock of the executor that took over
+_RELEASE_LOCK_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+
+def _as_utc(value: Optional[datetime]) -> Optional[datetime]:
+    if value is not None and value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+async def run_retention() -> dict:
+    """Compact old terminal tasks and purge the archive. Skips if another executor holds the lock."""
+    lock_acquired = True
+    lock_token = uuid.uuid4().hex
+    redis = None
+    try:
+        from src.utils.dedup import get_redis
+        redis = await get_redis()
+        lock_acquired = bool(await redis.set(COMPACT_LOCK_KEY, lock_token, nx=True, ex=COMPACT_LOCK_TTL))
+    except Exception as e:
+        # Redis down: compact anyway, SKIP LOCKED keeps concurrent runs disjoint
+        logger.debug("Compactor lock unavailable, proceeding: %s", str(e))
+        redis = None
+
+    if not lock_acquired:
+        return {"archived": 0, "purged": 0, "skipped": True}
+
+    try:
+        archived = await compact_terminal_tasks()
+        purged = await purge_archive()
+    finally:
+        if redis is not None:
+            try:
+                await redis.eval(_RELEASE_LOCK_SCRIPT, 1, COMPACT_LOCK_KEY, lock_token)
+            except Exception as e:
+                logger.debug("Compactor lock release failed: %s", str(e))
+
+    if archived or purged:
+        logger.info("Task retention: archived=%d purged=%d", archived, purged)
+    return {"archived": archived, "purged": purged, "skipped": False}
+
+
+async def compact_terminal_tasks(retention_days: int = TASK_RETENTION_DAYS) -> int:
+    """Move terminal tasks older than `retention_days` to the archive. Returns rows moved."""
+    cutoff = datetime.now(timezone.utc) - timedelta(days=retention_days)
+    total = 0
+    for _ in range(MAX_BATCHES_PER_RUN):
+        moved = await _compact_batch(cutoff)
+        total += moved
+        if moved < COMPACT_BATCH_SIZE:
+            break
+    return total
+
+
+async def _compact_batch(cutoff: datetime) -> int:
+    """Archive one batch of terminal rows and update their rollups in a single transaction."""
+    async with async_session_factory() as db:
+        result = await db.execute(
+            select(TaskQueue)
+            .where(
+                and_(
+                    TaskQueue.status.in_(TERMINAL_STATUSES),
+                    or_(
+                        TaskQueue.completed_at < cutoff,
+                        and_(TaskQueue.completed_at.is_(None), TaskQueue.created_at < cutoff),
+                    ),
+                )
+            )
+            .order_by(TaskQueue.created_at)
+            .limit(COMPACT_BATCH_SIZE)
+            .with_for_update(skip_locked=True)
+        )
+        tasks = result.scalars().all()
+        if not tasks:
+            return 0
+
+        archived_at = datetime.now(timezone.utc)
+        db.add_all([
+            TaskQueueArchive(
+                id=t.id,
+                task_type=t.task_type,
+                lane=t.lane or "normal",
+                status=t.status,
+                priority=t.priority,
+                retry_count=t.retry_count,
+                payload=t.payload,
+                result_data=t.result_data,
+                error_message=t.error_message,
+                scheduled_at=t.scheduled_at,
+                started_at=t.started_at,
+                completed_at=t.completed_at,
+                created_at=t.created_at,
+                archived_at=archived_at,
+            )
+            for t in tasks
+        ])
+        await _merge_rollups(db, _rollup_totals(tasks))
+        await db.execute(delete(TaskQueue).where(TaskQueue.id.in_([t.id for t in tasks])))
+        await db.commit()
+        return len(tasks)
+
+
+def _rollup_totals(tasks: list) -> dict[tuple[date, str, str], dict]:
+    """Aggregate tasks into (day, task_type, status) buckets."""
+    totals: dict[tuple[date, str, str], dict] = defaultdict(
+        lambda: {"count": 0, "retries": 0, "duration": 0.0, "timed": 0, "max_duration": 0.0}
+    )
+    for t in tasks:
+        finished = _as_utc(t.completed_at or t.created_at)
+        bucket = totals[(finished.date(), t.task_type, t.status)]
+        bucket["count"] += 1
+        bucket["retries"] += t.retry_count or 0
+        started = _as_utc(t.started_at)
+        if started and t.completed_at:
+            duration = max(0.0, (finished - started).total_seconds())
+            bucket["duration"] += duration
+            bucket["timed"] += 1
+            bucket["max_duration"] = max(bucket["max_duration"], duration)
+    return totals
+
+
+async def _merge_rollups(db, totals: dict[tuple[date, str, str], dict]) -> None:
+    """
+    Add bucket totals onto existing rollup rows, creating any that are missing.
+    A single upsert, so concurrent compactors never race on a new row.
+    """
+    if not totals:
+        return
+
+    now = datetime.now(timezone.utc)
+    stmt = insert(TaskQueueDailyRollup).values([
+        {
+            "day": day,
+            "task_type": task_type,
+            "status": status,
+            "task_count": bucket["count"],
+            "retry_count": bucket["retries"],
+            "total_duration_s": bucket["duration"],
+            "timed_count": bucket["timed"],
+            "max_duration_s": bucket["max_duration"],
+            "updated_at": now,
+        }
+        for (day, task_type, status), bucket in totals.items()
+    ])
+    rollup, incoming = TaskQueueDailyRollup, stmt.excluded
+    await db.execute(stmt.on_conflict_do_update(
+        index_elements=["day", "task_type", "status"],
+        set_={
+            "task_count": rollup.task_count + incoming.task_count,
+            "retry_count": rollup.retry_count + incoming.retry_count,
+            "total_duration_s": rollup.total_duration_s + incoming.total_duration_s,
+            "timed_count": rollup.timed_count + incoming.timed_count,
+            "max_duration_s": case(
+                (incoming.max_duration_s > rollup.max_duration_s, incoming.max_duration_s),
+                else_=rollup.max_duration_s,
+            ),
+            "updated_at": incoming.updated_at,
+        },
+    ))
+
+
+async def purge_archive(retention_days: int = ARCHIVE_RETENTION_DAYS) -> int:
+    """Delete archived rows older than `retention_days`. Rollups are kept."""
+    cutoff = datetime.now(timezone.utc) - timedelta(days=retention_days)
+    async with async_session_factory() as db:
+        result = await db.execute(
+            delete(TaskQueueArchive).where(TaskQueueArchive.archived_at < cutoff)
+        )
+        await db.commit()
+        return result.rowcount or 0
+
+
+async def get_rollup_totals(
+    since: date,
+    task_types: Optional[list[str]] = None,
+) -> dict[str, dict]:
+    """
+    Archived task totals per status since `since` (inclusive).
+    Returns {status: {"count", "timed_count", "total_duration_s"}}.
+    """
+    conditions = [TaskQueueDailyRollup.day >= since]
+    if task_types is not None:
+        conditions.append(TaskQueueDailyRollup.task_type.in_(task_types))
+
+    async with async_session_factory() as db:
+        rows = await db.execute(
+            select(
+                TaskQueueDailyRollup.status,
+                func.sum(TaskQueueDailyRollup.task_count),
+                func.sum(TaskQueueDailyRollup.timed_count),
+                func.sum(TaskQueueDailyRollup.total_duration_s),
+            )
+            .where(and_(*conditions))
+            .group_by(TaskQueueDailyRollup.status)
+        )
+        return {
+            status: {
+                "count": int(count or 0),
+                "timed_count": int(timed or 0),
+                "total_duration_s": float(duration or 0.0),
+            }
+            for status, count, timed, duration in rows
+        }
+
+
+async def get_daily_rollups(days: int = 30) -> list[dict]:
+    """Per-day, per-type rollup rows for the last `days` days, newest first."""
+    since = datetime.now(timezone.utc).date() - timedelta(days=days - 1)
+    async with async_session_factory() as db:
+        result = await db.execute(
+            select(TaskQueueDailyRollup)
+            .where(TaskQueueDailyRollup.day >= since)
+            .order_by(TaskQueueDailyRollup.day.desc(), TaskQueueDailyRollup.task_type)
+        )
+        return [
+            {
+                "day": r.day.isoformat(),
+                "task_type": r.task_type,
+                "status": r.status,
+                "count": r.task_count,
+                "retries": r.retry_count,
+                "avg_duration_s": round(r.total_duration_s / r.timed_count, 2) if r.timed_count else None,
+                "max_duration_s": round(r.max_duration_s, 2),
+            }
+            for r in result.scalars().all()
+        ]
@@ -0,0 +1,107 @@
+"""
+Conversation transcript - the last few turns the qualify/book agents see.
+
+Prompt assembly used to iterate lead.conversations, loading a lead's whole
+history on every reply, only for process_qualify/process_booking to keep
+the last 8 messages. recent_turns() returns just those turns, oldest first,
+from a rolling per-lead ring in Redis:
+
+    leadlock:transcript:{lead_id}   list  JSON {"direction", "content"}, oldest first
+
+append_turn() extends the ring whenever a message is received or sent. It
+uses RPUSHX, so it only extends a ring that a full load created - a ring
+is never started from a single turn and mistaken for the whole history.
+On a miss recent_turns() runs a keyset query on (lead_id, created_at desc)
+and backfills the ring.
+
+The ring is a cache; conversations stays the source of truth. Appends don't
+refresh the TTL, so a ring that missed one (Redis blip, race with a
+backfill) is rebuilt from the DB within TRANSCRIPT_TTL_SECONDS.
+"""
+import json
+import logging
+import uuid
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.models.conversation import Conversation
+
+logger = logging.getLogger(__name__)
+
+TRANSCRIPT_KEY_PREFIX = "leadlock:transcript"
+TRANSCRIPT_TURNS = 8  # prompt window of process_qualify / process_booking
+TRANSCRIPT_TTL_SECONDS = 86400
+
+
+def _key(lead_id) -> str:
+    return f"{TRANSCRIPT_KEY_PREFIX}:{lead_id}"
+
+
+def _encode(direction: str, content: str) -> str:
+    return json.dumps({"direction": direction, "content": content})
+
+
+async def append_turn(lead_id: uuid.UUID, direction: str, content: str) -> None:
+    """Add a message to the lead's ring, if one is cached. Best-effort."""
+    try:
+        from src.utils.dedup import get_redis
+        redis = await get_redis()
+        key = _key(lead_id)
+        pipe = redis.pipeline()
+        pipe.rpushx(key, _encode(direction, content))
+        pipe.ltrim(key, -TRANSCRIPT_TURNS, -1)
+        await pipe.execute()
+    except Exception as e:
+        logger.debug("Transcript append failed for lead %s: %s", str(lead_id)[:8], str(e))
+
+
+async def recent_turns(
+    db: AsyncSession,
+    lead_id: uuid.UUID,
+    limit: int = TRANSCRIPT_TURNS,
+) -> list[dict]:
+    """
+    Last `limit` messages of a lead's conversation, oldest first, as
+    {"direction", "content"} dicts. Messages added to the session but not
+    yet flushed are included on a cache miss (autoflush), so callers should
+    append_turn() them as they add them.
+    """
+    if limit <= TRANSCRIPT_TURNS:
+        try:
+            from src.utils.dedup import get_redis
+            redis = await get_redis()
+            cached = await redis.lrange(_key(lead_id), -limit, -1)
+            if cached:
+                return [json.loads(item) for item in cached]
+        except Exception as e:
+            logger.debug("Transcript read failed for lead %s: %s", str(lead_id)[:8], str(e))
+
+    result = await db.execute(
+        select(Conversation.direction, Conversation.content)
+        .where(Conversation.lead_id == lead_id)
+        .order_by(Conversation.created_at.desc())
+        .limit(max(limit, TRANSCRIPT_TURNS))
+    )
+    turns = [
+        {"direction": direction, "content": content}
+        for direction, content in reversed(result.all())
+    ]
+
+    if turns:
+        await _backfill(lead_id, turns[-TRANSCRIPT_TURNS:])
+    return turns[-limit:]
+
+
+async def _backfill(lead_id: uuid.UUID, turns: list[dict]) -> None:
+    try:
+        from src.utils.dedup import get_redis
+        redis = await get_redis()
+        key = _key(lead_id)
+        pipe = redis.pipeline()
+        pipe.delete(key)
+        pipe.rpush(key, *[_encode(t["direction"], t["content"]) for t in turns])
+        pipe.expire(key, TRANSCRIPT_TTL_SECONDS)
+        await pipe.execute()
+    except Exception as e:
+        logger.debug("Transcript backfill failed for lead %s: %s", str(lead_id)[:8], str(e))
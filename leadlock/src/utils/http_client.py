@@ -0,0 +1,143 @@
+"""
+Shared outbound HTTP clients - one pooled httpx.AsyncClient per upstream.
+
+Every CRM call, Telnyx send and website scrape used to open a throwaway
+AsyncClient, paying a fresh TCP + TLS handshake per request. Clients here are
+created lazily on first use, kept alive for the life of the process and closed
+from the FastAPI lifespan via close_http_clients().
+
+HTTP/2 is negotiated (ALPN) when the optional `h2` package is installed;
+otherwise clients fall back to HTTP/1.1 keep-alive.
+
+Pooled clients never store cookies: one client serves every tenant's CRM
+calls and every scraped site, so a persistent jar would leak one caller's
+session into the next. Callers that need a cookie send it as a header.
+"""
+import importlib.util
+import logging
+from http.cookiejar import CookieJar, DefaultCookiePolicy
+from urllib.parse import urlparse
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TIMEOUT = 10.0
+
+# Pool shape per upstream: (max_connections, max_keepalive_connections, keepalive_expiry_s)
+DEFAULT_LIMITS = (20, 10, 30.0)
+UPSTREAM_LIMITS = {
+    "auth.servicetitan.io": (4, 2, 60.0),
+    "api.servicetitan.io": (20, 10, 60.0),
+    "api.getjobber.com": (10, 5, 60.0),
+    "api.housecallpro.com": (10, 5, 60.0),
+    "services.leadconnectorhq.com": (10, 5, 60.0),
+    "api.telnyx.com": (20, 10, 60.0),
+    "api.twilio.com": (25, 25, 60.0),
+    # Website scraping fans out across many hosts through one shared client
+    "web": (50, 20, 15.0),
+}
+
+HTTP2_ENABLED = importlib.util.find_spec("h2") is not None
+
+_clients: dict[str, httpx.AsyncClient] = {}
+_stats: dict[str, dict] = {}
+
+
+def _upstream_key(upstream: str) -> str:
+    """Normalize a URL or upstream name to its registry key (the host)."""
+    if "://" in upstream:
+        return (urlparse(upstream).hostname or upstream).lower()
+    return upstream.lower()
+
+
+def _no_cookie_jar() -> CookieJar:
+    """A cookie jar whose policy accepts no domain, so Set-Cookie is ignored."""
+    return CookieJar(policy=DefaultCookiePolicy(allowed_domains=[]))
+
+
+def _make_hooks(key: str) -> dict:
+    """Build event hooks that count requests and new connections for an upstream."""
+    stats = _stats.setdefault(key, {"requests": 0, "connections_opened": 0, "errors": 0})
+
+    async def _trace(event_name: str, info: dict) -> None:
+        if event_name == "connection.connect_tcp.complete":
+            stats["connections_opened"] += 1
+
+    async def _on_request(request: httpx.Request) -> None:
+        stats["requests"] += 1
+        request.extensions["trace"] = _trace
+
+    async def _on_response(response: httpx.Response) -> None:
+        if response.status_code >= 500:
+            stats["errors"] += 1
+
+    return {"request": [_on_request], "response": [_on_response]}
+
+
+def get_http_client(upstream: str) -> httpx.AsyncClient:
+    """
+    Get the shared client for an upstream, creating it on first use.
+
+    Args:
+        upstream: A URL on the upstream (its host is the key) or a pool name
+            such as "web" for clients that talk to arbitrary hosts.
+
+    Callers pass per-request headers, timeout and follow_redirects; the client
+    only owns the connection pool.
+    """
+    key = _upstream_key(upstream)
+    client = _clients.get(key)
+    if client is None or client.is_closed:
+        max_conn, max_keepalive, expiry = UPSTREAM_LIMITS.get(key, DEFAULT_LIMITS)
+        client = httpx.AsyncClient(
+            timeout=DEFAULT_TIMEOUT,
+            http2=HTTP2_ENABLED,
+            limits=httpx.Limits(
+                max_connections=max_conn,
+                max_keepalive_connections=max_keepalive,
+                keepalive_expiry=expiry,
+            ),
+            cookies=_no_cookie_jar(),
+            event_hooks=_make_hooks(key),
+        )
+        _clients[key] = client
+        logger.debug("HTTP client pool created for %s (http2=%s)", key, HTTP2_ENABLED)
+    return client
+
+
+def get_http_client_stats() -> dict:
+    """
+    Connection reuse per upstream.
+
+    Returns:
+        {host: {"requests", "connections_opened", "reused", "reuse_ratio", "errors"}}
+    """
+    result = {}
+    for key, stats in _stats.items():
+        requests = stats["requests"]
+        opened = stats["connections_opened"]
+        reused = max(requests - opened, 0)
+        result[key] = {
+            "requests": requests,
+            "connections_opened": opened,
+            "reused": reused,
+            "reuse_ratio": round(reused / requests, 3) if requests else 0.0,
+            "errors": stats["errors"],
+        }
+    return result
+
+
+async def close_http_clients(reset_stats: bool = False) -> None:
+    """Close every pooled client. Called once from the app lifespan on shutdown."""
+    clients = list(_clients.values())
+    _clients.clear()
+    for client in clients:
+        try:
+            await client.aclose()
+        except Exception as e:
+            logger.warning("Failed to close HTTP client: %s", str(e))
+    if reset_stats:
+        _stats.clear()
+    if clients:
+        logger.info("Closed %d pooled HTTP client(s)", len(clients))
@@ -1,9 +1,15 @@
 """
 Redis distributed locks - prevents race conditions on lead processing.
 Uses Redis SET NX with TTL for automatic expiration.
+
+Waiters do not poll: releasing a lock pushes onto "{lock key}:released"
+and a waiter blocks on that list with BRPOP, retrying SET NX when woken.
+Each BRPOP is capped at LOCK_RECHECK_SECONDS so a lock that expired
+instead of being released (holder crashed) is still picked up.
 """
-import asyncio
 import logging
+import math
+import time
 import uuid
 from contextlib import asynccontextmanager
 from typing import Optional
@@ -12,7 +18,12 @@ logger = logging.getLogger(__name__)
 
 LOCK_TTL_SECONDS = 30
 LOCK_WAIT_SECONDS = 5
-LOCK_POLL_INTERVAL = 0.1  # 100ms
+LOCK_RECHECK_SECONDS = 1.0  # longest a waiter blocks before retrying SET NX
+RELEASED_TTL_SECONDS = 10  # an unclaimed release notification expires after this
+
+
+def _released_key(key: str) -> str:
+    return f"{key}:released"
 
 
 @asynccontextmanager
@@ -49,7 +60,7 @@ async def _acquire_lock(
     ttl: int,
     wait: float,
 ) -> bool:
-    """Try to acquire a Redis lock with polling."""
+    """Try to acquire a Redis lock, waiting on release notifications."""
     try:
         from src.utils.dedup import get_redis
         redis = await get_redis()
@@ -59,11 +70,12 @@ async def _acquire_lock(
         if was_set:
             return True
 
-        # Poll until timeout
-        elapsed = 0.0
-        while elapsed < wait:
-            await asyncio.sleep(LOCK_POLL_INTERVAL)
-            elapsed += LOCK_POLL_INTERVAL
+        # Block until the holder releases (or a recheck interval passes)
+        deadline = time.monotonic() + wait
+        while (remaining := deadline - time.monotonic()) > 0:
+            # BRPOP timeout 0 would block forever; keep it positive, in ms steps
+            timeout = math.ceil(min(remaining, LOCK_RECHECK_SECONDS) * 1000) / 1000
+            await redis.brpop(_released_key(key), timeout=timeout)
             was_set = await redis.set(key, value, nx=True, ex=ttl)
             if was_set:
                 return True
@@ -77,20 +89,27 @@ async def _acquire_lock(
 
 
 async def _release_lock(key: str, value: str) -> None:
-    """Release a Redis lock only if we still own it (compare-and-delete)."""
+    """
+    Release a Redis lock only if we still own it (compare-and-delete), and
+    wake one waiter.
+    """
     try:
         from src.utils.dedup import get_redis
         redis = await get_redis()
 
-        # Lua script for atomic compare-and-delete
+        # Lua script for atomic compare-and-delete + release notification
         lua_script = """
         if redis.call('get', KEYS[1]) == ARGV[1] then
+            local released = KEYS[1] .. ':released'
+            redis.call('lpush', released, '1')
+            redis.call('ltrim', released, 0, 0)
+            redis.call('expire', released, ARGV[2])
             return redis.call('del', KEYS[1])
         else
             return 0
         end
         """
-        await redis.eval(lua_script, 1, key, value)
+        await redis.eval(lua_script, 1, key, value, RELEASED_TTL_SECONDS)
     except Exception as e:
         logger.warning("Redis lock release error for %s: %s", key, str(e))
 
@@ -1,9 +1,17 @@
 """
-Metrics utilities - helpers for calculating dashboard KPIs.
+Metrics utilities - helpers for calculating dashboard KPIs and per-stage
+latency budgets for the webhook-to-first-SMS path.
 """
+import logging
+import math
 import time
+from contextlib import contextmanager
 from datetime import datetime
-from typing import Optional
+from typing import Awaitable, Iterator, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
 
 
 class Timer:
@@ -41,3 +49,194 @@ def response_time_bucket(ms: int) -> str:
         return "30-60s"
     else:
         return "60s+"
+
+
+# ---------------------------------------------------------------------------
+# Stage latency budget
+# ---------------------------------------------------------------------------
+
+# Histogram bucket upper bounds in milliseconds (rendered as seconds for Prometheus)
+STAGE_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000)
+
+# Rolling window of raw samples kept per stage in Redis for p50/p95/p99
+STAGE_SAMPLE_WINDOW = 1000
+STAGE_SAMPLE_TTL_SECONDS = 7 * 86400
+STAGE_KEY_PREFIX = "leadlock:latency"
+
+# In-process histograms: {(pipeline, stage): {"buckets": [...], "sum_ms": int, "count": int}}
+_stage_histograms: dict[tuple[str, str], dict] = {}
+# SLA breaches attributed to the slowest stage: {(pipeline, stage): count}
+_sla_breaches: dict[tuple[str, str], int] = {}
+
+
+def observe_stage(pipeline: str, stage: str, ms: int) -> None:
+    """Add one latency sample to the in-process histogram for a stage."""
+    hist = _stage_histograms.get((pipeline, stage))
+    if hist is None:
+        hist = {"buckets": [0] * len(STAGE_BUCKETS_MS), "sum_ms": 0, "count": 0}
+        _stage_histograms[(pipeline, stage)] = hist
+    for i, bound in enumerate(STAGE_BUCKETS_MS):
+        if ms <= bound:
+            hist["buckets"][i] += 1
+    hist["sum_ms"] += ms
+    hist["count"] += 1
+
+
+class LatencyTrace:
+    """
+    Per-request stage breakdown built on Timer.
+
+    Usage:
+        trace = LatencyTrace("new_lead")
+        with trace.span("commit"):
+            await db.commit()
+        response_ms = trace.finish(target_ms=settings.lead_response_target_ms)
+
+    Spans with the same name accumulate. finish() stops the overall timer and
+    feeds every stage (plus "total") into the in-process histograms.
+    """
+
+    def __init__(self, pipeline: str):
+        self.pipeline = pipeline
+        self.timer = Timer().start()
+        self.stages: dict[str, int] = {}
+        self.total_ms: Optional[int] = None
+
+    @contextmanager
+    def span(self, stage: str) -> Iterator[None]:
+        """Time the enclosed block as one stage."""
+        timer = Timer().start()
+        try:
+            yield
+        finally:
+            self.stages[stage] = self.stages.get(stage, 0) + timer.stop()
+
+    async def timed(self, stage: str, awaitable: Awaitable[T]) -> T:
+        """Await a coroutine as one stage - for stages run under asyncio.gather."""
+        with self.span(stage):
+            return await awaitable
+
+    @property
+    def slowest_stage(self) -> Optional[str]:
+        if not self.stages:
+            return None
+        return max(self.stages, key=self.stages.get)
+
+    def finish(self, target_ms: Optional[int] = None) -> int:
+        """
+        Stop the trace and record it. Returns total elapsed milliseconds.
+
+        When the total exceeds target_ms the breach is counted against the
+        slowest stage and logged with the full breakdown.
+        """
+        self.total_ms = self.timer.stop()
+        for stage, ms in self.stages.items():
+            observe_stage(self.pipeline, stage, ms)
+        observe_stage(self.pipeline, "total", self.total_ms)
+
+        if target_ms is not None and self.total_ms > target_ms:
+            culprit = self.slowest_stage or "unknown"
+            key = (self.pipeline, culprit)
+            _sla_breaches[key] = _sla_breaches.get(key, 0) + 1
+            logger.warning(
+                "%s exceeded %dms target: %dms (slowest=%s, stages=%s)",
+                self.pipeline, target_ms, self.total_ms, culprit, self.stages,
+            )
+        return self.total_ms
+
+
+def _format_seconds(ms: float) -> str:
+    return f"{ms / 1000:g}"
+
+
+def render_prometheus() -> str:
+    """Render stage histograms and SLA breach counters in Prometheus text format."""
+    lines = [
+        "# HELP leadlock_stage_duration_seconds Latency of each pipeline stage.",
+        "# TYPE leadlock_stage_duration_seconds histogram",
+    ]
+    for (pipeline, stage), hist in sorted(_stage_histograms.items()):
+        labels = f'pipeline="{pipeline}",stage="{stage}"'
+        for bound, count in zip(STAGE_BUCKETS_MS, hist["buckets"]):
+            lines.append(
+                f'leadlock_stage_duration_seconds_bucket{{{labels},le="{_format_seconds(bound)}"}} {count}'
+            )
+        lines.append(f'leadlock_stage_duration_seconds_bucket{{{labels},le="+Inf"}} {hist["count"]}')
+        lines.append(f"leadlock_stage_duration_seconds_sum{{{labels}}} {_format_seconds(hist['sum_ms'])}")
+        lines.append(f"leadlock_stage_duration_seconds_count{{{labels}}} {hist['count']}")
+
+    lines.append("# HELP leadlock_sla_breaches_total Responses over target, by slowest stage.")
+    lines.append("# TYPE leadlock_sla_breaches_total counter")
+    for (pipeline, stage), count in sorted(_sla_breaches.items()):
+        lines.append(f'leadlock_sla_breaches_total{{pipeline="{pipeline}",stage="{stage}"}} {count}')
+    return "\n".join(lines) + "\n"
+
+
+def _stage_key(pipeline: str, stage: str) -> str:
+    return f"{STAGE_KEY_PREFIX}:{pipeline}:{stage}"
+
+
+async def record_stage_samples(trace: LatencyTrace) -> None:
+    """
+    Push a finished trace's stage timings into the rolling Redis windows.
+    One pipelined round trip; never raises.
+    """
+    if trace.total_ms is None:
+        return
+    try:
+        from src.utils.dedup import get_redis
+        redis = await get_redis()
+        samples = {**trace.stages, "total": trace.total_ms}
+        stages_key = f"{STAGE_KEY_PREFIX}:{trace.pipeline}:stages"
+        pipe = redis.pipeline()
+        for stage, ms in samples.items():
+            key = _stage_key(trace.pipeline, stage)
+            pipe.lpush(key, ms)
+            pipe.ltrim(key, 0, STAGE_SAMPLE_WINDOW - 1)
+            pipe.expire(key, STAGE_SAMPLE_TTL_SECONDS)
+        pipe.sadd(stages_key, *samples.keys())
+        pipe.expire(stages_key, STAGE_SAMPLE_TTL_SECONDS)
+        await pipe.execute()
+    except Exception as e:
+        logger.debug("Failed to record stage latency samples: %s", str(e))
+
+
+def _percentile(sorted_values: list[int], pct: float) -> int:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0
+    rank = max(math.ceil(pct / 100 * len(sorted_values)), 1)
+    return sorted_values[rank - 1]
+
+
+async def get_stage_percentiles(pipeline: str) -> dict:
+    """
+    Rolling p50/p95/p99 per stage over the last STAGE_SAMPLE_WINDOW samples.
+
+    Returns:
+        {stage: {"samples", "p50_ms", "p95_ms", "p99_ms", "max_ms"}}
+    """
+    from src.utils.dedup import get_redis
+    redis = await get_redis()
+    stages = sorted(await redis.smembers(f"{STAGE_KEY_PREFIX}:{pipeline}:stages"))
+    if not stages:
+        return {}
+
+    pipe = redis.pipeline()
+    for stage in stages:
+        pipe.lrange(_stage_key(pipeline, stage), 0, -1)
+    windows = await pipe.execute()
+
+    result = {}
+    for stage, raw in zip(stages, windows):
+        values = sorted(int(v) for v in raw)
+        if not values:
+            continue
+        result[stage] = {
+            "samples": len(values),
+            "p50_ms": _percentile(values, 50),
+            "p95_ms": _percentile(values, 95),
+            "p99_ms": _percentile(values, 99),
+            "max_ms": values[-1],
+        }
+    return result
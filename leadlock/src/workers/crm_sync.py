@@ -6,11 +6,24 @@ Retry logic:
 - On failure: retry up to 5 times with exponential backoff (30s, 2min, 10min, 30min, 2hr)
 - After max retries: mark as permanently failed, alert admin
 - Heartbeat stored in Redis for health monitoring
+
+Wakes on the crm_sync due index (see services/due_index.py): new bookings
+and scheduled retries register when they come due, so a booking is pushed
+to the CRM right after it is committed. With nothing due the worker idles
+up to IDLE_WAIT_SECONDS; without Redis it polls every POLL_INTERVAL_SECONDS.
+
+Each cycle claims a batch with a short lease (crm_next_retry_at pushed
+SYNC_CLAIM_SECONDS ahead and committed), loads its leads and clients with
+one IN query each, and syncs the bookings concurrently: at most
+SYNC_CONCURRENCY at once and CRM_CONCURRENCY per CRM type. Each booking's
+outcome commits in its own transaction. CRM adapters are cached per client
+(see get_crm_for_client) and share HTTP pools via utils.http_client.
 """
 import asyncio
+import json
 import logging
 from datetime import datetime, timezone, timedelta
-from sqlalchemy import select, and_, or_, cast, String
+from sqlalchemy import select, and_, or_
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.database import async_session_factory
@@ -24,13 +37,31 @@ from src.integrations.google_sheets import GoogleSheetsCRM
 from src.integrations.jobber import JobberCRM
 from src.integrations.gohighlevel import GoHighLevelCRM
 from src.integrations.housecallpro import HousecallProCRM
+from src.services import due_index
 
 logger = logging.getLogger(__name__)
 
-POLL_INTERVAL_SECONDS = 30
+POLL_INTERVAL_SECONDS = 30  # fixed poll when the due index is unavailable
+IDLE_WAIT_SECONDS = 180  # longest wait with nothing due (safety net)
+DUE_INDEX = "crm_sync"
+SYNC_BATCH_SIZE = 20
+SYNC_STATUSES = ("pending", "retrying")
+SYNC_CLAIM_SECONDS = 300  # lease on a claimed batch; crashed runs retry after this
+SYNC_CONCURRENCY = 8  # syncs in flight (each holds a DB session)
+DEFAULT_CRM_CONCURRENCY = 3
+CRM_CONCURRENCY = {  # concurrent syncs per CRM type, under each vendor's rate limit
+    "servicetitan": 4,
+    "jobber": 2,
+    "housecallpro": 3,
+    "gohighlevel": 3,
+    "google_sheets": 1,
+}
 MAX_CRM_RETRIES = 5
 CRM_RETRY_DELAYS = [30, 120, 600, 1800, 7200]  # 30s, 2m, 10m, 30m, 2h
 
+# {client_id: (credentials fingerprint, adapter)}
+_crm_adapters: dict = {}
+
 
 async def _heartbeat():
     """Store heartbeat timestamp in Redis."""
@@ -47,93 +78,198 @@ async def _heartbeat():
 
 
 async def run_crm_sync():
-    """Main loop - poll for bookings that need CRM sync."""
-    logger.info("CRM sync worker started (poll every %ds)", POLL_INTERVAL_SECONDS)
+    """Main loop - sync bookings whenever the due index says one is due."""
+    logger.info("CRM sync worker started (idle wait %ds)", IDLE_WAIT_SECONDS)
 
     while True:
+        await due_index.consume(DUE_INDEX)
         try:
             await sync_pending_bookings()
         except Exception as e:
             logger.error("CRM sync error: %s", str(e))
 
         await _heartbeat()
-        await asyncio.sleep(POLL_INTERVAL_SECONDS)
+        await due_index.wait(DUE_INDEX, IDLE_WAIT_SECONDS, fallback_seconds=POLL_INTERVAL_SECONDS)
 
 
-async def sync_pending_bookings():
-    """Find and sync all pending and retrying bookings to their CRM."""
+async def schedule_booking_sync(booking_id, due_at: datetime | None = None) -> None:
+    """Register a committed booking (or its next retry) with the due index."""
+    await due_index.schedule(DUE_INDEX, {f"booking:{booking_id}": due_at})
+
+
+class _SyncBatch:
+    """A claimed batch: booking ids with the leads and clients they need."""
+
+    def __init__(self, bookings: list[Booking], leads: dict, clients: dict, claimed_until: datetime):
+        self.booking_ids = [booking.id for booking in bookings]
+        self.lead_ids = {booking.id: booking.lead_id for booking in bookings}
+        self.client_ids = {booking.id: booking.client_id for booking in bookings}
+        self.leads = leads
+        self.clients = clients
+        self.claimed_until = claimed_until
+
+
+async def _claim_pending_bookings() -> _SyncBatch | None:
+    """
+    Lock up to SYNC_BATCH_SIZE bookings due for sync with FOR UPDATE SKIP
+    LOCKED, lease them by moving crm_next_retry_at to the claim expiry and
+    load their leads and clients with one IN query each, then commit.
+    """
+    now = datetime.now(timezone.utc)
+    claimed_until = now + timedelta(seconds=SYNC_CLAIM_SECONDS)
+
     async with async_session_factory() as db:
-        # Find pending bookings AND retrying bookings that are past their retry-at time
-        now = datetime.now(timezone.utc)
         result = await db.execute(
             select(Booking)
             .where(
-                or_(
-                    Booking.crm_sync_status == "pending",
-                    and_(
-                        Booking.crm_sync_status == "retrying",
-                        # Only retry if crm_next_retry_at has passed (stored in extra_data JSON)
-                        or_(
-                            Booking.extra_data.is_(None),
-                            Booking.extra_data["crm_next_retry_at"].astext <= now.isoformat(),
-                        ),
+                and_(
+                    Booking.crm_sync_status.in_(SYNC_STATUSES),
+                    or_(
+                        Booking.crm_next_retry_at.is_(None),
+                        Booking.crm_next_retry_at <= now,
                     ),
                 )
             )
             .order_by(Booking.created_at)
-            .limit(20)
+            .limit(SYNC_BATCH_SIZE)
+            .with_for_update(skip_locked=True)
         )
         bookings = result.scalars().all()
 
         if not bookings:
-            return
+            return None
 
-        logger.info("Syncing %d bookings to CRM", len(bookings))
+        lead_ids = {booking.lead_id for booking in bookings}
+        result = await db.execute(select(Lead).where(Lead.id.in_(lead_ids)))
+        leads = {lead.id: lead for lead in result.scalars().all()}
+        client_ids = {booking.client_id for booking in bookings}
+        result = await db.execute(select(Client).where(Client.id.in_(client_ids)))
+        clients = {client.id: client for client in result.scalars().all()}
 
         for booking in bookings:
+            booking.crm_next_retry_at = claimed_until
+        await db.commit()
+
+    return _SyncBatch(bookings, leads, clients, claimed_until)
+
+
+async def sync_pending_bookings():
+    """Find and sync all pending and retrying bookings to their CRM."""
+    batch = await _claim_pending_bookings()
+    if batch is None:
+        return
+
+    logger.info("Syncing %d bookings to CRM", len(batch.booking_ids))
+
+    # Each CRM type gets its own rate limit; every sync also holds a DB session
+    slots = asyncio.Semaphore(SYNC_CONCURRENCY)
+    lanes: dict[str, asyncio.Semaphore] = {}
+
+    async def _run(booking_id):
+        client = batch.clients.get(batch.client_ids[booking_id])
+        crm_type = (client.crm_type or "") if client else ""
+        lane = lanes.setdefault(
+            crm_type, asyncio.Semaphore(CRM_CONCURRENCY.get(crm_type, DEFAULT_CRM_CONCURRENCY)),
+        )
+        async with lane, slots:
             try:
-                await sync_booking(db, booking)
+                return await _sync_claimed_booking(booking_id, batch)
             except Exception as e:
-                retry_count = (booking.extra_data or {}).get("crm_retry_count", 0)
-                logger.error(
-                    "CRM sync failed for booking %s (attempt %d/%d): %s",
-                    str(booking.id)[:8], retry_count + 1, MAX_CRM_RETRIES, str(e),
-                )
-
-                if retry_count < MAX_CRM_RETRIES:
-                    # Schedule retry with exponential backoff
-                    delay = CRM_RETRY_DELAYS[min(retry_count, len(CRM_RETRY_DELAYS) - 1)]
-                    booking.crm_sync_status = "retrying"
-                    booking.crm_sync_error = str(e)
-                    extra = dict(booking.extra_data or {})
-                    extra["crm_retry_count"] = retry_count + 1
-                    extra["crm_next_retry_at"] = (
-                        datetime.now(timezone.utc) + timedelta(seconds=delay)
-                    ).isoformat()
-                    booking.extra_data = extra
-                    logger.info(
-                        "CRM sync retry scheduled for booking %s in %ds",
-                        str(booking.id)[:8], delay,
-                    )
-                else:
-                    # Max retries exhausted
-                    booking.crm_sync_status = "failed"
-                    booking.crm_sync_error = f"Max retries ({MAX_CRM_RETRIES}) exhausted: {str(e)}"
-
-                    from src.utils.alerting import send_alert, AlertType
-                    await send_alert(
-                        AlertType.LEAD_PROCESSING_FAILED,
-                        f"CRM sync permanently failed for booking {str(booking.id)[:8]} after {MAX_CRM_RETRIES} retries: {str(e)}",
-                        extra={"booking_id": str(booking.id)[:8]},
-                    )
+                # Lease expiry hands the booking back to a later cycle
+                logger.error("Failed to record CRM sync for booking %s: %s", str(booking_id)[:8], str(e))
+                return None
+
+    next_retries = await asyncio.gather(*(_run(booking_id) for booking_id in batch.booking_ids))
+
+    due = {
+        f"booking:{booking_id}": next_retry_at
+        for booking_id, next_retry_at in zip(batch.booking_ids, next_retries)
+        if next_retry_at is not None
+    }
+    if len(batch.booking_ids) >= SYNC_BATCH_SIZE:
+        # More may be waiting; come straight back
+        due["bookings:backlog"] = None
+    await due_index.schedule(DUE_INDEX, due)
+
+
+async def _sync_claimed_booking(booking_id, batch: _SyncBatch) -> datetime | None:
+    """
+    Sync one claimed booking in its own session and commit the outcome.
+    Returns the next retry time if the sync failed and will be retried.
+    """
+    async with async_session_factory() as db:
+        booking = (await db.execute(
+            select(Booking).where(Booking.id == booking_id).with_for_update()
+        )).scalar_one_or_none()
+
+        if (
+            booking is None
+            or booking.crm_sync_status not in SYNC_STATUSES
+            or booking.crm_next_retry_at != batch.claimed_until
+        ):
+            logger.warning("Booking %s changed after claim, skipping CRM sync", str(booking_id)[:8])
+            return None
+
+        booking.crm_next_retry_at = None
+        next_retry_at = None
+        try:
+            await sync_booking(
+                db, booking,
+                lead=batch.leads.get(batch.lead_ids[booking_id]),
+                client=batch.clients.get(batch.client_ids[booking_id]),
+            )
+        except Exception as e:
+            next_retry_at = await _record_sync_failure(booking, e)
 
         await db.commit()
+    return next_retry_at
 
 
-async def sync_booking(db: AsyncSession, booking: Booking):
-    """Sync a single booking to the client's CRM."""
-    lead = await db.get(Lead, booking.lead_id)
-    client = await db.get(Client, booking.client_id)
+async def _record_sync_failure(booking: Booking, error: Exception) -> datetime | None:
+    """Schedule the next retry with exponential backoff, or give up and alert."""
+    retry_count = booking.crm_retry_count or 0
+    logger.error(
+        "CRM sync failed for booking %s (attempt %d/%d): %s",
+        str(booking.id)[:8], retry_count + 1, MAX_CRM_RETRIES, str(error),
+    )
+
+    if retry_count < MAX_CRM_RETRIES:
+        delay = CRM_RETRY_DELAYS[min(retry_count, len(CRM_RETRY_DELAYS) - 1)]
+        next_retry_at = datetime.now(timezone.utc) + timedelta(seconds=delay)
+        booking.crm_sync_status = "retrying"
+        booking.crm_sync_error = str(error)
+        booking.crm_retry_count = retry_count + 1
+        booking.crm_next_retry_at = next_retry_at
+        logger.info(
+            "CRM sync retry scheduled for booking %s in %ds",
+            str(booking.id)[:8], delay,
+        )
+        return next_retry_at
+
+    # Max retries exhausted
+    booking.crm_sync_status = "failed"
+    booking.crm_sync_error = f"Max retries ({MAX_CRM_RETRIES}) exhausted: {str(error)}"
+
+    from src.utils.alerting import send_alert, AlertType
+    await send_alert(
+        AlertType.LEAD_PROCESSING_FAILED,
+        f"CRM sync permanently failed for booking {str(booking.id)[:8]} after {MAX_CRM_RETRIES} retries: {str(error)}",
+        extra={"booking_id": str(booking.id)[:8]},
+    )
+    return None
+
+
+async def sync_booking(
+    db: AsyncSession,
+    booking: Booking,
+    lead: Lead | None = None,
+    client: Client | None = None,
+):
+    """Sync a single booking to the client's CRM. Loads lead/client if not given."""
+    if lead is None:
+        lead = await db.get(Lead, booking.lead_id)
+    if client is None:
+        client = await db.get(Client, booking.client_id)
 
     if not lead or not client:
         booking.crm_sync_status = "failed"
@@ -189,8 +325,36 @@ async def sync_booking(db: AsyncSession, booking: Booking):
         booking.crm_sync_error = job_result.get("error")
 
 
+def _credentials_fingerprint(client: Client) -> tuple:
+    """Everything an adapter is built from; any change means a new adapter."""
+    return (
+        client.crm_type,
+        json.dumps(client.crm_config or {}, sort_keys=True, default=str),
+        client.crm_tenant_id,
+        client.crm_api_key_encrypted,
+    )
+
+
 def get_crm_for_client(client: Client) -> CRMBase | None:
-    """Get the appropriate CRM integration for a client."""
+    """
+    The client's CRM adapter, reused across syncs so its token cache and
+    decrypted key survive. Rebuilt when the client's CRM credentials change.
+    """
+    fingerprint = _credentials_fingerprint(client)
+    cached = _crm_adapters.get(client.id)
+    if cached is not None and cached[0] == fingerprint:
+        return cached[1]
+
+    crm = _build_crm(client)
+    if crm is None:
+        _crm_adapters.pop(client.id, None)
+    else:
+        _crm_adapters[client.id] = (fingerprint, crm)
+    return crm
+
+
+def _build_crm(client: Client) -> CRMBase | None:
+    """Build the appropriate CRM integration for a client."""
     crm_config = client.crm_config or {}
 
     # Decrypt API key if stored
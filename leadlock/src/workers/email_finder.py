@@ -34,6 +34,12 @@ BOUNCE_RETRY_DAYS = 14  # Longer than normal retry — give domain time to cool
 BOUNCE_RETRY_BATCH = 25  # Reserve 25 slots (of 150 total) for bounce retries
 NORMAL_BATCH_SIZE = BATCH_SIZE - BOUNCE_RETRY_BATCH  # 125 normal slots
 
+# Prospects discovered at once. Page fetches are further capped per host and
+# per process by src.utils.crawl, so this mostly bounds DNS/MX lookups and
+# open sessions. At 20 a full batch of worst-case timeouts takes ~8 minutes.
+FINDER_CONCURRENCY = 20
+DISCOVERY_TIMEOUT = 60.0  # per prospect
+
 
 async def run_email_finder():
     """Main loop — find real emails for unverified prospects."""
@@ -203,41 +209,36 @@ async def _process_batch():
         failed = 0
         bounce_reactivated = 0
 
-        for prospect in prospects:
+        # Discovery is network-bound (website crawls, DNS), so prospects are
+        # discovered concurrently; outcomes are applied here one at a time
+        # as they finish, since they share this session.
+        slots = asyncio.Semaphore(FINDER_CONCURRENCY)
+
+        async def _run(prospect: Outreach):
+            async with slots:
+                try:
+                    return prospect, await _discover(prospect, prospect.id in bounce_retry_ids)
+                except Exception as e:
+                    return prospect, e
+
+        for next_done in asyncio.as_completed([_run(p) for p in prospects]):
+            prospect, discovery = await next_done
             domain = _extract_prospect_domain(prospect)
             is_bounce_retry = prospect.id in bounce_retry_ids
 
-            logger.info(
-                "Email finder: checking %s (%s)%s",
-                prospect.prospect_name, domain or "no domain",
-                " [bounce retry]" if is_bounce_retry else "",
-            )
-
-            try:
-                # Pass db session for bounce-retry prospects to enable blacklist checks
-                # 60s per-prospect timeout to prevent worker hangs on stuck domains
-                discovery = await asyncio.wait_for(
-                    discover_email(
-                        website=prospect.website,
-                        company_name=prospect.prospect_company or prospect.prospect_name,
-                        enrichment_data=prospect.enrichment_data,
-                        db=db if is_bounce_retry else None,
-                    ),
-                    timeout=60.0,
-                )
-            except asyncio.TimeoutError:
+            if isinstance(discovery, asyncio.TimeoutError):
                 logger.warning(
-                    "Email finder: discovery TIMED OUT for %s (%s) after 60s",
-                    prospect.prospect_name, domain or "no domain",
+                    "Email finder: discovery TIMED OUT for %s (%s) after %ds",
+                    prospect.prospect_name, domain or "no domain", DISCOVERY_TIMEOUT,
                 )
                 prospect.email_discovery_attempted_at = now
                 failed += 1
                 await db.commit()
                 continue
-            except Exception as e:
+            if isinstance(discovery, Exception):
                 logger.warning(
                     "Email finder: discovery failed for %s: %s",
-                    prospect.prospect_name, str(e),
+                    prospect.prospect_name, str(discovery),
                 )
                 # Stamp the attempt so we don't retry immediately
                 prospect.email_discovery_attempted_at = now
@@ -324,6 +325,32 @@ async def _process_batch():
         )
 
 
+async def _discover(prospect: Outreach, is_bounce_retry: bool) -> dict:
+    """
+    Run email discovery for one prospect, bounded by DISCOVERY_TIMEOUT to
+    prevent worker hangs on stuck domains. Bounce retries get their own
+    session for blacklist checks - the batch session is not safe to share
+    across concurrent discoveries.
+    """
+    domain = _extract_prospect_domain(prospect)
+    logger.info(
+        "Email finder: checking %s (%s)%s",
+        prospect.prospect_name, domain or "no domain",
+        " [bounce retry]" if is_bounce_retry else "",
+    )
+
+    kwargs = dict(
+        website=prospect.website,
+        company_name=prospect.prospect_company or prospect.prospect_name,
+        enrichment_data=prospect.enrichment_data,
+    )
+    if not is_bounce_retry:
+        return await asyncio.wait_for(discover_email(**kwargs, db=None), timeout=DISCOVERY_TIMEOUT)
+
+    async with async_session_factory() as check_db:
+        return await asyncio.wait_for(discover_email(**kwargs, db=check_db), timeout=DISCOVERY_TIMEOUT)
+
+
 def _extract_prospect_domain(prospect: Outreach) -> str | None:
     """Extract domain from a prospect's website URL."""
     if not prospect.website:
@@ -0,0 +1,247 @@
+"""
+Inbound SMS worker - runs the conductor for texts the Twilio webhook queued.
+
+The webhook records the WebhookEvent, queues it on a partitioned Redis
+stream (see services/inbound_queue.py) and acks Twilio right away. This
+worker does the slow part: lead lock, qualify/book AI call and reply send.
+
+One consumer task per partition reads its stream in order, so texts from
+one lead are handled in arrival order and different leads run in parallel
+(at most PARTITIONS conversations at once). Events still "queued" after
+QUEUED_STALE_SECONDS lost their stream entry (e.g. Redis restarted without
+persistence) and are queued again by a periodic sweep.
+
+Claiming an event stamps claimed_at. A worker cancelled or killed between
+the claim and the outcome leaves the event "processing": its stream entry
+is still pending, so the partition's next consumer re-reads and reclaims
+it, and the sweep re-queues any whose CLAIM_LEASE_SECONDS ran out without
+an entry to re-read.
+"""
+import asyncio
+import logging
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import select, and_, or_, update
+
+from src.database import async_session_factory
+from src.models.lead import Lead
+from src.models.webhook_event import WebhookEvent
+from src.schemas.lead_envelope import LeadEnvelope, NormalizedLead, LeadMetadata
+from src.services import inbound_queue
+from src.services.client_cache import get_cached_client
+from src.services.phone_validation import normalize_phone
+
+logger = logging.getLogger(__name__)
+
+READ_BLOCK_MS = 5000
+READ_COUNT = 10
+ERROR_BACKOFF_SECONDS = 5
+SWEEP_INTERVAL_SECONDS = 60
+QUEUED_STALE_SECONDS = 120
+CLAIM_LEASE_SECONDS = 600  # well past the conductor's own AI/send timeouts
+SWEEP_BATCH_SIZE = 100
+
+
+async def _heartbeat():
+    """Store heartbeat timestamp in Redis."""
+    try:
+        from src.utils.dedup import get_redis
+        redis = await get_redis()
+        await redis.set(
+            "leadlock:worker_health:inbound_sms",
+            datetime.now(timezone.utc).isoformat(),
+            ex=300,
+        )
+    except Exception as e:
+        logger.debug("Heartbeat write failed: %s", str(e))
+
+
+async def run_inbound_sms():
+    """Main loop - one consumer per partition, plus the stale-event sweep."""
+    logger.info("Inbound SMS worker started (%d partitions)", inbound_queue.PARTITIONS)
+    consumers = [
+        asyncio.create_task(_consume_partition(partition))
+        for partition in range(inbound_queue.PARTITIONS)
+    ]
+    try:
+        while True:
+            try:
+                await requeue_stale_events()
+            except Exception as e:
+                logger.error("Inbound SMS sweep error: %s", str(e))
+
+            await _heartbeat()
+            await asyncio.sleep(SWEEP_INTERVAL_SECONDS)
+    finally:
+        for task in consumers:
+            task.cancel()
+        await asyncio.gather(*consumers, return_exceptions=True)
+
+
+async def _consume_partition(partition: int):
+    """Process one partition's stream in order, forever."""
+    ready = False
+    pending = True  # start with entries a previous run read but never acked
+
+    while True:
+        try:
+            if not ready:
+                await inbound_queue.ensure_group(partition)
+                ready = True
+
+            entries = await inbound_queue.read(
+                partition, pending=pending, count=READ_COUNT, block_ms=READ_BLOCK_MS,
+            )
+            if pending and not entries:
+                pending = False
+                continue
+
+            for entry_id, event_id in entries:
+                # A pending entry was delivered to this partition's consumer
+                # and never acked: whoever claimed its event is gone
+                await process_queued_event(event_id, reclaim=pending)
+                await inbound_queue.ack(partition, entry_id)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error("Inbound SMS partition %d error: %s", partition, str(e))
+            # Unacked entries are still pending; re-read them before new ones
+            ready = False
+            pending = True
+            await asyncio.sleep(ERROR_BACKOFF_SECONDS)
+
+
+async def process_queued_event(event_id, reclaim: bool = False) -> dict | None:
+    """
+    Run the conductor for one queued webhook event and record the outcome.
+    Returns the conductor result, or None if the event was not ours to run
+    (unknown, finished, or claimed by a live worker).
+
+    A "processing" event is claimed again if its lease expired, or with
+    reclaim=True - a re-read pending entry whose previous run was interrupted.
+    """
+    try:
+        event_uuid = uuid.UUID(str(event_id))
+    except ValueError:
+        logger.warning("Inbound SMS entry without a valid event id: %r", event_id)
+        return None
+
+    async with async_session_factory() as db:
+        # Claim: only one live delivery of an event reaches the conductor
+        now = datetime.now(timezone.utc)
+        claimable = [WebhookEvent.processing_status == "queued", _lease_expired(now)]
+        if reclaim:
+            claimable.append(WebhookEvent.processing_status == "processing")
+        claimed = await db.execute(
+            update(WebhookEvent)
+            .where(and_(WebhookEvent.id == event_uuid, or_(*claimable)))
+            .values(processing_status="processing", claimed_at=now)
+        )
+        if not claimed.rowcount:
+            return None
+        await db.commit()
+
+        event = await db.get(WebhookEvent, event_uuid)
+        try:
+            result = await _route_inbound_sms(db, event)
+        except Exception as e:
+            await db.rollback()
+            logger.error("Inbound SMS processing error: %s", str(e), exc_info=True)
+            await db.execute(
+                update(WebhookEvent)
+                .where(WebhookEvent.id == event_uuid)
+                .values(
+                    processing_status="failed",
+                    error_message=str(e),
+                    processed_at=datetime.now(timezone.utc),
+                )
+                # The rollback expired the loaded event; don't try to refresh it
+                .execution_options(synchronize_session=False)
+            )
+            await db.commit()
+            return None
+
+        event.processing_status = "completed"
+        event.processed_at = datetime.now(timezone.utc)
+        await db.commit()
+        return result
+
+
+async def _route_inbound_sms(db, event: WebhookEvent) -> dict:
+    """New lead or reply, exactly as the webhook used to route it inline."""
+    from src.agents.conductor import handle_new_lead, handle_inbound_reply
+
+    form_params = event.raw_payload or {}
+    phone = normalize_phone(form_params.get("From", ""))
+    body_text = form_params.get("Body", "")
+    if not phone or not body_text:
+        raise ValueError("Missing From or Body")
+
+    client = await get_cached_client(event.client_id, db)
+    if not client:
+        raise ValueError("Client not found")
+
+    existing_lead_result = await db.execute(
+        select(Lead).where(
+            and_(Lead.client_id == client.id, Lead.phone == phone)
+        ).order_by(Lead.created_at.desc()).limit(1)
+    )
+    existing_lead = existing_lead_result.scalar_one_or_none()
+
+    if existing_lead:
+        return await handle_inbound_reply(db, existing_lead, client, body_text)
+
+    envelope = LeadEnvelope(
+        source="text_in",
+        client_id=str(client.id),
+        lead=NormalizedLead(phone=phone),
+        metadata=LeadMetadata(raw_payload=form_params),
+        consent_type="pec",
+        consent_method="text_in",
+        inbound_message=body_text,
+    )
+    return await handle_new_lead(db, envelope)
+
+
+def _lease_expired(now: datetime):
+    """Events a worker claimed but never finished within CLAIM_LEASE_SECONDS."""
+    return and_(
+        WebhookEvent.processing_status == "processing",
+        WebhookEvent.claimed_at.isnot(None),
+        WebhookEvent.claimed_at <= now - timedelta(seconds=CLAIM_LEASE_SECONDS),
+    )
+
+
+async def requeue_stale_events() -> int:
+    """
+    Queue again events left "queued" past QUEUED_STALE_SECONDS or stuck
+    "processing" past their claim lease. Returns how many.
+    """
+    now = datetime.now(timezone.utc)
+    cutoff = now - timedelta(seconds=QUEUED_STALE_SECONDS)
+    async with async_session_factory() as db:
+        result = await db.execute(
+            select(WebhookEvent.id, WebhookEvent.client_id, WebhookEvent.raw_payload)
+            .where(
+                or_(
+                    and_(
+                        WebhookEvent.processing_status == "queued",
+                        WebhookEvent.received_at <= cutoff,
+                    ),
+                    _lease_expired(now),
+                )
+            )
+            .order_by(WebhookEvent.received_at)
+            .limit(SWEEP_BATCH_SIZE)
+        )
+        stale = result.all()
+
+    requeued = 0
+    for event_id, client_id, raw_payload in stale:
+        phone = normalize_phone((raw_payload or {}).get("From", "")) or ""
+        if await inbound_queue.enqueue(event_id, client_id, phone):
+            requeued += 1
+    if requeued:
+        logger.warning("Re-queued %d stale inbound SMS events", requeued)
+    return requeued
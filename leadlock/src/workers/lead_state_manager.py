@@ -9,6 +9,8 @@ Phases per cycle:
 3. Archive old leads (from lead_lifecycle)
 4. Mark dead leads (from lead_lifecycle)
 5. Schedule cold recycling (from lead_lifecycle)
+6. Reconcile monthly lead usage counters (plan limit enforcement)
+7. Reconcile the appointment slot inventory
 """
 import asyncio
 import logging
@@ -81,6 +83,24 @@ async def run_lead_state_manager():
             dead = await _mark_dead_leads()
             recycled = await _schedule_cold_recycling()
 
+            # Phase 6: Rebuild monthly lead counters from the leads table
+            try:
+                from src.services.lead_usage import reconcile_monthly_lead_counts
+                drifted = await reconcile_monthly_lead_counts()
+                if drifted:
+                    logger.info("Lead usage counters corrected: %d", drifted)
+            except Exception as e:
+                logger.warning("Lead usage reconciliation failed: %s", str(e))
+
+            # Phase 7: Rebuild slot inventory days from the bookings table
+            try:
+                from src.services.slot_inventory import reconcile_slot_inventory
+                drifted = await reconcile_slot_inventory()
+                if drifted:
+                    logger.info("Slot inventory days corrected: %d", drifted)
+            except Exception as e:
+                logger.warning("Slot inventory reconciliation failed: %s", str(e))
+
             total = stuck + completed + no_shows + archived + dead + recycled
             if total > 0:
                 logger.info(
@@ -94,6 +114,18 @@ async def run_lead_state_manager():
         await asyncio.sleep(POLL_INTERVAL_SECONDS)
 
 
+def _new_followups(db) -> list[FollowupTask]:
+    """Followup tasks added to the session and not yet flushed."""
+    return [obj for obj in db.new if isinstance(obj, FollowupTask)]
+
+
+async def _schedule_followups(tasks: list[FollowupTask]) -> None:
+    """Tell sms_dispatch when newly committed followup tasks come due."""
+    if tasks:
+        from src.workers.sms_dispatch import schedule_followups
+        await schedule_followups(tasks)
+
+
 # ---------------------------------------------------------------------------
 # Phase 1: Sweep stuck leads (from stuck_lead_sweeper)
 # ---------------------------------------------------------------------------
@@ -129,7 +161,9 @@ async def _sweep_stuck_leads() -> int:
                 _handle_stuck_lead(db, lead, state, now)
 
         if total_found > 0:
+            new_tasks = _new_followups(db)
             await db.commit()
+            await _schedule_followups(new_tasks)
 
     return total_found
 
@@ -325,7 +359,9 @@ async def _complete_booked_leads() -> int:
             )
 
         if count > 0:
+            new_tasks = _new_followups(db)
             await db.commit()
+            await _schedule_followups(new_tasks)
             logger.info("Completed %d booked leads past appointment date", count)
 
     return count
@@ -412,7 +448,9 @@ async def _detect_no_shows() -> int:
             )
 
         if count > 0:
+            new_tasks = _new_followups(db)
             await db.commit()
+            await _schedule_followups(new_tasks)
             logger.info("Detected %d no-shows", count)
 
     return count
@@ -560,6 +598,8 @@ async def _schedule_cold_recycling() -> int:
             ))
 
         if count > 0:
+            new_tasks = _new_followups(db)
             await db.commit()
+            await _schedule_followups(new_tasks)
 
     return count
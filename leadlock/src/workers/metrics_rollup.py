@@ -0,0 +1,64 @@
+"""
+Metrics rollup worker - keeps client_daily_metrics current for the dashboard.
+Runs every minute and folds lead / conversation changes since the last
+watermark into the daily rollups (see services/metrics_rollup.py), new
+email-open signals into the send-time model (services/send_time_model.py),
+and pending A/B counters into ab_test_variants (services/ab_counters.py).
+Every REFRESH_INTERVAL_SECONDS it also recomputes the learning context
+snapshots outreach email generation reads (services/learning_snapshot.py).
+"""
+import asyncio
+import logging
+from datetime import datetime, timezone
+
+from src.services.ab_testing import fold_event_counts
+from src.services.learning_snapshot import refresh_learning_snapshots
+from src.services.metrics_rollup import refresh_rollups
+from src.services.send_time_model import refresh_send_time_stats
+
+logger = logging.getLogger(__name__)
+
+POLL_INTERVAL_SECONDS = 60
+
+
+async def _heartbeat():
+    """Store heartbeat timestamp in Redis."""
+    try:
+        from src.utils.dedup import get_redis
+        redis = await get_redis()
+        await redis.set(
+            "leadlock:worker_health:metrics_rollup",
+            datetime.now(timezone.utc).isoformat(),
+            ex=600,
+        )
+    except Exception as e:
+        logger.debug("Heartbeat write failed: %s", str(e))
+
+
+async def run_metrics_rollup():
+    """Main loop - refresh the daily rollups from changed rows."""
+    logger.info("Metrics rollup worker started (poll every %ds)", POLL_INTERVAL_SECONDS)
+
+    while True:
+        try:
+            await refresh_rollups()
+        except Exception as e:
+            logger.error("Metrics rollup error: %s", str(e))
+
+        try:
+            await refresh_send_time_stats()
+        except Exception as e:
+            logger.error("Send-time model refresh error: %s", str(e))
+
+        try:
+            await fold_event_counts()
+        except Exception as e:
+            logger.error("A/B counter fold error: %s", str(e))
+
+        try:
+            await refresh_learning_snapshots()
+        except Exception as e:
+            logger.error("Learning snapshot refresh error: %s", str(e))
+
+        await _heartbeat()
+        await asyncio.sleep(POLL_INTERVAL_SECONDS)
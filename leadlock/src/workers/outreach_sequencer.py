@@ -3,11 +3,19 @@ Outreach sequencer worker - orchestrates cold email sequences.
 Runs every 30 minutes. Respects daily email limits, sequence delays,
 and business hours gating (configurable timezone + weekdays).
 
+Each cycle plans every tenant's sends first (concurrently, one session per
+tenant), then dispatches them from a shared schedule: sends on the same
+(tenant, mailbox) lane are spaced by a random jitter, while different lanes
+send side by side, each send in its own session.
+
 Email sending logic lives in outreach_sending.py.
 """
 import asyncio
+import heapq
+import itertools
 import logging
 import random
+import uuid
 from datetime import datetime, timedelta, timezone
 from typing import Optional
 from zoneinfo import ZoneInfo
@@ -21,7 +29,10 @@ from src.models.sales_config import SalesEngineConfig
 from src.models.campaign import Campaign
 from src.config import get_settings
 from src.services.sales_tenancy import get_active_sales_configs
-from src.services.sender_mailboxes import get_primary_sender_profile
+from src.services.sender_mailboxes import (
+    get_active_sender_mailboxes,
+    get_primary_sender_profile,
+)
 from src.services.outreach_timing import (
     MIN_FOLLOWUP_DELAY_HOURS,
     followup_readiness,
@@ -40,6 +51,12 @@ logger = logging.getLogger(__name__)
 
 POLL_INTERVAL_SECONDS = 30 * 60  # 30 minutes
 
+# Send scheduling: gap between sends on one (tenant, mailbox) lane, and
+# how many sends / tenant plans may run at once across lanes.
+SEND_JITTER_SECONDS = (60, 120)
+MAX_CONCURRENT_SENDS = 8
+MAX_CONCURRENT_TENANT_PLANS = 4
+
 # Email warmup schedule - conservative ramp for sender reputation stability.
 # Format: (day_range_start, day_range_end, max_daily_emails)
 # day_range_end of None means "and beyond"; max_daily of None means "use configured limit"
@@ -648,57 +665,191 @@ async def _recover_generation_failed(db: AsyncSession, tenant_id) -> int:
         return 0
 
 
-async def sequence_cycle():
+class _SendBatch:
     """
-    Execute one full outreach sequence cycle. Respects business hours gating.
-    Two-pass per tenant: (1) active campaigns, (2) unbound prospects.
+    One pass of a tenant's sends (a campaign, or its unbound prospects).
+    Counts consecutive failures so a failing batch stops early.
     """
-    async with async_session_factory() as db:
-        configs = await get_active_sales_configs(db)
-        if not configs:
-            return
 
-        # Email reputation circuit breaker - pause if reputation is critical
-        email_healthy, throttle_level = await _check_email_health()
-        if not email_healthy:
-            logger.warning("Email sending paused due to poor reputation - skipping cycle")
-            return
+    def __init__(
+        self,
+        config: SalesEngineConfig,
+        settings,
+        label: str,
+        campaign: Optional[Campaign] = None,
+        trip_on_errors: bool = False,
+    ):
+        self.config = config
+        self.settings = settings
+        self.label = label
+        self.campaign = campaign
+        # Whether 3 consecutive exceptions (not just AI generation
+        # failures) trip the AI circuit breaker.
+        self.trip_on_errors = trip_on_errors
+        self.consecutive_failures = 0
+        self.stopped = False
+
+
+def _send_lane(config: SalesEngineConfig, prospect: Outreach) -> tuple:
+    """
+    Pacing lane for a send: the tenant plus the mailbox the round-robin in
+    outreach_sending._choose_sender_profile starts from for this prospect.
+    """
+    mailboxes = get_active_sender_mailboxes(config)
+    if len(mailboxes) <= 1:
+        return (config.tenant_id, None)
+    next_step = (prospect.outreach_sequence_step or 0) + 1
+    seed = uuid.UUID(str(prospect.id)).int + next_step
+    return (config.tenant_id, mailboxes[seed % len(mailboxes)]["from_email"])
 
-        settings = get_settings()
-        for config in configs:
-            tenant_id = getattr(config, "tenant_id", None)
-            if not tenant_id:
-                continue
-            if getattr(config, "sequencer_paused", False):
-                logger.debug("Outreach sequencer paused for tenant=%s", str(tenant_id)[:8])
-                continue
-            if not is_within_send_window(config):
-                logger.info(
-                    "Outside send window, deferring outreach (tenant=%s)",
-                    str(tenant_id)[:8],
-                )
-                continue
-            if not config.company_address:
-                logger.warning(
-                    "Company address not configured for tenant=%s",
-                    str(tenant_id)[:8],
-                )
+
+class _SendScheduler:
+    """
+    Timed send slots for one sequencer cycle.
+
+    Slots on the same lane are spaced by SEND_JITTER_SECONDS, matching the
+    old sleep-between-sends pacing per sender. All slots share one heap
+    ordered by due time, so lanes interleave instead of waiting on each
+    other, and up to MAX_CONCURRENT_SENDS sends are in flight at once.
+    """
+
+    def __init__(self):
+        self._heap: list = []
+        self._seq = itertools.count()
+        self._lane_next_due: dict = {}
+        self.halted = False
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def add(self, batch: _SendBatch, prospect: Outreach, template_id: Optional[str] = None) -> None:
+        """Book the next free slot on the prospect's lane."""
+        now = asyncio.get_running_loop().time()
+        lane = _send_lane(batch.config, prospect)
+        due = max(self._lane_next_due.get(lane, now), now)
+        self._lane_next_due[lane] = due + random.uniform(*SEND_JITTER_SECONDS)
+        heapq.heappush(self._heap, (due, next(self._seq), batch, prospect.id, template_id))
+
+    async def run(self) -> None:
+        """Dispatch every slot at its due time, then wait for in-flight sends."""
+        loop = asyncio.get_running_loop()
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_SENDS)
+        tasks = []
+        while self._heap and not self.halted:
+            due, _, batch, prospect_id, template_id = heapq.heappop(self._heap)
+            if batch.stopped:
                 continue
-            primary_sender = get_primary_sender_profile(config)
-            if not primary_sender:
-                logger.warning(
-                    "No active sender mailbox configured for tenant=%s",
-                    str(tenant_id)[:8],
+            delay = due - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            tasks.append(asyncio.create_task(
+                self._dispatch(semaphore, batch, prospect_id, template_id)
+            ))
+        if tasks:
+            await asyncio.gather(*tasks)
+
+    async def _dispatch(self, semaphore, batch: _SendBatch, prospect_id, template_id) -> None:
+        async with semaphore:
+            if batch.stopped or self.halted:
+                return
+            try:
+                async with async_session_factory() as db:
+                    # Another sequencer may have claimed it since planning
+                    prospect = await db.get(
+                        Outreach, prospect_id, with_for_update={"skip_locked": True},
+                    )
+                    if prospect is None:
+                        return
+                    prev_failures = prospect.generation_failures or 0
+                    if batch.campaign is not None:
+                        await send_sequence_email(
+                            db, batch.config, batch.settings, prospect,
+                            template_id=template_id, campaign=batch.campaign,
+                        )
+                    else:
+                        await send_sequence_email(db, batch.config, batch.settings, prospect)
+                    # Commit each send immediately so event webhooks can
+                    # correlate sendgrid_message_id records in near real-time.
+                    await db.commit()
+                    generation_failed = (prospect.generation_failures or 0) > prev_failures
+            except Exception as e:
+                logger.error(
+                    "%s: failed to send to %s: %s",
+                    batch.label, str(prospect_id)[:8], str(e),
                 )
-                continue
+                await self._record_failure(batch, trip=batch.trip_on_errors)
+                return
+
+            if generation_failed:
+                await self._record_failure(batch, trip=True)
+            else:
+                batch.consecutive_failures = 0
+
+    async def _record_failure(self, batch: _SendBatch, trip: bool) -> None:
+        batch.consecutive_failures += 1
+        if batch.consecutive_failures < 3 or batch.stopped:
+            return
+        batch.stopped = True
+        if trip:
+            # The AI breaker is global, so stop every tenant's remaining sends
+            self.halted = True
+            await _trip_ai_circuit_breaker()
+        else:
+            logger.warning(
+                "Circuit breaker: %d consecutive exceptions. Stopping %s.",
+                batch.consecutive_failures, batch.label,
+            )
+
+
+def _tenant_ready_to_send(config: SalesEngineConfig) -> bool:
+    """Per-tenant gates checked before planning any sends."""
+    tenant_id = getattr(config, "tenant_id", None)
+    if not tenant_id:
+        return False
+    if getattr(config, "sequencer_paused", False):
+        logger.debug("Outreach sequencer paused for tenant=%s", str(tenant_id)[:8])
+        return False
+    if not is_within_send_window(config):
+        logger.info(
+            "Outside send window, deferring outreach (tenant=%s)",
+            str(tenant_id)[:8],
+        )
+        return False
+    if not config.company_address:
+        logger.warning(
+            "Company address not configured for tenant=%s",
+            str(tenant_id)[:8],
+        )
+        return False
+    if not get_primary_sender_profile(config):
+        logger.warning(
+            "No active sender mailbox configured for tenant=%s",
+            str(tenant_id)[:8],
+        )
+        return False
+    return True
+
 
+async def _plan_tenant(
+    semaphore: asyncio.Semaphore,
+    scheduler: _SendScheduler,
+    config: SalesEngineConfig,
+    settings,
+    throttle_level: str,
+) -> None:
+    """Select one tenant's sends in its own session and book them on the schedule."""
+    tenant_id = config.tenant_id
+    plan: list = []
+    async with semaphore:
+        async with async_session_factory() as db:
             try:
                 await _sequence_cycle_for_tenant(
                     db,
                     config,
                     settings,
                     throttle_level,
-                    primary_sender["from_email"],
+                    get_primary_sender_profile(config)["from_email"],
+                    plan,
                 )
                 await db.commit()
             except Exception as tenant_err:
@@ -708,6 +859,44 @@ async def sequence_cycle():
                     str(tenant_id)[:8],
                     str(tenant_err),
                 )
+                return
+
+    for batch, prospect, template_id in plan:
+        scheduler.add(batch, prospect, template_id)
+
+
+async def sequence_cycle():
+    """
+    Execute one full outreach sequence cycle. Respects business hours gating.
+    Two-pass per tenant: (1) active campaigns, (2) unbound prospects.
+    Tenants are planned concurrently, then all sends run from one schedule.
+    """
+    async with async_session_factory() as db:
+        configs = await get_active_sales_configs(db)
+    if not configs:
+        return
+
+    # Email reputation circuit breaker - pause if reputation is critical
+    email_healthy, throttle_level = await _check_email_health()
+    if not email_healthy:
+        logger.warning("Email sending paused due to poor reputation - skipping cycle")
+        return
+
+    settings = get_settings()
+    scheduler = _SendScheduler()
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_TENANT_PLANS)
+    ready = [config for config in configs if _tenant_ready_to_send(config)]
+    await asyncio.gather(*(
+        _plan_tenant(semaphore, scheduler, config, settings, throttle_level)
+        for config in ready
+    ))
+
+    if len(scheduler):
+        logger.info(
+            "Outreach cycle: %d sends scheduled across %d tenants",
+            len(scheduler), len(ready),
+        )
+    await scheduler.run()
 
 
 async def _auto_assign_unbound_to_campaigns(
@@ -786,8 +975,12 @@ async def _sequence_cycle_for_tenant(
     settings,
     throttle_level: str,
     primary_from_email: str,
+    plan: list,
 ) -> None:
-    """Run one sequencer cycle for a single tenant config."""
+    """
+    Plan one sequencer cycle for a single tenant config.
+    Appends (batch, prospect, template_id) sends to `plan`; nothing is sent here.
+    """
     tenant_id = config.tenant_id
     if not tenant_id:
         return
@@ -824,7 +1017,7 @@ async def _sequence_cycle_for_tenant(
     for campaign in active_campaigns:
         try:
             await _process_campaign_prospects(
-                db, config, settings, campaign, today_start
+                db, config, settings, campaign, today_start, plan,
             )
         except Exception as e:
             logger.error(
@@ -961,49 +1154,16 @@ async def _sequence_cycle_for_tenant(
             str(tenant_id)[:8],
         )
 
-    consecutive_failures = 0
-    for i, prospect in enumerate(all_prospects):
-        try:
-            deferred = await _check_smart_timing(prospect, config)
-            if deferred:
-                logger.debug(
-                    "Prospect %s deferred to optimal send time",
-                    str(prospect.id)[:8],
-                )
-                continue
-
-            prev_failures = prospect.generation_failures or 0
-            await send_sequence_email(db, config, settings, prospect)
-            await db.flush()
-            # Commit each send immediately so webhooks can resolve records
-            # without waiting for end-of-tenant batch commit.
-            await db.commit()
-
-            new_failures = prospect.generation_failures or 0
-            if new_failures > prev_failures:
-                consecutive_failures += 1
-            else:
-                consecutive_failures = 0
-
-            if consecutive_failures >= 3:
-                await _trip_ai_circuit_breaker()
-                break
-        except Exception as e:
-            logger.error(
-                "Failed to send outreach to %s: %s",
-                str(prospect.id)[:8], str(e),
+    batch = _SendBatch(config, settings, f"Tenant {str(tenant_id)[:8]} unbound")
+    for prospect in all_prospects:
+        deferred = await _check_smart_timing(prospect, config)
+        if deferred:
+            logger.debug(
+                "Prospect %s deferred to optimal send time",
+                str(prospect.id)[:8],
             )
-            consecutive_failures += 1
-            if consecutive_failures >= 3:
-                logger.warning(
-                    "Circuit breaker: %d consecutive exceptions. Stopping batch.",
-                    consecutive_failures,
-                )
-                break
-
-        if i < len(all_prospects) - 1:
-            jitter = random.uniform(60, 120)
-            await asyncio.sleep(jitter)
+            continue
+        plan.append((batch, prospect, None))
 
 
 async def _process_campaign_prospects(
@@ -1012,9 +1172,10 @@ async def _process_campaign_prospects(
     settings,
     campaign: Campaign,
     today_start: datetime,
+    plan: list,
 ) -> None:
     """
-    Process prospects bound to a specific campaign.
+    Plan sends for prospects bound to a specific campaign.
     Uses campaign's daily_limit and sequence_steps for timing/templates.
     """
     steps = campaign.sequence_steps or []
@@ -1149,42 +1310,12 @@ async def _process_campaign_prospects(
         str(campaign.id)[:8], len(all_prospects),
     )
 
-    consecutive_failures = 0
-    for i, (prospect, template_id) in enumerate(all_prospects):
-        try:
-            deferred = await _check_smart_timing(prospect, config)
-            if deferred:
-                continue
-
-            prev_failures = prospect.generation_failures or 0
-            await send_sequence_email(
-                db, config, settings, prospect,
-                template_id=template_id, campaign=campaign,
-            )
-            await db.flush()
-            # Commit each send immediately so event webhooks can correlate
-            # sendgrid_message_id records in near real-time.
-            await db.commit()
-
-            new_failures = prospect.generation_failures or 0
-            if new_failures > prev_failures:
-                consecutive_failures += 1
-            else:
-                consecutive_failures = 0
-
-            if consecutive_failures >= 3:
-                await _trip_ai_circuit_breaker()
-                break
-        except Exception as e:
-            logger.error(
-                "Campaign %s: failed to send to %s: %s",
-                str(campaign.id)[:8], str(prospect.id)[:8], str(e),
-            )
-            consecutive_failures += 1
-            if consecutive_failures >= 3:
-                await _trip_ai_circuit_breaker()
-                break
-
-        if i < len(all_prospects) - 1:
-            jitter = random.uniform(60, 120)
-            await asyncio.sleep(jitter)
+    batch = _SendBatch(
+        config, settings, f"Campaign {str(campaign.id)[:8]}",
+        campaign=campaign, trip_on_errors=True,
+    )
+    for prospect, template_id in all_prospects:
+        deferred = await _check_smart_timing(prospect, config)
+        if deferred:
+            continue
+        plan.append((batch, prospect, template_id))
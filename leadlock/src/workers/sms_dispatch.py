@@ -1,16 +1,37 @@
 """
 SMS dispatch worker — merged from followup_scheduler + booking_reminder.
-Runs every 60 seconds. Shared compliance pipeline for both followup and reminder sends.
+Shared compliance pipeline for both followup and reminder sends.
+
+Wakes on the sms_dispatch due index (see services/due_index.py): new
+followup tasks, bookings and deferrals register when they come due, so
+the worker runs as soon as something is due and otherwise idles up to
+IDLE_WAIT_SECONDS. Without Redis it polls every POLL_INTERVAL_SECONDS.
 
 Phase 1: Process due followup tasks (from followup_scheduler)
 Phase 2: Send booking reminders (from booking_reminder)
+
+Followup batches are claimed with a short lease (scheduled_at pushed
+FOLLOWUP_CLAIM_SECONDS ahead and committed), their clients are loaded
+with one IN query, and the tasks then run concurrently: at most
+FOLLOWUP_CONCURRENCY at once and SENDS_PER_NUMBER per sending number.
+Each task re-reads its lead and consent in its own transaction, so the
+compliance check never sees a claim-time copy, and bumps the lead's
+send counters in SQL.
+A number that comes back throttled by deliverability gets no more sends
+this cycle; its remaining tasks are released for the next one.
+
+Sends blocked only by quiet hours are deferred to the lead's next
+permissible send instant rather than skipped: followup tasks move their
+scheduled_at, and day-before reminders record it in reminder_due_at. The
+reminder scan picks a deferred booking up once that instant passes, even
+if it now falls on the appointment day.
 """
 import asyncio
 import logging
 import re
-from datetime import datetime, timezone, date, timedelta
+from datetime import datetime, timezone, date, time, timedelta
 
-from sqlalchemy import select, and_
+from sqlalchemy import select, and_, or_, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.database import async_session_factory
@@ -21,15 +42,31 @@ from src.models.booking import Booking
 from src.models.consent import ConsentRecord
 from src.models.conversation import Conversation
 from src.models.event_log import EventLog
-from src.services.compliance import full_compliance_check, check_content_compliance
+from src.services.compliance import (
+    QUIET_HOURS_RULES,
+    check_content_compliance,
+    full_compliance_check,
+    next_permissible_send,
+)
+from src.services import due_index
 from src.services.sms import send_sms
+from src.services import transcript
 from src.agents.followup import process_followup
 from src.schemas.client_config import ClientConfig
 from src.services.plan_limits import is_cold_followup_enabled
 
 logger = logging.getLogger(__name__)
 
-POLL_INTERVAL_SECONDS = 60
+POLL_INTERVAL_SECONDS = 60  # fixed poll when the due index is unavailable
+IDLE_WAIT_SECONDS = 180  # longest wait with nothing due (safety net)
+DUE_INDEX = "sms_dispatch"
+
+FOLLOWUP_BATCH_SIZE = 50
+REMINDER_BATCH_SIZE = 50
+THROTTLE_BACKOFF_SECONDS = 60  # deliverability throttle window
+FOLLOWUP_CLAIM_SECONDS = 300  # lease on a claimed batch; crashed runs retry after this
+FOLLOWUP_CONCURRENCY = 10  # tasks in flight (each holds a DB session)
+SENDS_PER_NUMBER = 3  # concurrent sends per from_phone
 
 _PHONE_RE = re.compile(r'\+?\d[\d\-.\s]{7,}\d')
 
@@ -55,9 +92,10 @@ async def _heartbeat():
 
 async def run_sms_dispatch():
     """Main loop — process followup tasks, then booking reminders, then same-day reminders."""
-    logger.info("SMS dispatch worker started (poll every %ds)", POLL_INTERVAL_SECONDS)
+    logger.info("SMS dispatch worker started (idle wait %ds)", IDLE_WAIT_SECONDS)
 
     while True:
+        await due_index.consume(DUE_INDEX)
         try:
             # Phase 1: Due followup tasks
             await _process_due_followups()
@@ -74,7 +112,29 @@ async def run_sms_dispatch():
             logger.error("SMS dispatch error: %s", str(e))
 
         await _heartbeat()
-        await asyncio.sleep(POLL_INTERVAL_SECONDS)
+        await due_index.wait(DUE_INDEX, IDLE_WAIT_SECONDS, fallback_seconds=POLL_INTERVAL_SECONDS)
+
+
+async def schedule_followups(tasks: list[FollowupTask]) -> None:
+    """Register committed followup tasks with the due index."""
+    await due_index.schedule(DUE_INDEX, {
+        f"followup:{task.id}": task.scheduled_at for task in tasks
+    })
+
+
+async def schedule_booking_reminders(booking: Booking) -> None:
+    """Register a committed booking's day-before and same-day reminder times."""
+    # Day-before reminders go out from the (server-local) day before
+    day_before = datetime.combine(
+        booking.appointment_date - timedelta(days=1), time.min,
+    ).astimezone(timezone.utc)
+    items = {f"reminder:{booking.id}": day_before}
+    if booking.time_window_start:
+        appointment_at = datetime.combine(
+            booking.appointment_date, booking.time_window_start, tzinfo=timezone.utc,
+        )
+        items[f"same_day:{booking.id}"] = appointment_at - timedelta(hours=2)
+    await due_index.schedule(DUE_INDEX, items)
 
 
 # ---------------------------------------------------------------------------
@@ -112,6 +172,9 @@ async def _send_compliant_sms(
         from_phone=client.twilio_phone,
         messaging_service_sid=client.twilio_messaging_service_sid,
     )
+    if sms_result.get("status") == "throttled":
+        # Never reached the carrier - nothing to record
+        return sms_result
 
     # Record conversation
     db.add(Conversation(
@@ -128,10 +191,19 @@ async def _send_compliant_sms(
         segment_count=sms_result.get("segments", 1),
         sms_cost_usd=sms_result.get("cost_usd", 0.0),
     ))
-
-    # Update lead cost tracking
-    lead.total_messages_sent += 1
-    lead.total_sms_cost_usd += sms_result.get("cost_usd", 0.0)
+    await transcript.append_turn(lead.id, "outbound", message)
+
+    # Update lead cost tracking - counters in SQL so concurrent sends and
+    # conductor replies to the same lead don't overwrite each other
+    await db.execute(
+        update(Lead)
+        .where(Lead.id == lead.id)
+        .values(
+            total_messages_sent=Lead.total_messages_sent + 1,
+            total_sms_cost_usd=Lead.total_sms_cost_usd + sms_result.get("cost_usd", 0.0),
+        )
+        .execution_options(synchronize_session=False)
+    )
     lead.last_outbound_at = datetime.now(timezone.utc)
 
     return sms_result
@@ -141,11 +213,52 @@ async def _send_compliant_sms(
 # Phase 1: Followup tasks (from followup_scheduler)
 # ---------------------------------------------------------------------------
 
-async def _process_due_followups():
-    """Find and process all due followup tasks."""
-    async with async_session_factory() as db:
-        now = datetime.now(timezone.utc)
+class _FollowupContext:
+    """
+    Clients and parsed client configs for a batch of tasks. Leads and
+    consents are not batched: compliance must see them as they are at send
+    time, not as they were at claim time.
+    """
+
+    def __init__(self, clients: dict):
+        self.clients = clients
+        self.configs = {
+            client_id: ClientConfig(**client.config) if client.config else ClientConfig()
+            for client_id, client in clients.items()
+        }
+
+
+async def _load_followup_context(db: AsyncSession, tasks: list[FollowupTask]) -> _FollowupContext:
+    """Load the clients a batch of followup tasks needs with one query."""
+    client_ids = {task.client_id for task in tasks}
+
+    clients = {}
+    if client_ids:
+        result = await db.execute(select(Client).where(Client.id.in_(client_ids)))
+        clients = {client.id: client for client in result.scalars().all()}
 
+    return _FollowupContext(clients)
+
+
+class _NumberLane:
+    """Per-from_phone send slots; closed for the cycle once the number is throttled."""
+
+    def __init__(self):
+        self.semaphore = asyncio.Semaphore(SENDS_PER_NUMBER)
+        self.throttled = False
+
+
+async def _claim_due_followups() -> tuple[list[dict], _FollowupContext | None, datetime]:
+    """
+    Lock up to FOLLOWUP_BATCH_SIZE due tasks with FOR UPDATE SKIP LOCKED and
+    lease them by moving scheduled_at to the claim expiry, then load their
+    context and commit. Returns plain task snapshots, the context and the
+    lease expiry.
+    """
+    now = datetime.now(timezone.utc)
+    claimed_until = now + timedelta(seconds=FOLLOWUP_CLAIM_SECONDS)
+
+    async with async_session_factory() as db:
         result = await db.execute(
             select(FollowupTask)
             .where(
@@ -155,36 +268,147 @@ async def _process_due_followups():
                 )
             )
             .order_by(FollowupTask.scheduled_at)
-            .limit(50)
+            .limit(FOLLOWUP_BATCH_SIZE)
             .with_for_update(skip_locked=True)
         )
         tasks = result.scalars().all()
 
         if not tasks:
-            return
-
-        logger.info("Processing %d due followup tasks", len(tasks))
+            return [], None, claimed_until
 
+        context = await _load_followup_context(db, tasks)
+        snapshots = []
         for task in tasks:
-            try:
-                await _execute_followup_task(db, task)
-            except Exception as e:
-                logger.error(
-                    "Failed to execute followup task %s: %s",
-                    str(task.id)[:8], str(e),
+            snapshots.append({
+                "id": task.id,
+                "lead_id": task.lead_id,
+                "client_id": task.client_id,
+                "scheduled_at": task.scheduled_at,
+            })
+            task.scheduled_at = claimed_until
+        await db.commit()
+
+    return snapshots, context, claimed_until
+
+
+async def _process_due_followups():
+    """Find and process all due followup tasks."""
+    snapshots, context, claimed_until = await _claim_due_followups()
+    if not snapshots:
+        return
+
+    logger.info("Processing %d due followup tasks", len(snapshots))
+    if len(snapshots) >= FOLLOWUP_BATCH_SIZE:
+        # More may be waiting; come straight back
+        await due_index.schedule(DUE_INDEX, {"followups:backlog": None})
+
+    # Tasks for the same lead run in order; different leads run concurrently
+    chains: dict = {}
+    for snapshot in snapshots:
+        chains.setdefault(snapshot["lead_id"], []).append(snapshot)
+
+    lanes: dict[str, _NumberLane] = {}
+    slots = asyncio.Semaphore(FOLLOWUP_CONCURRENCY)
+    released: list = []
+
+    async def _run_chain(chain: list[dict]):
+        for snapshot in chain:
+            client = context.clients.get(snapshot["client_id"])
+            lane = lanes.setdefault((client.twilio_phone or "") if client else "", _NumberLane())
+            async with lane.semaphore, slots:
+                if lane.throttled:
+                    released.append(snapshot["id"])
+                    continue
+                try:
+                    outcome = await _run_followup_task(snapshot, context, claimed_until)
+                except Exception as e:
+                    # Lease expiry hands the task back to a later cycle
+                    logger.error(
+                        "Failed to record followup task %s: %s",
+                        str(snapshot["id"])[:8], _sanitize_error(str(e)),
+                    )
+                    continue
+                if outcome == "throttled":
+                    lane.throttled = True
+
+    await asyncio.gather(*(_run_chain(chain) for chain in chains.values()))
+
+    if released:
+        # Throttled numbers: hand the rest back once the throttle window passes
+        retry_at = datetime.now(timezone.utc) + timedelta(seconds=THROTTLE_BACKOFF_SECONDS)
+        async with async_session_factory() as db:
+            await db.execute(
+                update(FollowupTask)
+                .where(
+                    and_(
+                        FollowupTask.id.in_(released),
+                        FollowupTask.status == "pending",
+                    )
                 )
-                task.attempt_count += 1
-                task.last_error = _sanitize_error(str(e))
-                if task.attempt_count >= task.max_attempts:
-                    task.status = "failed"
+                .values(scheduled_at=retry_at)
+            )
+            await db.commit()
+        await due_index.schedule(DUE_INDEX, {f"followup:{task_id}": retry_at for task_id in released})
+        logger.info("Released %d followup tasks from throttled numbers", len(released))
+
+
+async def _run_followup_task(snapshot: dict, context: _FollowupContext, claimed_until: datetime):
+    """Execute one claimed task in its own session and commit its outcome."""
+    outcome = None
+    async with async_session_factory() as db:
+        task = (await db.execute(
+            select(FollowupTask).where(FollowupTask.id == snapshot["id"]).with_for_update()
+        )).scalar_one_or_none()
+
+        if task is None or task.status != "pending" or task.scheduled_at != claimed_until:
+            logger.warning(
+                "Followup task %s changed after claim, skipping", str(snapshot["id"])[:8],
+            )
+            return None
+
+        # Un-claim: a task that stays pending is due again at its original time
+        task.scheduled_at = snapshot["scheduled_at"]
+
+        try:
+            outcome = await _execute_followup_task(db, task, context)
+        except Exception as e:
+            logger.error(
+                "Failed to execute followup task %s: %s",
+                str(task.id)[:8], str(e),
+            )
+            task.attempt_count += 1
+            task.last_error = _sanitize_error(str(e))
+            if task.attempt_count >= task.max_attempts:
+                task.status = "failed"
+
+        if outcome == "throttled":
+            task.scheduled_at = datetime.now(timezone.utc) + timedelta(seconds=THROTTLE_BACKOFF_SECONDS)
 
         await db.commit()
 
+    # Deferred (quiet hours) or backed off: wake up again at the new time
+    if task.status == "pending" and task.scheduled_at != snapshot["scheduled_at"]:
+        await schedule_followups([task])
+    return outcome
+
 
-async def _execute_followup_task(db: AsyncSession, task: FollowupTask):
-    """Execute a single followup task with full compliance check."""
-    lead = await db.get(Lead, task.lead_id)
-    client = await db.get(Client, task.client_id)
+async def _execute_followup_task(
+    db: AsyncSession,
+    task: FollowupTask,
+    context: _FollowupContext | None = None,
+):
+    """
+    Execute a single followup task with full compliance check.
+    Uses the batch's preloaded clients when given. Returns "throttled" if
+    the sending number is throttled (the task stays pending), else None.
+    """
+    # Current lead row, not a cached copy: an opt-out or state change may
+    # have landed since the task was claimed
+    lead = await db.get(Lead, task.lead_id, populate_existing=True)
+    if context is not None:
+        client = context.clients.get(task.client_id)
+    else:
+        client = await db.get(Client, task.client_id)
 
     if not lead or not client:
         task.status = "skipped"
@@ -219,12 +443,15 @@ async def _execute_followup_task(db: AsyncSession, task: FollowupTask):
         task.skip_reason = "Lead re-engaged"
         return
 
-    config = ClientConfig(**client.config) if client.config else ClientConfig()
+    if context is not None:
+        config = context.configs[client.id]
+    else:
+        config = ClientConfig(**client.config) if client.config else ClientConfig()
 
     # Check consent
     consent = None
     if lead.consent_id:
-        consent = await db.get(ConsentRecord, lead.consent_id)
+        consent = await db.get(ConsentRecord, lead.consent_id, populate_existing=True)
 
     compliance = full_compliance_check(
         has_consent=consent is not None,
@@ -239,6 +466,14 @@ async def _execute_followup_task(db: AsyncSession, task: FollowupTask):
         business_name=client.business_name,
     )
 
+    if not compliance and compliance.rule in QUIET_HOURS_RULES:
+        task.scheduled_at = next_permissible_send(lead.state_code)
+        logger.info(
+            "Followup deferred for lead %s until %s: %s",
+            str(lead.id)[:8], task.scheduled_at.isoformat(), compliance.rule,
+        )
+        return
+
     if not compliance:
         task.status = "skipped"
         task.skip_reason = compliance.reason
@@ -278,6 +513,9 @@ async def _execute_followup_task(db: AsyncSession, task: FollowupTask):
         task.status = "skipped"
         task.skip_reason = "Content compliance failed"
         return
+    if sms_result.get("status") == "throttled":
+        logger.info("Followup for lead %s throttled, retrying next cycle", str(lead.id)[:8])
+        return "throttled"
 
     # Update task
     task.status = "sent"
@@ -285,7 +523,12 @@ async def _execute_followup_task(db: AsyncSession, task: FollowupTask):
     task.message_content = response.message
 
     if task.task_type == "cold_nurture":
-        lead.cold_outreach_count += 1
+        await db.execute(
+            update(Lead)
+            .where(Lead.id == lead.id)
+            .values(cold_outreach_count=Lead.cold_outreach_count + 1)
+            .execution_options(synchronize_session=False)
+        )
 
     db.add(EventLog(
         lead_id=lead.id,
@@ -306,20 +549,29 @@ async def _execute_followup_task(db: AsyncSession, task: FollowupTask):
 # ---------------------------------------------------------------------------
 
 async def _send_due_reminders():
-    """Find and send reminders for tomorrow's bookings."""
-    tomorrow = date.today() + timedelta(days=1)
+    """
+    Find and send reminders for tomorrow's bookings, plus any deferred by
+    quiet hours whose reminder_due_at has passed (possibly now the
+    appointment day).
+    """
+    today = date.today()
+    tomorrow = today + timedelta(days=1)
+    now = datetime.now(timezone.utc)
+
+    filters = [
+        Booking.status == "confirmed",
+        Booking.reminder_sent == False,  # noqa: E712
+        or_(
+            and_(Booking.appointment_date == tomorrow, Booking.reminder_due_at.is_(None)),
+            and_(Booking.appointment_date >= today, Booking.reminder_due_at <= now),
+        ),
+    ]
 
     async with async_session_factory() as db:
         result = await db.execute(
             select(Booking)
-            .where(
-                and_(
-                    Booking.appointment_date == tomorrow,
-                    Booking.status == "confirmed",
-                    Booking.reminder_sent == False,  # noqa: E712
-                )
-            )
-            .limit(50)
+            .where(and_(*filters))
+            .limit(REMINDER_BATCH_SIZE)
             .with_for_update(skip_locked=True)
         )
         bookings = result.scalars().all()
@@ -344,6 +596,8 @@ async def _send_due_reminders():
 
         await db.commit()
 
+    if sent_count >= REMINDER_BATCH_SIZE:
+        await due_index.schedule(DUE_INDEX, {"reminders:backlog": None})
     return sent_count
 
 
@@ -379,6 +633,10 @@ async def _send_single_reminder(db: AsyncSession, booking: Booking) -> bool:
     )
 
     if not compliance:
+        if compliance.rule in QUIET_HOURS_RULES:
+            send_at = next_permissible_send(lead.state_code)
+            booking.reminder_due_at = send_at
+            await due_index.schedule(DUE_INDEX, {f"reminder:{booking.id}": send_at})
         logger.info(
             "Reminder blocked for booking %s: %s",
             str(booking.id)[:8], compliance.reason,
@@ -406,7 +664,7 @@ async def _send_single_reminder(db: AsyncSession, booking: Booking) -> bool:
 
     # Send via shared compliance helper
     sms_result = await _send_compliant_sms(db, lead, client, response.message)
-    if sms_result is None:
+    if sms_result is None or sms_result.get("status") == "throttled":
         return False
 
     # Mark reminder as sent
@@ -516,7 +774,7 @@ async def _send_single_same_day_reminder(db: AsyncSession, booking: Booking) ->
     )
 
     sms_result = await _send_compliant_sms(db, lead, client, response.message)
-    if sms_result is None:
+    if sms_result is None or sms_result.get("status") == "throttled":
         return False
 
     booking.same_day_reminder_sent = True
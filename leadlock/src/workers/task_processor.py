@@ -1,15 +1,35 @@
 """
-Task processor worker - polls the task_queue table and dispatches tasks.
-Handles retries with exponential backoff.
+Task processor worker - concurrent, lease-based executor for the task_queue table.
+
+Claims batches of due tasks with FOR UPDATE SKIP LOCKED and stamps each
+claimed row with a lease (worker_id + lease_expires_at). Handlers run
+concurrently, bounded by a global cap and a per-task_type cap, and each
+task's outcome is committed in its own short transaction. Any number of
+processes or containers can drain the queue at once; rows whose lease
+expires (crashed worker) are reclaimed automatically.
+
+Tasks are scheduled in lanes (express / normal / bulk, see
+task_dispatch.TASK_LANES). Each lane reserves a share of the worker cap, and
+each claim batch is split across lanes by smooth weighted round-robin,
+so express work gets bounded latency however deep the bulk backlog is.
+Per-lane queue depth and wait time are published to Redis as gauges.
+
+About once an hour the loop also starts task retention in a background
+task, which moves old terminal rows to the archive so the hot table stays
+small without holding up claiming.
 
 Uses BRPOP on a Redis notification key for near-instant wake on new tasks,
 with a 30-second timeout falling back to DB poll as safety net.
 """
 import asyncio
+import json
 import logging
+import os
+import socket
+import time
+import uuid
 from datetime import datetime, timedelta, timezone
-from sqlalchemy import select, and_
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, update, func, and_, or_
 
 from src.database import async_session_factory
 from src.models.task_queue import TaskQueue
@@ -17,9 +37,49 @@ from src.models.task_queue import TaskQueue
 logger = logging.getLogger(__name__)
 
 POLL_INTERVAL_SECONDS = 30  # Fallback DB poll interval
-MAX_TASKS_PER_CYCLE = 10
+MAX_TASKS_PER_CYCLE = 10  # Max rows claimed per claim query
 BRPOP_TIMEOUT = 30  # seconds to wait for Redis notification
-from src.services.task_dispatch import TASK_NOTIFY_KEY  # noqa: F401 — single source of truth
+BUSY_BRPOP_TIMEOUT = 2  # shorter wait while handlers are in flight, so freed slots refill fast
+from src.services.task_dispatch import TASK_NOTIFY_KEY, LANES  # noqa: F401 — single source of truth
+
+# Concurrency limits (per process)
+MAX_CONCURRENT_TASKS = 16
+DEFAULT_TYPE_CONCURRENCY = 4
+TASK_TYPE_CONCURRENCY = {
+    "sms_retry": 8,
+    "send_sms_followup": 8,
+    "record_signal": 8,
+    "classify_reply": 4,
+    "enrich_email": 4,
+    "enrich_prospect": 4,
+    "send_sequence_email": 4,
+    "send_winback_email": 2,
+    "generate_ab_variants": 1,
+    "generate_content": 1,
+}
+
+# Lanes: reserved share of MAX_CONCURRENT_TASKS (see _lane_budgets) and fair-share weights
+LANE_BUDGET_SHARES = {"express": 0.375, "normal": 0.375, "bulk": 0.25}
+LANE_WEIGHTS = {"express": 4, "normal": 2, "bulk": 1}
+LANE_GAUGE_KEY = "leadlock:task_queue:lanes"
+LANE_GAUGE_INTERVAL_SECONDS = 30
+LANE_GAUGE_TTL_SECONDS = 120
+WAIT_EWMA_ALPHA = 0.2
+
+# Leases: a claimed row is invisible to other workers until its lease expires
+LEASE_SECONDS = 300
+LEASE_RENEW_INTERVAL_SECONDS = 60
+RECLAIM_INTERVAL_SECONDS = 60
+RECLAIM_BATCH_SIZE = 100
+RETENTION_INTERVAL_SECONDS = 3600
+
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}"[:64]
+
+# In-flight handlers owned by this process: task_id -> (task_type, lane, asyncio.Task)
+_in_flight: dict[uuid.UUID, tuple[str, str, asyncio.Task]] = {}
+
+# Smoothed claim wait (scheduled_at -> claimed) per lane, in milliseconds
+_lane_wait_ms: dict[str, float] = {}
 
 
 def _strip_nul_chars(value):
@@ -50,99 +110,514 @@ async def _heartbeat():
 
 
 async def run_task_processor():
-    """Main loop - wait for notification or poll every 30s."""
-    logger.info("Task processor started (adaptive polling, BRPOP %ds timeout)", BRPOP_TIMEOUT)
-
-    while True:
-        try:
-            await process_cycle()
-        except Exception as e:
-            logger.error("Task processor cycle error: %s", str(e))
-
-        await _heartbeat()
-
-        # Wait for either a Redis notification or timeout
-        try:
-            from src.utils.dedup import get_redis
-            redis = await get_redis()
-            # BRPOP blocks until a notification arrives or timeout expires
-            result = await redis.brpop(TASK_NOTIFY_KEY, timeout=BRPOP_TIMEOUT)
-            if result:
-                # Drain any additional notifications to avoid stacking
-                while await redis.rpop(TASK_NOTIFY_KEY):
-                    pass
-        except Exception as e:
-            # If Redis is unavailable, fall back to sleep
-            logger.debug("Redis BRPOP unavailable, falling back to sleep: %s", str(e))
-            await asyncio.sleep(POLL_INTERVAL_SECONDS)
-
-
-async def process_cycle():
-    """Find and execute pending tasks that are due."""
+    """Main loop - claim and launch tasks, then wait for notification or poll every 30s."""
+    logger.info(
+        "Task processor started (worker=%s, max_concurrent=%d, lease=%ds, BRPOP %ds timeout)",
+        WORKER_ID, MAX_CONCURRENT_TASKS, LEASE_SECONDS, BRPOP_TIMEOUT,
+    )
+    last_reclaim = 0.0
+    last_gauge = 0.0
+    last_retention = time.monotonic()
+    last_renew = time.monotonic()
+    retention: asyncio.Task | None = None
+
+    try:
+        while True:
+            try:
+                now_mono = time.monotonic()
+                if now_mono - last_reclaim >= RECLAIM_INTERVAL_SECONDS:
+                    last_reclaim = now_mono
+                    await reclaim_expired_leases()
+                if _in_flight and now_mono - last_renew >= LEASE_RENEW_INTERVAL_SECONDS:
+                    last_renew = now_mono
+                    await _renew_leases()
+                await process_cycle()
+                if now_mono - last_gauge >= LANE_GAUGE_INTERVAL_SECONDS:
+                    last_gauge = now_mono
+                    await publish_lane_gauges()
+                if (
+                    now_mono - last_retention >= RETENTION_INTERVAL_SECONDS
+                    and (retention is None or retention.done())
+                ):
+                    last_retention = now_mono
+                    retention = asyncio.create_task(_run_retention())
+            except Exception as e:
+                logger.error("Task processor cycle error: %s", str(e))
+
+            await _heartbeat()
+
+            # Wait for either a Redis notification or timeout
+            try:
+                from src.utils.dedup import get_redis
+                redis = await get_redis()
+                timeout = BUSY_BRPOP_TIMEOUT if _in_flight else BRPOP_TIMEOUT
+                # BRPOP blocks until a notification arrives or timeout expires
+                result = await redis.brpop(TASK_NOTIFY_KEY, timeout=timeout)
+                if result:
+                    # Drain any additional notifications to avoid stacking
+                    while await redis.rpop(TASK_NOTIFY_KEY):
+                        pass
+            except Exception as e:
+                # If Redis is unavailable, fall back to sleep
+                logger.debug("Redis BRPOP unavailable, falling back to sleep: %s", str(e))
+                await asyncio.sleep(BUSY_BRPOP_TIMEOUT if _in_flight else POLL_INTERVAL_SECONDS)
+    finally:
+        if retention is not None and not retention.done():
+            retention.cancel()
+            await asyncio.gather(retention, return_exceptions=True)
+        await _release_in_flight()
+        await _remove_lane_gauges()
+
+
+async def _run_retention() -> None:
+    """Archive old terminal tasks; runs beside the claim loop so a long purge never stalls it."""
+    try:
+        from src.services.task_retention import run_retention
+        await run_retention()
+    except Exception as e:
+        logger.error("Task retention error: %s", str(e))
+
+
+def _free_type_slots() -> dict[str, int]:
+    """Remaining per-type capacity for task types that currently have handlers in flight."""
+    running: dict[str, int] = {}
+    for task_type, _, _ in _in_flight.values():
+        running[task_type] = running.get(task_type, 0) + 1
+    return {
+        task_type: TASK_TYPE_CONCURRENCY.get(task_type, DEFAULT_TYPE_CONCURRENCY) - count
+        for task_type, count in running.items()
+    }
+
+
+def _lane_budgets() -> dict[str, int]:
+    """
+    Worker budget per lane, scaled to MAX_CONCURRENT_TASKS (read at call
+    time, since the standalone executor overrides it). Rounding leftovers
+    go to the highest-weight lanes; every lane gets at least one slot.
+    """
+    budgets = {
+        lane: max(1, int(MAX_CONCURRENT_TASKS * LANE_BUDGET_SHARES.get(lane, 0)))
+        for lane in LANES
+    }
+    for lane in sorted(LANES, key=lambda lane: -LANE_WEIGHTS.get(lane, 1)):
+        if sum(budgets.values()) >= MAX_CONCURRENT_TASKS:
+            break
+        budgets[lane] += 1
+    return budgets
+
+
+def _free_lane_slots() -> dict[str, int]:
+    """Remaining worker budget per lane."""
+    running = {lane: 0 for lane in LANES}
+    for _, lane, _ in _in_flight.values():
+        running[lane] = running.get(lane, 0) + 1
+    budgets = _lane_budgets()
+    return {lane: max(0, budgets[lane] - running[lane]) for lane in LANES}
+
+
+def _allocate_lane_shares(budget: int, lane_free: dict[str, int]) -> dict[str, int]:
+    """
+    Split a claim budget across lanes with smooth weighted round-robin,
+    never giving a lane more than its free budget.
+    """
+    shares = {lane: 0 for lane in LANES}
+    credit = {lane: 0 for lane in LANES}
+    while budget > 0:
+        eligible = [lane for lane in LANES if shares[lane] < lane_free.get(lane, 0)]
+        if not eligible:
+            break
+        total = sum(LANE_WEIGHTS.get(lane, 1) for lane in eligible)
+        for lane in eligible:
+            credit[lane] += LANE_WEIGHTS.get(lane, 1)
+        pick = max(eligible, key=lambda lane: credit[lane])
+        credit[pick] -= total
+        shares[pick] += 1
+        budget -= 1
+    return shares
+
+
+def _launch(snapshot: dict) -> None:
+    """Start a claimed task's handler and track it until it finishes."""
+    handle = asyncio.create_task(_execute_task(snapshot))
+    _in_flight[snapshot["id"]] = (snapshot["task_type"], snapshot["lane"], handle)
+    handle.add_done_callback(lambda _, task_id=snapshot["id"]: _in_flight.pop(task_id, None))
+
+    previous = _lane_wait_ms.get(snapshot["lane"])
+    wait_ms = snapshot["wait_ms"]
+    _lane_wait_ms[snapshot["lane"]] = (
+        wait_ms if previous is None
+        else previous + WAIT_EWMA_ALPHA * (wait_ms - previous)
+    )
+
+
+async def process_cycle() -> int:
+    """
+    Claim due tasks up to the free concurrency budget and launch their handlers.
+
+    The batch is split across lanes by weight (express first). Shares a
+    lane could not fill are offered to lanes that filled theirs, but only
+    up to each lane's own budget (_lane_budgets): budgets are hard caps and
+    are never lent out. With one lane backlogged and the others empty,
+    the idle lanes' workers stay unused, so express work always finds a
+    free slot. Returns the number of tasks launched.
+    """
+    free_slots = MAX_CONCURRENT_TASKS - len(_in_flight)
+    if free_slots <= 0:
+        return 0
+
+    budget = min(free_slots, MAX_TASKS_PER_CYCLE)
+    shares = _allocate_lane_shares(budget, _free_lane_slots())
+
+    launched = 0
+    unused = 0
+    saturated_lanes = []
+    for lane in LANES:
+        if shares[lane] <= 0:
+            continue
+        claimed = await claim_tasks(shares[lane], _free_type_slots(), lane=lane)
+        for snapshot in claimed:
+            _launch(snapshot)
+        launched += len(claimed)
+        unused += shares[lane] - len(claimed)
+        if len(claimed) == shares[lane]:
+            saturated_lanes.append(lane)
+
+    lane_free = _free_lane_slots()
+    for lane in saturated_lanes:
+        if unused <= 0:
+            break
+        extra = min(unused, lane_free[lane])
+        if extra <= 0:
+            continue
+        claimed = await claim_tasks(extra, _free_type_slots(), lane=lane)
+        for snapshot in claimed:
+            _launch(snapshot)
+        launched += len(claimed)
+        unused -= len(claimed)
+
+    if launched:
+        logger.info("Claimed %d tasks (in flight: %d)", launched, len(_in_flight))
+
+    return launched
+
+
+async def claim_tasks(
+    limit: int,
+    type_slots: dict[str, int] | None = None,
+    lane: str | None = None,
+) -> list[dict]:
+    """
+    Atomically claim up to `limit` due tasks for this worker.
+
+    Rows are locked with FOR UPDATE SKIP LOCKED so concurrent workers never
+    claim the same row, then marked processing with a fresh lease and
+    committed before any handler runs. Task types with no remaining slots
+    in `type_slots` are excluded; any surplus rows of a type that would
+    exceed its slot count are left unclaimed for the next cycle. When
+    `lane` is given, only that lane's rows are considered.
+
+    Returns plain dict snapshots so handlers never hold a DB session.
+    """
+    type_slots = dict(type_slots or {})
+    saturated = [task_type for task_type, free in type_slots.items() if free <= 0]
     now = datetime.now(timezone.utc)
 
     async with async_session_factory() as db:
-        # Fetch pending tasks that are due, ordered by priority (high first)
+        conditions = [
+            TaskQueue.status == "pending",
+            TaskQueue.scheduled_at <= now,
+        ]
+        if lane is not None:
+            conditions.append(TaskQueue.lane == lane)
+        if saturated:
+            conditions.append(TaskQueue.task_type.notin_(saturated))
+
         result = await db.execute(
             select(TaskQueue)
-            .where(
-                and_(
-                    TaskQueue.status == "pending",
-                    TaskQueue.scheduled_at <= now,
-                )
-            )
+            .where(and_(*conditions))
             .order_by(TaskQueue.priority.desc(), TaskQueue.created_at)
-            .limit(MAX_TASKS_PER_CYCLE)
+            .limit(limit * 2)
+            .with_for_update(skip_locked=True)
         )
-        tasks = result.scalars().all()
+        candidates = result.scalars().all()
+
+        claimed = []
+        lease_expires_at = now + timedelta(seconds=LEASE_SECONDS)
+        for task in candidates:
+            if len(claimed) >= limit:
+                break
+            free = type_slots.get(
+                task.task_type,
+                TASK_TYPE_CONCURRENCY.get(task.task_type, DEFAULT_TYPE_CONCURRENCY),
+            )
+            if free <= 0:
+                continue
+            type_slots[task.task_type] = free - 1
+
+            task.status = "processing"
+            task.started_at = now
+            task.worker_id = WORKER_ID
+            task.lease_expires_at = lease_expires_at
+            scheduled_at = task.scheduled_at or now
+            if scheduled_at.tzinfo is None:
+                scheduled_at = scheduled_at.replace(tzinfo=timezone.utc)
+            claimed.append({
+                "id": task.id,
+                "task_type": task.task_type,
+                "lane": task.lane or "normal",
+                "payload": task.payload or {},
+                "wait_ms": max(0, int((now - scheduled_at).total_seconds() * 1000)),
+            })
+
+        if claimed:
+            await db.commit()
 
-        if not tasks:
-            return
+    return claimed
+
+
+async def _execute_task(snapshot: dict) -> None:
+    """Run a claimed task's handler outside any DB session, then record the outcome."""
+    started = time.monotonic()
+    result = None
+    error_msg = None
+    try:
+        result = await _dispatch_task(snapshot["task_type"], snapshot["payload"])
+    except asyncio.CancelledError:
+        raise
+    except Exception as e:
+        error_msg = str(e)
+
+    try:
+        await _finish_task(snapshot["id"], result, error_msg)
+    except Exception as e:
+        # Lease expiry will hand the row back to the queue.
+        logger.error(
+            "Failed to record task outcome: id=%s type=%s error=%s",
+            str(snapshot["id"])[:8], snapshot["task_type"], str(e),
+        )
+        return
+
+    logger.debug(
+        "Task handler finished: id=%s type=%s elapsed=%dms",
+        str(snapshot["id"])[:8], snapshot["task_type"], int((time.monotonic() - started) * 1000),
+    )
 
-        logger.info("Processing %d pending tasks", len(tasks))
 
-        for task in tasks:
-            await _execute_task(db, task)
+async def _finish_task(task_id: uuid.UUID, result: dict | None, error_msg: str | None) -> None:
+    """Commit a task's outcome in its own transaction, if this worker still holds the lease."""
+    async with async_session_factory() as db:
+        task = (await db.execute(
+            select(TaskQueue).where(TaskQueue.id == task_id).with_for_update()
+        )).scalar_one_or_none()
+
+        if task is None or task.status != "processing" or task.worker_id != WORKER_ID:
+            logger.warning(
+                "Lease lost before completion, discarding outcome: id=%s", str(task_id)[:8],
+            )
+            return
 
+        _apply_outcome(task, result, error_msg)
         await db.commit()
 
 
-async def _execute_task(db: AsyncSession, task: TaskQueue) -> None:
-    """Execute a single task and handle success/failure."""
-    task.status = "processing"
-    task.started_at = datetime.now(timezone.utc)
-    await db.flush()
+def _apply_outcome(task: TaskQueue, result: dict | None, error_msg: str | None) -> None:
+    """Mark a task completed, schedule a retry with backoff, or fail it permanently."""
+    task.worker_id = None
+    task.lease_expires_at = None
 
-    try:
-        result = await _dispatch_task(task.task_type, task.payload or {})
+    if error_msg is None:
         task.status = "completed"
         task.completed_at = datetime.now(timezone.utc)
         task.result_data = result
         logger.info("Task completed: id=%s type=%s", str(task.id)[:8], task.task_type)
+        return
+
+    task.retry_count = task.retry_count + 1
+    task.error_message = error_msg
+
+    if task.retry_count >= task.max_retries:
+        task.status = "failed"
+        task.completed_at = datetime.now(timezone.utc)
+        logger.error(
+            "Task failed (max retries): id=%s type=%s error=%s",
+            str(task.id)[:8], task.task_type, error_msg,
+        )
+    else:
+        # Exponential backoff: 30s, 120s, 480s
+        backoff = 30 * (4 ** (task.retry_count - 1))
+        task.status = "pending"
+        task.scheduled_at = datetime.now(timezone.utc) + timedelta(seconds=backoff)
+        logger.warning(
+            "Task retry %d/%d: id=%s type=%s backoff=%ds",
+            task.retry_count, task.max_retries,
+            str(task.id)[:8], task.task_type, backoff,
+        )
+
 
+async def _renew_leases() -> None:
+    """Extend the lease on every row this worker is still executing."""
+    task_ids = list(_in_flight.keys())
+    if not task_ids:
+        return
+    try:
+        async with async_session_factory() as db:
+            await db.execute(
+                update(TaskQueue)
+                .where(
+                    and_(
+                        TaskQueue.id.in_(task_ids),
+                        TaskQueue.worker_id == WORKER_ID,
+                        TaskQueue.status == "processing",
+                    )
+                )
+                .values(lease_expires_at=datetime.now(timezone.utc) + timedelta(seconds=LEASE_SECONDS))
+            )
+            await db.commit()
     except Exception as e:
-        task.retry_count = task.retry_count + 1
-        error_msg = str(e)
+        logger.warning("Lease renewal failed for %d tasks: %s", len(task_ids), str(e))
+
 
-        if task.retry_count >= task.max_retries:
-            task.status = "failed"
-            task.error_message = error_msg
-            task.completed_at = datetime.now(timezone.utc)
-            logger.error(
-                "Task failed (max retries): id=%s type=%s error=%s",
-                str(task.id)[:8], task.task_type, error_msg,
+async def reclaim_expired_leases() -> int:
+    """
+    Return rows whose lease expired (crashed or hung worker) to the queue.
+    Counts as a failed attempt so a task that keeps killing workers
+    eventually fails instead of looping forever.
+    Returns the number of rows reclaimed.
+    """
+    now = datetime.now(timezone.utc)
+    async with async_session_factory() as db:
+        result = await db.execute(
+            select(TaskQueue)
+            .where(
+                and_(
+                    TaskQueue.status == "processing",
+                    or_(
+                        TaskQueue.lease_expires_at < now,
+                        # Rows claimed before leases existed
+                        and_(
+                            TaskQueue.lease_expires_at.is_(None),
+                            TaskQueue.started_at < now - timedelta(seconds=LEASE_SECONDS),
+                        ),
+                    ),
+                )
             )
-        else:
-            # Exponential backoff: 30s, 120s, 480s
-            backoff = 30 * (4 ** (task.retry_count - 1))
-            task.status = "pending"
-            task.scheduled_at = datetime.now(timezone.utc) + timedelta(seconds=backoff)
-            task.error_message = error_msg
+            .limit(RECLAIM_BATCH_SIZE)
+            .with_for_update(skip_locked=True)
+        )
+        expired = result.scalars().all()
+        if not expired:
+            return 0
+
+        for task in expired:
             logger.warning(
-                "Task retry %d/%d: id=%s type=%s backoff=%ds",
-                task.retry_count, task.max_retries,
-                str(task.id)[:8], task.task_type, backoff,
+                "Reclaiming expired lease: id=%s type=%s worker=%s",
+                str(task.id)[:8], task.task_type, task.worker_id,
             )
+            _apply_outcome(task, None, f"lease expired (worker={task.worker_id})")
+            if task.status == "pending":
+                task.scheduled_at = now
+
+        await db.commit()
+        return len(expired)
+
+
+async def get_lane_stats() -> dict[str, dict]:
+    """
+    Per-lane queue depth and wait time.
+
+    depth / oldest_wait_s come from due pending rows (served by the
+    lane dispatch index); in_flight / avg_claim_wait_ms are this process's
+    view of the work it is executing.
+    """
+    now = datetime.now(timezone.utc)
+    async with async_session_factory() as db:
+        rows = await db.execute(
+            select(TaskQueue.lane, func.count(TaskQueue.id), func.min(TaskQueue.scheduled_at))
+            .where(
+                and_(
+                    TaskQueue.status == "pending",
+                    TaskQueue.scheduled_at <= now,
+                )
+            )
+            .group_by(TaskQueue.lane)
+        )
+        pending = {lane: (count, oldest) for lane, count, oldest in rows}
+
+    in_flight = {lane: 0 for lane in LANES}
+    for _, lane, _ in _in_flight.values():
+        in_flight[lane] = in_flight.get(lane, 0) + 1
+
+    budgets = _lane_budgets()
+    stats = {}
+    for lane in LANES:
+        count, oldest = pending.get(lane, (0, None))
+        if oldest is not None and oldest.tzinfo is None:
+            oldest = oldest.replace(tzinfo=timezone.utc)
+        stats[lane] = {
+            "depth": count,
+            "oldest_wait_s": round((now - oldest).total_seconds(), 1) if oldest else 0.0,
+            "in_flight": in_flight.get(lane, 0),
+            "budget": budgets[lane],
+            "avg_claim_wait_ms": int(_lane_wait_ms.get(lane, 0)),
+        }
+    return stats
+
+
+async def publish_lane_gauges() -> None:
+    """Store per-lane gauges in Redis for the fleet dashboard (best-effort)."""
+    try:
+        stats = await get_lane_stats()
+        from src.utils.dedup import get_redis
+        redis = await get_redis()
+        # One field per executor; readers drop fields older than the TTL.
+        await redis.hset(
+            LANE_GAUGE_KEY,
+            WORKER_ID,
+            json.dumps({"updated_at": datetime.now(timezone.utc).isoformat(), "lanes": stats}),
+        )
+        await redis.expire(LANE_GAUGE_KEY, LANE_GAUGE_TTL_SECONDS)
+    except Exception as e:
+        logger.debug("Lane gauge publish failed: %s", str(e))
+
+
+async def _remove_lane_gauges() -> None:
+    """On shutdown, drop this executor's gauge field so the hash does not collect dead workers."""
+    try:
+        from src.utils.dedup import get_redis
+        redis = await get_redis()
+        await redis.hdel(LANE_GAUGE_KEY, WORKER_ID)
+    except Exception as e:
+        logger.debug("Lane gauge removal failed: %s", str(e))
+
+
+async def _release_in_flight() -> None:
+    """On shutdown, cancel running handlers and hand their rows straight back to the queue."""
+    if not _in_flight:
+        return
+
+    task_ids = list(_in_flight.keys())
+    handles = [handle for _, _, handle in _in_flight.values()]
+    for handle in handles:
+        handle.cancel()
+    await asyncio.gather(*handles, return_exceptions=True)
+
+    try:
+        async with async_session_factory() as db:
+            await db.execute(
+                update(TaskQueue)
+                .where(
+                    and_(
+                        TaskQueue.id.in_(task_ids),
+                        TaskQueue.worker_id == WORKER_ID,
+                        TaskQueue.status == "processing",
+                    )
+                )
+                .values(status="pending", worker_id=None, lease_expires_at=None)
+            )
+            await db.commit()
+        logger.info("Released %d in-flight tasks back to the queue", len(task_ids))
+    except Exception as e:
+        logger.warning("Failed to release in-flight tasks (leases will expire): %s", str(e))
 
 
 async def _dispatch_task(task_type: str, payload: dict) -> dict:
@@ -271,14 +746,17 @@ async def _handle_sms_retry(payload: dict) -> dict:
     Safety guards:
     - Checks opt-out status before sending (TCPA compliance)
     - Skips if conversation already has an sms_sid (prevents double-send)
+    - Re-queues for the lead's next permissible send instant during quiet hours
     - Treats throttled status as failure (triggers task retry)
     """
     import uuid
     from sqlalchemy import select, and_
+    from src.services.compliance import check_quiet_hours, next_permissible_send
     from src.services.sms import send_sms
     from src.models.conversation import Conversation
     from src.models.consent import ConsentRecord
     from src.models.event_log import EventLog
+    from src.models.lead import Lead
 
     lead_id = payload.get("lead_id")
     to = payload.get("to")
@@ -323,6 +801,21 @@ async def _handle_sms_retry(payload: dict) -> dict:
                 )
                 return {"status": "skipped", "reason": "already_delivered"}
 
+            # Quiet hours may have started since the original attempt
+            lead = await db.get(Lead, lead_uuid)
+            if lead and not check_quiet_hours(lead.state_code, is_emergency=bool(lead.is_emergency)):
+                from src.services.task_dispatch import enqueue_task
+
+                send_at = next_permissible_send(lead.state_code)
+                delay = (send_at - datetime.now(timezone.utc)).total_seconds()
+                await enqueue_task(
+                    task_type="sms_retry",
+                    payload=payload,
+                    priority=10,
+                    delay_seconds=max(int(delay) + 1, 1),
+                )
+                return {"status": "re-queued", "reason": "quiet hours", "send_at": send_at.isoformat()}
+
     result = await send_sms(
         to=to,
         body=body,
@@ -404,15 +897,20 @@ async def _handle_send_sms_followup(payload: dict) -> dict:
         if prospect.email_unsubscribed:
             return {"status": "skipped", "reason": "unsubscribed"}
 
-        # Still in quiet hours? Re-queue for later
+        # Still in quiet hours? Re-queue for the next permissible instant
         if not is_within_sms_quiet_hours(prospect.state_code):
+            from src.services.compliance import next_permissible_send
+            from src.services.outreach_sms import _get_prospect_timezone
             from src.services.task_dispatch import enqueue_task
 
+            state_code = (prospect.state_code or "").upper() or None
+            send_at = next_permissible_send(state_code, _get_prospect_timezone(state_code).key)
+            delay = (send_at - datetime.now(timezone.utc)).total_seconds()
             await enqueue_task(
                 task_type="send_sms_followup",
                 payload={"outreach_id": outreach_id},
                 priority=7,
-                delay_seconds=3600,
+                delay_seconds=max(int(delay) + 1, 1),
             )
             return {"status": "re-queued", "reason": "still quiet hours"}
 
@@ -17,6 +17,29 @@ def _compile_jsonb_sqlite(type_, compiler, **kw):
     return "JSON"
 
 
+@pytest.fixture(autouse=True)
+def _reset_http_clients():
+    """Drop pooled HTTP clients so a patched httpx.AsyncClient never leaks across tests."""
+    from src.utils import http_client
+    http_client._clients.clear()
+    yield
+    http_client._clients.clear()
+
+
+@pytest.fixture(autouse=True)
+def _reset_crm_caches():
+    """Drop cached CRM adapters and ServiceTitan tokens between tests."""
+    from src.integrations import servicetitan
+    from src.workers import crm_sync
+    servicetitan._shared_tokens.clear()
+    servicetitan._token_locks.clear()
+    crm_sync._crm_adapters.clear()
+    yield
+    servicetitan._shared_tokens.clear()
+    servicetitan._token_locks.clear()
+    crm_sync._crm_adapters.clear()
+
+
 @pytest.fixture
 async def db():
     """In-memory SQLite database for tests."""
@@ -122,3 +145,12 @@ def sample_client_config():
 @pytest.fixture
 def sample_client_id():
     return str(uuid.UUID("11111111-1111-1111-1111-111111111111"))
+
+
+@pytest.fixture(autouse=True)
+def _reset_client_cache():
+    """Clear the in-process client cache so snapshots never leak across tests."""
+    from src.services import client_cache
+    client_cache.evict_local()
+    yield
+    client_cache.evict_local()
@@ -235,46 +235,251 @@ class TestCheckAndDeclareWinner:
 
 
 # ---------------------------------------------------------------------------
-# record_event
+# Redis counters
+# ---------------------------------------------------------------------------
+
+REDIS_PATCH = "src.utils.dedup.get_redis"
+
+
+class _FakeRedis:
+    """Enough of redis.asyncio for the A/B counters: hashes, sets, pipelines."""
+
+    def __init__(self):
+        self.hashes = {}
+        self.sets = {}
+        self.strings = {}
+
+    async def hincrby(self, key, field, n):
+        fields = self.hashes.setdefault(key, {})
+        fields[field] = str(int(fields.get(field, 0)) + n)
+        return int(fields[field])
+
+    async def hgetall(self, key):
+        return dict(self.hashes.get(key, {}))
+
+    async def sadd(self, key, *members):
+        self.sets.setdefault(key, set()).update(members)
+
+    async def srem(self, key, *members):
+        self.sets.get(key, set()).difference_update(members)
+
+    async def smembers(self, key):
+        return set(self.sets.get(key, set()))
+
+    async def set(self, key, value, nx=False, ex=None):
+        if nx and key in self.strings:
+            return False
+        self.strings[key] = value
+        return True
+
+    async def delete(self, key):
+        self.strings.pop(key, None)
+
+    def pipeline(self):
+        redis = self
+        calls = []
+
+        class _Pipe:
+            def __getattr__(self, name):
+                return lambda *args: calls.append((name, args))
+
+            async def execute(self):
+                return [await getattr(redis, name)(*args) for name, args in calls]
+
+        return _Pipe()
+
+
+async def _add_variant(db, **fields):
+    from src.models.ab_test import ABTestExperiment, ABTestVariant
+
+    exp = ABTestExperiment(name="Step 1", status="active", sequence_step=1, min_sample_per_variant=30)
+    db.add(exp)
+    await db.flush()
+    defaults = dict(total_sent=10, total_opened=2, total_replied=0, open_rate=0.2)
+    defaults.update(fields)
+    variant = ABTestVariant(experiment_id=exp.id, variant_label="A", subject_instruction="x", **defaults)
+    db.add(variant)
+    await db.commit()
+    return exp, variant
+
+
+def _session_factory(db):
+    from contextlib import asynccontextmanager
+
+    @asynccontextmanager
+    async def _factory():
+        yield db
+
+    return patch("src.services.ab_testing.async_session_factory", _factory)
+
+
+# ---------------------------------------------------------------------------
+# record_event / record_event_counts
 # ---------------------------------------------------------------------------
 
 class TestRecordEvent:
     @pytest.mark.asyncio
-    async def test_increments_sent_count(self):
+    async def test_increments_redis_counter(self):
+        from src.services.ab_counters import DIRTY_KEY
         from src.services.ab_testing import record_event
 
-        variant = _make_variant(total_sent=5, total_opened=2, open_rate=0.4)
-        mock_db = AsyncMock()
-        mock_db.get = AsyncMock(return_value=variant)
-        mock_db.commit = AsyncMock()
+        redis = _FakeRedis()
+        variant_id = str(uuid.uuid4())
+        with (
+            patch(REDIS_PATCH, new_callable=AsyncMock, return_value=redis),
+            patch("src.services.ab_testing.async_session_factory") as mock_factory,
+        ):
+            await record_event(variant_id, "sent")
+            await record_event(variant_id, "sent")
+            await record_event(variant_id, "opened")
 
-        class _FakeCtx:
-            async def __aenter__(self):
-                return mock_db
-            async def __aexit__(self, *a):
-                pass
+        assert redis.hashes[f"leadlock:ab_counts:{variant_id}"] == {"sent": "2", "opened": "1"}
+        assert redis.sets[DIRTY_KEY] == {variant_id}
+        mock_factory.assert_not_called()
 
-        with patch("src.services.ab_testing.async_session_factory", return_value=_FakeCtx()):
+    @pytest.mark.asyncio
+    async def test_falls_back_to_sql_without_redis(self, db):
+        from src.services.ab_testing import record_event
+
+        _, variant = await _add_variant(db)
+        with (
+            patch(REDIS_PATCH, new_callable=AsyncMock, side_effect=ConnectionError("down")),
+            _session_factory(db),
+        ):
             await record_event(str(variant.id), "sent")
+            await record_event(str(variant.id), "opened")
 
-        assert variant.total_sent == 6
+        await db.refresh(variant)
+        assert (variant.total_sent, variant.total_opened) == (11, 3)
+        assert variant.open_rate == pytest.approx(3 / 11)
 
+
+class TestRecordEventCounts:
     @pytest.mark.asyncio
-    async def test_increments_opened_count(self):
-        from src.services.ab_testing import record_event
+    async def test_applies_counts_in_sql(self, db):
+        from src.services.ab_testing import apply_event_counts
 
-        variant = _make_variant(total_sent=10, total_opened=3, open_rate=0.3)
-        mock_db = AsyncMock()
-        mock_db.get = AsyncMock(return_value=variant)
-        mock_db.commit = AsyncMock()
+        _, variant = await _add_variant(db)
+        with _session_factory(db):
+            await apply_event_counts({str(variant.id): {"opened": 3, "replied": 1, "clicked": 4}})
 
-        class _FakeCtx:
-            async def __aenter__(self):
-                return mock_db
-            async def __aexit__(self, *a):
-                pass
+        await db.refresh(variant)
+        assert variant.total_sent == 10
+        assert variant.total_opened == 5
+        assert variant.total_replied == 1
+        assert variant.open_rate == pytest.approx(0.5)
 
-        with patch("src.services.ab_testing.async_session_factory", return_value=_FakeCtx()):
-            await record_event(str(variant.id), "opened")
+    @pytest.mark.asyncio
+    async def test_empty_counts_skip_db(self):
+        from src.services.ab_testing import record_event_counts
+
+        with patch("src.services.ab_testing.async_session_factory") as mock_factory:
+            await record_event_counts({})
+        mock_factory.assert_not_called()
+
+
+class TestFoldEventCounts:
+    @pytest.mark.asyncio
+    async def test_moves_pending_counts_into_db(self, db):
+        from src.services.ab_counters import DIRTY_KEY, FOLD_LOCK_KEY
+        from src.services.ab_testing import fold_event_counts, record_event_counts
+
+        _, variant = await _add_variant(db)
+        key = f"leadlock:ab_counts:{variant.id}"
+        redis = _FakeRedis()
+        with patch(REDIS_PATCH, new_callable=AsyncMock, return_value=redis), _session_factory(db):
+            await record_event_counts({str(variant.id): {"sent": 10, "opened": 8}})
+            assert await fold_event_counts() == 1
+            # Nothing left to fold
+            assert await fold_event_counts() == 0
+
+        await db.refresh(variant)
+        assert (variant.total_sent, variant.total_opened) == (20, 10)
+        assert variant.open_rate == pytest.approx(0.5)
+        assert redis.hashes[key] == {"sent": "0", "opened": "0"}
+        assert redis.sets[DIRTY_KEY] == set()
+        assert FOLD_LOCK_KEY not in redis.strings
+
+    @pytest.mark.asyncio
+    async def test_failed_apply_keeps_counts(self):
+        from src.services.ab_counters import DIRTY_KEY
+        from src.services.ab_testing import fold_event_counts, record_event_counts
+
+        variant_id = str(uuid.uuid4())
+        redis = _FakeRedis()
+        with (
+            patch(REDIS_PATCH, new_callable=AsyncMock, return_value=redis),
+            patch("src.services.ab_testing.apply_event_counts", AsyncMock(side_effect=RuntimeError("db"))),
+        ):
+            await record_event_counts({variant_id: {"sent": 3}})
+            with pytest.raises(RuntimeError):
+                await fold_event_counts()
+
+        assert redis.hashes[f"leadlock:ab_counts:{variant_id}"] == {"sent": "3"}
+        assert redis.sets[DIRTY_KEY] == {variant_id}
+
+    @pytest.mark.asyncio
+    async def test_skips_when_locked(self):
+        from src.services.ab_counters import FOLD_LOCK_KEY
+        from src.services.ab_testing import fold_event_counts
+
+        redis = _FakeRedis()
+        redis.strings[FOLD_LOCK_KEY] = "1"
+        with patch(REDIS_PATCH, new_callable=AsyncMock, return_value=redis):
+            assert await fold_event_counts() == 0
+
+
+class TestMergedView:
+    @pytest.mark.asyncio
+    async def test_winner_check_counts_pending_events(self, db):
+        from src.models.ab_test import ABTestVariant
+        from src.services.ab_testing import check_and_declare_winner, record_event_counts
+
+        exp, var_a = await _add_variant(db, total_sent=20, total_opened=4, open_rate=0.2)
+        var_b = ABTestVariant(
+            experiment_id=exp.id, variant_label="B", subject_instruction="y",
+            total_sent=20, total_opened=4, total_replied=0, open_rate=0.2,
+        )
+        db.add(var_b)
+        await db.commit()
+
+        redis = _FakeRedis()
+        with (
+            patch(REDIS_PATCH, new_callable=AsyncMock, return_value=redis),
+            patch("src.services.winning_patterns.store_winning_pattern", AsyncMock()),
+            _session_factory(db),
+        ):
+            # DB alone is below min sample (20 < 30)
+            assert await check_and_declare_winner(str(exp.id)) is None
+            await record_event_counts({
+                str(var_a.id): {"sent": 10, "opened": 12},
+                str(var_b.id): {"sent": 10},
+            })
+            result = await check_and_declare_winner(str(exp.id))
+
+        assert result["winner_label"] == "A"
+        assert result["winner_open_rate"] == pytest.approx(16 / 30)
+
+    @pytest.mark.asyncio
+    async def test_active_experiment_reports_merged_sent(self, db):
+        from src.services.ab_testing import get_active_experiment, record_event_counts
+
+        from contextlib import asynccontextmanager
+        from src.services import experiment_registry
+
+        @asynccontextmanager
+        async def _factory():
+            yield db
+
+        _, variant = await _add_variant(db)
+        redis = _FakeRedis()
+        experiment_registry.invalidate_registry()
+        with (
+            patch(REDIS_PATCH, new_callable=AsyncMock, return_value=redis),
+            patch.object(experiment_registry, "async_session_factory", _factory),
+        ):
+            await record_event_counts({str(variant.id): {"sent": 5}})
+            experiment = await get_active_experiment(1)
+        experiment_registry.invalidate_registry()
 
-        assert variant.total_opened == 4
+        assert experiment["variants"][0]["total_sent"] == 15
@@ -394,6 +394,42 @@ class TestGetTaskQueue:
         assert "status_counts" in result
 
 
+class TestGetLaneGauges:
+    @pytest.mark.asyncio
+    async def test_merges_live_executors_and_drops_stale(self):
+        from src.services.agent_fleet import get_lane_gauges
+
+        now = datetime.now(timezone.utc)
+        fresh = {"updated_at": now.isoformat(), "lanes": {
+            "express": {"depth": 3, "oldest_wait_s": 4.0, "in_flight": 2, "budget": 6, "avg_claim_wait_ms": 900},
+        }}
+        other = {"updated_at": (now - timedelta(seconds=5)).isoformat(), "lanes": {
+            "express": {"depth": 5, "oldest_wait_s": 9.0, "in_flight": 1, "budget": 6, "avg_claim_wait_ms": 300},
+        }}
+        stale = {"updated_at": (now - timedelta(hours=1)).isoformat(), "lanes": {
+            "express": {"depth": 99, "in_flight": 50, "budget": 6},
+        }}
+        mock_redis = AsyncMock()
+        mock_redis.hgetall = AsyncMock(return_value={
+            "a:1": json.dumps(fresh), "b:2": json.dumps(other), "c:3": json.dumps(stale), "d:4": "garbage",
+        })
+
+        with patch("src.services.agent_fleet.get_redis", new_callable=AsyncMock, return_value=mock_redis):
+            lanes = await get_lane_gauges()
+
+        assert lanes["express"]["depth"] == 3  # freshest snapshot wins
+        assert lanes["express"]["in_flight"] == 3
+        assert lanes["express"]["budget"] == 12
+        assert lanes["express"]["avg_claim_wait_ms"] == 900
+
+    @pytest.mark.asyncio
+    async def test_redis_failure_returns_empty(self):
+        from src.services.agent_fleet import get_lane_gauges
+
+        with patch("src.services.agent_fleet.get_redis", new_callable=AsyncMock, side_effect=Exception("down")):
+            assert await get_lane_gauges() == {}
+
+
 # ---------------------------------------------------------------------------
 # API endpoints
 # ---------------------------------------------------------------------------
@@ -433,3 +469,12 @@ class TestAgentsAPI:
         with patch("src.api.agents.get_task_queue", return_value=mock_data):
             result = await task_queue(_admin=MagicMock(), status="all", task_type="all", page=1, per_page=20)
         assert result["success"] is True
+
+    @pytest.mark.asyncio
+    async def test_task_rollups_endpoint(self):
+        from src.api.agents import task_rollups
+        rows = [{"day": "2026-03-01", "task_type": "sms_retry", "status": "completed", "count": 4}]
+        with patch("src.services.task_retention.get_daily_rollups", new_callable=AsyncMock, return_value=rows) as mock_rollups:
+            result = await task_rollups(_admin=MagicMock(), days=7)
+        mock_rollups.assert_awaited_once_with(days=7)
+        assert result == {"success": True, "data": {"rollups": rows}}
@@ -39,6 +39,22 @@ from src.schemas.agent_responses import (
 from src.utils.metrics import Timer
 
 
+@pytest.fixture(autouse=True)
+def _open_slot_inventory():
+    """Mocked DB sessions have no bookings - every slot is free."""
+    with patch("src.services.slot_inventory.available_slots", new_callable=AsyncMock, return_value=None), \
+         patch("src.services.slot_inventory.reserve", new_callable=AsyncMock, return_value=True):
+        yield
+
+
+@pytest.fixture(autouse=True)
+def _empty_transcript():
+    """Mocked leads have no conversation rows - serve an empty transcript."""
+    with patch("src.services.transcript.recent_turns", new_callable=AsyncMock, return_value=[]), \
+         patch("src.services.transcript.append_turn", new_callable=AsyncMock):
+        yield
+
+
 # ============================================================
 # Helpers - reusable factory functions for test objects
 # ============================================================
@@ -112,7 +128,6 @@ def _make_lead(lead_id=None, state="qualifying", score=50):
     lead.total_sms_cost_usd = 0.01
     lead.total_ai_cost_usd = 0.0
     lead.conversation_turn = 1
-    lead.conversations = []
     lead.last_agent_response = None
     lead.previous_state = None
     lead.current_agent = "qualify"
@@ -681,6 +696,126 @@ class TestProcessReplyLockedRouting:
         assert result["lead_id"] == str(lead.id)
         mock_booking.assert_called_once()
 
+    @patch("src.services.learning.record_lead_signal", new_callable=AsyncMock)
+    @patch("src.agents.conductor.full_compliance_check")
+    @patch("src.agents.conductor.send_sms", new_callable=AsyncMock)
+    @patch("src.agents.conductor.process_booking", new_callable=AsyncMock)
+    @patch("src.agents.conductor.detect_emergency")
+    @patch("src.config.get_settings")
+    async def test_confirmed_booking_schedules_sync_and_reminders(
+        self, mock_settings, mock_emergency, mock_booking, mock_sms, mock_compliance, _mock_signal,
+    ):
+        """The booking is scheduled even though its savepoint flush took it out of db.new."""
+        from src.models.booking import Booking
+
+        mock_settings.return_value.max_conversation_turns = 10
+        mock_emergency.return_value = {"is_emergency": False, "emergency_type": None, "matched_keyword": None}
+        mock_booking.return_value = BookResponse(
+            message="You're all set for tomorrow at 9am!",
+            appointment_date="2026-02-20",
+            time_window_start="09:00",
+            booking_confirmed=True,
+        )
+        mock_compliance.return_value = MagicMock(__bool__=lambda s: True)
+        mock_sms.return_value = _sms_result()
+
+        lead = _make_lead(state="booking", score=80)
+        db = AsyncMock()
+        db.add = MagicMock()
+        db.new = set()
+        db.get = AsyncMock(return_value=_make_consent())
+
+        with patch("src.workers.crm_sync.schedule_booking_sync", new_callable=AsyncMock) as mock_sync, \
+             patch("src.workers.sms_dispatch.schedule_booking_reminders", new_callable=AsyncMock) as mock_remind:
+            await _process_reply_locked(db, lead, _make_client(), _make_config(), "Yes!", Timer().start())
+
+        booking = mock_remind.await_args.args[0]
+        assert isinstance(booking, Booking)
+        assert booking.appointment_date == date(2026, 2, 20)
+        mock_sync.assert_awaited_once_with(booking.id)
+
+    @patch("src.services.learning.record_lead_signal", new_callable=AsyncMock)
+    @patch("src.agents.conductor.full_compliance_check")
+    @patch("src.agents.conductor.send_sms", new_callable=AsyncMock)
+    @patch("src.agents.conductor.process_booking", new_callable=AsyncMock)
+    @patch("src.agents.conductor.detect_emergency")
+    @patch("src.config.get_settings")
+    async def test_failed_commit_releases_reserved_slot(
+        self, mock_settings, mock_emergency, mock_booking, mock_sms, mock_compliance, _mock_signal,
+    ):
+        """A booking whose commit fails gives its reserved slot back."""
+        mock_settings.return_value.max_conversation_turns = 10
+        mock_emergency.return_value = {"is_emergency": False, "emergency_type": None, "matched_keyword": None}
+        mock_booking.return_value = BookResponse(
+            message="You're all set for tomorrow at 9am!",
+            appointment_date="2026-02-20",
+            time_window_start="09:00",
+            booking_confirmed=True,
+        )
+        mock_compliance.return_value = MagicMock(__bool__=lambda s: True)
+        mock_sms.return_value = _sms_result()
+
+        client = _make_client()
+        db = AsyncMock()
+        db.add = MagicMock()
+        db.new = set()
+        db.get = AsyncMock(return_value=_make_consent())
+        db.commit = AsyncMock(side_effect=RuntimeError("connection lost"))
+
+        with patch("src.services.slot_inventory.release", new_callable=AsyncMock) as mock_release, \
+             pytest.raises(RuntimeError):
+            await _process_reply_locked(db, _make_lead(state="booking", score=80), client, _make_config(), "Yes!", Timer().start())
+
+        mock_release.assert_awaited_once_with(client.id, date(2026, 2, 20), time(9, 0))
+
+    @patch("src.services.learning.record_lead_signal", new_callable=AsyncMock)
+    @patch("src.agents.conductor.full_compliance_check")
+    @patch("src.agents.conductor.send_sms", new_callable=AsyncMock)
+    @patch("src.agents.conductor.process_booking", new_callable=AsyncMock)
+    @patch("src.agents.conductor.detect_emergency")
+    @patch("src.config.get_settings")
+    async def test_rejected_booking_flush_releases_slot(
+        self, mock_settings, mock_emergency, mock_booking, mock_sms, mock_compliance, _mock_signal,
+    ):
+        """A Booking the database rejects on flush gives its slot back and offers others."""
+        from sqlalchemy.exc import IntegrityError
+
+        mock_settings.return_value.max_conversation_turns = 10
+        mock_emergency.return_value = {"is_emergency": False, "emergency_type": None, "matched_keyword": None}
+        mock_booking.return_value = BookResponse(
+            message="You're all set for tomorrow at 9am!",
+            appointment_date="2026-02-20",
+            time_window_start="09:00",
+            booking_confirmed=True,
+        )
+        mock_compliance.return_value = MagicMock(__bool__=lambda s: True)
+        mock_sms.return_value = _sms_result()
+
+        client = _make_client()
+        lead = _make_lead(state="booking", score=80)
+        savepoint = AsyncMock()
+        savepoint.commit = AsyncMock(side_effect=IntegrityError("INSERT INTO bookings", {}, Exception("duplicate key")))
+        db = AsyncMock()
+        db.add = MagicMock()
+        db.new = set()
+        db.get = AsyncMock(return_value=_make_consent())
+        db.begin_nested = AsyncMock(return_value=savepoint)
+
+        with patch("src.services.slot_inventory.release", new_callable=AsyncMock) as mock_release, \
+             patch("src.workers.sms_dispatch.schedule_booking_reminders", new_callable=AsyncMock) as mock_remind:
+            result = await _process_reply_locked(db, lead, client, _make_config(), "Yes!", Timer().start())
+
+        mock_release.assert_awaited_once_with(client.id, date(2026, 2, 20), time(9, 0))
+        savepoint.rollback.assert_awaited_once()
+        mock_remind.assert_not_awaited()
+        assert result["status"] == "booking"
+        actions = [c.args[0].action for c in db.add.call_args_list if hasattr(c.args[0], "action")]
+        assert "booking_slot_taken" in actions
+        assert "booking_confirmed" not in actions
+        sent = mock_sms.await_args.kwargs["body"]
+        assert sent != "You're all set for tomorrow at 9am!"
+        db.commit.assert_awaited_once()
+
     @patch("src.agents.conductor.full_compliance_check")
     @patch("src.agents.conductor.send_sms", new_callable=AsyncMock)
     @patch("src.agents.conductor.process_qualify", new_callable=AsyncMock)
@@ -779,9 +914,10 @@ class TestProcessReplyLockedComplianceBlocked:
 class TestRouteToQualify:
     """Cover lines 484, 502-514, 521-528 in _route_to_qualify."""
 
+    @patch("src.services.transcript.recent_turns", new_callable=AsyncMock)
     @patch("src.agents.conductor.process_qualify", new_callable=AsyncMock)
-    async def test_conversation_history_built(self, mock_qualify):
-        """Conversation history from lead.conversations is passed to qualify."""
+    async def test_conversation_history_built(self, mock_qualify, mock_turns):
+        """Recent transcript turns are passed to qualify."""
         qualify_result = MagicMock()
         qualify_result.message = "What service do you need?"
         qualify_result.qualification = QualificationData(
@@ -798,13 +934,10 @@ class TestRouteToQualify:
 
         lead = _make_lead(state="qualifying", score=50)
         # Add conversation history
-        conv1 = MagicMock()
-        conv1.direction = "outbound"
-        conv1.content = "Hi, how can I help?"
-        conv2 = MagicMock()
-        conv2.direction = "inbound"
-        conv2.content = "I need AC repair today"
-        lead.conversations = [conv1, conv2]
+        mock_turns.return_value = [
+            {"direction": "outbound", "content": "Hi, how can I help?"},
+            {"direction": "inbound", "content": "I need AC repair today"},
+        ]
         lead.qualification_data = {}
 
         client = _make_client()
@@ -814,6 +947,7 @@ class TestRouteToQualify:
         result = await _route_to_qualify(db, lead, client, config, "I need AC repair today")
 
         # Verify conversations were passed
+        mock_turns.assert_awaited_once_with(db, lead.id)
         call_kwargs = mock_qualify.call_args.kwargs
         assert len(call_kwargs["conversation_history"]) == 2
         assert call_kwargs["conversation_history"][0]["direction"] == "outbound"
@@ -917,6 +1051,42 @@ class TestRouteToBook:
         # Booking + EventLog added
         assert db.add.call_count >= 2
 
+    @patch("src.services.slot_inventory.reserve", new_callable=AsyncMock, return_value=False)
+    @patch("src.services.config_cache.get_sales_config", new_callable=AsyncMock, return_value=None)
+    @patch("src.agents.conductor.process_booking", new_callable=AsyncMock)
+    async def test_booking_confirmed_slot_taken(self, mock_booking, _mock_config, mock_reserve):
+        """A slot another conversation reserved first is not booked twice."""
+        from src.models.booking import Booking
+        from src.services.scheduling import TimeSlot
+
+        mock_booking.return_value = BookResponse(
+            message="You're all set for tomorrow at 9am!",
+            appointment_date="2026-02-20",
+            time_window_start="09:00",
+            time_window_end="11:00",
+            booking_confirmed=True,
+        )
+        offered = [
+            TimeSlot(date(2026, 2, 20), time(9, 0), time(11, 0)),
+            TimeSlot(date(2026, 2, 20), time(11, 30), time(13, 30), "Mike"),
+        ]
+
+        lead = _make_lead(state="booking", score=80)
+        client = _make_client()
+        config = _make_config()
+        db = AsyncMock()
+        db.add = MagicMock()
+
+        with patch("src.services.slot_inventory.available_slots", new_callable=AsyncMock, return_value=offered):
+            result = await _route_to_book(db, lead, client, config, "Yes, tomorrow 9am works!")
+
+        mock_reserve.assert_awaited_once_with(db, client.id, config, date(2026, 2, 20), time(9, 0))
+        assert mock_booking.call_args.kwargs["slots"] == offered
+        assert lead.state == "booking"
+        assert "just got booked" in result["message"]
+        assert "11:30 AM" in result["message"] and "Mike" in result["message"]
+        assert not any(isinstance(c.args[0], Booking) for c in db.add.call_args_list)
+
     @patch("src.services.learning.record_lead_signal", new_callable=AsyncMock)
     @patch("src.services.config_cache.get_sales_config", new_callable=AsyncMock, return_value=None)
     @patch("src.agents.conductor.process_booking", new_callable=AsyncMock)
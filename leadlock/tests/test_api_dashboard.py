@@ -1046,7 +1046,34 @@ class TestProvisionNumber:
         assert result["status"] == "provisioned"
         assert result["phone_number"] == "+15125551234"
         assert client.twilio_phone == "+15125551234"
-        db.flush.assert_awaited_once()
+        db.commit.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_commits_before_invalidating_cache(self):
+        """The cached client is dropped only after the new number is committed."""
+        client = _make_mock_client(twilio_phone=None, business_type=None)
+        db = _make_mock_db()
+        request = _make_mock_request(json_data={"phone_number": "+15125551234"})
+        calls = []
+        db.commit = AsyncMock(side_effect=lambda: calls.append("commit"))
+
+        with patch(
+            PROVISION_PATCH,
+            new_callable=AsyncMock,
+            return_value={
+                "phone_number": "+15125551234",
+                "phone_sid": "PN_test_123",
+                "is_tollfree": False,
+                "error": None,
+            },
+        ), patch(
+            "src.services.client_cache.invalidate_client",
+            new_callable=AsyncMock,
+            side_effect=lambda client_id: calls.append("invalidate"),
+        ):
+            await provision_number(request, db, client)
+
+        assert calls == ["commit", "invalidate"]
 
     @pytest.mark.asyncio
     async def test_already_provisioned_raises_400(self):
@@ -1865,6 +1892,20 @@ class TestUpdateSettings:
         assert client.config["persona"]["rep_name"] == "Mike"
         assert client.config["new_key"] == "value"
 
+    @pytest.mark.asyncio
+    async def test_update_invalidates_client_cache(self):
+        """Saved settings must evict the cached client snapshot everywhere."""
+        client = _make_mock_client(config={})
+        db = _make_mock_db()
+
+        payload_data = {"config": {"persona": {"rep_name": "Mike"}}}
+        request = _make_mock_request(json_data=payload_data, body=json.dumps(payload_data).encode())
+
+        with patch("src.api.dash_reports.invalidate_client", new_callable=AsyncMock) as mock_invalidate:
+            await update_settings(request, db, client)
+
+        mock_invalidate.assert_awaited_once_with(client.id)
+
     @pytest.mark.asyncio
     async def test_config_not_dict_raises_400(self):
         """Non-dict config should return 400."""
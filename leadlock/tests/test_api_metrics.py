@@ -517,7 +517,7 @@ class TestGetWorkerHealth:
             result = await get_worker_health(admin=admin)
 
         workers = result["workers"]
-        assert len(workers) == 7
+        assert len(workers) == 9
         for name, info in workers.items():
             assert info["status"] == "healthy"
             assert info["last_heartbeat"] == recent_ts
@@ -637,7 +637,7 @@ class TestGetWorkerHealth:
             assert 50 <= info["age_seconds"] <= 120
 
     async def test_worker_list_completeness(self):
-        """All 7 expected workers are present in the response."""
+        """All 9 expected workers are present in the response."""
         admin = _make_admin_client()
         mock_redis = AsyncMock()
         mock_redis.get = AsyncMock(return_value=None)
@@ -651,7 +651,89 @@ class TestGetWorkerHealth:
             "lead_state_manager",
             "crm_sync",
             "sms_dispatch",
+            "inbound_sms",
             "outreach_monitor",
             "registration_poller",
+            "metrics_rollup",
         }
         assert set(result["workers"].keys()) == expected_workers
+
+
+# ---------------------------------------------------------------------------
+# GET /api/v1/metrics/latency-budget
+# ---------------------------------------------------------------------------
+
+STAGE_PERCENTILES_PATCH = "src.utils.metrics.get_stage_percentiles"
+
+
+class TestGetLatencyBudget:
+    """Tests for the per-stage latency budget endpoint."""
+
+    async def test_reports_slowest_p95_stage(self):
+        """The stage with the highest p95 (excluding total) is called out."""
+        from src.api.metrics import get_latency_budget
+
+        stages = {
+            "commit": {"samples": 10, "p50_ms": 20, "p95_ms": 80, "p99_ms": 90, "max_ms": 95},
+            "sms_send": {"samples": 10, "p50_ms": 300, "p95_ms": 900, "p99_ms": 1500, "max_ms": 1600},
+            "total": {"samples": 10, "p50_ms": 400, "p95_ms": 1100, "p99_ms": 1700, "max_ms": 1800},
+        }
+        with patch(STAGE_PERCENTILES_PATCH, new_callable=AsyncMock, return_value=stages):
+            result = await get_latency_budget(admin=_make_admin_client())
+
+        assert result["stages"] == stages
+        assert result["slowest_p95_stage"] == "sms_send"
+        assert result["target_ms"] > 0
+
+    async def test_redis_failure_returns_error(self):
+        """Redis failure returns empty stages with an error message."""
+        from src.api.metrics import get_latency_budget
+
+        with patch(
+            STAGE_PERCENTILES_PATCH,
+            new_callable=AsyncMock,
+            side_effect=ConnectionError("Redis down"),
+        ):
+            result = await get_latency_budget(admin=_make_admin_client())
+
+        assert result["stages"] == {}
+        assert "error" in result
+
+
+# ---------------------------------------------------------------------------
+# GET /api/v1/metrics/prometheus
+# ---------------------------------------------------------------------------
+
+
+class TestGetPrometheusMetrics:
+    """Tests for the Prometheus scrape endpoint."""
+
+    def _settings(self, token: str):
+        settings = MagicMock()
+        settings.metrics_scrape_token = token
+        return settings
+
+    async def test_disabled_without_token(self):
+        from src.api.metrics import get_prometheus_metrics
+
+        with patch("src.config.get_settings", return_value=self._settings("")):
+            with pytest.raises(HTTPException) as exc_info:
+                await get_prometheus_metrics(authorization="Bearer anything")
+        assert exc_info.value.status_code == 404
+
+    async def test_wrong_token_rejected(self):
+        from src.api.metrics import get_prometheus_metrics
+
+        with patch("src.config.get_settings", return_value=self._settings("s3cret")):
+            with pytest.raises(HTTPException) as exc_info:
+                await get_prometheus_metrics(authorization="Bearer nope")
+        assert exc_info.value.status_code == 401
+
+    async def test_valid_token_returns_text_format(self):
+        from src.api.metrics import get_prometheus_metrics
+
+        with patch("src.config.get_settings", return_value=self._settings("s3cret")):
+            response = await get_prometheus_metrics(authorization="Bearer s3cret")
+
+        assert response.media_type.startswith("text/plain")
+        assert b"# TYPE leadlock_stage_duration_seconds histogram" in response.body
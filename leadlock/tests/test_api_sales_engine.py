@@ -685,7 +685,7 @@ class TestEmailEventsWebhook:
             await email_events_webhook(request, db)
         assert exc_info.value.status_code == 403
 
-    @patch("src.api.sales_webhooks._record_email_signal", new_callable=AsyncMock)
+    @patch("src.services.learning.record_signals", new_callable=AsyncMock)
     @patch("src.api.sales_webhooks._verify_sendgrid_webhook", new_callable=AsyncMock, return_value=True)
     async def test_processes_delivered_event(self, mock_verify, mock_signal, db):
         """Should update delivered_at on delivery event."""
@@ -705,7 +705,7 @@ class TestEmailEventsWebhook:
         assert result["status"] == "processed"
         assert email.delivered_at is not None
 
-    @patch("src.api.sales_webhooks._record_email_signal", new_callable=AsyncMock)
+    @patch("src.services.learning.record_signals", new_callable=AsyncMock)
     @patch("src.api.sales_webhooks._verify_sendgrid_webhook", new_callable=AsyncMock, return_value=True)
     async def test_processes_open_event(self, mock_verify, mock_signal, db):
         """Should update opened_at on open event and update prospect."""
@@ -731,7 +731,7 @@ class TestEmailEventsWebhook:
         assert email.opened_at is not None
         assert prospect.last_email_opened_at is not None
 
-    @patch("src.api.sales_webhooks._record_email_signal", new_callable=AsyncMock)
+    @patch("src.services.learning.record_signals", new_callable=AsyncMock)
     @patch("src.api.sales_webhooks._verify_sendgrid_webhook", new_callable=AsyncMock, return_value=True)
     async def test_processes_click_event(self, mock_verify, mock_signal, db):
         """Should update clicked_at on click event."""
@@ -756,7 +756,7 @@ class TestEmailEventsWebhook:
         assert result["status"] == "processed"
         assert email.clicked_at is not None
 
-    @patch("src.api.sales_webhooks._record_email_signal", new_callable=AsyncMock)
+    @patch("src.services.learning.record_signals", new_callable=AsyncMock)
     @patch("src.api.sales_webhooks._verify_sendgrid_webhook", new_callable=AsyncMock, return_value=True)
     async def test_processes_bounce_event_marks_prospect_lost(self, mock_verify, mock_signal, db):
         """Should mark prospect as lost and email_verified as False on hard bounce."""
@@ -786,7 +786,7 @@ class TestEmailEventsWebhook:
         assert prospect.status == "lost"
 
     @patch("src.services.deliverability.record_email_event", new_callable=AsyncMock)
-    @patch("src.api.sales_webhooks._record_email_signal", new_callable=AsyncMock)
+    @patch("src.services.learning.record_signals", new_callable=AsyncMock)
     @patch("src.api.sales_webhooks._verify_sendgrid_webhook", new_callable=AsyncMock, return_value=True)
     async def test_dedupes_duplicate_sendgrid_event(self, mock_verify, mock_signal, mock_record_event, db):
         """Duplicate sg_event_id should be processed once (idempotent webhook handling)."""
@@ -829,7 +829,7 @@ class TestEmailEventsWebhook:
         assert email.bounced_at is not None
         assert mock_record_event.await_count == 1
 
-    @patch("src.api.sales_webhooks._record_email_signal", new_callable=AsyncMock)
+    @patch("src.services.learning.record_signals", new_callable=AsyncMock)
     @patch("src.api.sales_webhooks._verify_sendgrid_webhook", new_callable=AsyncMock, return_value=True)
     async def test_bounce_auto_blacklists_email(self, mock_verify, mock_signal, db):
         """Should auto-blacklist email address on hard bounce."""
@@ -942,7 +942,7 @@ class TestEmailEventsWebhook:
         assert result["status"] == "processed"
         assert result["events"] == 1
 
-    @patch("src.api.sales_webhooks._record_email_signal", new_callable=AsyncMock)
+    @patch("src.services.learning.record_signals", new_callable=AsyncMock)
     @patch("src.api.sales_webhooks._verify_sendgrid_webhook", new_callable=AsyncMock, return_value=True)
     async def test_fallback_lookup_by_outreach_id_and_step(self, mock_verify, mock_signal, db):
         """Should find email by outreach_id + step if sg_message_id lookup fails."""
@@ -968,7 +968,7 @@ class TestEmailEventsWebhook:
         assert result["status"] == "processed"
         assert email.delivered_at is not None
 
-    @patch("src.api.sales_webhooks._record_email_signal", new_callable=AsyncMock)
+    @patch("src.services.learning.record_signals", new_callable=AsyncMock)
     @patch("src.api.sales_webhooks._verify_sendgrid_webhook", new_callable=AsyncMock, return_value=True)
     async def test_open_event_does_not_mutate_campaign_counter(self, mock_verify, mock_signal, db):
         """Opens should NOT increment denormalized campaign counter (calculated metrics used instead)."""
@@ -1015,7 +1015,7 @@ class TestEmailEventsWebhook:
 
         assert email.delivered_at == original_time
 
-    @patch("src.api.sales_webhooks._record_email_signal", new_callable=AsyncMock)
+    @patch("src.services.learning.record_signals", new_callable=AsyncMock)
     @patch("src.api.sales_webhooks._verify_sendgrid_webhook", new_callable=AsyncMock, return_value=True)
     async def test_protected_domain_not_blacklisted(self, mock_verify, mock_signal, db):
         """Should NOT domain-blacklist protected providers like gmail.com."""
@@ -1099,6 +1099,65 @@ class TestEmailEventsWebhook:
         assert prospect.email_unsubscribed is False
 
 
+    @patch("src.services.ab_testing.record_event_counts", new_callable=AsyncMock)
+    @patch("src.services.learning.record_signals", new_callable=AsyncMock)
+    @patch("src.api.sales_webhooks._verify_sendgrid_webhook", new_callable=AsyncMock, return_value=True)
+    async def test_batch_aggregates_ab_counts_and_signals(self, mock_verify, mock_signals, mock_counts, db):
+        """A batch writes one A/B update per variant and one bulk signal insert."""
+        from src.api.sales_engine import email_events_webhook
+
+        variant_id = uuid.uuid4()
+        emails = []
+        for i in range(2):
+            p = _make_prospect(db, prospect_email=f"batch{i}@example.com")
+            await db.flush()
+            emails.append(_make_email(
+                db, p.id, sendgrid_message_id=f"sg_batch_{i}", ab_variant_id=variant_id,
+            ))
+        await db.flush()
+
+        events = [
+            {"event": "open", "sg_message_id": "sg_batch_0.filter1", "timestamp": 1700000000},
+            {"event": "open", "sg_message_id": "sg_batch_1", "timestamp": 1700000001},
+            {"event": "open", "sg_message_id": "sg_batch_1", "timestamp": 1700000002},
+            {"event": "click", "sg_message_id": "sg_batch_1", "timestamp": 1700000003},
+        ]
+        request = _mock_request(json_data=events)
+
+        with patch("src.utils.dedup.get_redis", new_callable=AsyncMock, side_effect=Exception("no redis")):
+            result = await email_events_webhook(request, db)
+
+        assert result == {"status": "processed", "events": 4}
+        assert all(e.opened_at is not None for e in emails)
+        mock_counts.assert_awaited_once_with({str(variant_id): {"opened": 2, "clicked": 1}})
+        mock_signals.assert_awaited_once()
+        signal_types = [s["signal_type"] for s in mock_signals.call_args[0][0]]
+        assert signal_types == ["email_opened", "email_opened", "email_clicked"]
+
+    @patch("src.api.sales_webhooks._verify_sendgrid_webhook", new_callable=AsyncMock, return_value=True)
+    async def test_commit_failure_releases_dedupe_keys(self, mock_verify, db):
+        """A failed batch returns 500 and clears its dedupe keys so SendGrid can retry."""
+        from src.api.sales_engine import email_events_webhook
+
+        prospect = _make_prospect(db)
+        await db.flush()
+        _make_email(db, prospect.id, sendgrid_message_id="sg_retry_1")
+        await db.flush()
+
+        events = [{"event": "delivered", "sg_event_id": "evt_retry", "sg_message_id": "sg_retry_1"}]
+        request = _mock_request(json_data=events)
+
+        redis = AsyncMock()
+        redis.set = AsyncMock(return_value=True)
+        db.commit = AsyncMock(side_effect=Exception("db down"))
+
+        with patch("src.utils.dedup.get_redis", new_callable=AsyncMock, return_value=redis):
+            with pytest.raises(HTTPException) as exc_info:
+                await email_events_webhook(request, db)
+
+        assert exc_info.value.status_code == 500
+        redis.delete.assert_awaited_once_with("leadlock:email_event_seen:evt_retry")
+
 # ── Unsubscribe ───────────────────────────────────────────────────────────
 
 class TestUnsubscribe:
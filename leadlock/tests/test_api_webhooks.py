@@ -408,9 +408,49 @@ class TestTwilioSmsWebhook:
             result = await twilio_sms_webhook(CLIENT_ID, request, db)
 
         assert result.status == "accepted"
-        mock_reply.assert_awaited_once_with(
-            db, existing_lead, mock_client, "Yes, tomorrow works!"
-        )
+        mock_reply.assert_awaited_once()
+        args = mock_reply.call_args[0]
+        assert args[0] is db
+        assert args[1] is existing_lead
+        # Handlers receive the cached snapshot of the client row
+        assert args[2].id == mock_client.id
+        assert args[2].twilio_phone == mock_client.twilio_phone
+        assert args[3] == "Yes, tomorrow works!"
+
+    @pytest.mark.asyncio
+    async def test_queues_for_worker_and_acks(self):
+        """With the inbound queue available, the webhook acks without running the conductor."""
+        form_data = {"From": "+15125559876", "Body": "Yes, tomorrow works!"}
+        request = _make_request(body=b"From=%2B15125559876&Body=Yes", form_data=form_data)
+        db = AsyncMock()
+        db.add = MagicMock()
+        db.get = AsyncMock(return_value=_make_client())
+
+        patches = _standard_patches()
+        with (
+            patches["rate_limit"],
+            patches["validate_sig"],
+            patches["compute_hash"],
+            patches["normalize_phone"],
+            patches["handle_new_lead"] as mock_new_lead,
+            patches["handle_inbound_reply"] as mock_reply,
+            patches["get_correlation_id"],
+            patch(
+                "src.api.webhooks.inbound_queue.enqueue",
+                new_callable=AsyncMock,
+                return_value=True,
+            ) as mock_enqueue,
+        ):
+            result = await twilio_sms_webhook(CLIENT_ID, request, db)
+
+        assert result.status == "queued"
+        event = db.add.call_args_list[0][0][0]
+        assert event.processing_status == "queued"
+        db.commit.assert_awaited()
+        mock_enqueue.assert_awaited_once_with(event.id, CLIENT_UUID, "+15125559876")
+        db.execute.assert_not_awaited()
+        mock_new_lead.assert_not_awaited()
+        mock_reply.assert_not_awaited()
 
     @pytest.mark.asyncio
     async def test_missing_from_field_returns_400(self):
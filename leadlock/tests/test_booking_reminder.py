@@ -247,15 +247,21 @@ class TestSendSingleReminder:
         booking = _make_booking()
 
         blocked = ComplianceResult(allowed=False, reason="Quiet hours", rule="tcpa_quiet_hours")
+        send_at = datetime.now(timezone.utc) + timedelta(hours=3)
 
+        from src.workers import sms_dispatch
         with patch(
             "src.workers.sms_dispatch.full_compliance_check",
             return_value=blocked,
+        ), patch(
+            "src.workers.sms_dispatch.next_permissible_send",
+            return_value=send_at,
         ):
-            from src.workers.sms_dispatch import _send_single_reminder
-            result = await _send_single_reminder(db, booking)
+            result = await sms_dispatch._send_single_reminder(db, booking)
 
         assert result is False
+        # Deferred to the window opening rather than retried every poll
+        assert booking.reminder_due_at == send_at
 
     async def test_content_compliance_blocks_reminder(self):
         """When post-generation content check fails, return False."""
@@ -351,9 +357,11 @@ class TestSendSingleReminder:
         assert "09:00 AM" in followup_kwargs["time_window"]
         assert "11:00 AM" in followup_kwargs["time_window"]
 
-        # Lead cost tracking updated
-        assert lead.total_messages_sent == 4
-        assert lead.total_sms_cost_usd == pytest.approx(0.02 + 0.0079)
+        # Lead cost tracking updated in SQL, not on the loaded copy
+        counters = db.execute.await_args.args[0]
+        assert counters.table.name == "leads"
+        assert 0.0079 in counters.compile().params.values()
+        assert lead.total_messages_sent == 3
         assert lead.last_outbound_at is not None
 
         # Conversation and EventLog added
@@ -607,6 +615,55 @@ class TestSendDueReminders:
         assert count == 0
         db_mock.commit.assert_not_called()
 
+    async def test_deferred_reminder_is_sent_on_appointment_day(self, db):
+        """A reminder deferred past midnight is still picked up once due."""
+        from src.models.booking import Booking
+        from src.models.client import Client
+        from src.models.lead import Lead
+
+        client = Client(business_name="Cool HVAC Co", trade_type="hvac")
+        db.add(client)
+        await db.flush()
+        now = datetime.now(timezone.utc)
+        today, tomorrow = date.today(), date.today() + timedelta(days=1)
+
+        async def _book(day, reminder_due_at=None):
+            lead = Lead(client_id=client.id, phone="+15125551234", source="google_lsa")
+            db.add(lead)
+            await db.flush()
+            booking = Booking(
+                lead_id=lead.id, client_id=client.id, appointment_date=day,
+                service_type="AC Repair", reminder_due_at=reminder_due_at,
+            )
+            db.add(booking)
+            await db.flush()
+            return booking.id
+
+        deferred_due = await _book(today, now - timedelta(minutes=1))
+        await _book(today)
+        tomorrow_due = await _book(tomorrow)
+        await _book(tomorrow, now + timedelta(hours=1))
+        await db.commit()
+
+        sent = []
+
+        async def _send(session, booking):
+            sent.append(booking.id)
+            return True
+
+        with (
+            patch(
+                "src.workers.sms_dispatch.async_session_factory",
+                side_effect=lambda: _mock_session_factory(db),
+            ),
+            patch("src.workers.sms_dispatch._send_single_reminder", side_effect=_send),
+        ):
+            from src.workers.sms_dispatch import _send_due_reminders
+            count = await _send_due_reminders()
+
+        assert count == 2
+        assert set(sent) == {deferred_due, tomorrow_due}
+
     async def test_sends_reminders_for_found_bookings(self):
         """Found bookings each get _send_single_reminder called."""
         booking1 = _make_booking(booking_id=uuid.uuid4())
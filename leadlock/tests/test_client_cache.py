@@ -0,0 +1,217 @@
+"""
+Tests for src/services/client_cache.py - two-tier Client snapshot cache.
+Redis and the database session are mocked.
+"""
+import json
+import uuid
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from src.schemas.client_config import ClientConfig
+from src.services import client_cache
+from src.services.client_cache import (
+    CachedClient,
+    evict_local,
+    get_cached_client,
+    get_client_config,
+    invalidate_client,
+)
+
+REDIS_PATCH = "src.utils.dedup.get_redis"
+
+CONFIG = {
+    "persona": {"rep_name": "Sarah"},
+    "service_area": {"center": {"lat": 30.2672, "lng": -97.7431}, "radius_miles": 35},
+}
+
+
+def _make_client(client_id=None, config=None):
+    client = MagicMock()
+    client.id = client_id or uuid.uuid4()
+    client.business_name = "Austin HVAC"
+    client.trade_type = "hvac"
+    client.tier = "pro"
+    client.twilio_phone = "+15125551234"
+    client.twilio_messaging_service_sid = "MG_test"
+    client.billing_status = "active"
+    client.is_active = True
+    client.config = config if config is not None else CONFIG
+    return client
+
+
+def _make_redis(cached=None):
+    redis = MagicMock()
+    redis.get = AsyncMock(return_value=cached)
+    redis.set = AsyncMock()
+    redis.delete = AsyncMock()
+    return redis
+
+
+class TestCachedClient:
+    def test_from_model_copies_hot_fields(self):
+        client = _make_client()
+        snapshot = CachedClient.from_model(client)
+        assert snapshot.id == client.id
+        assert snapshot.twilio_phone == "+15125551234"
+        assert snapshot.billing_status == "active"
+        assert snapshot.client_config.persona.rep_name == "Sarah"
+
+    def test_client_config_parsed_once(self):
+        snapshot = CachedClient.from_model(_make_client())
+        assert snapshot.client_config is snapshot.client_config
+
+    def test_json_round_trip(self):
+        client = _make_client()
+        snapshot = CachedClient(client.id, json.loads(CachedClient.from_model(client).to_json()))
+        assert snapshot.business_name == "Austin HVAC"
+        assert snapshot.config == CONFIG
+
+    def test_secrets_not_serialized(self):
+        data = json.loads(CachedClient.from_model(_make_client()).to_json())
+        assert "dashboard_password_hash" not in data
+        assert "crm_api_key_encrypted" not in data
+
+    def test_get_client_config_for_orm_client(self):
+        config = get_client_config(_make_client())
+        assert isinstance(config, ClientConfig)
+        assert config.persona.rep_name == "Sarah"
+
+
+class TestGetCachedClient:
+    async def test_db_miss_populates_both_tiers(self):
+        client = _make_client()
+        db = AsyncMock()
+        db.get = AsyncMock(return_value=client)
+        redis = _make_redis()
+
+        with patch(REDIS_PATCH, new_callable=AsyncMock, return_value=redis):
+            first = await get_cached_client(str(client.id), db)
+            second = await get_cached_client(client.id, db)
+
+        assert first is second
+        db.get.assert_awaited_once()
+        redis.get.assert_awaited_once()
+        redis.set.assert_awaited_once()
+        assert redis.set.call_args[1]["ex"] == client_cache.REDIS_TTL
+
+    async def test_redis_hit_skips_db(self):
+        client = _make_client()
+        redis = _make_redis(CachedClient.from_model(client).to_json())
+        db = AsyncMock()
+
+        with patch(REDIS_PATCH, new_callable=AsyncMock, return_value=redis):
+            snapshot = await get_cached_client(client.id, db)
+
+        assert snapshot.business_name == "Austin HVAC"
+        db.get.assert_not_called()
+
+    async def test_redis_down_falls_back_to_db(self):
+        client = _make_client()
+        db = AsyncMock()
+        db.get = AsyncMock(return_value=client)
+
+        with patch(REDIS_PATCH, new_callable=AsyncMock, side_effect=ConnectionError("down")):
+            snapshot = await get_cached_client(client.id, db)
+
+        assert snapshot.id == client.id
+
+    async def test_missing_client_not_cached(self):
+        db = AsyncMock()
+        db.get = AsyncMock(return_value=None)
+        cid = uuid.uuid4()
+
+        with patch(REDIS_PATCH, new_callable=AsyncMock, return_value=_make_redis()):
+            assert await get_cached_client(cid, db) is None
+            assert await get_cached_client(cid, db) is None
+
+        assert db.get.await_count == 2
+
+    async def test_invalid_uuid_raises(self):
+        with pytest.raises(ValueError):
+            await get_cached_client("not-a-uuid", AsyncMock())
+
+    async def test_local_entry_expires(self):
+        client = _make_client()
+        db = AsyncMock()
+        db.get = AsyncMock(return_value=client)
+
+        with (
+            patch(REDIS_PATCH, new_callable=AsyncMock, return_value=_make_redis()),
+            patch.object(client_cache, "LOCAL_TTL", -1),
+        ):
+            await get_cached_client(client.id, db)
+            await get_cached_client(client.id, db)
+
+        assert db.get.await_count == 2
+
+    async def test_lru_bounded(self):
+        db = AsyncMock()
+        db.get = AsyncMock(side_effect=lambda model, cid: _make_client(cid))
+
+        with (
+            patch(REDIS_PATCH, new_callable=AsyncMock, return_value=_make_redis()),
+            patch.object(client_cache, "LOCAL_MAX_ENTRIES", 2),
+        ):
+            ids = [uuid.uuid4() for _ in range(3)]
+            for cid in ids:
+                await get_cached_client(cid, db)
+
+        assert list(client_cache._local) == [str(ids[1]), str(ids[2])]
+
+
+class TestInvalidation:
+    async def test_invalidate_clears_tiers_and_publishes(self):
+        cid = uuid.uuid4()
+        client_cache._local_put(str(cid), CachedClient.from_model(_make_client(cid)))
+        redis = _make_redis()
+
+        with (
+            patch(REDIS_PATCH, new_callable=AsyncMock, return_value=redis),
+            patch("src.services.event_bus.publish_event", new_callable=AsyncMock) as mock_publish,
+        ):
+            await invalidate_client(cid)
+
+        assert str(cid) not in client_cache._local
+        redis.delete.assert_awaited_once_with(f"leadlock:client_cache:{cid}")
+        mock_publish.assert_awaited_once_with("config_changed", {"client_id": str(cid)})
+
+    def test_bus_message_evicts_local_entry(self):
+        cid = str(uuid.uuid4())
+        client_cache._local_put(cid, CachedClient.from_model(_make_client(uuid.UUID(cid))))
+
+        client_cache._handle_bus_message(json.dumps({
+            "type": "config_changed", "data": {"client_id": cid},
+        }))
+
+        assert cid not in client_cache._local
+
+    def test_bus_message_ignores_other_events(self):
+        cid = str(uuid.uuid4())
+        client_cache._local_put(cid, CachedClient.from_model(_make_client(uuid.UUID(cid))))
+
+        client_cache._handle_bus_message(json.dumps({
+            "type": "ab_test_winner", "data": {"client_id": cid},
+        }))
+        client_cache._handle_bus_message(b"not json")
+
+        assert cid in client_cache._local
+
+    async def test_handle_events_evicts_without_touching_sales_config(self):
+        from src.services.event_bus import handle_events
+
+        cid = str(uuid.uuid4())
+        client_cache._local_put(cid, CachedClient.from_model(_make_client(uuid.UUID(cid))))
+
+        with patch(
+            "src.services.config_cache.invalidate_sales_config", new_callable=AsyncMock,
+        ) as mock_invalidate:
+            await handle_events([{"type": "config_changed", "data": {"client_id": cid}}])
+
+        assert cid not in client_cache._local
+        mock_invalidate.assert_not_called()
+
+    def test_evict_all(self):
+        client_cache._local_put("a", MagicMock())
+        evict_local()
+        assert not client_cache._local
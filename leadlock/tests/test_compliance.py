@@ -3,7 +3,7 @@ Compliance tests - EVERY TCPA rule must have a test.
 TCPA penalties: $500/violation minimum, $1,500 willful, NO CAP.
 """
 import pytest
-from datetime import datetime, time
+from datetime import datetime, time, timedelta, timezone
 from zoneinfo import ZoneInfo
 from src.services.compliance import (
     is_stop_keyword,
@@ -15,6 +15,7 @@ from src.services.compliance import (
     is_california_number,
     needs_ai_disclosure,
     get_ai_disclosure,
+    next_permissible_send,
     STOP_PHRASES,
 )
 
@@ -408,6 +409,44 @@ class TestFloridaHolidayBlocking:
         assert result.allowed is False
 
 
+# === NEXT PERMISSIBLE SEND ===
+
+class TestNextPermissibleSend:
+    def test_allowed_now_returns_now(self):
+        now = datetime(2026, 2, 17, 12, 0, tzinfo=ZoneInfo("America/New_York"))
+        assert next_permissible_send("NY", now=now) == now.astimezone(timezone.utc)
+
+    def test_before_window_opens_same_day(self):
+        now = datetime(2026, 2, 17, 7, 30, tzinfo=ZoneInfo("America/New_York"))
+        send_at = next_permissible_send("NY", now=now)
+        assert send_at == datetime(2026, 2, 17, 8, 0, tzinfo=ZoneInfo("America/New_York"))
+        assert send_at.tzinfo == timezone.utc
+
+    def test_after_window_closes_moves_to_next_morning(self):
+        now = datetime(2026, 2, 17, 21, 30, tzinfo=ZoneInfo("America/New_York"))
+        send_at = next_permissible_send("NY", now=now)
+        assert send_at == datetime(2026, 2, 18, 8, 0, tzinfo=ZoneInfo("America/New_York"))
+
+    def test_texas_sunday_waits_until_noon(self):
+        now = datetime(2026, 2, 15, 10, 0, tzinfo=ZoneInfo("America/Chicago"))
+        send_at = next_permissible_send("TX", now=now)
+        assert send_at == datetime(2026, 2, 15, 12, 0, tzinfo=ZoneInfo("America/Chicago"))
+
+    def test_florida_skips_holidays(self):
+        # Thanksgiving evening -> Friday is a holiday too -> Saturday morning
+        now = datetime(2026, 11, 26, 21, 0, tzinfo=ZoneInfo("America/New_York"))
+        send_at = next_permissible_send("FL", now=now)
+        assert send_at == datetime(2026, 11, 28, 8, 0, tzinfo=ZoneInfo("America/New_York"))
+
+    def test_result_passes_quiet_hours_check(self):
+        start = datetime(2026, 4, 2, 20, 0, tzinfo=ZoneInfo("America/New_York"))
+        for hours in range(0, 72, 5):
+            now = start + timedelta(hours=hours)
+            send_at = next_permissible_send("FL", now=now)
+            assert send_at >= now
+            assert check_quiet_hours("FL", now=send_at).allowed is True
+
+
 # === CALIFORNIA SB 1001 AI DISCLOSURE ===
 
 class TestCaliforniaAIDisclosure:
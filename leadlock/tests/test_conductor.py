@@ -18,6 +18,14 @@ from src.agents.conductor import (
 from src.schemas.lead_envelope import LeadEnvelope, NormalizedLead, LeadMetadata
 
 
+@pytest.fixture(autouse=True)
+def _empty_transcript():
+    """Mocked leads have no conversation rows - serve an empty transcript."""
+    with patch("src.services.transcript.recent_turns", new_callable=AsyncMock, return_value=[]), \
+         patch("src.services.transcript.append_turn", new_callable=AsyncMock):
+        yield
+
+
 # --- Helpers ---
 
 def _make_envelope(
@@ -87,7 +95,6 @@ def _make_lead(lead_id=None, state="qualifying", score=50):
     lead.total_sms_cost_usd = 0.01
     lead.total_ai_cost_usd = 0.0
     lead.conversation_turn = 1
-    lead.conversations = []
     lead.last_agent_response = None
     lead.previous_state = None
     lead.current_agent = "qualify"
@@ -201,6 +208,51 @@ class TestHandleNewLead:
         call_kwargs = mock_sms.call_args[1]
         assert call_kwargs.get("no_retry") is True
 
+    @patch("src.agents.conductor.record_stage_samples", new_callable=AsyncMock)
+    @patch("src.agents.conductor.needs_ai_disclosure", return_value=False)
+    @patch("src.services.compliance.check_content_compliance")
+    @patch("src.agents.conductor.full_compliance_check")
+    @patch("src.agents.conductor.send_sms", new_callable=AsyncMock)
+    @patch("src.agents.conductor.process_intake", new_callable=AsyncMock)
+    @patch("src.agents.conductor.get_monthly_lead_limit")
+    @patch("src.agents.conductor.is_duplicate", new_callable=AsyncMock)
+    @patch("src.agents.conductor.normalize_phone")
+    async def test_new_lead_records_stage_latencies(
+        self, mock_normalize, mock_dedup, mock_limit, mock_intake, mock_sms,
+        mock_compliance, mock_content, mock_ai_disc, mock_record,
+    ):
+        """Every pre-SMS stage is timed and the finished trace is sent to Redis."""
+        mock_normalize.return_value = "+15125559876"
+        mock_dedup.return_value = False
+        mock_limit.return_value = 100
+        mock_compliance.return_value = MagicMock(__bool__=lambda s: True)
+        mock_content.return_value = MagicMock(__bool__=lambda s: True)
+        intake_result = MagicMock()
+        intake_result.message = "Hi John! Reply STOP to opt out."
+        intake_result.template_id = "standard_A"
+        intake_result.is_emergency = False
+        mock_intake.return_value = intake_result
+        mock_sms.return_value = _sms_result()
+
+        client = _make_client()
+        db = AsyncMock()
+        db.add = MagicMock()
+        db.get = AsyncMock(return_value=client)
+        mock_execute_result = MagicMock()
+        mock_execute_result.scalar.return_value = 0
+        mock_execute_result.scalar_one_or_none.return_value = None
+        db.execute = AsyncMock(return_value=mock_execute_result)
+
+        result = await handle_new_lead(db, _make_envelope(client_id=str(client.id)))
+
+        assert result["status"] == "intake_sent"
+        trace = mock_record.call_args[0][0]
+        assert set(trace.stages) == {
+            "dedup", "client_load", "monthly_limit", "consent_flush", "lead_flush",
+            "commit", "optout_lookup", "template_render", "sms_send",
+        }
+        assert trace.total_ms == result["response_ms"]
+
     @patch("src.agents.conductor.needs_ai_disclosure", return_value=False)
     @patch("src.services.compliance.check_content_compliance")
     @patch("src.agents.conductor.full_compliance_check")
@@ -0,0 +1,75 @@
+"""
+Tests for src/utils/crawl.py - bounded concurrent page fetching with
+priority-ordered results and early termination.
+"""
+import asyncio
+
+import pytest
+
+from src.utils import crawl as crawl_module
+from src.utils.crawl import crawl
+
+
+class TestCrawl:
+    @pytest.mark.asyncio
+    async def test_results_follow_url_order(self):
+        delays = {"https://a.com/1": 0.03, "https://a.com/2": 0.0, "https://a.com/3": 0.01}
+
+        async def _fetch(url):
+            await asyncio.sleep(delays[url])
+            return url[-1]
+
+        assert await crawl(list(delays), _fetch) == ["1", "2", "3"]
+
+    @pytest.mark.asyncio
+    async def test_stop_cancels_lower_priority_pages(self):
+        cancelled: list[str] = []
+
+        async def _fetch(url):
+            if url.endswith("/hit"):
+                return "mailto"
+            if url.endswith("/first"):
+                await asyncio.sleep(0.01)
+                return None
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.append(url)
+                raise
+
+        urls = ["https://a.com/first", "https://a.com/hit", "https://a.com/slow"]
+        results = await crawl(urls, _fetch, stop=lambda page: page == "mailto")
+
+        assert results == [None, "mailto"]
+        assert cancelled == ["https://a.com/slow"]
+
+    @pytest.mark.asyncio
+    async def test_fetch_errors_count_as_empty(self):
+        async def _fetch(url):
+            if url.endswith("/bad"):
+                raise ConnectionError("reset")
+            return "ok"
+
+        assert await crawl(["https://a.com/bad", "https://a.com/good"], _fetch) == [None, "ok"]
+
+    @pytest.mark.asyncio
+    async def test_per_host_fan_out_is_bounded(self):
+        in_flight = {"a.com": 0, "b.com": 0}
+        peak = {"a.com": 0, "b.com": 0}
+
+        async def _fetch(url):
+            host = url.split("/")[2]
+            in_flight[host] += 1
+            peak[host] = max(peak[host], in_flight[host])
+            await asyncio.sleep(0.01)
+            in_flight[host] -= 1
+            return host
+
+        urls = [f"https://{host}/{n}" for n in range(10) for host in ("a.com", "b.com")]
+        results = await crawl(urls, _fetch)
+
+        assert len(results) == 20
+        assert peak == {
+            "a.com": crawl_module.PER_HOST_CONCURRENCY,
+            "b.com": crawl_module.PER_HOST_CONCURRENCY,
+        }
@@ -146,6 +146,45 @@ class TestServiceTitanCRM:
         assert token == "new_tok"
         mock_client.post.assert_called_once()
 
+    async def test_token_shared_across_instances_with_one_refresh(self):
+        import asyncio
+
+        first, second = self._make_crm(), self._make_crm()
+        token_response = _make_mock_response({
+            "access_token": "shared_tok",
+            "expires_in": 900,
+        })
+        mock_client = _build_mock_client(post_response=token_response)
+
+        with patch("httpx.AsyncClient", return_value=mock_client):
+            tokens = await asyncio.gather(first._get_token(), second._get_token())
+            later = await self._make_crm()._get_token()
+
+        assert tokens == ["shared_tok", "shared_tok"]
+        assert later == "shared_tok"
+        # Concurrent refreshes for one tenant collapse into a single POST
+        mock_client.post.assert_called_once()
+
+    async def test_token_not_shared_across_credentials(self):
+        from src.integrations.servicetitan import ServiceTitanCRM
+
+        mock_client = _build_mock_client(post_response=_make_mock_response({
+            "access_token": "tok",
+            "expires_in": 900,
+        }))
+        other = ServiceTitanCRM(
+            client_id="other_client_id",
+            client_secret="other_secret",
+            app_key="test_app_key",
+            tenant_id="999",
+        )
+
+        with patch("httpx.AsyncClient", return_value=mock_client):
+            await self._make_crm()._get_token()
+            await other._get_token()
+
+        assert mock_client.post.call_count == 2
+
     # -- create_customer -------------------------------------------------
 
     async def test_create_customer_success(self):
@@ -0,0 +1,172 @@
+"""
+Tests for src/services/due_index.py - the "next due at" index that wakes
+sms_dispatch and crm_sync. Redis is mocked.
+"""
+import time
+import uuid
+from datetime import date, datetime, time as dt_time, timedelta, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from src.services import due_index
+
+REDIS_PATCH = "src.utils.dedup.get_redis"
+
+
+def _redis(earliest=None, brpop=None):
+    redis = MagicMock()
+    pipe = MagicMock()
+    pipe.execute = AsyncMock(return_value=[])
+    redis.pipeline.return_value = pipe
+    redis.zrange = AsyncMock(return_value=earliest or [])
+    redis.zremrangebyscore = AsyncMock(return_value=2)
+    redis.brpop = AsyncMock(return_value=brpop)
+    redis.delete = AsyncMock()
+    return redis
+
+
+class TestSchedule:
+    async def test_adds_members_and_notifies(self):
+        redis = _redis()
+        due_at = datetime(2026, 3, 2, 15, 0, tzinfo=timezone.utc)
+
+        with patch(REDIS_PATCH, new_callable=AsyncMock, return_value=redis):
+            before = time.time()
+            await due_index.schedule("sms_dispatch", {"followup:1": due_at, "backlog": None})
+
+        pipe = redis.pipeline.return_value
+        key, scores = pipe.zadd.call_args.args
+        assert key == "leadlock:due:sms_dispatch"
+        assert scores["followup:1"] == due_at.timestamp()
+        assert before <= scores["backlog"] <= time.time()
+        pipe.lpush.assert_called_once_with("leadlock:due:sms_dispatch:notify", "1")
+        pipe.ltrim.assert_called_once_with("leadlock:due:sms_dispatch:notify", 0, 0)
+
+    async def test_naive_datetimes_are_utc(self):
+        redis = _redis()
+        with patch(REDIS_PATCH, new_callable=AsyncMock, return_value=redis):
+            await due_index.schedule("crm_sync", {"booking:1": datetime(2026, 3, 2, 15, 0)})
+
+        scores = redis.pipeline.return_value.zadd.call_args.args[1]
+        assert scores["booking:1"] == datetime(2026, 3, 2, 15, 0, tzinfo=timezone.utc).timestamp()
+
+    async def test_redis_failure_is_ignored(self):
+        with patch(REDIS_PATCH, new_callable=AsyncMock, side_effect=ConnectionError("down")):
+            await due_index.schedule("crm_sync", {"booking:1": None})
+
+
+class TestConsume:
+    async def test_removes_due_entries(self):
+        redis = _redis()
+        with patch(REDIS_PATCH, new_callable=AsyncMock, return_value=redis):
+            assert await due_index.consume("crm_sync") == 2
+
+        key, low, high = redis.zremrangebyscore.call_args.args
+        assert (key, low) == ("leadlock:due:crm_sync", "-inf")
+        assert high <= time.time()
+
+
+class TestWait:
+    async def test_returns_at_once_when_already_due(self):
+        redis = _redis(earliest=[("followup:1", time.time() - 5)])
+        with patch(REDIS_PATCH, new_callable=AsyncMock, return_value=redis):
+            await due_index.wait("sms_dispatch", 180)
+
+        redis.brpop.assert_not_called()
+        redis.delete.assert_awaited_once_with("leadlock:due:sms_dispatch:notify")
+
+    async def test_blocks_until_earliest_entry(self):
+        redis = _redis(earliest=[("followup:1", time.time() + 4.2)])
+        with patch(REDIS_PATCH, new_callable=AsyncMock, return_value=redis):
+            await due_index.wait("sms_dispatch", 180)
+
+        redis.brpop.assert_awaited_once_with("leadlock:due:sms_dispatch:notify", timeout=5)
+
+    async def test_blocks_for_max_wait_when_index_empty(self):
+        redis = _redis(brpop=("leadlock:due:crm_sync:notify", "1"))
+        with patch(REDIS_PATCH, new_callable=AsyncMock, return_value=redis):
+            await due_index.wait("crm_sync", 180)
+
+        redis.brpop.assert_awaited_once_with("leadlock:due:crm_sync:notify", timeout=180)
+        # Woken by a notification: clear it so the next wait blocks again
+        redis.delete.assert_awaited_once_with("leadlock:due:crm_sync:notify")
+
+    async def test_falls_back_to_fixed_poll(self):
+        with patch(REDIS_PATCH, new_callable=AsyncMock, side_effect=ConnectionError("down")), \
+             patch("src.services.due_index.asyncio.sleep", new_callable=AsyncMock) as mock_sleep:
+            await due_index.wait("crm_sync", 180, fallback_seconds=30)
+
+        mock_sleep.assert_awaited_once_with(30)
+
+
+class TestProducers:
+    async def test_booking_reminder_due_times(self):
+        from src.workers.sms_dispatch import schedule_booking_reminders
+
+        booking = MagicMock()
+        booking.id = uuid.uuid4()
+        booking.appointment_date = date(2026, 3, 10)
+        booking.time_window_start = dt_time(14, 0)
+
+        with patch("src.services.due_index.schedule", new_callable=AsyncMock) as mock_schedule:
+            await schedule_booking_reminders(booking)
+
+        worker, items = mock_schedule.await_args.args
+        assert worker == "sms_dispatch"
+        assert items[f"reminder:{booking.id}"] == datetime(2026, 3, 9).astimezone(timezone.utc)
+        assert items[f"same_day:{booking.id}"] == datetime(2026, 3, 10, 12, 0, tzinfo=timezone.utc)
+
+    async def test_crm_retry_registers_next_attempt(self, db):
+        from contextlib import asynccontextmanager
+
+        from src.models.booking import Booking
+        from src.models.client import Client
+        from src.models.lead import Lead
+        from src.workers import crm_sync
+
+        client = Client(business_name="Cool HVAC Co", trade_type="hvac", crm_type="jobber")
+        db.add(client)
+        await db.flush()
+        lead = Lead(client_id=client.id, phone="+15125551234", source="google_lsa")
+        db.add(lead)
+        await db.flush()
+        booking = Booking(
+            lead_id=lead.id, client_id=client.id,
+            appointment_date=date(2026, 3, 10), service_type="AC Repair",
+        )
+        db.add(booking)
+        await db.commit()
+
+        @asynccontextmanager
+        async def _factory():
+            yield db
+
+        with patch.object(crm_sync, "async_session_factory", _factory), \
+             patch.object(crm_sync, "sync_booking", AsyncMock(side_effect=RuntimeError("CRM down"))), \
+             patch("src.services.due_index.schedule", new_callable=AsyncMock) as mock_schedule:
+            await crm_sync.sync_pending_bookings()
+
+        worker, items = mock_schedule.await_args.args
+        assert worker == "crm_sync"
+        retry_at = items[f"booking:{booking.id}"]
+        assert retry_at == booking.crm_next_retry_at
+        assert timedelta(seconds=25) < retry_at - datetime.now(timezone.utc) <= timedelta(seconds=30)
+
+    async def test_sms_dispatch_waits_on_due_index(self):
+        from src.workers import sms_dispatch
+
+        with patch.object(sms_dispatch, "_process_due_followups", AsyncMock()), \
+             patch.object(sms_dispatch, "_send_due_reminders", AsyncMock(return_value=0)), \
+             patch.object(sms_dispatch, "_send_same_day_reminders", AsyncMock(return_value=0)), \
+             patch.object(sms_dispatch, "_heartbeat", AsyncMock()), \
+             patch("src.services.due_index.consume", new_callable=AsyncMock) as mock_consume, \
+             patch("src.services.due_index.wait", new_callable=AsyncMock, side_effect=KeyboardInterrupt) as mock_wait:
+            with pytest.raises(KeyboardInterrupt):
+                await sms_dispatch.run_sms_dispatch()
+
+        mock_consume.assert_awaited_once_with("sms_dispatch")
+        mock_wait.assert_awaited_once_with(
+            "sms_dispatch", sms_dispatch.IDLE_WAIT_SECONDS,
+            fallback_seconds=sms_dispatch.POLL_INTERVAL_SECONDS,
+        )
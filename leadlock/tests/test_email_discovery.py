@@ -9,6 +9,7 @@ Covers:
 - enrichment_data fallback
 - pattern_guess last resort
 """
+import asyncio
 import json
 import pytest
 from unittest.mock import AsyncMock, MagicMock, patch
@@ -384,6 +385,34 @@ class TestDeepScrapeWebsite:
         assert checked == ["https://www.biz.com", "https://biz.com"]
 
 
+    @pytest.mark.asyncio
+    async def test_stops_at_first_page_with_mailto(self):
+        """Pages after the first mailto: hit are not fetched; earlier pages still count."""
+        pages = {
+            "https://biz.com/contact": "Write to office@biz.com",
+            "https://biz.com/contact-us": '<a href="mailto:owner@biz.com">Email</a>',
+        }
+        never = asyncio.Event()
+
+        async def _fetch(session, url):
+            if url in pages:
+                return pages[url]
+            # Lower-priority pages hang until the crawl cancels them
+            await never.wait()
+
+        with patch(
+            "src.services.email_discovery._is_safe_url",
+            new_callable=AsyncMock,
+            return_value=True,
+        ), patch(
+            "src.services.email_discovery._fetch_html",
+            side_effect=_fetch,
+        ):
+            result = await deep_scrape_website("https://biz.com")
+
+        assert result == ["office@biz.com", "owner@biz.com"]
+
+
 class TestConfidenceDowngrades:
     """Test confidence assignment for generic vs personal emails in Strategy 1."""
 
@@ -298,3 +298,39 @@ class TestProcessBatch:
         assert prospect.prospect_email == "info@unknownco.com"
         # Attempt should be stamped
         assert prospect.email_discovery_attempted_at is not None
+
+    @pytest.mark.asyncio
+    async def test_discovers_prospects_concurrently(self):
+        """A slow prospect does not hold up the rest of the batch."""
+        slow = _make_prospect(prospect_name="Slow Co", website="https://slow.com")
+        fast = _make_prospect(prospect_name="Fast Co", website="https://fast.com")
+        mock_session = _make_mock_session(2, 2, [slow, fast])
+        fast_done = asyncio.Event()
+
+        async def _discover(website, **kwargs):
+            if website == "https://slow.com":
+                # Only finishes once the fast prospect has been discovered
+                await asyncio.wait_for(fast_done.wait(), timeout=1.0)
+                return {"email": None, "source": None, "confidence": None, "cost_usd": 0.0}
+            fast_done.set()
+            return {
+                "email": "owner@fast.com",
+                "source": "website_deep_scrape",
+                "confidence": "high",
+                "cost_usd": 0.0,
+            }
+
+        with patch(
+            "src.workers.email_finder.async_session_factory",
+            return_value=mock_session,
+        ), patch(
+            "src.workers.email_finder.discover_email",
+            side_effect=_discover,
+        ):
+            from src.workers.email_finder import _process_batch
+            await _process_batch()
+
+        assert fast.prospect_email == "owner@fast.com"
+        assert slow.prospect_email == "info@hvacpro.com"
+        assert slow.email_discovery_attempted_at is not None
+        assert mock_session.commit.await_count == 2
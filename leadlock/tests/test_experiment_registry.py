@@ -0,0 +1,131 @@
+"""
+Tests for src/services/experiment_registry.py - the per-process cache of
+active A/B experiments behind get_active_experiment.
+Experiments live in an in-memory SQLite database; Redis is mocked.
+"""
+import json
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from src.models.ab_test import ABTestExperiment, ABTestVariant
+from src.services import client_cache, experiment_registry
+from src.services.ab_testing import check_and_declare_winner, get_active_experiment
+
+REDIS_PATCH = "src.utils.dedup.get_redis"
+
+
+@pytest.fixture(autouse=True)
+def _fresh_registry():
+    experiment_registry.invalidate_registry()
+    yield
+    experiment_registry.invalidate_registry()
+
+
+@pytest.fixture
+def session_factory(db):
+    calls = []
+
+    @asynccontextmanager
+    async def _factory():
+        calls.append(1)
+        yield db
+
+    _factory.calls = calls
+    with (
+        patch.object(experiment_registry, "async_session_factory", _factory),
+        patch("src.services.ab_testing.async_session_factory", _factory),
+        # No pending Redis counters
+        patch(REDIS_PATCH, new_callable=AsyncMock, side_effect=ConnectionError("down")),
+    ):
+        yield _factory
+
+
+async def _add_experiment(db, step=1, trade=None, status="active", labels=("A", "B"), **fields):
+    experiment = ABTestExperiment(
+        name=f"Step {step} - {trade or 'all'}", status=status,
+        sequence_step=step, target_trade=trade, min_sample_per_variant=30,
+    )
+    db.add(experiment)
+    await db.flush()
+    for label in labels:
+        db.add(ABTestVariant(
+            experiment_id=experiment.id, variant_label=label,
+            subject_instruction=f"angle {label}", **fields.get(label, {}),
+        ))
+    await db.commit()
+    return experiment
+
+
+class TestFindExperiment:
+    async def test_prefers_trade_specific_experiment(self, db, session_factory):
+        general = await _add_experiment(db, step=1)
+        hvac = await _add_experiment(db, step=1, trade="hvac", labels=("A", "B", "C"))
+        await _add_experiment(db, step=2, status="completed")
+
+        found = await get_active_experiment(1, "hvac")
+        assert found["experiment_id"] == str(hvac.id)
+        assert [v["label"] for v in found["variants"]] == ["A", "B", "C"]
+        assert found["variants"][0]["instruction"] == "angle A"
+
+        assert (await get_active_experiment(1, "plumbing"))["experiment_id"] == str(general.id)
+        assert (await get_active_experiment(1))["experiment_id"] == str(general.id)
+        assert await get_active_experiment(2, "hvac") is None
+
+    async def test_loads_once_per_ttl(self, db, session_factory):
+        await _add_experiment(db, step=1)
+
+        for _ in range(5):
+            assert await get_active_experiment(1, "hvac") is not None
+        assert len(session_factory.calls) == 1
+
+        experiment_registry.invalidate_registry()
+        await get_active_experiment(1)
+        assert len(session_factory.calls) == 2
+
+    async def test_reloads_after_ttl(self, db, session_factory):
+        assert await get_active_experiment(1) is None
+        await _add_experiment(db, step=1)
+
+        assert await get_active_experiment(1) is None  # cached miss
+        with patch.object(experiment_registry, "REGISTRY_TTL_SECONDS", 0):
+            assert await get_active_experiment(1) is not None
+
+
+class TestInvalidation:
+    async def test_winner_drops_registry_and_publishes(self, db, session_factory):
+        experiment = await _add_experiment(db, step=1, **{
+            "A": {"total_sent": 40, "total_opened": 20, "open_rate": 0.5},
+            "B": {"total_sent": 40, "total_opened": 8, "open_rate": 0.2},
+        })
+        assert await get_active_experiment(1) is not None
+
+        with (
+            patch("src.services.winning_patterns.store_winning_pattern", AsyncMock()),
+            patch("src.services.event_bus.publish_event", new_callable=AsyncMock) as mock_publish,
+        ):
+            assert (await check_and_declare_winner(str(experiment.id)))["winner_label"] == "A"
+
+        mock_publish.assert_awaited_once_with("ab_test_winner", {
+            "experiment_id": str(experiment.id), "sequence_step": 1, "target_trade": None,
+        })
+        assert await get_active_experiment(1) is None
+
+    async def test_bus_message_drops_registry(self, db, session_factory):
+        await _add_experiment(db, step=1)
+        await get_active_experiment(1)
+
+        client_cache._handle_bus_message(json.dumps({"type": "ab_test_winner", "data": {}}))
+
+        assert experiment_registry._loaded_at == 0.0
+
+    async def test_handle_events_drops_registry(self, db, session_factory):
+        from src.services.event_bus import handle_events
+
+        await _add_experiment(db, step=1)
+        await get_active_experiment(1)
+
+        await handle_events([{"type": "ab_test_winner", "data": {}}])
+
+        assert experiment_registry._loaded_at == 0.0
@@ -13,6 +13,7 @@ from datetime import datetime, timezone, timedelta
 from unittest.mock import AsyncMock, MagicMock, patch, call
 
 import pytest
+from sqlalchemy import select, update
 
 from src.models.client import Client
 from src.models.consent import ConsentRecord
@@ -331,6 +332,121 @@ class TestProcessDueTasks:
         assert task.status == "failed"
 
 
+    async def test_batch_loads_context_once_and_sends_each_task(self, db):
+        """Clients are loaded once per batch; each task is sent."""
+        tasks = []
+        for phone in ("+15121110000", "+15122220000"):
+            lead_id, client_id, consent_id = _make_ids()
+            db.add_all([
+                _make_client(client_id, twilio_phone=phone),
+                _make_consent(consent_id, client_id),
+                _make_lead(lead_id, client_id, consent_id=consent_id),
+            ])
+            tasks.append(_make_task(lead_id, client_id))
+        db.add_all(tasks)
+        await db.commit()
+
+        from src.workers import sms_dispatch
+        followup_response = FollowupResponse(message="Hi Jane!", followup_type="cold_nurture", sequence_number=1)
+        sms_result = {"sid": "SM1", "status": "sent", "provider": "twilio", "segments": 1, "cost_usd": 0.0079}
+
+        with patch("src.workers.sms_dispatch.async_session_factory") as factory_mock, \
+             patch.object(sms_dispatch, "FOLLOWUP_CONCURRENCY", 1), \
+             patch.object(sms_dispatch, "_load_followup_context", wraps=sms_dispatch._load_followup_context) as load_mock, \
+             patch("src.workers.sms_dispatch.full_compliance_check", return_value=ComplianceResult(True, "ok")), \
+             patch("src.workers.sms_dispatch.check_content_compliance", return_value=ComplianceResult(True, "ok")), \
+             patch("src.workers.sms_dispatch.process_followup", new_callable=AsyncMock, return_value=followup_response), \
+             patch("src.workers.sms_dispatch.send_sms", new_callable=AsyncMock, return_value=sms_result) as send_mock, \
+             patch("src.workers.sms_dispatch.is_cold_followup_enabled", return_value=True):
+
+            session_cm = AsyncMock()
+            session_cm.__aenter__ = AsyncMock(return_value=db)
+            session_cm.__aexit__ = AsyncMock(return_value=False)
+            factory_mock.return_value = session_cm
+
+            await sms_dispatch._process_due_followups()
+
+        load_mock.assert_awaited_once()
+        assert sorted(c.kwargs["from_phone"] for c in send_mock.await_args_list) == [
+            "+15121110000", "+15122220000",
+        ]
+        for task in tasks:
+            await db.refresh(task)
+            assert task.status == "sent"
+
+    async def test_throttled_number_releases_remaining_tasks(self, db):
+        """Once a number is throttled, its tasks stay pending until the throttle window passes."""
+        _, client_id, _ = _make_ids()
+        db.add(_make_client(client_id))
+        tasks = []
+        for _ in range(2):
+            lead_id = uuid.uuid4()
+            db.add(_make_lead(lead_id, client_id))
+            tasks.append(_make_task(lead_id, client_id, task_type="re_engage"))
+        db.add_all(tasks)
+        await db.commit()
+
+        from src.workers import sms_dispatch
+        followup_response = FollowupResponse(message="Hi Jane!", followup_type="re_engage", sequence_number=1)
+        throttled = {"sid": None, "status": "throttled", "provider": "none", "segments": 1, "cost_usd": 0.0}
+
+        with patch("src.workers.sms_dispatch.async_session_factory") as factory_mock, \
+             patch.object(sms_dispatch, "SENDS_PER_NUMBER", 1), \
+             patch("src.workers.sms_dispatch.full_compliance_check", return_value=ComplianceResult(True, "ok")), \
+             patch("src.workers.sms_dispatch.check_content_compliance", return_value=ComplianceResult(True, "ok")), \
+             patch("src.workers.sms_dispatch.process_followup", new_callable=AsyncMock, return_value=followup_response), \
+             patch("src.workers.sms_dispatch.send_sms", new_callable=AsyncMock, return_value=throttled) as send_mock, \
+             patch("src.services.due_index.schedule", new_callable=AsyncMock) as schedule_mock:
+
+            session_cm = AsyncMock()
+            session_cm.__aenter__ = AsyncMock(return_value=db)
+            session_cm.__aexit__ = AsyncMock(return_value=False)
+            factory_mock.return_value = session_cm
+
+            await sms_dispatch._process_due_followups()
+
+        send_mock.assert_awaited_once()
+        now = datetime.now(timezone.utc)
+        for task in tasks:
+            await db.refresh(task)
+            assert task.status == "pending"
+            assert task.attempt_count == 0
+            retry_in = (task.scheduled_at.replace(tzinfo=timezone.utc) - now).total_seconds()
+            assert 0 < retry_in <= sms_dispatch.THROTTLE_BACKOFF_SECONDS
+        # Both tasks are registered with the due index for their retry
+        scheduled = {}
+        for c in schedule_mock.await_args_list:
+            scheduled.update(c.args[1])
+        assert set(scheduled) == {f"followup:{task.id}" for task in tasks}
+        conversations = (await db.execute(select(Conversation))).scalars().all()
+        assert conversations == []
+
+    async def test_task_changed_after_claim_is_skipped(self, db):
+        """A task whose lease no longer matches is left alone."""
+        lead_id, client_id, _ = _make_ids()
+        client = _make_client(client_id)
+        lead = _make_lead(lead_id, client_id)
+        task = _make_task(lead_id, client_id)
+        db.add_all([client, lead, task])
+        await db.commit()
+
+        from src.workers import sms_dispatch
+        context = await sms_dispatch._load_followup_context(db, [task])
+        snapshot = {"id": task.id, "lead_id": lead_id, "client_id": client_id, "scheduled_at": task.scheduled_at}
+
+        with patch("src.workers.sms_dispatch.async_session_factory") as factory_mock, \
+             patch.object(sms_dispatch, "_execute_followup_task", new_callable=AsyncMock) as exec_mock:
+            session_cm = AsyncMock()
+            session_cm.__aenter__ = AsyncMock(return_value=db)
+            session_cm.__aexit__ = AsyncMock(return_value=False)
+            factory_mock.return_value = session_cm
+
+            claimed_until = datetime.now(timezone.utc) + timedelta(minutes=5)
+            assert await sms_dispatch._run_followup_task(snapshot, context, claimed_until) is None
+
+        exec_mock.assert_not_called()
+
+
 # ---------------------------------------------------------------------------
 # _execute_followup_task
 # ---------------------------------------------------------------------------
@@ -341,6 +457,39 @@ class TestExecuteFollowupTask:
 
     # ---- Skip paths ----
 
+    async def test_opt_out_after_claim_is_seen(self, db):
+        """Compliance sees an opt-out committed after the batch loaded the lead."""
+        lead_id, client_id, consent_id = _make_ids()
+        client = _make_client(client_id)
+        consent = _make_consent(consent_id, client_id)
+        lead = _make_lead(lead_id, client_id, consent_id=consent_id, state="cold")
+        task = _make_task(lead_id, client_id, task_type="re_engage")
+        db.add_all([client, consent, lead, task])
+        await db.commit()
+
+        from src.workers import sms_dispatch
+        context = await sms_dispatch._load_followup_context(db, [task])
+        # Opt-out lands through another session; the loaded objects are stale
+        await db.execute(
+            update(ConsentRecord).where(ConsentRecord.id == consent_id).values(opted_out=True)
+            .execution_options(synchronize_session=False)
+        )
+        await db.execute(
+            update(Lead).where(Lead.id == lead_id).values(state_code="FL")
+            .execution_options(synchronize_session=False)
+        )
+
+        with patch(
+            "src.workers.sms_dispatch.full_compliance_check",
+            return_value=ComplianceResult(False, "Opted out"),
+        ) as comp_mock, patch("src.workers.sms_dispatch.send_sms", new_callable=AsyncMock) as send_mock:
+            await sms_dispatch._execute_followup_task(db, task, context)
+
+        assert comp_mock.call_args.kwargs["is_opted_out"] is True
+        assert comp_mock.call_args.kwargs["state_code"] == "FL"
+        send_mock.assert_not_awaited()
+        assert task.status == "skipped"
+
     async def test_skips_when_lead_not_found(self, db):
         """Task skipped when lead does not exist."""
         _, client_id, _ = _make_ids()
@@ -471,6 +620,7 @@ class TestExecuteFollowupTask:
             await _execute_followup_task(db, task)
 
         assert task.status == "sent"
+        await db.refresh(lead)
         assert lead.cold_outreach_count == 1
 
     async def test_cold_nurture_proceeds_when_lead_state_intake_sent(self, db):
@@ -512,7 +662,7 @@ class TestExecuteFollowupTask:
         db.add_all([client, consent, lead, task])
         await db.commit()
 
-        blocked = ComplianceResult(False, "Quiet hours active", "tcpa_quiet_hours")
+        blocked = ComplianceResult(False, "Consent revoked", "consent_opted_out")
 
         with patch("src.workers.sms_dispatch.is_cold_followup_enabled", return_value=True), \
              patch("src.workers.sms_dispatch.full_compliance_check", return_value=blocked):
@@ -520,7 +670,33 @@ class TestExecuteFollowupTask:
             await _execute_followup_task(db, task)
 
         assert task.status == "skipped"
-        assert task.skip_reason == "Quiet hours active"
+        assert task.skip_reason == "Consent revoked"
+
+    async def test_defers_when_quiet_hours_block(self, db):
+        """Quiet-hours blocks move scheduled_at to the next permissible instant."""
+        lead_id, client_id, consent_id = _make_ids()
+        client = _make_client(client_id, tier="pro")
+        consent = _make_consent(consent_id, client_id)
+        lead = _make_lead(lead_id, client_id, consent_id=consent_id, state="cold")
+        task = _make_task(lead_id, client_id, task_type="cold_nurture")
+
+        db.add_all([client, consent, lead, task])
+        await db.commit()
+
+        blocked = ComplianceResult(False, "Quiet hours active", "tcpa_quiet_hours")
+        send_at = datetime.now(timezone.utc) + timedelta(hours=9)
+
+        with patch("src.workers.sms_dispatch.is_cold_followup_enabled", return_value=True), \
+             patch("src.workers.sms_dispatch.full_compliance_check", return_value=blocked), \
+             patch("src.workers.sms_dispatch.next_permissible_send", return_value=send_at) as next_send, \
+             patch("src.workers.sms_dispatch.process_followup", new_callable=AsyncMock) as followup:
+            from src.workers.sms_dispatch import _execute_followup_task
+            await _execute_followup_task(db, task)
+
+        assert task.status == "pending"
+        assert task.scheduled_at == send_at
+        next_send.assert_called_once_with(lead.state_code)
+        followup.assert_not_called()
 
     async def test_skips_when_content_compliance_fails(self, db):
         """Task skipped when check_content_compliance fails on the generated message."""
@@ -642,7 +818,8 @@ class TestExecuteFollowupTask:
         assert task.sent_at is not None
         assert task.message_content == msg_text
 
-        # Lead updates
+        # Lead updates (counters are bumped in SQL)
+        await db.refresh(lead)
         assert lead.total_messages_sent == 1
         assert lead.total_sms_cost_usd == 0.0158
         assert lead.last_outbound_at is not None
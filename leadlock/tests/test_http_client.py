@@ -0,0 +1,106 @@
+"""
+Tests for src/utils/http_client.py - shared pooled outbound HTTP clients.
+"""
+import httpx
+import pytest
+
+from src.utils import http_client
+from src.utils.http_client import (
+    close_http_clients,
+    get_http_client,
+    get_http_client_stats,
+)
+
+
+@pytest.fixture(autouse=True)
+def _clean_stats():
+    http_client._stats.clear()
+    yield
+    http_client._stats.clear()
+
+
+class TestGetHttpClient:
+    async def test_same_host_reuses_client(self):
+        a = get_http_client("https://api.getjobber.com/api/graphql")
+        b = get_http_client("https://api.getjobber.com/other")
+        assert a is b
+        await close_http_clients()
+
+    async def test_different_hosts_get_separate_pools(self):
+        a = get_http_client("https://api.getjobber.com/api/graphql")
+        b = get_http_client("https://api.housecallpro.com")
+        assert a is not b
+        await close_http_clients()
+
+    async def test_named_pool(self):
+        assert get_http_client("web") is get_http_client("WEB")
+        await close_http_clients()
+
+    async def test_upstream_limits_applied(self):
+        client = get_http_client("https://auth.servicetitan.io/connect/token")
+        pool = client._transport._pool
+        assert pool._max_connections == 4
+        assert pool._max_keepalive_connections == 2
+        await close_http_clients()
+
+    async def test_closed_client_is_recreated(self):
+        a = get_http_client("https://api.telnyx.com/v2/messages")
+        await a.aclose()
+        b = get_http_client("https://api.telnyx.com/v2/messages")
+        assert b is not a
+        assert not b.is_closed
+        await close_http_clients()
+
+    async def test_response_cookies_are_not_kept(self):
+        client = get_http_client("web")
+        request = httpx.Request("GET", "https://contractor.example.com/contact")
+        response = httpx.Response(
+            200, request=request,
+            headers={"set-cookie": "session=abc123; Domain=contractor.example.com; Path=/"},
+        )
+
+        client.cookies.extract_cookies(response)
+
+        assert len(client.cookies.jar) == 0
+        next_request = client.build_request("GET", "https://contractor.example.com/about")
+        assert "cookie" not in next_request.headers
+        await close_http_clients()
+
+
+class TestCloseHttpClients:
+    async def test_closes_and_clears(self):
+        client = get_http_client("https://api.telnyx.com")
+        await close_http_clients()
+        assert client.is_closed
+        assert http_client._clients == {}
+
+    async def test_noop_when_empty(self):
+        await close_http_clients()
+        assert http_client._clients == {}
+
+
+class TestStats:
+    async def test_request_hook_counts_and_sets_trace(self):
+        client = get_http_client("https://api.telnyx.com")
+        request = httpx.Request("POST", "https://api.telnyx.com/v2/messages")
+        await client.event_hooks["request"][0](request)
+        await client.event_hooks["request"][0](request)
+        await request.extensions["trace"]("connection.connect_tcp.complete", {})
+
+        stats = get_http_client_stats()["api.telnyx.com"]
+        assert stats["requests"] == 2
+        assert stats["connections_opened"] == 1
+        assert stats["reused"] == 1
+        assert stats["reuse_ratio"] == 0.5
+        await close_http_clients()
+
+    async def test_server_errors_counted(self):
+        client = get_http_client("https://api.telnyx.com")
+        request = httpx.Request("POST", "https://api.telnyx.com/v2/messages")
+        await client.event_hooks["response"][0](httpx.Response(503, request=request))
+        await client.event_hooks["response"][0](httpx.Response(200, request=request))
+        assert get_http_client_stats()["api.telnyx.com"]["errors"] == 1
+        await close_http_clients()
+
+    def test_empty_stats(self):
+        assert get_http_client_stats() == {}
@@ -0,0 +1,254 @@
+"""
+Tests for the queued inbound SMS path - src/services/inbound_queue.py and
+src/workers/inbound_sms.py. Webhook events live in an in-memory SQLite
+database; Redis and the conductor are mocked.
+"""
+import asyncio
+import uuid
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from sqlalchemy import select
+
+from src.models.client import Client
+from src.models.lead import Lead
+from src.models.webhook_event import WebhookEvent
+from src.services import inbound_queue
+from src.workers import inbound_sms
+
+REDIS_PATCH = "src.utils.dedup.get_redis"
+
+
+@pytest.fixture
+def session_factory(db):
+    @asynccontextmanager
+    async def _factory():
+        yield db
+
+    with (
+        patch.object(inbound_sms, "async_session_factory", _factory),
+        # Client lookups fall through to the DB
+        patch(REDIS_PATCH, new_callable=AsyncMock, side_effect=ConnectionError("down")),
+    ):
+        yield _factory
+
+
+async def _add_event(
+    db, client, *, status="queued", body="Need AC repair", received_at=None, claimed_at=None,
+):
+    event = WebhookEvent(
+        source="twilio",
+        event_type="inbound_sms",
+        payload_hash="a" * 64,
+        raw_payload={"From": "+15125559876", "Body": body},
+        client_id=client.id,
+        processing_status=status,
+        received_at=received_at or datetime.now(timezone.utc),
+        claimed_at=claimed_at,
+    )
+    db.add(event)
+    await db.commit()
+    return event
+
+
+@pytest.fixture
+async def client(db):
+    client = Client(
+        business_name="Cool HVAC Co", trade_type="hvac",
+        twilio_phone="+15125550000", billing_status="active",
+    )
+    db.add(client)
+    await db.commit()
+    return client
+
+
+class TestPartitioning:
+    def test_same_lead_same_partition(self):
+        client_id = uuid.uuid4()
+        partition = inbound_queue.partition_for(client_id, "+15125559876")
+        assert partition == inbound_queue.partition_for(client_id, "+15125559876")
+        assert 0 <= partition < inbound_queue.PARTITIONS
+
+    def test_leads_spread_across_partitions(self):
+        client_id = uuid.uuid4()
+        partitions = {inbound_queue.partition_for(client_id, f"+1512555{n:04d}") for n in range(200)}
+        assert len(partitions) == inbound_queue.PARTITIONS
+
+    async def test_enqueue_adds_to_partition_stream(self):
+        redis = MagicMock()
+        redis.xadd = AsyncMock()
+        client_id = uuid.uuid4()
+
+        with patch(REDIS_PATCH, new_callable=AsyncMock, return_value=redis):
+            assert await inbound_queue.enqueue("evt-1", client_id, "+15125559876") is True
+
+        key, fields = redis.xadd.await_args.args
+        assert key == inbound_queue.stream_key(inbound_queue.partition_for(client_id, "+15125559876"))
+        assert fields == {"event_id": "evt-1"}
+
+    async def test_enqueue_without_redis_returns_false(self):
+        with patch(REDIS_PATCH, new_callable=AsyncMock, side_effect=ConnectionError("down")):
+            assert await inbound_queue.enqueue("evt-1", uuid.uuid4(), "+15125559876") is False
+
+
+class TestProcessQueuedEvent:
+    async def test_new_lead_runs_conductor_once(self, db, session_factory, client):
+        event = await _add_event(db, client)
+
+        with patch(
+            "src.agents.conductor.handle_new_lead",
+            new_callable=AsyncMock,
+            return_value={"lead_id": "abc", "status": "intake_sent"},
+        ) as mock_new_lead:
+            result = await inbound_sms.process_queued_event(str(event.id))
+            # A re-delivered entry finds the event already claimed
+            again = await inbound_sms.process_queued_event(str(event.id))
+
+        assert result["status"] == "intake_sent"
+        assert again is None
+        mock_new_lead.assert_awaited_once()
+        envelope = mock_new_lead.await_args.args[1]
+        assert envelope.lead.phone == "+15125559876"
+        assert envelope.inbound_message == "Need AC repair"
+        assert event.processing_status == "completed"
+        assert event.processed_at is not None
+
+    async def test_reply_routes_to_existing_lead(self, db, session_factory, client):
+        lead = Lead(client_id=client.id, phone="+15125559876", source="google_lsa", state="qualifying")
+        db.add(lead)
+        await db.commit()
+        event = await _add_event(db, client, body="Tomorrow works")
+
+        with patch(
+            "src.agents.conductor.handle_inbound_reply",
+            new_callable=AsyncMock,
+            return_value={"lead_id": str(lead.id), "status": "replied"},
+        ) as mock_reply:
+            await inbound_sms.process_queued_event(str(event.id))
+
+        args = mock_reply.await_args.args
+        assert args[1].id == lead.id
+        assert args[2].id == client.id
+        assert args[3] == "Tomorrow works"
+
+    async def test_conductor_failure_marks_event_failed(self, db, session_factory, client):
+        event_id = (await _add_event(db, client)).id
+
+        with patch(
+            "src.agents.conductor.handle_new_lead",
+            new_callable=AsyncMock,
+            side_effect=RuntimeError("AI service down"),
+        ):
+            assert await inbound_sms.process_queued_event(str(event_id)) is None
+
+        stored = (await db.execute(
+            select(WebhookEvent).where(WebhookEvent.id == event_id).execution_options(populate_existing=True)
+        )).scalar_one()
+        assert stored.processing_status == "failed"
+        assert "AI service down" in stored.error_message
+
+    async def test_event_not_queued_is_skipped(self, db, session_factory, client):
+        event = await _add_event(db, client, status="completed")
+
+        with patch("src.agents.conductor.handle_new_lead", new_callable=AsyncMock) as mock_new_lead:
+            assert await inbound_sms.process_queued_event(str(event.id)) is None
+            assert await inbound_sms.process_queued_event("not-a-uuid") is None
+
+        mock_new_lead.assert_not_awaited()
+
+    async def test_interrupted_claim_is_reprocessed(self, db, session_factory, client):
+        # Claimed by a worker that was cancelled before recording an outcome
+        event = await _add_event(db, client, status="processing", claimed_at=datetime.now(timezone.utc))
+
+        with patch(
+            "src.agents.conductor.handle_new_lead",
+            new_callable=AsyncMock,
+            return_value={"lead_id": "abc", "status": "intake_sent"},
+        ) as mock_new_lead:
+            # A new delivery leaves a live claim alone...
+            assert await inbound_sms.process_queued_event(str(event.id)) is None
+            # ...but a re-read pending entry takes it over
+            result = await inbound_sms.process_queued_event(str(event.id), reclaim=True)
+
+        assert result["status"] == "intake_sent"
+        mock_new_lead.assert_awaited_once()
+        assert event.processing_status == "completed"
+
+    async def test_expired_claim_is_reclaimed(self, db, session_factory, client):
+        expired = datetime.now(timezone.utc) - timedelta(seconds=inbound_sms.CLAIM_LEASE_SECONDS + 60)
+        event = await _add_event(db, client, status="processing", claimed_at=expired)
+
+        with patch(
+            "src.agents.conductor.handle_new_lead",
+            new_callable=AsyncMock,
+            return_value={"lead_id": "abc", "status": "intake_sent"},
+        ):
+            assert await inbound_sms.process_queued_event(str(event.id)) is not None
+
+        assert event.processing_status == "completed"
+
+
+class TestConsumePartition:
+    async def test_processes_in_order_and_acks_each(self):
+        calls = []
+        reads = [
+            [("1-0", "evt-pending")],  # left over from a previous run
+            [],  # pending drained
+            [("2-0", "evt-a"), ("3-0", "evt-b")],
+            asyncio.CancelledError(),
+        ]
+
+        async def _process(event_id, reclaim=False):
+            calls.append(("process", event_id, reclaim))
+
+        async def _ack(partition, entry_id):
+            calls.append(("ack", entry_id))
+
+        with (
+            patch.object(inbound_queue, "ensure_group", AsyncMock()),
+            patch.object(inbound_queue, "read", AsyncMock(side_effect=reads)) as mock_read,
+            patch.object(inbound_queue, "ack", side_effect=_ack),
+            patch.object(inbound_sms, "process_queued_event", side_effect=_process),
+        ):
+            with pytest.raises(asyncio.CancelledError):
+                await inbound_sms._consume_partition(3)
+
+        assert calls == [
+            ("process", "evt-pending", True), ("ack", "1-0"),
+            ("process", "evt-a", False), ("ack", "2-0"),
+            ("process", "evt-b", False), ("ack", "3-0"),
+        ]
+        assert [c.kwargs["pending"] for c in mock_read.await_args_list] == [True, True, False, False]
+
+
+class TestRequeueStaleEvents:
+    async def test_requeues_only_stale_queued_events(self, db, session_factory, client):
+        stale = await _add_event(db, client, received_at=datetime.now(timezone.utc) - timedelta(minutes=10))
+        await _add_event(db, client)  # still within its window
+        await _add_event(
+            db, client, status="completed",
+            received_at=datetime.now(timezone.utc) - timedelta(minutes=10),
+        )
+
+        with patch.object(inbound_queue, "enqueue", AsyncMock(return_value=True)) as mock_enqueue:
+            assert await inbound_sms.requeue_stale_events() == 1
+
+        mock_enqueue.assert_awaited_once_with(stale.id, client.id, "+15125559876")
+
+    async def test_requeues_processing_events_past_their_lease(self, db, session_factory, client):
+        now = datetime.now(timezone.utc)
+        expired = await _add_event(
+            db, client, status="processing", received_at=now - timedelta(hours=1),
+            claimed_at=now - timedelta(seconds=inbound_sms.CLAIM_LEASE_SECONDS + 60),
+        )
+        # Claimed moments ago: a live worker is still on it
+        await _add_event(
+            db, client, status="processing", received_at=now - timedelta(hours=1), claimed_at=now,
+        )
+
+        with patch.object(inbound_queue, "enqueue", AsyncMock(return_value=True)) as mock_enqueue:
+            assert await inbound_sms.requeue_stale_events() == 1
+
+        mock_enqueue.assert_awaited_once_with(expired.id, client.id, "+15125559876")
@@ -0,0 +1,148 @@
+"""
+Tests for src/services/lead_usage.py - monthly lead counters for plan limits.
+Redis is mocked; lead counts come from an in-memory SQLite database.
+"""
+import uuid
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from src.models.client import Client
+from src.models.lead import Lead
+from src.services.lead_usage import (
+    USAGE_KEY_TTL_SECONDS,
+    count_leads_this_month,
+    month_start,
+    reconcile_monthly_lead_counts,
+    reserve_monthly_lead,
+    usage_key,
+)
+
+REDIS_PATCH = "src.utils.dedup.get_redis"
+
+
+async def _add_client(db) -> Client:
+    client = Client(business_name="Austin HVAC", trade_type="hvac", tier="starter", config={})
+    db.add(client)
+    await db.flush()
+    return client
+
+
+async def _add_leads(db, client_id, count, created_at=None):
+    for i in range(count):
+        db.add(Lead(
+            client_id=client_id,
+            phone=f"+1512555{i:04d}",
+            source="website",
+            created_at=created_at or datetime.now(timezone.utc),
+        ))
+    await db.commit()
+
+
+class TestKeys:
+    def test_month_start(self):
+        now = datetime(2026, 3, 17, 14, 5, tzinfo=timezone.utc)
+        assert month_start(now) == datetime(2026, 3, 1, tzinfo=timezone.utc)
+
+    def test_usage_key_is_per_month(self):
+        cid = uuid.uuid4()
+        march = usage_key(cid, datetime(2026, 3, 31, 23, 59, tzinfo=timezone.utc))
+        april = usage_key(cid, datetime(2026, 4, 1, tzinfo=timezone.utc))
+        assert march == f"leadlock:lead_usage:{cid}:2026-03"
+        assert april == f"leadlock:lead_usage:{cid}:2026-04"
+
+
+class TestCountLeadsThisMonth:
+    async def test_ignores_previous_months(self, db):
+        client = await _add_client(db)
+        await _add_leads(db, client.id, 3)
+        await _add_leads(db, client.id, 2, created_at=month_start() - timedelta(days=1))
+
+        assert await count_leads_this_month(db, client.id) == 3
+
+
+class TestReserveMonthlyLead:
+    async def test_existing_counter_reserves_without_db(self):
+        redis = MagicMock()
+        redis.eval = AsyncMock(return_value=[1, 42])
+        db = AsyncMock()
+
+        with patch(REDIS_PATCH, new_callable=AsyncMock, return_value=redis):
+            allowed, count = await reserve_monthly_lead(db, uuid.uuid4(), 200)
+
+        assert (allowed, count) == (True, 42)
+        db.execute.assert_not_called()
+
+    async def test_at_limit_rejected(self):
+        redis = MagicMock()
+        redis.eval = AsyncMock(return_value=[0, 200])
+
+        with patch(REDIS_PATCH, new_callable=AsyncMock, return_value=redis):
+            allowed, count = await reserve_monthly_lead(AsyncMock(), uuid.uuid4(), 200)
+
+        assert (allowed, count) == (False, 200)
+
+    async def test_missing_counter_seeded_from_db(self, db):
+        client = await _add_client(db)
+        await _add_leads(db, client.id, 5)
+
+        redis = MagicMock()
+        redis.eval = AsyncMock(side_effect=[[-1, 0], [1, 6]])
+        redis.set = AsyncMock()
+
+        with patch(REDIS_PATCH, new_callable=AsyncMock, return_value=redis):
+            allowed, count = await reserve_monthly_lead(db, client.id, 200)
+
+        assert (allowed, count) == (True, 6)
+        redis.set.assert_awaited_once_with(
+            usage_key(client.id), 5, ex=USAGE_KEY_TTL_SECONDS, nx=True,
+        )
+
+    async def test_redis_down_falls_back_to_count(self, db):
+        client = await _add_client(db)
+        await _add_leads(db, client.id, 2)
+
+        with patch(REDIS_PATCH, new_callable=AsyncMock, side_effect=ConnectionError("down")):
+            assert await reserve_monthly_lead(db, client.id, 3) == (True, 3)
+            assert await reserve_monthly_lead(db, client.id, 2) == (False, 2)
+
+
+class TestReconcile:
+    @pytest.fixture
+    def session_factory(self, db):
+        @asynccontextmanager
+        async def _factory():
+            yield db
+
+        with patch("src.database.async_session_factory", _factory):
+            yield _factory
+
+    async def test_rewrites_drifted_and_missing_counters(self, db, session_factory):
+        drifted = await _add_client(db)
+        missing = await _add_client(db)
+        exact = await _add_client(db)
+        await _add_leads(db, drifted.id, 4)
+        await _add_leads(db, missing.id, 1)
+        await _add_leads(db, exact.id, 2)
+
+        cached = {usage_key(drifted.id): "9", usage_key(exact.id): "2"}
+        pipe = MagicMock()
+        pipe.execute = AsyncMock()
+        redis = MagicMock()
+        redis.mget = AsyncMock(side_effect=lambda keys: [cached.get(k) for k in keys])
+        redis.pipeline.return_value = pipe
+
+        with patch(REDIS_PATCH, new_callable=AsyncMock, return_value=redis):
+            corrected = await reconcile_monthly_lead_counts()
+
+        assert corrected == 1
+        written = {c.args[0]: c.args[1] for c in pipe.set.call_args_list}
+        assert written == {usage_key(drifted.id): 4, usage_key(missing.id): 1}
+        pipe.execute.assert_awaited_once()
+
+    async def test_no_leads_this_month(self, db, session_factory):
+        with patch(REDIS_PATCH, new_callable=AsyncMock) as mock_get_redis:
+            assert await reconcile_monthly_lead_counts() == 0
+        mock_get_redis.assert_not_called()
@@ -5,7 +5,7 @@ import pytest
 import uuid
 from unittest.mock import AsyncMock, MagicMock, patch
 
-from src.services.learning import _time_bucket, record_signal
+from src.services.learning import _time_bucket, dimension_columns, record_signal, record_signals
 
 
 # ---------------------------------------------------------------------------
@@ -79,6 +79,27 @@ def _mock_async_session_factory():
     return _FakeCtx, mock_db
 
 
+class TestDimensionColumns:
+    def test_extracts_typed_values(self):
+        lead_id = uuid.uuid4()
+        columns = dimension_columns({
+            "trade": "hvac", "state": "TX", "time_bucket": "evening",
+            "step": "2", "lead_id": str(lead_id), "day_of_week": "monday",
+        })
+        assert columns == {
+            "trade": "hvac", "state": "TX", "time_bucket": "evening",
+            "step": 2, "lead_id": lead_id,
+        }
+
+    def test_missing_or_bad_values_are_none(self):
+        columns = dimension_columns({"trade": "", "step": "two", "lead_id": "not-a-uuid"})
+        assert set(columns.values()) == {None}
+        assert set(dimension_columns(None).values()) == {None}
+
+    def test_truncates_to_column_length(self):
+        assert dimension_columns({"state": "X" * 30})["state"] == "X" * 10
+
+
 class TestRecordSignal:
     @pytest.mark.asyncio
     async def test_creates_learning_signal(self):
@@ -96,6 +117,7 @@ class TestRecordSignal:
         signal = mock_db.add.call_args[0][0]
         assert signal.signal_type == "email_opened"
         assert signal.dimensions["trade"] == "hvac"
+        assert (signal.trade, signal.state, signal.time_bucket) == ("hvac", "TX", "9am-12pm")
         assert signal.value == 1.0
         assert signal.outreach_id is None
         mock_db.commit.assert_awaited_once()
@@ -163,3 +185,32 @@ class TestRecordSignal:
 
         signal = mock_db.add.call_args[0][0]
         assert signal.outreach_id is None
+
+
+class TestRecordSignals:
+    @pytest.mark.asyncio
+    async def test_writes_batch_in_one_commit(self):
+        """record_signals adds every signal and commits once."""
+        factory_cls, mock_db = _mock_async_session_factory()
+        outreach_uuid = str(uuid.uuid4())
+
+        with patch("src.services.learning.async_session_factory", return_value=factory_cls()):
+            written = await record_signals([
+                {"signal_type": "email_opened", "dimensions": {"trade": "hvac"}, "value": 1.0,
+                 "outreach_id": outreach_uuid},
+                {"signal_type": "email_bounced", "dimensions": {}, "value": 0.0,
+                 "outreach_id": "not-a-uuid"},
+            ])
+
+        assert written == 2
+        rows = mock_db.add_all.call_args[0][0]
+        assert [r.signal_type for r in rows] == ["email_opened", "email_bounced"]
+        assert rows[0].outreach_id == uuid.UUID(outreach_uuid)
+        assert rows[1].outreach_id is None
+        mock_db.commit.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_empty_batch_skips_db(self):
+        with patch("src.services.learning.async_session_factory") as mock_factory:
+            assert await record_signals([]) == 0
+        mock_factory.assert_not_called()
@@ -39,63 +39,30 @@ def _make_mock_session_factory(mock_db):
 class TestGetBestSendTime:
     @pytest.mark.asyncio
     async def test_returns_best_time_bucket_when_data_exists(self):
-        """Returns the top time_bucket when sufficient data is available."""
-        mock_row = MagicMock()
-        mock_row.time_bucket = "9am-12pm"
-        mock_row.avg_value = 0.75
-        mock_row.sample_count = 20
-
-        mock_result = MagicMock()
-        mock_result.first.return_value = mock_row
-
-        mock_db = AsyncMock()
-        mock_db.execute = AsyncMock(return_value=mock_result)
-
-        factory_cls = _make_mock_session_factory(mock_db)
-
-        with patch("src.services.learning.async_session_factory", return_value=factory_cls()):
+        """Returns the model's best time_bucket when sufficient data is available."""
+        from src.services.send_time_model import BucketStat
+
+        best = BucketStat("9am-12pm", samples=20, open_rate=0.75, confidence=0.53)
+        with patch(
+            "src.services.send_time_model.best_send_time",
+            new_callable=AsyncMock, return_value=best,
+        ) as mock_best:
             result = await get_best_send_time("hvac", "TX")
 
         assert result == "9am-12pm"
-        mock_db.execute.assert_awaited_once()
+        mock_best.assert_awaited_once_with("hvac", "TX")
 
     @pytest.mark.asyncio
     async def test_returns_none_when_no_data(self):
-        """Returns None when no rows meet the minimum sample threshold."""
-        mock_result = MagicMock()
-        mock_result.first.return_value = None
-
-        mock_db = AsyncMock()
-        mock_db.execute = AsyncMock(return_value=mock_result)
-
-        factory_cls = _make_mock_session_factory(mock_db)
-
-        with patch("src.services.learning.async_session_factory", return_value=factory_cls()):
+        """Returns None when no bucket meets the minimum sample threshold."""
+        with patch(
+            "src.services.send_time_model.best_send_time",
+            new_callable=AsyncMock, return_value=None,
+        ):
             result = await get_best_send_time("plumbing", "FL")
 
         assert result is None
 
-    @pytest.mark.asyncio
-    async def test_returns_evening_bucket(self):
-        """Returns 'evening' when that is the best bucket."""
-        mock_row = MagicMock()
-        mock_row.time_bucket = "evening"
-        mock_row.avg_value = 0.92
-        mock_row.sample_count = 50
-
-        mock_result = MagicMock()
-        mock_result.first.return_value = mock_row
-
-        mock_db = AsyncMock()
-        mock_db.execute = AsyncMock(return_value=mock_result)
-
-        factory_cls = _make_mock_session_factory(mock_db)
-
-        with patch("src.services.learning.async_session_factory", return_value=factory_cls()):
-            result = await get_best_send_time("roofing", "CA")
-
-        assert result == "evening"
-
 
 # ---------------------------------------------------------------------------
 # get_open_rate_by_dimension (lines 126-137)
@@ -0,0 +1,115 @@
+"""
+Tests for src/services/learning_snapshot.py - precomputed learning context
+for outreach email generation. Prospects live in an in-memory SQLite
+database; Redis and the context builder are mocked.
+"""
+import json
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from src.models.outreach import Outreach
+from src.services import learning_snapshot
+
+REDIS_PATCH = "src.utils.dedup.get_redis"
+BUILDER_PATCH = "src.agents.sales_outreach._get_learning_context"
+
+
+def _redis(cached=None, gate_open=True):
+    redis = MagicMock()
+    pipe = MagicMock()
+    pipe.execute = AsyncMock(return_value=[])
+    redis.pipeline.return_value = pipe
+    redis.get = AsyncMock(return_value=cached)
+    redis.set = AsyncMock(return_value=True if gate_open else None)
+    return redis
+
+
+def _snapshot(context, version=learning_snapshot.SNAPSHOT_VERSION):
+    return json.dumps({"version": version, "computed_at": "2026-03-14T00:00:00+00:00", "context": context})
+
+
+class TestGetLearningContext:
+    async def test_hit_skips_builder(self):
+        redis = _redis(cached=_snapshot("Writing instructions from past performance:\n- keep going"))
+
+        with patch(REDIS_PATCH, new_callable=AsyncMock, return_value=redis), \
+             patch(BUILDER_PATCH, new_callable=AsyncMock) as mock_build:
+            context = await learning_snapshot.get_learning_context("hvac", "TX", 2)
+
+        assert context.endswith("- keep going")
+        redis.get.assert_awaited_once_with("leadlock:learning_snapshot:hvac:TX:2")
+        mock_build.assert_not_awaited()
+
+    async def test_miss_computes_and_stores(self):
+        redis = _redis()
+
+        with patch(REDIS_PATCH, new_callable=AsyncMock, return_value=redis), \
+             patch(BUILDER_PATCH, new_callable=AsyncMock, return_value="fresh") as mock_build:
+            assert await learning_snapshot.get_learning_context("hvac", "TX", 1) == "fresh"
+
+        mock_build.assert_awaited_once_with("hvac", "TX", 1)
+        key, value = redis.set.await_args.args
+        assert key == "leadlock:learning_snapshot:hvac:TX:1"
+        assert json.loads(value)["context"] == "fresh"
+        assert redis.set.await_args.kwargs["ex"] == learning_snapshot.SNAPSHOT_TTL_SECONDS
+
+    async def test_other_version_is_a_miss(self):
+        redis = _redis(cached=_snapshot("old format", version=learning_snapshot.SNAPSHOT_VERSION - 1))
+
+        with patch(REDIS_PATCH, new_callable=AsyncMock, return_value=redis), \
+             patch(BUILDER_PATCH, new_callable=AsyncMock, return_value="new format"):
+            assert await learning_snapshot.get_learning_context("hvac", "TX", 1) == "new format"
+
+    async def test_without_redis_computes_live(self):
+        with patch(REDIS_PATCH, new_callable=AsyncMock, side_effect=ConnectionError("down")), \
+             patch(BUILDER_PATCH, new_callable=AsyncMock, return_value="live"):
+            assert await learning_snapshot.get_learning_context("plumbing", "CA", 3) == "live"
+
+
+class TestRefreshLearningSnapshots:
+    @pytest.fixture
+    def session_factory(self, db):
+        @asynccontextmanager
+        async def _factory():
+            yield db
+
+        with patch.object(learning_snapshot, "async_session_factory", _factory):
+            yield _factory
+
+    async def test_refreshes_combinations_in_sequence(self, db, session_factory):
+        db.add_all([
+            Outreach(prospect_name="A", prospect_trade_type="hvac", state_code="TX", outreach_sequence_step=0),
+            Outreach(prospect_name="B", prospect_trade_type="hvac", state_code="TX", outreach_sequence_step=0),
+            Outreach(prospect_name="C", prospect_trade_type=None, state_code="FL", outreach_sequence_step=1),
+            # Finished, replied or lost prospects get no more emails
+            Outreach(prospect_name="D", prospect_trade_type="roofing", state_code="TX", outreach_sequence_step=3),
+            Outreach(prospect_name="E", prospect_trade_type="solar", state_code="AZ", status="lost"),
+        ])
+        await db.commit()
+        redis = _redis()
+
+        with patch(REDIS_PATCH, new_callable=AsyncMock, return_value=redis), \
+             patch(BUILDER_PATCH, new_callable=AsyncMock, side_effect=lambda t, s, n: f"{t}/{s}/{n}"):
+            result = await learning_snapshot.refresh_learning_snapshots()
+
+        assert result == {"skipped": False, "refreshed": 2}
+        redis.set.assert_awaited_once_with(
+            learning_snapshot.REFRESH_GATE_KEY, "1", nx=True, ex=learning_snapshot.REFRESH_INTERVAL_SECONDS,
+        )
+        pipe = redis.pipeline.return_value
+        written = {c.args[0]: json.loads(c.args[1])["context"] for c in pipe.set.call_args_list}
+        assert written == {
+            "leadlock:learning_snapshot:hvac:TX:1": "hvac/TX/1",
+            "leadlock:learning_snapshot:general:FL:2": "general/FL/2",
+        }
+        pipe.execute.assert_awaited_once()
+
+    async def test_skips_until_interval_elapses(self, db, session_factory):
+        redis = _redis(gate_open=False)
+        with patch(REDIS_PATCH, new_callable=AsyncMock, return_value=redis), \
+             patch(BUILDER_PATCH, new_callable=AsyncMock) as mock_build:
+            assert await learning_snapshot.refresh_learning_snapshots() == {"skipped": True}
+
+        mock_build.assert_not_awaited()
@@ -195,6 +195,8 @@ class TestLifespan:
             "src.workers.crm_sync.run_crm_sync",
             "src.workers.sms_dispatch.run_sms_dispatch",
             "src.workers.registration_poller.run_registration_poller",
+            "src.workers.metrics_rollup.run_metrics_rollup",
+            "src.workers.inbound_sms.run_inbound_sms",
         ]
 
         patches = [patch("src.main.get_settings", return_value=mock_settings)]
@@ -232,6 +234,8 @@ class TestLifespan:
             patch("src.workers.crm_sync.run_crm_sync", return_value=AsyncMock()()),
             patch("src.workers.sms_dispatch.run_sms_dispatch", return_value=AsyncMock()()),
             patch("src.workers.registration_poller.run_registration_poller", return_value=AsyncMock()()),
+            patch("src.workers.metrics_rollup.run_metrics_rollup", return_value=AsyncMock()()),
+            patch("src.workers.inbound_sms.run_inbound_sms", return_value=AsyncMock()()),
         ):
             async with lifespan(mock_app):
                 pass
@@ -260,6 +264,8 @@ class TestLifespan:
             patch("src.workers.crm_sync.run_crm_sync", return_value=AsyncMock()()),
             patch("src.workers.sms_dispatch.run_sms_dispatch", return_value=AsyncMock()()),
             patch("src.workers.registration_poller.run_registration_poller", return_value=AsyncMock()()),
+            patch("src.workers.metrics_rollup.run_metrics_rollup", return_value=AsyncMock()()),
+            patch("src.workers.inbound_sms.run_inbound_sms", return_value=AsyncMock()()),
         ):
             async with lifespan(mock_app):
                 pass
@@ -288,6 +294,8 @@ class TestLifespan:
             patch("src.workers.crm_sync.run_crm_sync", return_value=AsyncMock()()),
             patch("src.workers.sms_dispatch.run_sms_dispatch", return_value=AsyncMock()()),
             patch("src.workers.registration_poller.run_registration_poller", return_value=AsyncMock()()),
+            patch("src.workers.metrics_rollup.run_metrics_rollup", return_value=AsyncMock()()),
+            patch("src.workers.inbound_sms.run_inbound_sms", return_value=AsyncMock()()),
         ):
             async with lifespan(mock_app):
                 pass
@@ -312,6 +320,8 @@ class TestLifespan:
             patch("src.workers.crm_sync.run_crm_sync", return_value=AsyncMock()()),
             patch("src.workers.sms_dispatch.run_sms_dispatch", return_value=AsyncMock()()),
             patch("src.workers.registration_poller.run_registration_poller", return_value=AsyncMock()()),
+            patch("src.workers.metrics_rollup.run_metrics_rollup", return_value=AsyncMock()()),
+            patch("src.workers.inbound_sms.run_inbound_sms", return_value=AsyncMock()()),
         ):
             async with lifespan(mock_app):
                 pass
@@ -347,12 +357,15 @@ class TestLifespan:
             patch("src.workers.crm_sync.run_crm_sync", return_value=AsyncMock()()),
             patch("src.workers.sms_dispatch.run_sms_dispatch", return_value=AsyncMock()()),
             patch("src.workers.registration_poller.run_registration_poller", return_value=AsyncMock()()),
+            patch("src.workers.metrics_rollup.run_metrics_rollup", return_value=AsyncMock()()),
+            patch("src.workers.inbound_sms.run_inbound_sms", return_value=AsyncMock()()),
         ):
             async with lifespan(mock_app):
                 pass
 
-        # Should have started 6 core workers
-        assert len(task_names) == 6
+        # Should have started 8 core workers + the client cache listener
+        # and signal writer
+        assert len(task_names) == 10
 
     @pytest.mark.asyncio
     async def test_lifespan_starts_sales_engine_workers_when_enabled(self):
@@ -396,6 +409,8 @@ class TestLifespan:
             "src.workers.crm_sync.run_crm_sync",
             "src.workers.sms_dispatch.run_sms_dispatch",
             "src.workers.registration_poller.run_registration_poller",
+            "src.workers.metrics_rollup.run_metrics_rollup",
+            "src.workers.inbound_sms.run_inbound_sms",
             "src.workers.scraper.run_scraper",
             "src.workers.outreach_sequencer.run_outreach_sequencer",
             "src.workers.outreach_monitor.run_outreach_monitor",
@@ -419,8 +434,9 @@ class TestLifespan:
             async with lifespan(mock_app):
                 pass
 
-        # 6 core + 5 sales engine (incl email_finder) + 4 flagged agents = 15 workers
-        assert len(task_count) == 15
+        # 8 core + 5 sales engine (incl email_finder) + 4 flagged agents = 17 workers,
+        # plus the per-process client cache listener and signal writer
+        assert len(task_count) == 19
 
     @pytest.mark.asyncio
     async def test_lifespan_shutdown_cancels_workers(self):
@@ -449,6 +465,8 @@ class TestLifespan:
             patch("src.workers.crm_sync.run_crm_sync", return_value=AsyncMock()()),
             patch("src.workers.sms_dispatch.run_sms_dispatch", return_value=AsyncMock()()),
             patch("src.workers.registration_poller.run_registration_poller", return_value=AsyncMock()()),
+            patch("src.workers.metrics_rollup.run_metrics_rollup", return_value=AsyncMock()()),
+            patch("src.workers.inbound_sms.run_inbound_sms", return_value=AsyncMock()()),
         ):
             async with lifespan(mock_app):
                 pass
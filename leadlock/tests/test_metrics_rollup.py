@@ -0,0 +1,245 @@
+"""
+Tests for src/services/metrics_rollup.py - incremental daily rollups,
+and the ROI dashboard that reads them.
+Redis is mocked; leads and rollups live in an in-memory SQLite database.
+"""
+import uuid
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from sqlalchemy import select
+
+from src.api.dash_reports import get_roi_dashboard
+from src.models.client import Client
+from src.models.client_metrics import ClientDailyMessages, ClientDailyMetric
+from src.models.conversation import Conversation
+from src.models.lead import Lead
+from src.services import metrics_rollup
+from src.services.metrics_rollup import (
+    WATERMARK_KEY_PREFIX,
+    rebuild_lead_day,
+    refresh_rollups,
+)
+
+REDIS_PATCH = "src.utils.dedup.get_redis"
+
+NOW = datetime.now(timezone.utc)
+TODAY = NOW.date()
+
+
+async def _add_client(db, config=None) -> Client:
+    client = Client(business_name="Austin HVAC", trade_type="hvac", tier="pro", config=config or {})
+    db.add(client)
+    await db.flush()
+    return client
+
+
+def _lead(client_id, created_at=None, updated_at=None, **fields) -> Lead:
+    created_at = created_at or NOW - timedelta(hours=1)
+    return Lead(
+        client_id=client_id,
+        phone=f"+1512{uuid.uuid4().int % 10**7:07d}",
+        source=fields.pop("source", "website"),
+        state=fields.pop("state", "new"),
+        created_at=created_at,
+        updated_at=updated_at or created_at,
+        **fields,
+    )
+
+
+async def _cells(db, client_id) -> list[ClientDailyMetric]:
+    db.expire_all()
+    result = await db.execute(
+        select(ClientDailyMetric)
+        .where(ClientDailyMetric.client_id == client_id)
+        .order_by(ClientDailyMetric.source, ClientDailyMetric.state)
+    )
+    return list(result.scalars().all())
+
+
+def _make_redis():
+    store = {}
+    redis = MagicMock()
+    redis.get = AsyncMock(side_effect=lambda key: store.get(key))
+
+    async def _set(key, value, nx=False, ex=None):
+        if nx and key in store:
+            return False
+        store[key] = value
+        return True
+
+    redis.set = AsyncMock(side_effect=_set)
+    redis.delete = AsyncMock(side_effect=lambda key: store.pop(key, None))
+    redis.store = store
+    return redis
+
+
+@pytest.fixture
+def session_factory(db):
+    @asynccontextmanager
+    async def _factory():
+        yield db
+
+    with patch.object(metrics_rollup, "async_session_factory", _factory):
+        yield _factory
+
+
+class TestRebuildLeadDay:
+    async def test_aggregates_cells(self, db):
+        client = await _add_client(db)
+        db.add_all([
+            _lead(client.id, first_response_ms=3000, total_ai_cost_usd=0.01, total_sms_cost_usd=0.02),
+            _lead(client.id, first_response_ms=45000, total_ai_cost_usd=0.03),
+            _lead(client.id, state="booked", qualify_variant="B", first_response_ms=8000),
+            _lead(client.id, created_at=NOW - timedelta(days=3)),
+        ])
+        await db.commit()
+
+        assert await rebuild_lead_day(db, client.id, (NOW - timedelta(hours=1)).date()) == 2
+        await db.commit()
+
+        booked, new = await _cells(db, client.id)
+        assert (new.state, new.leads, new.qualify_variant) == ("new", 2, "")
+        assert new.responded == 2
+        assert new.response_ms_total == 48000
+        assert (new.responded_under_5s, new.responded_under_30s, new.responded_under_60s) == (1, 1, 2)
+        assert new.ai_cost_usd == pytest.approx(0.04)
+        assert new.sms_cost_usd == pytest.approx(0.02)
+        assert (booked.state, booked.qualify_variant, booked.responded_under_10s) == ("booked", "B", 1)
+
+    async def test_rebuild_replaces_previous_cells(self, db):
+        client = await _add_client(db)
+        lead = _lead(client.id)
+        db.add(lead)
+        await db.commit()
+        day = lead.created_at.date()
+
+        await rebuild_lead_day(db, client.id, day)
+        lead.state = "qualifying"
+        await db.commit()
+        await rebuild_lead_day(db, client.id, day)
+        await db.commit()
+
+        cells = await _cells(db, client.id)
+        assert [(c.state, c.leads) for c in cells] == [("qualifying", 1)]
+
+
+class TestRefreshRollups:
+    async def test_folds_changes_since_watermark(self, db, session_factory):
+        client = await _add_client(db)
+        changed = _lead(client.id, updated_at=NOW - timedelta(minutes=5))
+        db.add(changed)
+        await db.flush()
+        db.add(Conversation(
+            lead_id=changed.id, client_id=client.id, direction="outbound",
+            content="Hi", from_phone="+15125550000", to_phone="+15125551111",
+            created_at=NOW - timedelta(minutes=5),
+        ))
+        await db.commit()
+        changed_id = changed.id
+
+        redis = _make_redis()
+        with patch(REDIS_PATCH, new_callable=AsyncMock, return_value=redis):
+            stats = await refresh_rollups()
+
+        assert stats["leads"] == {"scanned": 1, "days_rebuilt": 1}
+        assert stats["conversations"] == {"scanned": 1, "days_rebuilt": 1}
+        assert [(c.state, c.leads) for c in await _cells(db, client.id)] == [("new", 1)]
+        messages = (await db.execute(select(ClientDailyMessages))).scalar_one()
+        assert messages.messages == 1
+        assert redis.store[f"{WATERMARK_KEY_PREFIX}:leads"].endswith(str(changed_id))
+        assert metrics_rollup.ROLLUP_LOCK_KEY not in redis.store
+
+        # Second run: nothing changed, nothing scanned
+        with patch(REDIS_PATCH, new_callable=AsyncMock, return_value=redis):
+            stats = await refresh_rollups()
+        assert stats["leads"]["scanned"] == 0
+
+    async def test_unsettled_rows_left_for_next_run(self, db, session_factory):
+        client = await _add_client(db)
+        db.add(_lead(client.id, updated_at=datetime.now(timezone.utc)))
+        await db.commit()
+
+        with patch(REDIS_PATCH, new_callable=AsyncMock, return_value=_make_redis()):
+            stats = await refresh_rollups()
+
+        assert stats["leads"]["scanned"] == 0
+
+    async def test_pages_through_batches(self, db, session_factory):
+        client = await _add_client(db)
+        same_ts = NOW - timedelta(minutes=5)
+        db.add_all([_lead(client.id, created_at=same_ts) for _ in range(5)])
+        await db.commit()
+
+        with (
+            patch(REDIS_PATCH, new_callable=AsyncMock, return_value=_make_redis()),
+            patch.object(metrics_rollup, "SCAN_BATCH_SIZE", 2),
+        ):
+            stats = await refresh_rollups()
+
+        assert stats["leads"]["scanned"] == 5
+        assert [c.leads for c in await _cells(db, client.id)] == [5]
+
+    async def test_skips_when_locked(self, db, session_factory):
+        redis = _make_redis()
+        redis.store[metrics_rollup.ROLLUP_LOCK_KEY] = "1"
+
+        with patch(REDIS_PATCH, new_callable=AsyncMock, return_value=redis):
+            assert await refresh_rollups() == {"skipped": True}
+
+    async def test_skips_without_redis(self, db, session_factory):
+        with patch(REDIS_PATCH, new_callable=AsyncMock, side_effect=ConnectionError("down")):
+            assert await refresh_rollups() == {"skipped": True}
+
+
+class TestRoiDashboard:
+    async def test_reads_rollups(self, db):
+        client = await _add_client(db, config={"avg_job_value": 1000.0})
+        db.add_all([
+            ClientDailyMetric(
+                client_id=client.id, day=TODAY, source="google_lsa", state="booked",
+                qualify_variant="A", leads=2, responded=2, response_ms_total=8000,
+                responded_under_5s=2, responded_under_10s=2, responded_under_30s=2,
+                responded_under_60s=2, ai_cost_usd=0.5, sms_cost_usd=0.5,
+            ),
+            ClientDailyMetric(
+                client_id=client.id, day=TODAY, source="website", state="qualifying",
+                qualify_variant="", leads=3, responded=2, response_ms_total=60000,
+                responded_under_5s=0, responded_under_10s=0, responded_under_30s=1,
+                responded_under_60s=1, ai_cost_usd=0.5, sms_cost_usd=0.5,
+            ),
+            ClientDailyMetric(
+                client_id=client.id, day=TODAY - timedelta(days=60), source="website",
+                state="booked", qualify_variant="", leads=7,
+            ),
+        ])
+        await db.commit()
+
+        result = await get_roi_dashboard(period="30d", db=db, client=client)
+
+        kpis = result["hero_kpis"]
+        assert kpis["total_leads"] == 5
+        assert kpis["leads_booked"] == 2
+        assert kpis["estimated_revenue"] == 2000.0
+        assert kpis["roi_multiplier"] == 1000.0
+        assert kpis["avg_response_time_seconds"] == 17.0
+        assert kpis["leads_under_10s"] == 0.5
+        assert result["funnel"]["qualifying"] == 3
+        assert [s["source"] for s in result["revenue_by_source"]] == ["website", "google_lsa"]
+        assert result["revenue_by_month"] == [
+            {"month": TODAY.strftime("%Y-%m"), "leads": 5, "booked": 2, "revenue": 2000.0},
+        ]
+        assert result["response_time_distribution"] == [
+            {"bucket": "0-5s", "count": 2},
+            {"bucket": "5-10s", "count": 0},
+            {"bucket": "10-30s", "count": 1},
+            {"bucket": "30s+", "count": 1},
+        ]
+        assert result["qualify_variant_performance"] == [
+            {"variant": "A", "leads": 2, "booked": 2, "rate": 1.0},
+        ]
+
+        all_time = await get_roi_dashboard(period="all", db=db, client=client)
+        assert all_time["hero_kpis"]["total_leads"] == 12
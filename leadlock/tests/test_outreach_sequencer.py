@@ -27,6 +27,8 @@ from src.workers.outreach_sequencer import (
     run_outreach_sequencer,
     sequence_cycle,
     _process_campaign_prospects,
+    _SendBatch,
+    _SendScheduler,
     _generate_email_with_template,
     send_sequence_email,
     EMAIL_WARMUP_SCHEDULE,
@@ -167,6 +169,35 @@ def _make_template(
     return tmpl
 
 
+def _prospect_lookup(*prospects):
+    """db.get side effect returning the given mock prospects by id."""
+    by_id = {p.id: p for p in prospects}
+
+    async def _get(model, ident, **kwargs):
+        return by_id.get(ident)
+
+    return _get
+
+
+async def _run_plan(plan):
+    """Dispatch planned sends through a scheduler, one mocked session per send."""
+    scheduler = _SendScheduler()
+    for batch, prospect, template_id in plan:
+        scheduler.add(batch, prospect, template_id)
+
+    @asynccontextmanager
+    async def mock_session_factory():
+        db = AsyncMock()
+        db.get = AsyncMock(side_effect=_prospect_lookup(*(p for _, p, _ in plan)))
+        yield db
+
+    with patch(
+        "src.workers.outreach_sequencer.async_session_factory",
+        side_effect=mock_session_factory,
+    ):
+        await scheduler.run()
+
+
 # ---------------------------------------------------------------------------
 # sanitize_dashes
 # ---------------------------------------------------------------------------
@@ -2263,6 +2294,7 @@ class TestSequenceCycle:
             db.execute = AsyncMock(side_effect=mock_execute)
             db.commit = AsyncMock()
             db.flush = AsyncMock()
+            db.get = AsyncMock(side_effect=_prospect_lookup(prospect))
             yield db
 
         with patch(
@@ -2404,6 +2436,7 @@ class TestSequenceCycle:
             db.execute = AsyncMock(side_effect=mock_execute)
             db.commit = AsyncMock()
             db.flush = AsyncMock()
+            db.get = AsyncMock(side_effect=_prospect_lookup(prospect))
             yield db
 
         with patch(
@@ -2484,6 +2517,7 @@ class TestSequenceCycle:
             db.execute = AsyncMock(side_effect=mock_execute)
             db.commit = AsyncMock()
             db.flush = AsyncMock()
+            db.get = AsyncMock(side_effect=_prospect_lookup(prospect))
             yield db
 
         with patch(
@@ -2563,6 +2597,7 @@ class TestSequenceCycle:
             db.execute = AsyncMock(side_effect=mock_execute)
             db.commit = AsyncMock()
             db.flush = AsyncMock()
+            db.get = AsyncMock(side_effect=_prospect_lookup(p1, p2))
             yield db
 
         with patch(
@@ -2711,6 +2746,7 @@ class TestSequenceCycle:
             db.execute = AsyncMock(side_effect=mock_execute)
             db.commit = AsyncMock()
             db.flush = AsyncMock()
+            db.get = AsyncMock(side_effect=_prospect_lookup(*prospects))
             yield db
 
         with patch(
@@ -2787,9 +2823,11 @@ class TestProcessCampaignProspects:
         db.execute = AsyncMock(side_effect=mock_execute)
         db.flush = AsyncMock()
 
+        plan = []
         await _process_campaign_prospects(
-            db, config, settings, campaign, today_start,
+            db, config, settings, campaign, today_start, plan,
         )
+        await _run_plan(plan)
 
         mock_send.assert_awaited_once()
         send_call = mock_send.call_args
@@ -2805,9 +2843,11 @@ class TestProcessCampaignProspects:
 
         db = AsyncMock()
 
+        plan = []
         await _process_campaign_prospects(
-            db, config, settings, campaign, today_start,
+            db, config, settings, campaign, today_start, plan,
         )
+        await _run_plan(plan)
 
         db.execute.assert_not_awaited()
 
@@ -2821,9 +2861,11 @@ class TestProcessCampaignProspects:
 
         db = AsyncMock()
 
+        plan = []
         await _process_campaign_prospects(
-            db, config, settings, campaign, today_start,
+            db, config, settings, campaign, today_start, plan,
         )
+        await _run_plan(plan)
 
         db.execute.assert_not_awaited()
 
@@ -2844,9 +2886,11 @@ class TestProcessCampaignProspects:
         db = AsyncMock()
         db.execute = AsyncMock(return_value=sent_count_result)
 
+        plan = []
         await _process_campaign_prospects(
-            db, config, settings, campaign, today_start,
+            db, config, settings, campaign, today_start, plan,
         )
+        await _run_plan(plan)
 
     @patch("src.workers.outreach_sequencer.asyncio.sleep", new_callable=AsyncMock)
     @patch("src.workers.outreach_sequencer.send_sequence_email", new_callable=AsyncMock)
@@ -2889,9 +2933,11 @@ class TestProcessCampaignProspects:
         db.execute = AsyncMock(side_effect=mock_execute)
         db.flush = AsyncMock()
 
+        plan = []
         await _process_campaign_prospects(
-            db, config, settings, campaign, today_start,
+            db, config, settings, campaign, today_start, plan,
         )
+        await _run_plan(plan)
 
         mock_send.assert_not_awaited()
 
@@ -2938,9 +2984,11 @@ class TestProcessCampaignProspects:
         db.flush = AsyncMock()
 
         # Should not raise
+        plan = []
         await _process_campaign_prospects(
-            db, config, settings, campaign, today_start,
+            db, config, settings, campaign, today_start, plan,
         )
+        await _run_plan(plan)
 
     @patch("src.workers.outreach_sequencer.asyncio.sleep", new_callable=AsyncMock)
     @patch("src.workers.outreach_sequencer.send_sequence_email", new_callable=AsyncMock)
@@ -2989,9 +3037,11 @@ class TestProcessCampaignProspects:
         db.execute = AsyncMock(side_effect=mock_execute)
         db.flush = AsyncMock()
 
+        plan = []
         await _process_campaign_prospects(
-            db, config, settings, campaign, today_start,
+            db, config, settings, campaign, today_start, plan,
         )
+        await _run_plan(plan)
 
         # Should only send once despite appearing in both step queries
         mock_send.assert_awaited_once()
@@ -3032,9 +3082,11 @@ class TestProcessCampaignProspects:
         db = AsyncMock()
         db.execute = AsyncMock(side_effect=mock_execute)
 
+        plan = []
         await _process_campaign_prospects(
-            db, config, settings, campaign, today_start,
+            db, config, settings, campaign, today_start, plan,
         )
+        await _run_plan(plan)
 
         mock_send.assert_not_awaited()
 
@@ -3081,14 +3133,95 @@ class TestProcessCampaignProspects:
         db.execute = AsyncMock(side_effect=mock_execute)
         db.flush = AsyncMock()
 
+        plan = []
         await _process_campaign_prospects(
-            db, config, settings, campaign, today_start,
+            db, config, settings, campaign, today_start, plan,
         )
+        await _run_plan(plan)
 
         # Sleep called once between 2 prospects (not after the last one)
         assert mock_sleep.await_count == 1
 
 
+# ---------------------------------------------------------------------------
+# _SendScheduler
+# ---------------------------------------------------------------------------
+
+class TestSendScheduler:
+    """Tests for the per-lane send schedule."""
+
+    @patch("src.workers.outreach_sequencer.random.uniform", return_value=90)
+    @patch("src.workers.outreach_sequencer.asyncio.sleep", new_callable=AsyncMock)
+    @patch("src.workers.outreach_sequencer.send_sequence_email", new_callable=AsyncMock)
+    async def test_tenants_interleave_instead_of_queueing(self, mock_send, mock_sleep, mock_uniform):
+        """Each tenant's first send goes out immediately; gaps apply per lane."""
+        settings = _make_settings()
+        config_a = _make_config()
+        config_a.tenant_id = uuid.uuid4()
+        config_b = _make_config()
+        config_b.tenant_id = uuid.uuid4()
+        batch_a = _SendBatch(config_a, settings, "A")
+        batch_b = _SendBatch(config_b, settings, "B")
+        a1, a2, b1, b2 = (_make_prospect() for _ in range(4))
+
+        plan = [(batch_a, a1, None), (batch_a, a2, None), (batch_b, b1, None), (batch_b, b2, None)]
+        await _run_plan(plan)
+
+        sent = [call.args[3] for call in mock_send.await_args_list]
+        assert sent[:2] in ([a1, b1], [b1, a1])
+        assert set(sent[2:]) == {a2, b2}
+        # Second sends are due one jitter after start on both lanes, not stacked
+        assert [c.args[0] for c in mock_sleep.await_args_list] == [
+            pytest.approx(90, abs=1), pytest.approx(90, abs=1),
+        ]
+
+    @patch("src.workers.outreach_sequencer.asyncio.sleep", new_callable=AsyncMock)
+    @patch("src.workers.outreach_sequencer.send_sequence_email", new_callable=AsyncMock)
+    async def test_skips_prospect_claimed_elsewhere(self, mock_send, mock_sleep):
+        """A prospect locked by another worker (db.get -> None) is not sent."""
+        batch = _SendBatch(_make_config(), _make_settings(), "A")
+        scheduler = _SendScheduler()
+        scheduler.add(batch, _make_prospect())
+
+        @asynccontextmanager
+        async def mock_session_factory():
+            db = AsyncMock()
+            db.get = AsyncMock(return_value=None)
+            yield db
+
+        with patch(
+            "src.workers.outreach_sequencer.async_session_factory",
+            side_effect=mock_session_factory,
+        ):
+            await scheduler.run()
+
+        mock_send.assert_not_awaited()
+
+    @patch("src.workers.outreach_sequencer._trip_ai_circuit_breaker", new_callable=AsyncMock)
+    @patch("src.workers.outreach_sequencer.asyncio.sleep", new_callable=AsyncMock)
+    @patch("src.workers.outreach_sequencer.send_sequence_email", new_callable=AsyncMock)
+    async def test_exceptions_stop_only_their_batch(self, mock_send, mock_sleep, mock_trip):
+        """Unbound-batch exceptions stop that batch without halting other tenants."""
+        failing = _SendBatch(_make_config(), _make_settings(), "A")
+        healthy = _SendBatch(_make_config(), _make_settings(), "B")
+        bad = [_make_prospect() for _ in range(4)]
+        good = [_make_prospect() for _ in range(4)]
+        bad_ids = {p.id for p in bad}
+
+        async def mock_send_fn(db, cfg, settings, prospect, **kwargs):
+            if prospect.id in bad_ids:
+                raise Exception("Send failed")
+
+        mock_send.side_effect = mock_send_fn
+
+        await _run_plan([(failing, p, None) for p in bad] + [(healthy, p, None) for p in good])
+
+        assert failing.stopped is True
+        assert healthy.stopped is False
+        assert mock_send.await_count == 3 + 4
+        mock_trip.assert_not_awaited()
+
+
 # ---------------------------------------------------------------------------
 # Constants
 # ---------------------------------------------------------------------------
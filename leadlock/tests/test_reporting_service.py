@@ -1,15 +1,16 @@
 """
 Tests for src/services/reporting.py - dashboard metrics generation.
 
-Uses AsyncMock for the DB session to avoid SQLite/PostgreSQL date_trunc
-incompatibility while achieving full coverage of all code paths.
+get_dashboard_metrics reads the daily rollup tables, so tests seed
+client_daily_metrics / client_daily_messages in the in-memory SQLite DB.
 """
 import uuid
-from datetime import datetime, date, timedelta, timezone
-from unittest.mock import AsyncMock, MagicMock
+from datetime import datetime, timedelta, timezone
 
 import pytest
 
+from src.models.client import Client
+from src.models.client_metrics import ClientDailyMessages, ClientDailyMetric
 from src.schemas.api_responses import DashboardMetrics, DayMetric, ResponseTimeBucket
 from src.services.reporting import get_dashboard_metrics
 
@@ -18,67 +19,43 @@ from src.services.reporting import get_dashboard_metrics
 # Helpers
 # ---------------------------------------------------------------------------
 
-def _scalar(value):
-    """Wrap a value in a mock result that returns it via .scalar()."""
-    result = MagicMock()
-    result.scalar.return_value = value
-    return result
-
-
-def _all_rows(rows):
-    """Wrap a list of tuples in a mock result that returns them via .all()."""
-    result = MagicMock()
-    result.all.return_value = rows
-    return result
-
-
-def _make_mock_db(
-    total_leads=0,
-    total_booked=0,
-    avg_response_ms=None,
-    leads_under_60s=0,
-    total_messages=0,
-    total_ai_cost=None,
-    total_sms_cost=None,
-    source_rows=None,
-    state_rows=None,
-    day_rows=None,
-    response_ms_rows=None,
-):
-    """Build a mock AsyncSession with configurable return values.
-
-    The query order in get_dashboard_metrics is:
-    1. total_leads (count)
-    2. total_booked (count)
-    3. avg_response_ms (avg)
-    4. leads_under_60s (count)
-    5. total_messages (count)
-    6. total_ai_cost (sum)
-    7. total_sms_cost (sum)
-    8. leads_by_source (group by)
-    9. leads_by_state (group by)
-    10. leads_by_day (group by)
-    11. response_ms (individual values)
-    """
-    db = AsyncMock()
-
-    # Build sequential return values for db.execute()
-    returns = [
-        _scalar(total_leads),
-        _scalar(total_booked),
-        _scalar(avg_response_ms),
-        _scalar(leads_under_60s),
-        _scalar(total_messages),
-        _scalar(total_ai_cost),
-        _scalar(total_sms_cost),
-        _all_rows(source_rows or []),
-        _all_rows(state_rows or []),
-        _all_rows(day_rows or []),
-        _all_rows(response_ms_rows or []),
-    ]
-
-    db.execute = AsyncMock(side_effect=returns)
-    return db
+TODAY = datetime.now(timezone.utc).date()
+
+
+async def _add_client(db) -> uuid.UUID:
+    client = Client(business_name="Austin HVAC", trade_type="hvac", tier="pro", config={})
+    db.add(client)
+    await db.flush()
+    return client.id
+
+
+def _cell(client_id, day=None, source="website", state="new", leads=1, **fields) -> ClientDailyMetric:
+    return ClientDailyMetric(
+        client_id=client_id,
+        day=day or TODAY,
+        source=source,
+        state=state,
+        qualify_variant=fields.pop("qualify_variant", ""),
+        leads=leads,
+        responded=fields.pop("responded", 0),
+        response_ms_total=fields.pop("response_ms_total", 0),
+        responded_under_5s=fields.pop("under_5s", 0),
+        responded_under_10s=fields.pop("under_10s", 0),
+        responded_under_30s=fields.pop("under_30s", 0),
+        responded_under_60s=fields.pop("under_60s", 0),
+        ai_cost_usd=fields.pop("ai_cost_usd", 0.0),
+        sms_cost_usd=fields.pop("sms_cost_usd", 0.0),
+    )
+
+
+async def _seed(db, *rows):
+    db.add_all(rows)
+    await db.commit()
+
+
+@pytest.fixture
+async def client_id(db):
+    return await _add_client(db)
 
 
 # ---------------------------------------------------------------------------
@@ -86,10 +63,9 @@ def _make_mock_db(
 # ---------------------------------------------------------------------------
 
 class TestDashboardMetricsEmpty:
-    async def test_returns_zeros_for_no_data(self):
-        """Dashboard metrics with no leads returns all zeros."""
-        db = _make_mock_db()
-        result = await get_dashboard_metrics(db, "some-client-id", period="7d")
+    async def test_returns_zeros_for_no_data(self, db, client_id):
+        """Dashboard metrics with no rollups returns all zeros."""
+        result = await get_dashboard_metrics(db, client_id, period="7d")
 
         assert isinstance(result, DashboardMetrics)
         assert result.total_leads == 0
@@ -118,136 +94,94 @@ class TestDashboardMetricsEmpty:
 # ---------------------------------------------------------------------------
 
 class TestDashboardMetricsWithData:
-    async def test_counts_leads_correctly(self):
-        """Counts total leads within the period."""
-        db = _make_mock_db(total_leads=5)
-        result = await get_dashboard_metrics(db, "client-1", period="7d")
-        assert result.total_leads == 5
-
-    async def test_counts_booked_leads(self):
-        """Counts leads in booked/completed states."""
-        db = _make_mock_db(total_leads=10, total_booked=4)
-        result = await get_dashboard_metrics(db, "client-1", period="7d")
-        assert result.total_booked == 4
+    async def test_counts_leads_and_booked(self, db, client_id):
+        """Booked counts leads in booked/completed cells."""
+        await _seed(
+            db,
+            _cell(client_id, state="new", leads=6),
+            _cell(client_id, state="booked", leads=3),
+            _cell(client_id, state="completed", leads=1),
+        )
+        result = await get_dashboard_metrics(db, client_id, period="7d")
         assert result.total_leads == 10
+        assert result.total_booked == 4
+        assert result.conversion_rate == pytest.approx(0.4)
 
-    async def test_conversion_rate(self):
-        """Conversion rate is booked/total."""
-        db = _make_mock_db(total_leads=10, total_booked=3)
-        result = await get_dashboard_metrics(db, "client-1")
-        assert result.conversion_rate == pytest.approx(0.3)
-
-    async def test_conversion_rate_zero_leads(self):
-        """Conversion rate is 0.0 when no leads."""
-        db = _make_mock_db(total_leads=0, total_booked=0)
-        result = await get_dashboard_metrics(db, "client-1")
-        assert result.conversion_rate == 0.0
-
-    async def test_average_response_time(self):
-        """Calculates average first_response_ms."""
-        db = _make_mock_db(total_leads=3, avg_response_ms=8500)
-        result = await get_dashboard_metrics(db, "client-1")
+    async def test_average_response_time(self, db, client_id):
+        """Average is taken over leads that got a response."""
+        await _seed(
+            db,
+            _cell(client_id, leads=3, responded=2, response_ms_total=17000),
+        )
+        result = await get_dashboard_metrics(db, client_id)
         assert result.avg_response_time_ms == 8500
 
-    async def test_average_response_time_none(self):
-        """avg_response_ms defaults to 0 when None."""
-        db = _make_mock_db(total_leads=3, avg_response_ms=None)
-        result = await get_dashboard_metrics(db, "client-1")
-        assert result.avg_response_time_ms == 0
-
-    async def test_leads_under_60s(self):
+    async def test_leads_under_60s(self, db, client_id):
         """Counts leads with response under 60s and percentage."""
-        db = _make_mock_db(total_leads=4, leads_under_60s=3)
-        result = await get_dashboard_metrics(db, "client-1")
+        await _seed(db, _cell(client_id, leads=4, responded=4, under_60s=3))
+        result = await get_dashboard_metrics(db, client_id)
         assert result.leads_under_60s == 3
         assert result.leads_under_60s_pct == pytest.approx(75.0)
 
-    async def test_leads_under_60s_zero_leads(self):
-        """Percentage is 0 when no leads."""
-        db = _make_mock_db(total_leads=0, leads_under_60s=0)
-        result = await get_dashboard_metrics(db, "client-1")
-        assert result.leads_under_60s_pct == 0.0
-
-    async def test_total_messages(self):
-        """Counts total conversations (messages)."""
-        db = _make_mock_db(total_leads=2, total_messages=15)
-        result = await get_dashboard_metrics(db, "client-1")
+    async def test_total_messages(self, db, client_id):
+        """Sums the per-day conversation counts."""
+        await _seed(
+            db,
+            ClientDailyMessages(client_id=client_id, day=TODAY, messages=10),
+            ClientDailyMessages(client_id=client_id, day=TODAY - timedelta(days=1), messages=5),
+        )
+        result = await get_dashboard_metrics(db, client_id)
         assert result.total_messages == 15
 
-    async def test_cost_tracking(self):
+    async def test_cost_tracking(self, db, client_id):
         """Sums AI and SMS costs."""
-        db = _make_mock_db(
-            total_leads=2,
-            total_ai_cost=0.15,
-            total_sms_cost=0.05,
+        await _seed(
+            db,
+            _cell(client_id, source="website", ai_cost_usd=0.10, sms_cost_usd=0.02),
+            _cell(client_id, source="angi", ai_cost_usd=0.05, sms_cost_usd=0.03),
         )
-        result = await get_dashboard_metrics(db, "client-1")
+        result = await get_dashboard_metrics(db, client_id)
         assert result.total_ai_cost == pytest.approx(0.15)
         assert result.total_sms_cost == pytest.approx(0.05)
 
-    async def test_cost_tracking_none(self):
-        """Cost defaults to 0 when None."""
-        db = _make_mock_db(total_leads=0, total_ai_cost=None, total_sms_cost=None)
-        result = await get_dashboard_metrics(db, "client-1")
-        assert result.total_ai_cost == 0.0
-        assert result.total_sms_cost == 0.0
-
-    async def test_leads_by_source(self):
-        """Groups leads by source."""
-        db = _make_mock_db(
-            total_leads=3,
-            source_rows=[("google_lsa", 2), ("website", 1)],
+    async def test_leads_by_source_and_state(self, db, client_id):
+        """Cells are folded into per-source and per-state totals."""
+        await _seed(
+            db,
+            _cell(client_id, source="google_lsa", state="new", leads=1),
+            _cell(client_id, source="google_lsa", state="booked", leads=1),
+            _cell(client_id, source="website", state="booked", leads=1),
         )
-        result = await get_dashboard_metrics(db, "client-1")
+        result = await get_dashboard_metrics(db, client_id)
         assert result.leads_by_source == {"google_lsa": 2, "website": 1}
-
-    async def test_leads_by_state(self):
-        """Groups leads by state."""
-        db = _make_mock_db(
-            total_leads=3,
-            state_rows=[("new", 1), ("booked", 2)],
-        )
-        result = await get_dashboard_metrics(db, "client-1")
         assert result.leads_by_state == {"new": 1, "booked": 2}
 
-    async def test_leads_by_day(self):
-        """Groups leads by day with booked counts."""
-        day1 = datetime(2026, 2, 15, 0, 0, 0, tzinfo=timezone.utc)
-        day2 = datetime(2026, 2, 16, 0, 0, 0, tzinfo=timezone.utc)
-
-        db = _make_mock_db(
-            total_leads=5,
-            total_booked=2,
-            day_rows=[(day1, 3, 1), (day2, 2, 1)],
-        )
-        result = await get_dashboard_metrics(db, "client-1")
-        assert len(result.leads_by_day) == 2
-        assert result.leads_by_day[0] == DayMetric(date="2026-02-15", count=3, booked=1)
-        assert result.leads_by_day[1] == DayMetric(date="2026-02-16", count=2, booked=1)
-
-    async def test_response_time_distribution(self):
-        """Buckets response times into 0-10s, 10-30s, 30-60s, 60s+."""
-        db = _make_mock_db(
-            total_leads=4,
-            response_ms_rows=[(5000,), (20000,), (45000,), (90000,)],
+    async def test_leads_by_day(self, db, client_id):
+        """Groups leads by day with booked counts, oldest first."""
+        day1 = TODAY - timedelta(days=2)
+        day2 = TODAY - timedelta(days=1)
+        await _seed(
+            db,
+            _cell(client_id, day=day2, state="new", leads=1),
+            _cell(client_id, day=day2, state="booked", leads=1),
+            _cell(client_id, day=day1, state="qualifying", leads=2),
+            _cell(client_id, day=day1, state="completed", leads=1),
         )
-        result = await get_dashboard_metrics(db, "client-1")
-        dist = {b.bucket: b.count for b in result.response_time_distribution}
-        assert dist["0-10s"] == 1
-        assert dist["10-30s"] == 1
-        assert dist["30-60s"] == 1
-        assert dist["60s+"] == 1
-
-    async def test_response_time_distribution_multiple_in_bucket(self):
-        """Multiple responses in the same bucket are counted."""
-        db = _make_mock_db(
-            total_leads=3,
-            response_ms_rows=[(3000,), (7000,), (9000,)],
+        result = await get_dashboard_metrics(db, client_id)
+        assert result.leads_by_day == [
+            DayMetric(date=day1.isoformat(), count=3, booked=1),
+            DayMetric(date=day2.isoformat(), count=2, booked=1),
+        ]
+
+    async def test_response_time_distribution(self, db, client_id):
+        """Buckets come from the cumulative under-N counters."""
+        await _seed(
+            db,
+            _cell(client_id, leads=5, responded=4, under_10s=1, under_30s=2, under_60s=3),
         )
-        result = await get_dashboard_metrics(db, "client-1")
+        result = await get_dashboard_metrics(db, client_id)
         dist = {b.bucket: b.count for b in result.response_time_distribution}
-        assert dist["0-10s"] == 3
-        assert dist["10-30s"] == 0
+        assert dist == {"0-10s": 1, "10-30s": 1, "30-60s": 1, "60s+": 1}
 
 
 # ---------------------------------------------------------------------------
@@ -255,35 +189,34 @@ class TestDashboardMetricsWithData:
 # ---------------------------------------------------------------------------
 
 class TestDashboardMetricsPeriods:
-    async def test_7d_period(self):
-        """7d period uses 7-day window."""
-        db = _make_mock_db(total_leads=2)
-        result = await get_dashboard_metrics(db, "client-1", period="7d")
-        assert result.total_leads == 2
-
-    async def test_30d_period(self):
-        """30d period passes without error."""
-        db = _make_mock_db(total_leads=5)
-        result = await get_dashboard_metrics(db, "client-1", period="30d")
-        assert result.total_leads == 5
-
-    async def test_90d_period(self):
-        """90d period passes without error."""
-        db = _make_mock_db(total_leads=10)
-        result = await get_dashboard_metrics(db, "client-1", period="90d")
-        assert result.total_leads == 10
+    async def test_period_excludes_older_days(self, db, client_id):
+        """Only days inside the window are counted."""
+        await _seed(
+            db,
+            _cell(client_id, day=TODAY, leads=2),
+            _cell(client_id, day=TODAY - timedelta(days=20), leads=5),
+            _cell(client_id, day=TODAY - timedelta(days=60), leads=10),
+        )
+        assert (await get_dashboard_metrics(db, client_id, period="7d")).total_leads == 2
+        assert (await get_dashboard_metrics(db, client_id, period="30d")).total_leads == 7
+        assert (await get_dashboard_metrics(db, client_id, period="90d")).total_leads == 17
 
-    async def test_unknown_period_defaults_to_7d(self):
+    async def test_unknown_period_defaults_to_7d(self, db, client_id):
         """Unknown period string defaults to 7 days."""
-        db = _make_mock_db(total_leads=1)
-        result = await get_dashboard_metrics(db, "client-1", period="invalid")
+        await _seed(
+            db,
+            _cell(client_id, day=TODAY, leads=1),
+            _cell(client_id, day=TODAY - timedelta(days=20), leads=5),
+        )
+        result = await get_dashboard_metrics(db, client_id, period="invalid")
         assert result.total_leads == 1
 
-    async def test_default_period_is_7d(self):
-        """Default period (no argument) is 7d."""
-        db = _make_mock_db(total_leads=3)
-        result = await get_dashboard_metrics(db, "client-1")
-        assert result.total_leads == 3
+    async def test_other_clients_excluded(self, db, client_id):
+        """Rollups are scoped to the requested client."""
+        other = await _add_client(db)
+        await _seed(db, _cell(client_id, leads=1), _cell(other, leads=9))
+        result = await get_dashboard_metrics(db, client_id)
+        assert result.total_leads == 1
 
 
 # ---------------------------------------------------------------------------
@@ -291,60 +224,31 @@ class TestDashboardMetricsPeriods:
 # ---------------------------------------------------------------------------
 
 class TestDashboardMetricsStructure:
-    async def test_full_response_structure(self):
+    async def test_full_response_structure(self, db, client_id):
         """Full response includes all expected fields with correct types."""
-        day1 = datetime(2026, 2, 17, 0, 0, 0, tzinfo=timezone.utc)
-
-        db = _make_mock_db(
-            total_leads=10,
-            total_booked=4,
-            avg_response_ms=7500,
-            leads_under_60s=8,
-            total_messages=25,
-            total_ai_cost=1.50,
-            total_sms_cost=0.40,
-            source_rows=[("google_lsa", 6), ("website", 4)],
-            state_rows=[("new", 2), ("qualifying", 4), ("booked", 3), ("completed", 1)],
-            day_rows=[(day1, 10, 4)],
-            response_ms_rows=[(5000,), (15000,), (35000,), (70000,)],
+        await _seed(
+            db,
+            _cell(
+                client_id, state="booked", leads=4, responded=4, response_ms_total=30000,
+                under_10s=2, under_30s=3, under_60s=4, ai_cost_usd=1.5, sms_cost_usd=0.4,
+            ),
+            ClientDailyMessages(client_id=client_id, day=TODAY, messages=25),
         )
-        result = await get_dashboard_metrics(db, "client-1", period="7d")
+        result = await get_dashboard_metrics(db, client_id, period="7d")
 
-        # Verify types
         assert isinstance(result.total_leads, int)
-        assert isinstance(result.total_booked, int)
         assert isinstance(result.conversion_rate, float)
         assert isinstance(result.avg_response_time_ms, int)
-        assert isinstance(result.leads_under_60s, int)
         assert isinstance(result.leads_under_60s_pct, float)
-        assert isinstance(result.total_messages, int)
         assert isinstance(result.total_ai_cost, float)
-        assert isinstance(result.total_sms_cost, float)
-        assert isinstance(result.leads_by_source, dict)
-        assert isinstance(result.leads_by_state, dict)
         assert isinstance(result.leads_by_day, list)
         assert isinstance(result.response_time_distribution, list)
-        assert isinstance(result.conversion_by_source, dict)
 
-        # Verify values
-        assert result.total_leads == 10
+        assert result.total_leads == 4
         assert result.total_booked == 4
-        assert result.conversion_rate == pytest.approx(0.4)
         assert result.avg_response_time_ms == 7500
-        assert result.leads_under_60s == 8
-        assert result.leads_under_60s_pct == pytest.approx(80.0)
         assert result.total_messages == 25
-        assert result.total_ai_cost == pytest.approx(1.50)
-        assert result.total_sms_cost == pytest.approx(0.40)
         assert result.conversion_by_source == {}
-
-    async def test_all_response_time_buckets_present(self):
-        """All 4 response time buckets are always present, even if zero."""
-        db = _make_mock_db(total_leads=0)
-        result = await get_dashboard_metrics(db, "client-1")
-
-        bucket_names = [b.bucket for b in result.response_time_distribution]
-        assert "0-10s" in bucket_names
-        assert "10-30s" in bucket_names
-        assert "30-60s" in bucket_names
-        assert "60s+" in bucket_names
+        assert [b.bucket for b in result.response_time_distribution] == [
+            "0-10s", "10-30s", "30-60s", "60s+",
+        ]
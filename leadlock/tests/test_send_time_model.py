@@ -0,0 +1,164 @@
+"""
+Tests for src/services/send_time_model.py - daily send-time rollups and
+the in-memory model behind get_best_send_time.
+Redis is mocked; signals and rollups live in an in-memory SQLite database.
+"""
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from sqlalchemy import select
+
+from src.models.learning_signal import LearningSignal
+from src.models.send_time_stat import SendTimeStat
+from src.services import send_time_model
+from src.services.learning import dimension_columns, get_best_send_time
+from src.services.send_time_model import (
+    best_send_time,
+    get_send_time_model,
+    rebuild_send_time_day,
+    refresh_send_time_stats,
+)
+
+REDIS_PATCH = "src.utils.dedup.get_redis"
+
+NOW = datetime.now(timezone.utc)
+
+
+def _open(trade="hvac", state="TX", time_bucket="9am-12pm", created_at=None, value=1.0):
+    dimensions = {"trade": trade, "state": state, "time_bucket": time_bucket, "step": "1"}
+    return LearningSignal(
+        signal_type="email_opened",
+        dimensions=dimensions,
+        **dimension_columns(dimensions),
+        value=value,
+        created_at=created_at or NOW - timedelta(hours=1),
+    )
+
+
+def _make_redis():
+    store = {}
+    redis = MagicMock()
+    redis.get = AsyncMock(side_effect=lambda key: store.get(key))
+
+    async def _set(key, value, nx=False, ex=None):
+        if nx and key in store:
+            return False
+        store[key] = value
+        return True
+
+    redis.set = AsyncMock(side_effect=_set)
+    redis.delete = AsyncMock(side_effect=lambda key: store.pop(key, None))
+    redis.store = store
+    return redis
+
+
+@pytest.fixture(autouse=True)
+def _fresh_model():
+    send_time_model.invalidate_send_time_model()
+    yield
+    send_time_model.invalidate_send_time_model()
+
+
+@pytest.fixture
+def session_factory(db):
+    @asynccontextmanager
+    async def _factory():
+        yield db
+
+    with patch.object(send_time_model, "async_session_factory", _factory):
+        yield _factory
+
+
+async def _stats(db) -> list[SendTimeStat]:
+    db.expire_all()
+    result = await db.execute(
+        select(SendTimeStat).order_by(SendTimeStat.trade, SendTimeStat.time_bucket)
+    )
+    return list(result.scalars().all())
+
+
+class TestRebuildSendTimeDay:
+    async def test_aggregates_open_signals(self, db):
+        db.add_all([
+            _open(), _open(), _open(time_bucket="evening", value=0.0),
+            _open(trade="plumbing", state="FL"),
+            _open(created_at=NOW - timedelta(days=3)),
+            LearningSignal(signal_type="email_clicked", dimensions={"trade": "hvac", "time_bucket": "evening"}, value=1.0),
+            LearningSignal(signal_type="email_opened", dimensions={"state": "TX"}, value=1.0),
+        ])
+        await db.commit()
+
+        assert await rebuild_send_time_day(db, (NOW - timedelta(hours=1)).date()) == 3
+        await db.commit()
+
+        cells = [(s.trade, s.state, s.time_bucket, s.samples, s.value_sum) for s in await _stats(db)]
+        assert cells == [
+            ("hvac", "TX", "9am-12pm", 2, 2.0),
+            ("hvac", "TX", "evening", 1, 0.0),
+            ("plumbing", "FL", "9am-12pm", 1, 1.0),
+        ]
+
+
+class TestRefreshSendTimeStats:
+    async def test_folds_new_signals_and_invalidates_model(self, db, session_factory):
+        db.add_all([_open() for _ in range(3)])
+        await db.commit()
+
+        redis = _make_redis()
+        with patch(REDIS_PATCH, new_callable=AsyncMock, return_value=redis):
+            await get_send_time_model()  # warm (empty) model
+            stats = await refresh_send_time_stats()
+
+        assert stats == {"skipped": False, "scanned": 3, "days_rebuilt": 1}
+        assert [s.samples for s in await _stats(db)] == [3]
+        assert send_time_model._model_loaded_at == 0.0
+        assert send_time_model.REFRESH_LOCK_KEY not in redis.store
+
+        with patch(REDIS_PATCH, new_callable=AsyncMock, return_value=redis):
+            stats = await refresh_send_time_stats()
+        assert stats["scanned"] == 0
+
+    async def test_skips_without_redis(self, db, session_factory):
+        with patch(REDIS_PATCH, new_callable=AsyncMock, side_effect=ConnectionError("down")):
+            assert await refresh_send_time_stats() == {"skipped": True}
+
+
+class TestSendTimeModel:
+    async def _seed(self, db, cells):
+        today = NOW.date()
+        for i, (time_bucket, samples, value_sum) in enumerate(cells):
+            db.add(SendTimeStat(
+                day=today - timedelta(days=i % 2), trade="hvac", state="TX",
+                time_bucket=time_bucket, samples=samples, value_sum=value_sum,
+            ))
+        await db.commit()
+
+    async def test_best_bucket_needs_min_samples(self, db, session_factory):
+        await self._seed(db, [
+            ("evening", 4, 4.0),        # perfect rate, too few samples
+            ("9am-12pm", 10, 8.0),
+            ("12pm-3pm", 3, 2.0),
+            ("12pm-3pm", 3, 2.0),       # second day, summed to n=6
+        ])
+
+        best = await best_send_time("hvac", "TX")
+
+        assert best.time_bucket == "9am-12pm"
+        assert best.samples == 10
+        assert best.open_rate == pytest.approx(0.8)
+        assert 0.0 < best.confidence < best.open_rate
+        assert await best_send_time("roofing", "TX") is None
+
+    async def test_equal_rates_prefer_larger_sample(self, db, session_factory):
+        await self._seed(db, [("evening", 5, 5.0), ("3pm-6pm", 40, 40.0)])
+        assert await get_best_send_time("hvac", "TX") == "3pm-6pm"
+
+    async def test_model_cached_between_lookups(self, db, session_factory):
+        await self._seed(db, [("evening", 6, 6.0)])
+        assert await get_best_send_time("hvac", "TX") == "evening"
+
+        with patch.object(send_time_model, "load_send_time_model", new_callable=AsyncMock) as mock_load:
+            assert await get_best_send_time("hvac", "TX") == "evening"
+        mock_load.assert_not_awaited()
@@ -0,0 +1,214 @@
+"""
+Tests for src/services/signal_buffer.py - batched learning signal writes,
+shutdown drain and the optional Redis spill stream.
+Redis is mocked; signals are written to an in-memory SQLite database.
+"""
+import asyncio
+import json
+import time
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from sqlalchemy import select
+
+from src.models.learning_signal import LearningSignal
+from src.services import signal_buffer
+from src.services.learning import _signal_row, record_signal
+
+REDIS_PATCH = "src.utils.dedup.get_redis"
+
+
+@pytest.fixture(autouse=True)
+def _reset_buffer():
+    signal_buffer._queue.clear()
+    signal_buffer._running = False
+    signal_buffer._stopping = False
+    signal_buffer._dropped = 0
+    yield
+    signal_buffer._queue.clear()
+    signal_buffer._running = False
+    signal_buffer._stopping = False
+
+
+@pytest.fixture
+def session_factory(db):
+    @asynccontextmanager
+    async def _factory():
+        yield db
+
+    with (
+        patch.object(signal_buffer, "async_session_factory", _factory),
+        patch("src.services.learning.async_session_factory", _factory),
+    ):
+        yield _factory
+
+
+@pytest.fixture
+def spill():
+    with patch.object(signal_buffer, "_spill_enabled", return_value=True):
+        yield
+
+
+async def _signals(db) -> list[LearningSignal]:
+    db.expire_all()
+    result = await db.execute(select(LearningSignal).order_by(LearningSignal.created_at))
+    return list(result.scalars().all())
+
+
+def _row(trade="hvac", value=1.0):
+    return _signal_row("email_opened", {"trade": trade, "step": 2}, value)
+
+
+class TestFlush:
+    async def test_writes_buffered_rows(self, db, session_factory):
+        for trade in ("hvac", "plumbing", "roofing"):
+            assert await signal_buffer.enqueue(_row(trade))
+
+        assert await signal_buffer.flush() == 3
+        assert signal_buffer.pending_count() == 0
+
+        signals = await _signals(db)
+        assert [s.trade for s in signals] == ["hvac", "plumbing", "roofing"]
+        assert signals[0].step == 2
+
+    async def test_flushes_at_most_one_batch(self, db, session_factory):
+        with patch.object(signal_buffer, "FLUSH_BATCH_SIZE", 2):
+            for _ in range(3):
+                await signal_buffer.enqueue(_row())
+            assert await signal_buffer.flush() == 2
+        assert signal_buffer.pending_count() == 1
+
+    async def test_failed_flush_requeues_in_order(self):
+        rows = [_row("hvac"), _row("plumbing")]
+        for row in rows:
+            await signal_buffer.enqueue(row)
+
+        with patch.object(signal_buffer, "_insert_rows", AsyncMock(side_effect=RuntimeError("db down"))):
+            assert await signal_buffer.flush() == 0
+
+        assert [row for row, _ in signal_buffer._queue] == rows
+
+    async def test_full_queue_drops_new_signals(self):
+        with patch.object(signal_buffer, "MAX_QUEUE_SIZE", 2):
+            assert await signal_buffer.enqueue(_row())
+            assert await signal_buffer.enqueue(_row())
+            assert not await signal_buffer.enqueue(_row())
+        assert signal_buffer.pending_count() == 2
+        assert signal_buffer._dropped == 1
+
+
+class TestRecordSignal:
+    async def test_buffers_while_writer_runs(self, db, session_factory):
+        signal_buffer._running = True
+        await record_signal("email_opened", {"trade": "hvac"}, 1.0)
+
+        assert signal_buffer.pending_count() == 1
+        assert await _signals(db) == []
+
+    async def test_writes_directly_without_writer(self, db, session_factory):
+        await record_signal("email_opened", {"trade": "hvac"}, 1.0)
+
+        assert signal_buffer.pending_count() == 0
+        assert [s.trade for s in await _signals(db)] == ["hvac"]
+
+
+class TestWriter:
+    async def test_stop_drains_queue(self, db, session_factory):
+        with patch.object(signal_buffer, "FLUSH_INTERVAL_SECONDS", 60):
+            task = asyncio.create_task(signal_buffer.run_signal_writer())
+            await asyncio.sleep(0)
+            assert signal_buffer.is_running()
+
+            await record_signal("email_opened", {"trade": "hvac"}, 1.0)
+            await record_signal("email_clicked", {"trade": "hvac"}, 1.0)
+            await signal_buffer.stop_signal_writer(task)
+
+        assert task.done()
+        assert not signal_buffer.is_running()
+        assert len(await _signals(db)) == 2
+
+    async def test_stop_cancels_writer_that_never_started(self):
+        task = MagicMock(spec=asyncio.Task)
+        await signal_buffer.stop_signal_writer(task)
+        task.cancel.assert_called_once()
+
+
+class TestSpill:
+    async def test_spilled_entries_deleted_after_flush(self, db, session_factory, spill):
+        redis = MagicMock()
+        redis.xadd = AsyncMock(side_effect=["1-0", "1-1"])
+        redis.xdel = AsyncMock()
+
+        with patch(REDIS_PATCH, new_callable=AsyncMock, return_value=redis):
+            await signal_buffer.enqueue(_row())
+            await signal_buffer.enqueue(_row())
+            assert await signal_buffer.flush() == 2
+
+        assert redis.xadd.await_count == 2
+        redis.xdel.assert_awaited_once_with(signal_buffer.SPILL_STREAM_KEY, "1-0", "1-1")
+
+    async def test_recovers_orphaned_entries(self, db, session_factory):
+        row = _row("solar", value=0.0)
+        redis = MagicMock()
+        redis.set = AsyncMock(return_value=True)
+        redis.delete = AsyncMock()
+        redis.xrange = AsyncMock(return_value=[
+            ("5-0", {"row": signal_buffer._encode(row)}),
+            ("5-1", {"row": "not json"}),
+        ])
+        redis.xdel = AsyncMock()
+
+        with patch(REDIS_PATCH, new_callable=AsyncMock, return_value=redis):
+            assert await signal_buffer.recover_spilled() == 1
+
+        max_id = int(redis.xrange.call_args.kwargs["max"])
+        assert max_id <= (time.time() - signal_buffer.ORPHAN_AGE_SECONDS) * 1000
+        redis.xdel.assert_awaited_once_with(signal_buffer.SPILL_STREAM_KEY, "5-0", "5-1")
+        redis.delete.assert_awaited_once_with(signal_buffer.RECOVER_LOCK_KEY)
+
+        signals = await _signals(db)
+        assert [(s.id, s.trade, s.value) for s in signals] == [(row["id"], "solar", 0.0)]
+
+    async def test_recovery_skips_rows_already_flushed(self, db, session_factory):
+        flushed, orphan = _row("hvac"), _row("solar")
+        orphan["created_at"] = orphan["created_at"] - timedelta(minutes=5)
+        await signal_buffer._insert_rows([flushed])
+
+        redis = MagicMock()
+        redis.set = AsyncMock(return_value=True)
+        redis.delete = AsyncMock()
+        redis.xrange = AsyncMock(return_value=[
+            ("5-0", {"row": signal_buffer._encode(flushed)}),
+            ("5-1", {"row": signal_buffer._encode(orphan)}),
+        ])
+        redis.xdel = AsyncMock()
+
+        before = datetime.now(timezone.utc)
+        with patch(REDIS_PATCH, new_callable=AsyncMock, return_value=redis):
+            assert await signal_buffer.recover_spilled() == 2
+
+        redis.xdel.assert_awaited_once_with(signal_buffer.SPILL_STREAM_KEY, "5-0", "5-1")
+        signals = {s.id: s for s in await _signals(db)}
+        assert set(signals) == {flushed["id"], orphan["id"]}
+        # Re-stamped so rollups past the original time still count it
+        recovered_at = signals[orphan["id"]].created_at
+        if recovered_at.tzinfo is None:
+            recovered_at = recovered_at.replace(tzinfo=timezone.utc)
+        assert recovered_at >= before
+
+    async def test_recovery_skipped_when_locked(self):
+        redis = MagicMock()
+        redis.set = AsyncMock(return_value=False)
+        redis.xrange = AsyncMock()
+
+        with patch(REDIS_PATCH, new_callable=AsyncMock, return_value=redis):
+            assert await signal_buffer.recover_spilled() == 0
+        redis.xrange.assert_not_called()
+
+    def test_encode_round_trip(self):
+        row = _row()
+        decoded = signal_buffer._decode(signal_buffer._encode(row))
+        assert decoded == row
+        assert json.loads(signal_buffer._encode(row))["id"] == str(row["id"])
@@ -0,0 +1,264 @@
+"""
+Tests for src/services/slot_inventory.py - per-client appointment slot
+inventory and atomic reservations. Bookings live in an in-memory SQLite
+database; Redis is mocked.
+"""
+import json
+from contextlib import asynccontextmanager
+from datetime import date, datetime, time, timedelta, timezone
+from unittest.mock import ANY, AsyncMock, MagicMock, patch
+
+import pytest
+
+from src.models.booking import Booking
+from src.models.client import Client
+from src.models.lead import Lead
+from src.schemas.client_config import ClientConfig
+from src.services import slot_inventory
+from src.services.scheduling import generate_available_slots
+
+REDIS_PATCH = "src.utils.dedup.get_redis"
+MONDAY = date(2026, 3, 16)
+
+
+def _config(**scheduling) -> ClientConfig:
+    return ClientConfig(
+        service_area={"center": {"lat": 30.2672, "lng": -97.7431}},
+        team=[{"name": "Mike"}, {"name": "Carlos"}],
+        scheduling={"advance_booking_days": 1, **scheduling},
+    )
+
+
+def _redis(hashes=None, eval_results=None):
+    redis = MagicMock()
+    pipe = MagicMock()
+    pipe.execute = AsyncMock(side_effect=[hashes or [], []] if hashes is not None else None)
+    redis.pipeline.return_value = pipe
+    redis.eval = AsyncMock(side_effect=eval_results)
+    redis.get = AsyncMock(return_value=None)
+    redis.set = AsyncMock()
+    return redis
+
+
+@pytest.fixture
+async def client(db):
+    client = Client(business_name="Cool HVAC Co", trade_type="hvac", crm_type="jobber")
+    db.add(client)
+    await db.commit()
+    return client
+
+
+async def _book(db, client, day, start, status="confirmed"):
+    lead = Lead(client_id=client.id, phone="+15125551234", source="google_lsa")
+    db.add(lead)
+    await db.flush()
+    db.add(Booking(
+        lead_id=lead.id, client_id=client.id, appointment_date=day,
+        time_window_start=start, service_type="AC Repair", status=status,
+    ))
+    await db.commit()
+
+
+class TestDayTemplate:
+    def test_matches_generated_slots(self):
+        config = _config()
+        template = slot_inventory.day_template(config, MONDAY)
+        generated = generate_available_slots(
+            start_date=MONDAY, days_ahead=1,
+            team_members=[{"name": "Mike"}, {"name": "Carlos"}],
+        )
+        assert [(s.date, s.start, s.end, s.tech_name) for s in template] == [
+            (s.date, s.start, s.end, s.tech_name) for s in generated
+        ]
+
+    def test_sunday_has_no_slots(self):
+        assert slot_inventory.day_template(_config(), MONDAY - timedelta(days=1)) == []
+
+
+class TestAvailableSlots:
+    async def test_booked_slots_are_not_offered(self, db, client):
+        await _book(db, client, MONDAY, time(7, 0))
+        await _book(db, client, MONDAY, time(9, 30), status="cancelled")
+
+        with patch(REDIS_PATCH, new_callable=AsyncMock, side_effect=ConnectionError("down")):
+            slots = await slot_inventory.available_slots(db, client, _config(), start_date=MONDAY)
+
+        starts = [s.start for s in slots]
+        assert time(7, 0) not in starts
+        assert time(9, 30) in starts
+
+    async def test_cached_day_skips_db(self, client):
+        redis = _redis(hashes=[{"_day": "2", "07:00": "1", "12:00": "1"}])
+        db = AsyncMock()
+
+        with patch(REDIS_PATCH, new_callable=AsyncMock, return_value=redis):
+            slots = await slot_inventory.available_slots(
+                db, client, _config(max_daily_bookings=4), start_date=MONDAY,
+            )
+
+        assert [s.start for s in slots] == [time(9, 30), time(14, 30)]
+        redis.pipeline.return_value.hgetall.assert_called_once_with(
+            slot_inventory.day_key(client.id, MONDAY),
+        )
+        db.execute.assert_not_awaited()
+
+    async def test_missing_day_is_seeded_from_db(self, db, client):
+        await _book(db, client, MONDAY, time(7, 0))
+        redis = _redis(hashes=[{}])
+
+        with patch(REDIS_PATCH, new_callable=AsyncMock, return_value=redis):
+            slots = await slot_inventory.available_slots(db, client, _config(), start_date=MONDAY)
+
+        assert time(7, 0) not in [s.start for s in slots]
+        pipe = redis.pipeline.return_value
+        args = pipe.eval.call_args.args
+        assert args[2] == slot_inventory.day_key(client.id, MONDAY)
+        assert dict(zip(args[4::2], args[5::2])) == {"_day": 1, "07:00": 1}
+        pipe.sadd.assert_called_once_with(slot_inventory.SEEDED_DAYS_KEY, f"{client.id}:{MONDAY}")
+
+    async def test_crm_availability_limits_slots(self, db, client):
+        crm = MagicMock()
+        crm.get_availability = AsyncMock(return_value=[
+            {"date": str(MONDAY), "start": "09:00", "end": "12:00", "tech_id": "1"},
+        ])
+
+        with patch(REDIS_PATCH, new_callable=AsyncMock, side_effect=ConnectionError("down")), \
+             patch("src.workers.crm_sync.get_crm_for_client", return_value=crm):
+            slots = await slot_inventory.available_slots(
+                db, client, _config(crm_availability=True), start_date=MONDAY,
+            )
+
+        assert [(s.start, s.end) for s in slots] == [(time(9, 30), time(11, 30))]
+        crm.get_availability.assert_awaited_once_with(MONDAY, MONDAY)
+
+
+class TestReserve:
+    async def test_reserves_with_one_script_call(self, client):
+        redis = _redis(eval_results=[1])
+        db = AsyncMock()
+
+        with patch(REDIS_PATCH, new_callable=AsyncMock, return_value=redis):
+            assert await slot_inventory.reserve(db, client.id, _config(), MONDAY, time(9, 30)) is True
+
+        redis.eval.assert_awaited_once_with(
+            slot_inventory._RESERVE_SCRIPT, 1, slot_inventory.day_key(client.id, MONDAY),
+            8, "09:30", slot_inventory.SLOT_CAPACITY, ANY,
+        )
+        db.execute.assert_not_called()
+
+    async def test_taken_slot_is_rejected(self, client):
+        redis = _redis(eval_results=[0])
+        with patch(REDIS_PATCH, new_callable=AsyncMock, return_value=redis):
+            assert await slot_inventory.reserve(AsyncMock(), client.id, _config(), MONDAY, time(9, 30)) is False
+
+    async def test_unseeded_day_seeds_then_reserves(self, db, client):
+        await _book(db, client, MONDAY, time(7, 0))
+        redis = _redis(eval_results=[-1, 1])
+        redis.pipeline.return_value.execute = AsyncMock(return_value=[])
+
+        with patch(REDIS_PATCH, new_callable=AsyncMock, return_value=redis):
+            assert await slot_inventory.reserve(db, client.id, _config(), MONDAY, time(9, 30)) is True
+
+        assert redis.eval.await_count == 2
+        seed_args = redis.pipeline.return_value.eval.call_args.args
+        assert dict(zip(seed_args[4::2], seed_args[5::2])) == {"_day": 1, "07:00": 1}
+
+    async def test_db_fallback_checks_day_and_slot(self, db, client):
+        await _book(db, client, MONDAY, time(7, 0))
+        config = _config(max_daily_bookings=2)
+
+        with patch(REDIS_PATCH, new_callable=AsyncMock, side_effect=ConnectionError("down")):
+            assert await slot_inventory.reserve(db, client.id, config, MONDAY, time(7, 0)) is False
+            assert await slot_inventory.reserve(db, client.id, config, MONDAY, time(9, 30)) is True
+            await _book(db, client, MONDAY, time(9, 30))
+            assert await slot_inventory.reserve(db, client.id, config, MONDAY, None) is False
+
+
+class TestReconcile:
+    @pytest.fixture
+    def session_factory(self, db):
+        @asynccontextmanager
+        async def _factory():
+            yield db
+
+        with patch("src.database.async_session_factory", _factory):
+            yield _factory
+
+    async def test_rebuilds_drifted_days_and_forgets_past_ones(self, db, client, session_factory):
+        today = date.today()
+        await _book(db, client, today, time(7, 0))
+        redis = MagicMock()
+        redis.smembers = AsyncMock(return_value={
+            f"{client.id}:{today}", f"{client.id}:{today - timedelta(days=3)}",
+        })
+        redis.srem = AsyncMock()
+        pipe = MagicMock()
+        # Cached count leaked a reservation that never committed, long ago
+        long_ago = str(int(datetime.now(timezone.utc).timestamp()) - 3600)
+        pipe.execute = AsyncMock(side_effect=[
+            [{"_day": "2", "07:00": "1", "09:30": "1", "_reserved_at": long_ago}], [1],
+        ])
+        redis.pipeline.return_value = pipe
+
+        with patch(REDIS_PATCH, new_callable=AsyncMock, return_value=redis):
+            assert await slot_inventory.reconcile_slot_inventory() == 1
+
+        redis.srem.assert_awaited_once_with(
+            slot_inventory.SEEDED_DAYS_KEY, f"{client.id}:{today - timedelta(days=3)}",
+        )
+        reseed_args = pipe.eval.call_args.args
+        assert reseed_args[0] == slot_inventory._RESEED_SCRIPT
+        assert reseed_args[2] == slot_inventory.day_key(client.id, today)
+        # The script itself re-checks the grace cutoff before replacing the hash
+        assert int(long_ago) < reseed_args[3] < datetime.now(timezone.utc).timestamp()
+        assert dict(zip(reseed_args[5::2], reseed_args[6::2])) == {"_day": 1, "07:00": 1}
+
+    async def test_recent_reservation_is_not_wiped(self, db, client, session_factory):
+        today = date.today()
+        redis = MagicMock()
+        redis.smembers = AsyncMock(return_value={f"{client.id}:{today}"})
+        pipe = MagicMock()
+        # Reserved a moment ago; its Booking has not committed yet
+        just_now = str(int(datetime.now(timezone.utc).timestamp()))
+        pipe.execute = AsyncMock(return_value=[{"_day": "1", "09:30": "1", "_reserved_at": just_now}])
+        redis.pipeline.return_value = pipe
+
+        with patch(REDIS_PATCH, new_callable=AsyncMock, return_value=redis):
+            assert await slot_inventory.reconcile_slot_inventory() == 0
+
+        pipe.eval.assert_not_called()
+
+
+class TestConfirmedSlotIndex:
+    async def test_second_confirmed_booking_for_a_slot_is_rejected(self, db, client):
+        from sqlalchemy.exc import IntegrityError
+
+        await _book(db, client, MONDAY, time(9, 30), status="cancelled")
+        await _book(db, client, MONDAY, time(9, 30))
+        with pytest.raises(IntegrityError):
+            await _book(db, client, MONDAY, time(9, 30))
+
+
+class TestCrmWindows:
+    def test_unparseable_entries_are_skipped(self):
+        windows = slot_inventory._parse_windows([
+            {"date": "2026-03-16", "start": "08:00", "end": "12:00"},
+            {"date": "2026-03-16T00:00:00Z", "start": "13:00:00", "end": "17:00:00"},
+            {"start": "08:00"},
+            {"date": "soon", "start": "08:00", "end": "12:00"},
+        ])
+        assert windows == {MONDAY: [(time(8, 0), time(12, 0)), (time(13, 0), time(17, 0))]}
+
+    async def test_cached_availability_skips_crm(self):
+        client = MagicMock()
+        redis = _redis()
+        redis.get = AsyncMock(return_value=json.dumps([
+            {"date": "2026-03-16", "start": "08:00", "end": "12:00"},
+        ]))
+
+        with patch(REDIS_PATCH, new_callable=AsyncMock, return_value=redis), \
+             patch("src.workers.crm_sync.get_crm_for_client") as mock_crm:
+            windows = await slot_inventory._crm_windows(client, MONDAY, MONDAY)
+
+        assert windows == {MONDAY: [(time(8, 0), time(12, 0))]}
+        mock_crm.assert_not_called()
@@ -57,9 +57,11 @@ class TestGetTwilioClient:
         settings = _make_settings()
 
         with patch("src.config.get_settings", return_value=settings), \
+             patch("src.services.sms._twilio_client", None), \
              patch("twilio.rest.Client", mock_twilio_client_cls), \
              patch("twilio.http.http_client.TwilioHttpClient", mock_http_client_cls):
             client = _get_twilio_client()
+            assert _get_twilio_client() is client
 
         mock_http_client_cls.assert_called_once_with(timeout=10)
         mock_twilio_client_cls.assert_called_once_with(
@@ -358,68 +360,131 @@ class TestReleasePhoneNumber:
 # _send_twilio (internal)
 # ---------------------------------------------------------------------------
 
+def _twilio_http_client(status_code=201, payload=None):
+    """Mock pooled HTTP client returning one Twilio Messages API response."""
+    mock_response = MagicMock()
+    mock_response.status_code = status_code
+    mock_response.json.return_value = payload if payload is not None else {
+        "sid": "SM_123", "status": "queued",
+    }
+    mock_response.text = "error"
+    mock_client = MagicMock()
+    mock_client.post = AsyncMock(return_value=mock_response)
+    return mock_client
+
+
 class TestSendTwilio:
     async def test_uses_messaging_service_sid_from_arg(self):
         """When messaging_service_sid is passed directly, use it."""
         from src.services.sms import _send_twilio
 
-        mock_msg = SimpleNamespace(sid="SM_123", status="queued")
-        mock_client = MagicMock()
-        mock_client.messages.create = MagicMock(return_value=mock_msg)
+        mock_client = _twilio_http_client()
         settings = _make_settings(twilio_messaging_service_sid="")
 
-        with patch("src.services.sms._get_twilio_client", return_value=mock_client), \
+        with patch("src.utils.http_client.get_http_client", return_value=mock_client), \
              patch("src.config.get_settings", return_value=settings):
             result = await _send_twilio("+15125551000", "Hello", messaging_service_sid="MG_arg")
 
-        call_kwargs = mock_client.messages.create.call_args
-        assert call_kwargs[1]["messaging_service_sid"] == "MG_arg"
+        call_args = mock_client.post.call_args
+        assert call_args[0][0] == (
+            "https://api.twilio.com/2010-04-01/Accounts/AC_test/Messages.json"
+        )
+        assert call_args[1]["data"] == {
+            "To": "+15125551000", "Body": "Hello", "MessagingServiceSid": "MG_arg",
+        }
+        assert call_args[1]["auth"] == ("AC_test", "auth_test")
         assert result == {"sid": "SM_123", "status": "queued"}
 
     async def test_uses_messaging_service_sid_from_settings(self):
         """When no messaging_service_sid arg, falls back to settings."""
         from src.services.sms import _send_twilio
 
-        mock_msg = SimpleNamespace(sid="SM_456", status="queued")
-        mock_client = MagicMock()
-        mock_client.messages.create = MagicMock(return_value=mock_msg)
+        mock_client = _twilio_http_client()
         settings = _make_settings(twilio_messaging_service_sid="MG_default_setting")
 
-        with patch("src.services.sms._get_twilio_client", return_value=mock_client), \
+        with patch("src.utils.http_client.get_http_client", return_value=mock_client), \
              patch("src.config.get_settings", return_value=settings):
-            result = await _send_twilio("+15125551000", "Hello")
+            await _send_twilio("+15125551000", "Hello")
 
-        call_kwargs = mock_client.messages.create.call_args
-        assert call_kwargs[1]["messaging_service_sid"] == "MG_default_setting"
+        data = mock_client.post.call_args[1]["data"]
+        assert data["MessagingServiceSid"] == "MG_default_setting"
 
     async def test_uses_from_phone_when_no_msgsvc(self):
         """When no messaging_service_sid at all, use from_phone."""
         from src.services.sms import _send_twilio
 
-        mock_msg = SimpleNamespace(sid="SM_789", status="queued")
-        mock_client = MagicMock()
-        mock_client.messages.create = MagicMock(return_value=mock_msg)
+        mock_client = _twilio_http_client()
         settings = _make_settings(twilio_messaging_service_sid="")
 
-        with patch("src.services.sms._get_twilio_client", return_value=mock_client), \
+        with patch("src.utils.http_client.get_http_client", return_value=mock_client), \
              patch("src.config.get_settings", return_value=settings):
-            result = await _send_twilio("+15125551000", "Hello", from_phone="+15125559999")
+            await _send_twilio("+15125551000", "Hello", from_phone="+15125559999")
 
-        call_kwargs = mock_client.messages.create.call_args
-        assert call_kwargs[1]["from_"] == "+15125559999"
-        assert "messaging_service_sid" not in call_kwargs[1]
+        data = mock_client.post.call_args[1]["data"]
+        assert data["From"] == "+15125559999"
+        assert "MessagingServiceSid" not in data
 
     async def test_raises_when_no_from_or_msgsvc(self):
         """When neither from_phone nor messaging_service_sid, raise ValueError."""
         from src.services.sms import _send_twilio
 
-        mock_client = MagicMock()
+        mock_client = _twilio_http_client()
         settings = _make_settings(twilio_messaging_service_sid="")
 
-        with patch("src.services.sms._get_twilio_client", return_value=mock_client), \
+        with patch("src.utils.http_client.get_http_client", return_value=mock_client), \
              patch("src.config.get_settings", return_value=settings):
             with pytest.raises(ValueError, match="Either from_phone or messaging_service_sid"):
                 await _send_twilio("+15125551000", "Hello")
+        mock_client.post.assert_not_called()
+
+    async def test_error_response_raises_with_twilio_code(self):
+        """Twilio error bodies surface as TwilioRestException with the error code."""
+        from twilio.base.exceptions import TwilioRestException
+        from src.services.sms import _extract_error_code, _send_twilio
+
+        mock_client = _twilio_http_client(
+            status_code=400,
+            payload={"code": 21211, "message": "Invalid 'To' Phone Number", "status": 400},
+        )
+
+        with patch("src.utils.http_client.get_http_client", return_value=mock_client), \
+             patch("src.config.get_settings", return_value=_make_settings()):
+            with pytest.raises(TwilioRestException) as exc_info:
+                await _send_twilio("+15125551000", "Hello")
+
+        assert exc_info.value.status == 400
+        assert _extract_error_code(exc_info.value) == "21211"
+
+    async def test_concurrent_sends_bounded_by_semaphore(self):
+        """No more than TWILIO_MAX_CONCURRENT_SENDS requests are in flight at once."""
+        from src.services import sms
+
+        in_flight = 0
+        peak = 0
+
+        async def slow_post(*args, **kwargs):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            response = MagicMock(status_code=201)
+            response.json.return_value = {"sid": "SM_x", "status": "queued"}
+            return response
+
+        mock_client = MagicMock()
+        mock_client.post = slow_post
+
+        with patch("src.utils.http_client.get_http_client", return_value=mock_client), \
+             patch("src.config.get_settings", return_value=_make_settings()), \
+             patch.object(sms, "TWILIO_MAX_CONCURRENT_SENDS", 3), \
+             patch.object(sms, "_twilio_send_semaphore", None):
+            results = await asyncio.gather(*[
+                sms._send_twilio("+15125551000", "Hello") for _ in range(10)
+            ])
+
+        assert len(results) == 10
+        assert peak == 3
 
 
 # ---------------------------------------------------------------------------
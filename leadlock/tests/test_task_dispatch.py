@@ -133,3 +133,18 @@ class TestEnqueueTask:
 
         task_obj = mock_db.add.call_args[0][0]
         assert task_obj.payload == {}
+
+    @pytest.mark.asyncio
+    async def test_assigns_lane_from_task_type(self):
+        """SMS retries go to the express lane, enrichment to bulk, others to normal."""
+        for task_type, lane in [
+            ("sms_retry", "express"),
+            ("enrich_prospect", "bulk"),
+            ("classify_reply", "normal"),
+        ]:
+            factory_cls, mock_db, fake_id = _mock_async_session_factory()
+
+            with patch("src.services.task_dispatch.async_session_factory", return_value=factory_cls()):
+                await enqueue_task(task_type=task_type)
+
+            assert mock_db.add.call_args[0][0].lane == lane
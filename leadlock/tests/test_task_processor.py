@@ -1,19 +1,29 @@
 """
 Tests for src/workers/task_processor.py - task processing, dispatch, and handlers.
-Covers: _heartbeat, run_task_processor, process_cycle, _execute_task,
-_dispatch_task, and all five handler functions.
+Covers: _heartbeat, run_task_processor, claiming/leases, process_cycle,
+_execute_task, _dispatch_task, and all five handler functions.
 """
+import asyncio
 import pytest
 import uuid
 from datetime import datetime, timedelta, timezone
 from unittest.mock import AsyncMock, MagicMock, patch, call
 
 from src.models.task_queue import TaskQueue
+from src.workers import task_processor as tp
 from src.workers.task_processor import (
     _heartbeat,
     run_task_processor,
     process_cycle,
+    claim_tasks,
+    reclaim_expired_leases,
+    _renew_leases,
+    _release_in_flight,
     _execute_task,
+    _apply_outcome,
+    _allocate_lane_shares,
+    get_lane_stats,
+    publish_lane_gauges,
     _dispatch_task,
     _handle_enrich_email,
     _handle_record_signal,
@@ -22,6 +32,7 @@ from src.workers.task_processor import (
     _handle_send_sequence_email,
     POLL_INTERVAL_SECONDS,
     MAX_TASKS_PER_CYCLE,
+    WORKER_ID,
 )
 
 
@@ -139,6 +150,7 @@ class TestRunTaskProcessor:
                 raise KeyboardInterrupt("stop loop")
 
         with patch("src.workers.task_processor.process_cycle", side_effect=_mock_process_cycle), \
+             patch("src.workers.task_processor.reclaim_expired_leases", new_callable=AsyncMock), \
              patch("src.workers.task_processor._heartbeat", new_callable=AsyncMock) as mock_hb, \
              patch("src.workers.task_processor.asyncio.sleep", new_callable=AsyncMock) as mock_sleep:
             with pytest.raises(KeyboardInterrupt):
@@ -162,6 +174,7 @@ class TestRunTaskProcessor:
             raise KeyboardInterrupt("stop")
 
         with patch("src.workers.task_processor.process_cycle", side_effect=_mock_process_cycle), \
+             patch("src.workers.task_processor.reclaim_expired_leases", new_callable=AsyncMock), \
              patch("src.workers.task_processor._heartbeat", new_callable=AsyncMock), \
              patch("src.workers.task_processor.asyncio.sleep", new_callable=AsyncMock):
             with pytest.raises(KeyboardInterrupt):
@@ -171,144 +184,429 @@ class TestRunTaskProcessor:
         assert call_count == 2
 
 
+    async def test_retention_runs_beside_claim_loop(self):
+        """A slow retention run does not hold up claiming and is cancelled on exit."""
+        started = asyncio.Event()
+        cancelled = False
+        call_count = 0
+
+        async def _slow_retention():
+            nonlocal cancelled
+            started.set()
+            try:
+                await asyncio.Event().wait()
+            except asyncio.CancelledError:
+                cancelled = True
+                raise
+
+        async def _mock_process_cycle():
+            nonlocal call_count
+            call_count += 1
+            if call_count >= 3:
+                raise KeyboardInterrupt("stop loop")
+
+        with patch("src.workers.task_processor.process_cycle", side_effect=_mock_process_cycle), \
+             patch("src.workers.task_processor.reclaim_expired_leases", new_callable=AsyncMock), \
+             patch("src.workers.task_processor._heartbeat", new_callable=AsyncMock), \
+             patch("src.workers.task_processor.RETENTION_INTERVAL_SECONDS", 0), \
+             patch("src.services.task_retention.run_retention", side_effect=_slow_retention) as mock_retention, \
+             patch("src.utils.dedup.get_redis", new_callable=AsyncMock, side_effect=RuntimeError("no redis")), \
+             patch("src.workers.task_processor.POLL_INTERVAL_SECONDS", 0):
+            with pytest.raises(KeyboardInterrupt):
+                await run_task_processor()
+
+        assert call_count == 3
+        assert started.is_set()
+        # Still running on the next cycle, so not started twice
+        assert mock_retention.call_count == 1
+        assert cancelled
+
+
 # ---------------------------------------------------------------------------
-# process_cycle
+# Executor against a real (SQLite) session factory
 # ---------------------------------------------------------------------------
 
-class TestProcessCycle:
-    async def test_no_tasks_returns_early(self):
-        """When no tasks are pending, return immediately without commit."""
-        factory_cls, mock_db = _mock_async_session_factory(tasks=[])
+@pytest.fixture
+async def session_factory(tmp_path):
+    """File-backed SQLite session factory so several sessions see the same rows."""
+    from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
+    from src.database import Base
 
-        with patch("src.workers.task_processor.async_session_factory", return_value=factory_cls()):
-            await process_cycle()
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'tasks.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    with patch("src.workers.task_processor.async_session_factory", factory):
+        yield factory
+    tp._in_flight.clear()
+    await engine.dispose()
 
-        mock_db.commit.assert_not_awaited()
 
-    async def test_executes_pending_tasks_and_commits(self):
-        """Processes each pending task and commits."""
-        task1 = _make_task(task_type="enrich_email")
-        task2 = _make_task(task_type="classify_reply")
-        factory_cls, mock_db = _mock_async_session_factory(tasks=[task1, task2])
+async def _add_task(factory, **fields):
+    task = TaskQueue(
+        task_type=fields.pop("task_type", "enrich_email"),
+        payload=fields.pop("payload", {}),
+        scheduled_at=fields.pop("scheduled_at", datetime.now(timezone.utc) - timedelta(seconds=5)),
+        **fields,
+    )
+    async with factory() as db:
+        db.add(task)
+        await db.commit()
+    return task.id
 
-        with patch("src.workers.task_processor.async_session_factory", return_value=factory_cls()), \
-             patch("src.workers.task_processor._execute_task", new_callable=AsyncMock) as mock_exec:
-            await process_cycle()
 
-        assert mock_exec.await_count == 2
-        mock_db.commit.assert_awaited_once()
+async def _load(factory, task_id):
+    async with factory() as db:
+        return await db.get(TaskQueue, task_id)
 
-    async def test_execute_task_called_with_db_and_task(self):
-        """_execute_task is called with the db session and each task."""
-        task = _make_task(task_type="record_signal")
-        factory_cls, mock_db = _mock_async_session_factory(tasks=[task])
 
-        with patch("src.workers.task_processor.async_session_factory", return_value=factory_cls()), \
-             patch("src.workers.task_processor._execute_task", new_callable=AsyncMock) as mock_exec:
+class TestClaimTasks:
+    async def test_claims_due_tasks_with_lease(self, session_factory):
+        task_id = await _add_task(session_factory, task_type="classify_reply", payload={"text": "hi"})
+
+        claimed = await claim_tasks(5)
+
+        assert len(claimed) == 1
+        assert claimed[0]["id"] == task_id
+        assert claimed[0]["task_type"] == "classify_reply"
+        assert claimed[0]["lane"] == "normal"
+        assert claimed[0]["payload"] == {"text": "hi"}
+        assert claimed[0]["wait_ms"] >= 5000
+        row = await _load(session_factory, task_id)
+        assert row.status == "processing"
+        assert row.worker_id == WORKER_ID
+        assert row.lease_expires_at is not None
+        assert row.started_at is not None
+
+    async def test_skips_future_and_claimed_tasks(self, session_factory):
+        await _add_task(session_factory, scheduled_at=datetime.now(timezone.utc) + timedelta(hours=1))
+        await _add_task(session_factory, status="processing")
+
+        assert await claim_tasks(5) == []
+
+    async def test_highest_priority_first(self, session_factory):
+        await _add_task(session_factory, task_type="enrich_email", priority=1)
+        high = await _add_task(session_factory, task_type="sms_retry", priority=9)
+
+        claimed = await claim_tasks(1)
+
+        assert [c["id"] for c in claimed] == [high]
+
+    async def test_respects_per_type_slots(self, session_factory):
+        for _ in range(3):
+            await _add_task(session_factory, task_type="generate_content")
+        sms = await _add_task(session_factory, task_type="sms_retry")
+
+        claimed = await claim_tasks(10)
+
+        types = sorted(c["task_type"] for c in claimed)
+        assert types == ["generate_content", "sms_retry"]
+        assert sms in {c["id"] for c in claimed}
+
+    async def test_saturated_type_excluded(self, session_factory):
+        await _add_task(session_factory, task_type="enrich_prospect")
+
+        claimed = await claim_tasks(10, {"enrich_prospect": 0})
+
+        assert claimed == []
+
+
+class TestProcessCycle:
+    async def test_no_free_slots_does_not_claim(self):
+        tp._in_flight.update({uuid.uuid4(): ("x", "normal", MagicMock()) for _ in range(tp.MAX_CONCURRENT_TASKS)})
+        try:
+            with patch("src.workers.task_processor.claim_tasks", new_callable=AsyncMock) as mock_claim:
+                launched = await process_cycle()
+        finally:
+            tp._in_flight.clear()
+
+        assert launched == 0
+        mock_claim.assert_not_awaited()
+
+    async def test_no_tasks_returns_zero(self):
+        with patch("src.workers.task_processor.claim_tasks", new_callable=AsyncMock, return_value=[]):
+            assert await process_cycle() == 0
+
+    async def test_runs_claimed_tasks_concurrently(self, session_factory):
+        """A slow handler does not block a fast one claimed in the same batch."""
+        slow = await _add_task(session_factory, task_type="enrich_prospect", lane="bulk", priority=9)
+        fast = await _add_task(session_factory, task_type="sms_retry", lane="express", priority=1)
+        release = asyncio.Event()
+
+        async def _dispatch(task_type, payload):
+            if task_type == "enrich_prospect":
+                await release.wait()
+            return {"status": task_type}
+
+        with patch("src.workers.task_processor._dispatch_task", side_effect=_dispatch):
+            assert await process_cycle() == 2
+            while fast in tp._in_flight:
+                await asyncio.sleep(0.01)
+
+            assert (await _load(session_factory, fast)).status == "completed"
+            assert (await _load(session_factory, slow)).status == "processing"
+
+            release.set()
+            _, _, slow_handle = tp._in_flight[slow]
+            await slow_handle
+
+        assert (await _load(session_factory, slow)).status == "completed"
+        assert tp._in_flight == {}
+
+
+class TestLanes:
+    def test_shares_follow_weights(self):
+        shares = _allocate_lane_shares(7, {"express": 6, "normal": 6, "bulk": 4})
+
+        assert shares == {"express": 4, "normal": 2, "bulk": 1}
+
+    def test_shares_capped_by_lane_budget(self):
+        shares = _allocate_lane_shares(10, {"express": 1, "normal": 6, "bulk": 4})
+
+        assert shares["express"] == 1
+        assert sum(shares.values()) == 10
+
+    def test_budgets_scale_with_concurrency(self):
+        with patch.object(tp, "MAX_CONCURRENT_TASKS", 16):
+            assert tp._lane_budgets() == {"express": 6, "normal": 6, "bulk": 4}
+        with patch.object(tp, "MAX_CONCURRENT_TASKS", 40):
+            budgets = tp._lane_budgets()
+        assert budgets == {"express": 15, "normal": 15, "bulk": 10}
+        with patch.object(tp, "MAX_CONCURRENT_TASKS", 10):
+            budgets = tp._lane_budgets()
+        assert sum(budgets.values()) == 10
+        assert budgets["express"] >= budgets["bulk"] >= 1
+
+    def test_no_budget_no_shares(self):
+        assert sum(_allocate_lane_shares(10, {"express": 0, "normal": 0, "bulk": 0}).values()) == 0
+
+    async def test_express_not_starved_by_bulk_flood(self, session_factory):
+        """High-priority bulk rows cannot take the express lane's slots."""
+        for _ in range(20):
+            await _add_task(session_factory, task_type="enrich_prospect", lane="bulk", priority=10)
+        sms = await _add_task(session_factory, task_type="sms_retry", lane="express", priority=0)
+        release = asyncio.Event()
+
+        async def _dispatch(task_type, payload):
+            await release.wait()
+            return {}
+
+        with patch("src.workers.task_processor._dispatch_task", side_effect=_dispatch):
             await process_cycle()
+            lanes = {tid: lane for tid, (_, lane, _) in tp._in_flight.items()}
+            release.set()
+            await asyncio.gather(*(h for _, _, h in list(tp._in_flight.values())))
 
-        mock_exec.assert_awaited_once_with(mock_db, task)
+        assert lanes[sms] == "express"
+        assert list(lanes.values()).count("bulk") == tp.TASK_TYPE_CONCURRENCY["enrich_prospect"]
 
+    async def test_unused_shares_go_to_busy_lanes(self, session_factory):
+        for _ in range(8):
+            await _add_task(session_factory, task_type="classify_reply", lane="normal")
 
-# ---------------------------------------------------------------------------
-# _execute_task
-# ---------------------------------------------------------------------------
+        with patch("src.workers.task_processor._dispatch_task", new_callable=AsyncMock, return_value={}):
+            launched = await process_cycle()
+            await asyncio.gather(*(h for _, _, h in list(tp._in_flight.values())))
 
-class TestExecuteTask:
-    async def test_success_path(self):
-        """On success, task status becomes completed with result_data."""
-        task = _make_task(task_type="enrich_email", payload={"website": "example.com"})
-        mock_db = AsyncMock()
-        mock_db.flush = AsyncMock()
+        assert launched == tp.TASK_TYPE_CONCURRENCY["classify_reply"]
 
-        dispatch_result = {"email": "found@example.com"}
-        with patch("src.workers.task_processor._dispatch_task", new_callable=AsyncMock, return_value=dispatch_result):
-            await _execute_task(mock_db, task)
+    async def test_lane_budget_is_a_hard_cap(self, session_factory):
+        """A backlogged lane never borrows the budget of idle lanes."""
+        for _ in range(12):
+            await _add_task(session_factory, task_type="enrich_prospect", lane="bulk")
 
-        assert task.status == "completed"
-        assert task.result_data == dispatch_result
-        assert task.completed_at is not None
-        assert task.started_at is not None
-        mock_db.flush.assert_awaited_once()
-
-    async def test_failure_with_retries_remaining(self):
-        """On failure with retries remaining, task goes back to pending with backoff."""
-        task = _make_task(
-            task_type="enrich_email",
-            retry_count=0,
-            max_retries=3,
+        with patch.object(tp, "MAX_CONCURRENT_TASKS", 16), \
+             patch.dict(tp.TASK_TYPE_CONCURRENCY, {"enrich_prospect": 16}), \
+             patch("src.workers.task_processor._dispatch_task", new_callable=AsyncMock, return_value={}):
+            launched = await process_cycle()
+            await asyncio.gather(*(h for _, _, h in list(tp._in_flight.values())))
+
+        assert launched == tp._lane_budgets()["bulk"] == 4
+
+    async def test_lane_stats(self, session_factory):
+        await _add_task(
+            session_factory, task_type="sms_retry", lane="express",
+            scheduled_at=datetime.now(timezone.utc) - timedelta(seconds=90),
         )
-        mock_db = AsyncMock()
-        mock_db.flush = AsyncMock()
+        await _add_task(session_factory, task_type="enrich_prospect", lane="bulk")
+
+        stats = await get_lane_stats()
+
+        assert stats["express"]["depth"] == 1
+        assert stats["express"]["oldest_wait_s"] >= 89
+        assert stats["bulk"]["depth"] == 1
+        assert stats["normal"]["depth"] == 0
+        assert stats["express"]["budget"] == tp._lane_budgets()["express"]
+
+    async def test_publish_lane_gauges(self):
+        mock_redis = AsyncMock()
+        stats = {"express": {"depth": 2}}
+
+        with patch("src.workers.task_processor.get_lane_stats", new_callable=AsyncMock, return_value=stats), \
+             patch("src.utils.dedup.get_redis", new_callable=AsyncMock, return_value=mock_redis):
+            await publish_lane_gauges()
+
+        key, field, value = mock_redis.hset.call_args[0]
+        assert key == tp.LANE_GAUGE_KEY
+        assert field == WORKER_ID
+        assert '"depth": 2' in value
+        mock_redis.expire.assert_awaited_once()
+
+
+    async def test_shutdown_removes_lane_gauges(self):
+        mock_redis = AsyncMock()
+
+        with patch("src.workers.task_processor.process_cycle", side_effect=KeyboardInterrupt("stop")), \
+             patch("src.workers.task_processor.reclaim_expired_leases", new_callable=AsyncMock), \
+             patch("src.utils.dedup.get_redis", new_callable=AsyncMock, return_value=mock_redis):
+            with pytest.raises(KeyboardInterrupt):
+                await run_task_processor()
+
+        mock_redis.hdel.assert_awaited_once_with(tp.LANE_GAUGE_KEY, WORKER_ID)
+
+
+class TestExecuteTask:
+    async def test_success_path(self, session_factory):
+        task_id = await _add_task(session_factory)
+        [snapshot] = await claim_tasks(1)
+
+        with patch("src.workers.task_processor._dispatch_task", new_callable=AsyncMock, return_value={"email": "found@example.com"}):
+            await _execute_task(snapshot)
+
+        row = await _load(session_factory, task_id)
+        assert row.status == "completed"
+        assert row.result_data == {"email": "found@example.com"}
+        assert row.completed_at is not None
+        assert row.worker_id is None
+        assert row.lease_expires_at is None
+
+    async def test_failure_schedules_retry(self, session_factory):
+        task_id = await _add_task(session_factory)
+        [snapshot] = await claim_tasks(1)
 
         with patch("src.workers.task_processor._dispatch_task", new_callable=AsyncMock, side_effect=Exception("timeout")):
-            await _execute_task(mock_db, task)
-
-        assert task.status == "pending"
-        assert task.retry_count == 1
-        assert task.error_message == "timeout"
-        # Backoff for first retry: 30 * (4^0) = 30 seconds
-        assert task.scheduled_at > datetime.now(timezone.utc)
-        assert task.completed_at is None
-
-    async def test_failure_at_max_retries(self):
-        """On failure at max retries, task status becomes failed."""
-        task = _make_task(
-            task_type="enrich_email",
-            retry_count=2,
-            max_retries=3,
-        )
-        mock_db = AsyncMock()
-        mock_db.flush = AsyncMock()
+            await _execute_task(snapshot)
+
+        row = await _load(session_factory, task_id)
+        assert row.status == "pending"
+        assert row.retry_count == 1
+        assert row.error_message == "timeout"
 
-        with patch("src.workers.task_processor._dispatch_task", new_callable=AsyncMock, side_effect=Exception("permanent error")):
-            await _execute_task(mock_db, task)
+    async def test_lost_lease_discards_outcome(self, session_factory):
+        """If another worker reclaimed the row, the stale outcome is not written."""
+        task_id = await _add_task(session_factory)
+        [snapshot] = await claim_tasks(1)
+        async with session_factory() as db:
+            row = await db.get(TaskQueue, task_id)
+            row.worker_id = "other-host:1"
+            await db.commit()
+
+        with patch("src.workers.task_processor._dispatch_task", new_callable=AsyncMock, return_value={"ok": True}):
+            await _execute_task(snapshot)
+
+        row = await _load(session_factory, task_id)
+        assert row.status == "processing"
+        assert row.result_data is None
+
+
+class TestApplyOutcome:
+    def test_success(self):
+        task = _make_task(worker_id=WORKER_ID)
+        _apply_outcome(task, {"ok": True}, None)
+
+        assert task.status == "completed"
+        assert task.result_data == {"ok": True}
+        assert task.worker_id is None
+
+    def test_failure_at_max_retries(self):
+        task = _make_task(retry_count=2, max_retries=3)
+        _apply_outcome(task, None, "permanent error")
 
         assert task.status == "failed"
         assert task.retry_count == 3
         assert task.error_message == "permanent error"
         assert task.completed_at is not None
 
-    async def test_exponential_backoff_values(self):
+    def test_exponential_backoff_values(self):
         """Backoff increases exponentially: 30s, 120s, 480s."""
-        expected_backoffs = [30, 120, 480]
-
-        for retry_idx, expected_backoff in enumerate(expected_backoffs):
-            task = _make_task(
-                task_type="enrich_email",
-                retry_count=retry_idx,
-                max_retries=5,  # enough retries to test all
-            )
-            mock_db = AsyncMock()
-            mock_db.flush = AsyncMock()
+        for retry_idx, expected_backoff in enumerate([30, 120, 480]):
+            task = _make_task(retry_count=retry_idx, max_retries=5)
             before = datetime.now(timezone.utc)
 
-            with patch("src.workers.task_processor._dispatch_task", new_callable=AsyncMock, side_effect=Exception("err")):
-                await _execute_task(mock_db, task)
+            _apply_outcome(task, None, "err")
 
-            # scheduled_at should be at least expected_backoff seconds from now
-            min_scheduled = before + timedelta(seconds=expected_backoff - 1)
-            assert task.scheduled_at >= min_scheduled, (
-                f"retry_count={retry_idx + 1}: expected backoff ~{expected_backoff}s"
-            )
+            assert task.status == "pending"
+            assert task.scheduled_at >= before + timedelta(seconds=expected_backoff - 1)
 
-    async def test_sets_processing_status_before_dispatch(self):
-        """Task is set to 'processing' and flushed before dispatch."""
-        task = _make_task(task_type="enrich_email")
-        mock_db = AsyncMock()
-        mock_db.flush = AsyncMock()
 
-        statuses_at_flush = []
+class TestLeases:
+    async def test_reclaims_expired_lease(self, session_factory):
+        now = datetime.now(timezone.utc)
+        expired = await _add_task(
+            session_factory, status="processing", worker_id="dead-host:1",
+            started_at=now - timedelta(hours=1), lease_expires_at=now - timedelta(minutes=1),
+        )
+        live = await _add_task(
+            session_factory, status="processing", worker_id="live-host:1",
+            started_at=now, lease_expires_at=now + timedelta(minutes=5),
+        )
 
-        async def _capture_flush():
-            statuses_at_flush.append(task.status)
+        assert await reclaim_expired_leases() == 1
+
+        row = await _load(session_factory, expired)
+        assert row.status == "pending"
+        assert row.retry_count == 1
+        assert row.worker_id is None
+        assert "lease expired" in row.error_message
+        assert (await _load(session_factory, live)).status == "processing"
+
+    async def test_reclaim_fails_task_at_max_retries(self, session_factory):
+        now = datetime.now(timezone.utc)
+        task_id = await _add_task(
+            session_factory, status="processing", worker_id="dead-host:1",
+            retry_count=2, max_retries=3,
+            started_at=now - timedelta(hours=1), lease_expires_at=now - timedelta(minutes=1),
+        )
 
-        mock_db.flush.side_effect = _capture_flush
+        await reclaim_expired_leases()
 
-        with patch("src.workers.task_processor._dispatch_task", new_callable=AsyncMock, return_value={}):
-            await _execute_task(mock_db, task)
+        assert (await _load(session_factory, task_id)).status == "failed"
 
-        assert statuses_at_flush == ["processing"]
+    async def test_reclaims_legacy_processing_rows_without_lease(self, session_factory):
+        task_id = await _add_task(
+            session_factory, status="processing",
+            started_at=datetime.now(timezone.utc) - timedelta(hours=1),
+        )
+
+        assert await reclaim_expired_leases() == 1
+        assert (await _load(session_factory, task_id)).status == "pending"
+
+    async def test_renew_extends_own_leases(self, session_factory):
+        task_id = await _add_task(session_factory)
+        await claim_tasks(1)
+        async with session_factory() as db:
+            row = await db.get(TaskQueue, task_id)
+            row.lease_expires_at = datetime.now(timezone.utc) + timedelta(seconds=1)
+            await db.commit()
+        tp._in_flight[task_id] = ("enrich_email", "bulk", MagicMock())
+
+        await _renew_leases()
+
+        row = await _load(session_factory, task_id)
+        assert row.lease_expires_at.replace(tzinfo=timezone.utc) > datetime.now(timezone.utc) + timedelta(seconds=60)
+
+    async def test_release_in_flight_returns_rows_to_queue(self, session_factory):
+        task_id = await _add_task(session_factory)
+        await claim_tasks(1)
+        blocker = asyncio.create_task(asyncio.sleep(60))
+        tp._in_flight[task_id] = ("enrich_email", "bulk", blocker)
+
+        await _release_in_flight()
+
+        assert blocker.cancelled()
+        row = await _load(session_factory, task_id)
+        assert row.status == "pending"
+        assert row.worker_id is None
 
 
 # ---------------------------------------------------------------------------
@@ -507,16 +805,22 @@ class TestHandleSendSmsFollowup:
 
         with patch("src.workers.task_processor.async_session_factory", return_value=factory_cls()), \
              patch("src.services.outreach_sms.is_within_sms_quiet_hours", return_value=False), \
+             patch(
+                 "src.services.compliance.next_permissible_send",
+                 return_value=datetime.now(timezone.utc) + timedelta(hours=5),
+             ) as mock_next, \
              patch("src.services.task_dispatch.enqueue_task", new_callable=AsyncMock) as mock_enqueue:
             oid = str(uuid.uuid4())
             result = await _handle_send_sms_followup({"outreach_id": oid})
 
         assert result == {"status": "re-queued", "reason": "still quiet hours"}
+        mock_next.assert_called_once()
         mock_enqueue.assert_awaited_once()
         enqueue_call = mock_enqueue.call_args
         assert enqueue_call[1]["task_type"] == "send_sms_followup"
         assert enqueue_call[1]["priority"] == 7
-        assert enqueue_call[1]["delay_seconds"] == 3600
+        # Delayed until the window opens, not a fixed hour
+        assert 5 * 3600 - 5 <= enqueue_call[1]["delay_seconds"] <= 5 * 3600 + 1
 
     async def test_no_config_returns_skipped(self):
         """Missing SalesEngineConfig returns skip."""
@@ -915,44 +1219,39 @@ class TestHandleSendSequenceEmail:
 # ---------------------------------------------------------------------------
 
 class TestExecuteTaskIntegration:
-    async def test_full_success_flow(self):
+    async def test_full_success_flow(self, session_factory):
         """_execute_task -> _dispatch_task -> handler -> success."""
-        task = _make_task(task_type="enrich_email", payload={"website": "example.com"})
-        mock_db = AsyncMock()
-        mock_db.flush = AsyncMock()
+        task_id = await _add_task(session_factory, task_type="enrich_email", payload={"website": "example.com"})
+        [snapshot] = await claim_tasks(1)
 
         with patch("src.services.enrichment.enrich_prospect_email", new_callable=AsyncMock, return_value={"email": "a@b.com"}):
-            await _execute_task(mock_db, task)
+            await _execute_task(snapshot)
 
-        assert task.status == "completed"
-        assert task.result_data == {"email": "a@b.com"}
+        row = await _load(session_factory, task_id)
+        assert row.status == "completed"
+        assert row.result_data == {"email": "a@b.com"}
 
-    async def test_full_failure_retry_flow(self):
+    async def test_full_failure_retry_flow(self, session_factory):
         """_execute_task -> _dispatch_task -> handler exception -> retry."""
-        task = _make_task(
-            task_type="classify_reply",
-            payload={"text": "hello"},
-            retry_count=0,
-            max_retries=3,
-        )
-        mock_db = AsyncMock()
-        mock_db.flush = AsyncMock()
+        task_id = await _add_task(session_factory, task_type="classify_reply", payload={"text": "hello"})
+        [snapshot] = await claim_tasks(1)
 
         with patch("src.agents.sales_outreach.classify_reply", new_callable=AsyncMock, side_effect=Exception("API timeout")):
-            await _execute_task(mock_db, task)
+            await _execute_task(snapshot)
 
-        assert task.status == "pending"
-        assert task.retry_count == 1
-        assert task.error_message == "API timeout"
+        row = await _load(session_factory, task_id)
+        assert row.status == "pending"
+        assert row.retry_count == 1
+        assert row.error_message == "API timeout"
 
-    async def test_unknown_type_succeeds_with_skip(self):
+    async def test_unknown_type_succeeds_with_skip(self, session_factory):
         """Unknown task type completes successfully with skip result."""
-        task = _make_task(task_type="nonexistent_handler", payload={})
-        mock_db = AsyncMock()
-        mock_db.flush = AsyncMock()
+        task_id = await _add_task(session_factory, task_type="nonexistent_handler")
+        [snapshot] = await claim_tasks(1)
 
-        await _execute_task(mock_db, task)
+        await _execute_task(snapshot)
 
-        assert task.status == "completed"
-        assert task.result_data["status"] == "skipped"
-        assert "unknown task type" in task.result_data["reason"]
+        row = await _load(session_factory, task_id)
+        assert row.status == "completed"
+        assert row.result_data["status"] == "skipped"
+        assert "unknown task type" in row.result_data["reason"]
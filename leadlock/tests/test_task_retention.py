@@ -0,0 +1,199 @@
+"""
+Tests for src/services/task_retention.py - archiving terminal tasks and daily rollups.
+"""
+import pytest
+from datetime import date, datetime, timedelta, timezone
+from unittest.mock import AsyncMock, patch
+
+from sqlalchemy import select
+
+from src.models.task_queue import TaskQueue, TaskQueueArchive, TaskQueueDailyRollup
+from src.services import task_retention
+from src.services.task_retention import (
+    compact_terminal_tasks,
+    purge_archive,
+    run_retention,
+    get_rollup_totals,
+    get_daily_rollups,
+)
+
+
+@pytest.fixture
+async def session_factory(tmp_path):
+    from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
+    from src.database import Base
+
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'retention.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    with patch("src.services.task_retention.async_session_factory", factory):
+        yield factory
+    await engine.dispose()
+
+
+def _days_ago(days, hours=0):
+    return datetime.now(timezone.utc) - timedelta(days=days, hours=hours)
+
+
+async def _add(factory, **fields):
+    async with factory() as db:
+        db.add(TaskQueue(task_type=fields.pop("task_type", "enrich_prospect"), **fields))
+        await db.commit()
+
+
+async def _all(factory, model):
+    async with factory() as db:
+        return (await db.execute(select(model))).scalars().all()
+
+
+class TestCompactTerminalTasks:
+    async def test_moves_only_old_terminal_rows(self, session_factory):
+        finished = _days_ago(10)
+        await _add(session_factory, status="completed", payload={"x": 1}, result_data={"ok": True},
+                   created_at=finished, started_at=finished - timedelta(seconds=4), completed_at=finished)
+        await _add(session_factory, status="failed", error_message="boom",
+                   created_at=finished, completed_at=finished)
+        await _add(session_factory, status="completed", created_at=_days_ago(0), completed_at=_days_ago(0))
+        await _add(session_factory, status="pending", created_at=_days_ago(10))
+
+        moved = await compact_terminal_tasks(retention_days=3)
+
+        assert moved == 2
+        hot = await _all(session_factory, TaskQueue)
+        assert sorted(t.status for t in hot) == ["completed", "pending"]
+        archived = await _all(session_factory, TaskQueueArchive)
+        assert sorted(a.status for a in archived) == ["completed", "failed"]
+        done = next(a for a in archived if a.status == "completed")
+        assert done.payload == {"x": 1}
+        assert done.result_data == {"ok": True}
+
+    async def test_rollups_accumulate_across_batches(self, session_factory):
+        finished = _days_ago(5)
+        for seconds in (2, 6, 10):
+            await _add(session_factory, status="completed", retry_count=1, created_at=finished,
+                       started_at=finished - timedelta(seconds=seconds), completed_at=finished)
+
+        with patch.object(task_retention, "COMPACT_BATCH_SIZE", 2):
+            moved = await compact_terminal_tasks(retention_days=3)
+
+        assert moved == 3
+        [rollup] = await _all(session_factory, TaskQueueDailyRollup)
+        assert rollup.day == finished.date()
+        assert rollup.task_type == "enrich_prospect"
+        assert rollup.status == "completed"
+        assert rollup.task_count == 3
+        assert rollup.retry_count == 3
+        assert rollup.timed_count == 3
+        assert rollup.total_duration_s == pytest.approx(18.0)
+        assert rollup.max_duration_s == pytest.approx(10.0)
+
+    async def test_merges_onto_rollup_written_elsewhere(self, session_factory):
+        finished = _days_ago(5)
+        async with session_factory() as db:
+            db.add(TaskQueueDailyRollup(
+                day=finished.date(), task_type="enrich_prospect", status="completed",
+                task_count=5, retry_count=0, total_duration_s=50.0, timed_count=5, max_duration_s=30.0,
+            ))
+            await db.commit()
+        await _add(session_factory, status="completed", created_at=finished,
+                   started_at=finished - timedelta(seconds=4), completed_at=finished)
+
+        assert await compact_terminal_tasks(retention_days=3) == 1
+
+        [rollup] = await _all(session_factory, TaskQueueDailyRollup)
+        assert rollup.task_count == 6
+        assert rollup.timed_count == 6
+        assert rollup.total_duration_s == pytest.approx(54.0)
+        assert rollup.max_duration_s == pytest.approx(30.0)
+
+    async def test_nothing_to_compact(self, session_factory):
+        assert await compact_terminal_tasks() == 0
+
+
+class TestPurgeArchive:
+    async def test_deletes_old_archive_rows_only(self, session_factory):
+        import uuid
+        async with session_factory() as db:
+            db.add(TaskQueueArchive(id=uuid.uuid4(), task_type="a", status="completed", archived_at=_days_ago(100)))
+            db.add(TaskQueueArchive(id=uuid.uuid4(), task_type="b", status="completed", archived_at=_days_ago(1)))
+            await db.commit()
+
+        assert await purge_archive(retention_days=90) == 1
+        assert [a.task_type for a in await _all(session_factory, TaskQueueArchive)] == ["b"]
+
+
+class TestRollupQueries:
+    async def test_totals_and_daily_rows(self, session_factory):
+        finished = _days_ago(4)
+        await _add(session_factory, status="completed", created_at=finished,
+                   started_at=finished - timedelta(seconds=3), completed_at=finished)
+        await _add(session_factory, status="failed", task_type="sms_retry",
+                   created_at=finished, completed_at=finished)
+        await compact_terminal_tasks(retention_days=3)
+
+        totals = await get_rollup_totals(date.min)
+        assert totals["completed"]["count"] == 1
+        assert totals["completed"]["total_duration_s"] == pytest.approx(3.0)
+        assert totals["failed"]["count"] == 1
+
+        only_sms = await get_rollup_totals(date.min, ["sms_retry"])
+        assert list(only_sms) == ["failed"]
+
+        rows = await get_daily_rollups(days=30)
+        assert {(r["task_type"], r["status"]) for r in rows} == {
+            ("enrich_prospect", "completed"), ("sms_retry", "failed"),
+        }
+        assert next(r for r in rows if r["status"] == "completed")["avg_duration_s"] == 3.0
+
+
+class TestRunRetention:
+    async def test_skips_when_lock_held(self):
+        mock_redis = AsyncMock()
+        mock_redis.set = AsyncMock(return_value=None)
+
+        with patch("src.utils.dedup.get_redis", new_callable=AsyncMock, return_value=mock_redis), \
+             patch("src.services.task_retention.compact_terminal_tasks", new_callable=AsyncMock) as mock_compact:
+            result = await run_retention()
+
+        assert result["skipped"] is True
+        mock_compact.assert_not_awaited()
+
+    async def test_runs_and_releases_lock(self):
+        mock_redis = AsyncMock()
+        mock_redis.set = AsyncMock(return_value=True)
+
+        with patch("src.utils.dedup.get_redis", new_callable=AsyncMock, return_value=mock_redis), \
+             patch("src.services.task_retention.compact_terminal_tasks", new_callable=AsyncMock, return_value=7), \
+             patch("src.services.task_retention.purge_archive", new_callable=AsyncMock, return_value=2):
+            result = await run_retention()
+
+        assert result == {"archived": 7, "purged": 2, "skipped": False}
+        # Released by compare-and-delete on this run's own token
+        key, token = mock_redis.set.await_args.args
+        assert key == task_retention.COMPACT_LOCK_KEY
+        mock_redis.eval.assert_awaited_once_with(
+            task_retention._RELEASE_LOCK_SCRIPT, 1, task_retention.COMPACT_LOCK_KEY, token,
+        )
+        mock_redis.delete.assert_not_awaited()
+
+    async def test_each_run_uses_its_own_lock_token(self):
+        mock_redis = AsyncMock()
+        mock_redis.set = AsyncMock(return_value=True)
+
+        with patch("src.utils.dedup.get_redis", new_callable=AsyncMock, return_value=mock_redis), \
+             patch("src.services.task_retention.compact_terminal_tasks", new_callable=AsyncMock, return_value=0), \
+             patch("src.services.task_retention.purge_archive", new_callable=AsyncMock, return_value=0):
+            await run_retention()
+            await run_retention()
+
+        first, second = (c.args[1] for c in mock_redis.set.await_args_list)
+        assert first != second
+
+    async def test_redis_down_still_compacts(self):
+        with patch("src.utils.dedup.get_redis", new_callable=AsyncMock, side_effect=Exception("down")), \
+             patch("src.services.task_retention.compact_terminal_tasks", new_callable=AsyncMock, return_value=1), \
+             patch("src.services.task_retention.purge_archive", new_callable=AsyncMock, return_value=0):
+            result = await run_retention()
+
+        assert result["archived"] == 1
@@ -0,0 +1,138 @@
+"""
+Tests for src/services/transcript.py - the bounded conversation window the
+qualify/book agents see. Conversations live in an in-memory SQLite
+database; Redis is mocked.
+"""
+import json
+import uuid
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from src.models.client import Client
+from src.models.conversation import Conversation
+from src.models.lead import Lead
+from src.services import transcript
+
+REDIS_PATCH = "src.utils.dedup.get_redis"
+
+
+def _redis(cached=None):
+    redis = MagicMock()
+    pipe = MagicMock()
+    pipe.execute = AsyncMock(return_value=[])
+    redis.pipeline.return_value = pipe
+    redis.lrange = AsyncMock(return_value=cached or [])
+    return redis
+
+
+@pytest.fixture
+async def lead(db):
+    client = Client(business_name="Cool HVAC Co", trade_type="hvac", twilio_phone="+15125550000")
+    db.add(client)
+    await db.flush()
+    lead = Lead(client_id=client.id, phone="+15125559876", source="google_lsa")
+    db.add(lead)
+    await db.commit()
+    return lead
+
+
+async def _add_messages(db, lead, count):
+    start = datetime.now(timezone.utc) - timedelta(hours=1)
+    for n in range(count):
+        db.add(Conversation(
+            lead_id=lead.id,
+            client_id=lead.client_id,
+            direction="inbound" if n % 2 else "outbound",
+            content=f"message {n}",
+            from_phone="+15125550000",
+            to_phone="+15125559876",
+            created_at=start + timedelta(minutes=n),
+        ))
+    await db.commit()
+
+
+class TestRecentTurns:
+    async def test_loads_only_last_turns_oldest_first(self, db, lead):
+        await _add_messages(db, lead, 12)
+
+        with patch(REDIS_PATCH, new_callable=AsyncMock, side_effect=ConnectionError("down")):
+            turns = await transcript.recent_turns(db, lead.id)
+
+        assert [t["content"] for t in turns] == [f"message {n}" for n in range(4, 12)]
+        assert turns[-1] == {"direction": "inbound", "content": "message 11"}
+
+    async def test_includes_pending_message(self, db, lead):
+        await _add_messages(db, lead, 2)
+        db.add(Conversation(
+            lead_id=lead.id, client_id=lead.client_id, direction="inbound",
+            content="Tomorrow works", from_phone="+15125559876", to_phone="+15125550000",
+        ))
+
+        with patch(REDIS_PATCH, new_callable=AsyncMock, side_effect=ConnectionError("down")):
+            turns = await transcript.recent_turns(db, lead.id, limit=2)
+
+        assert [t["content"] for t in turns] == ["message 1", "Tomorrow works"]
+
+    async def test_miss_backfills_ring(self, db, lead):
+        await _add_messages(db, lead, 10)
+        redis = _redis()
+
+        with patch(REDIS_PATCH, new_callable=AsyncMock, return_value=redis):
+            turns = await transcript.recent_turns(db, lead.id, limit=3)
+
+        assert [t["content"] for t in turns] == ["message 7", "message 8", "message 9"]
+        key = f"leadlock:transcript:{lead.id}"
+        redis.lrange.assert_awaited_once_with(key, -3, -1)
+        pipe = redis.pipeline.return_value
+        pipe.delete.assert_called_once_with(key)
+        pushed = pipe.rpush.call_args.args
+        assert pushed[0] == key
+        assert [json.loads(item)["content"] for item in pushed[1:]] == [
+            f"message {n}" for n in range(2, 10)
+        ]
+        pipe.expire.assert_called_once_with(key, transcript.TRANSCRIPT_TTL_SECONDS)
+
+    async def test_hit_skips_db(self):
+        cached = [
+            json.dumps({"direction": "outbound", "content": "What service do you need?"}),
+            json.dumps({"direction": "inbound", "content": "AC repair"}),
+        ]
+        db = AsyncMock()
+
+        with patch(REDIS_PATCH, new_callable=AsyncMock, return_value=_redis(cached)):
+            turns = await transcript.recent_turns(db, uuid.uuid4())
+
+        assert turns == [
+            {"direction": "outbound", "content": "What service do you need?"},
+            {"direction": "inbound", "content": "AC repair"},
+        ]
+        db.execute.assert_not_awaited()
+
+    async def test_no_history_is_not_cached(self, db, lead):
+        redis = _redis()
+        with patch(REDIS_PATCH, new_callable=AsyncMock, return_value=redis):
+            assert await transcript.recent_turns(db, lead.id) == []
+
+        redis.pipeline.assert_not_called()
+
+
+class TestAppendTurn:
+    async def test_extends_existing_ring_only(self):
+        redis = _redis()
+        lead_id = uuid.uuid4()
+
+        with patch(REDIS_PATCH, new_callable=AsyncMock, return_value=redis):
+            await transcript.append_turn(lead_id, "outbound", "See you at 9am")
+
+        key = f"leadlock:transcript:{lead_id}"
+        pipe = redis.pipeline.return_value
+        pipe.rpushx.assert_called_once_with(
+            key, json.dumps({"direction": "outbound", "content": "See you at 9am"}),
+        )
+        pipe.ltrim.assert_called_once_with(key, -transcript.TRANSCRIPT_TURNS, -1)
+
+    async def test_redis_failure_is_ignored(self):
+        with patch(REDIS_PATCH, new_callable=AsyncMock, side_effect=ConnectionError("down")):
+            await transcript.append_turn(uuid.uuid4(), "inbound", "hello")
@@ -14,7 +14,7 @@ import pytest
 
 
 # ---------------------------------------------------------------------------
-# 1. src/utils/metrics.py - Timer + response_time_bucket
+# 1. src/utils/metrics.py - Timer, response_time_bucket, stage latency
 # ---------------------------------------------------------------------------
 
 
@@ -106,6 +106,178 @@ class TestResponseTimeBucket:
         assert response_time_bucket(999999) == "60s+"
 
 
+class TestLatencyTrace:
+    """Tests for LatencyTrace stage spans and the in-process histograms."""
+
+    @pytest.fixture(autouse=True)
+    def _reset_histograms(self):
+        from src.utils import metrics
+        metrics._stage_histograms.clear()
+        metrics._sla_breaches.clear()
+        yield
+        metrics._stage_histograms.clear()
+        metrics._sla_breaches.clear()
+
+    def test_span_records_stage(self):
+        from src.utils.metrics import LatencyTrace
+
+        trace = LatencyTrace("new_lead")
+        with trace.span("commit"):
+            time.sleep(0.02)
+        assert trace.stages["commit"] >= 15
+
+    def test_repeated_span_accumulates(self):
+        from src.utils.metrics import LatencyTrace
+
+        trace = LatencyTrace("new_lead")
+        with patch("src.utils.metrics.Timer.stop", return_value=7):
+            with trace.span("flush"):
+                pass
+            with trace.span("flush"):
+                pass
+        assert trace.stages["flush"] == 14
+
+    def test_span_records_on_exception(self):
+        from src.utils.metrics import LatencyTrace
+
+        trace = LatencyTrace("new_lead")
+        with pytest.raises(ValueError):
+            with trace.span("sms_send"):
+                raise ValueError("boom")
+        assert "sms_send" in trace.stages
+
+    async def test_timed_returns_awaitable_result(self):
+        from src.utils.metrics import LatencyTrace
+
+        async def _load():
+            return "client"
+
+        trace = LatencyTrace("new_lead")
+        assert await trace.timed("client_load", _load()) == "client"
+        assert "client_load" in trace.stages
+
+    def test_finish_feeds_histograms(self):
+        from src.utils import metrics
+
+        trace = metrics.LatencyTrace("new_lead")
+        trace.stages = {"dedup": 3, "sms_send": 400}
+        total = trace.finish()
+        assert total == trace.total_ms
+        hist = metrics._stage_histograms[("new_lead", "sms_send")]
+        assert hist["count"] == 1
+        assert hist["sum_ms"] == 400
+        # 400ms lands in the 500ms bucket and every bucket above it
+        assert hist["buckets"][metrics.STAGE_BUCKETS_MS.index(250)] == 0
+        assert hist["buckets"][metrics.STAGE_BUCKETS_MS.index(500)] == 1
+        assert ("new_lead", "total") in metrics._stage_histograms
+
+    def test_finish_over_target_blames_slowest_stage(self):
+        from src.utils import metrics
+
+        trace = metrics.LatencyTrace("new_lead")
+        trace.stages = {"dedup": 3, "commit": 40, "sms_send": 12000}
+        with patch.object(trace.timer, "stop", return_value=12100):
+            trace.finish(target_ms=10000)
+        assert metrics._sla_breaches == {("new_lead", "sms_send"): 1}
+
+    def test_finish_under_target_no_breach(self):
+        from src.utils import metrics
+
+        trace = metrics.LatencyTrace("new_lead")
+        trace.stages = {"sms_send": 200}
+        trace.finish(target_ms=10000)
+        assert metrics._sla_breaches == {}
+
+    def test_render_prometheus(self):
+        from src.utils import metrics
+
+        trace = metrics.LatencyTrace("new_lead")
+        trace.stages = {"sms_send": 12000}
+        with patch.object(trace.timer, "stop", return_value=12000):
+            trace.finish(target_ms=10000)
+        text = metrics.render_prometheus()
+
+        assert "# TYPE leadlock_stage_duration_seconds histogram" in text
+        assert 'leadlock_stage_duration_seconds_bucket{pipeline="new_lead",stage="sms_send",le="10"} 0' in text
+        assert 'leadlock_stage_duration_seconds_bucket{pipeline="new_lead",stage="sms_send",le="30"} 1' in text
+        assert 'leadlock_stage_duration_seconds_bucket{pipeline="new_lead",stage="sms_send",le="+Inf"} 1' in text
+        assert 'leadlock_stage_duration_seconds_sum{pipeline="new_lead",stage="sms_send"} 12' in text
+        assert 'leadlock_sla_breaches_total{pipeline="new_lead",stage="sms_send"} 1' in text
+        assert text.endswith("\n")
+
+
+class TestStagePercentiles:
+    """Tests for the rolling per-stage samples kept in Redis."""
+
+    async def test_record_pushes_each_stage_and_total(self):
+        from src.utils.metrics import LatencyTrace, record_stage_samples
+
+        mock_pipe = MagicMock()
+        mock_pipe.execute = AsyncMock(return_value=[])
+        mock_redis = MagicMock()
+        mock_redis.pipeline.return_value = mock_pipe
+
+        trace = LatencyTrace("new_lead")
+        trace.stages = {"commit": 12}
+        trace.total_ms = 50
+
+        with patch("src.utils.dedup.get_redis", new_callable=AsyncMock, return_value=mock_redis):
+            await record_stage_samples(trace)
+
+        mock_pipe.lpush.assert_any_call("leadlock:latency:new_lead:commit", 12)
+        mock_pipe.lpush.assert_any_call("leadlock:latency:new_lead:total", 50)
+        mock_pipe.ltrim.assert_any_call("leadlock:latency:new_lead:commit", 0, 999)
+        mock_pipe.sadd.assert_called_once_with("leadlock:latency:new_lead:stages", "commit", "total")
+        mock_pipe.execute.assert_awaited_once()
+
+    async def test_record_skips_unfinished_trace(self):
+        from src.utils.metrics import LatencyTrace, record_stage_samples
+
+        with patch("src.utils.dedup.get_redis", new_callable=AsyncMock) as mock_get:
+            await record_stage_samples(LatencyTrace("new_lead"))
+        mock_get.assert_not_called()
+
+    async def test_record_swallows_redis_errors(self):
+        from src.utils.metrics import LatencyTrace, record_stage_samples
+
+        trace = LatencyTrace("new_lead")
+        trace.total_ms = 50
+        with patch(
+            "src.utils.dedup.get_redis",
+            new_callable=AsyncMock,
+            side_effect=ConnectionError("Redis down"),
+        ):
+            await record_stage_samples(trace)
+
+    async def test_get_stage_percentiles(self):
+        from src.utils.metrics import get_stage_percentiles
+
+        mock_pipe = MagicMock()
+        mock_pipe.execute = AsyncMock(return_value=[
+            [str(v) for v in range(1, 101)],
+            [],
+        ])
+        mock_redis = MagicMock()
+        mock_redis.smembers = AsyncMock(return_value={"sms_send", "commit"})
+        mock_redis.pipeline.return_value = mock_pipe
+
+        with patch("src.utils.dedup.get_redis", new_callable=AsyncMock, return_value=mock_redis):
+            result = await get_stage_percentiles("new_lead")
+
+        # Stages are read in sorted order: commit, sms_send (empty window is dropped)
+        assert result == {
+            "commit": {"samples": 100, "p50_ms": 50, "p95_ms": 95, "p99_ms": 99, "max_ms": 100},
+        }
+
+    async def test_get_stage_percentiles_empty(self):
+        from src.utils.metrics import get_stage_percentiles
+
+        mock_redis = MagicMock()
+        mock_redis.smembers = AsyncMock(return_value=set())
+        with patch("src.utils.dedup.get_redis", new_callable=AsyncMock, return_value=mock_redis):
+            assert await get_stage_percentiles("new_lead") == {}
+
+
 # ---------------------------------------------------------------------------
 # 2. src/utils/timezone.py - get_timezone_for_state + get_zoneinfo
 # ---------------------------------------------------------------------------
@@ -745,6 +917,23 @@ class TestAcquireLock:
             assert mock_redis.set.call_count == 2
 
 
+    async def test_waits_on_release_notification(self):
+        """A waiter blocks on the lock's release list instead of sleeping."""
+        mock_redis = AsyncMock()
+        mock_redis.set = AsyncMock(side_effect=[False, True])
+        mock_redis.brpop = AsyncMock(return_value=("test-key:released", "1"))
+
+        with patch("src.utils.dedup.get_redis", new_callable=AsyncMock, return_value=mock_redis):
+            from src.utils.locks import _acquire_lock, LOCK_RECHECK_SECONDS
+
+            assert await _acquire_lock("test-key", "test-value", ttl=30, wait=5.0) is True
+
+        key = mock_redis.brpop.await_args.args[0]
+        timeout = mock_redis.brpop.await_args.kwargs["timeout"]
+        assert key == "test-key:released"
+        assert 0 < timeout <= LOCK_RECHECK_SECONDS
+
+
 class TestReleaseLock:
     """Tests for _release_lock internal function."""
 
@@ -764,6 +953,8 @@ class TestReleaseLock:
             lua_script = call_args[0][0]
             assert "redis.call('get'" in lua_script
             assert "redis.call('del'" in lua_script
+            # Release wakes one waiter blocked on the lock's release list
+            assert "redis.call('lpush', released" in lua_script
             # Key and value are passed as arguments
             assert call_args[0][2] == "test-key"
             assert call_args[0][3] == "test-value"
@@ -1,13 +1,18 @@
 """
 Tests for src/workers/crm_sync.py - CRM synchronization worker.
 """
+import asyncio
 import uuid
 from contextlib import asynccontextmanager
-from datetime import date, time, datetime, timezone
+from datetime import date, time, datetime, timedelta, timezone
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
+from src.models.booking import Booking
+from src.models.client import Client
+from src.models.lead import Lead
+
 
 # ---------------------------------------------------------------------------
 # Helpers
@@ -74,6 +79,40 @@ def _make_client(
     return client
 
 
+@pytest.fixture
+def crm_session_factory(db):
+    """Point the worker's sessions at the test database; Redis is not needed."""
+    @asynccontextmanager
+    async def _factory():
+        yield db
+
+    with (
+        patch("src.workers.crm_sync.async_session_factory", _factory),
+        patch("src.services.due_index.schedule", new_callable=AsyncMock),
+    ):
+        yield _factory
+
+
+async def _add_booking(db, **fields):
+    """Insert a client, lead and booking; returns the booking."""
+    client = Client(business_name="Cool HVAC Co", trade_type="hvac", crm_type="jobber")
+    db.add(client)
+    await db.flush()
+    lead = Lead(client_id=client.id, phone="+15125551234", source="google_lsa", first_name="John")
+    db.add(lead)
+    await db.flush()
+    booking = Booking(
+        lead_id=lead.id,
+        client_id=client.id,
+        appointment_date=date(2026, 3, 15),
+        service_type="AC Repair",
+        **fields,
+    )
+    db.add(booking)
+    await db.commit()
+    return booking
+
+
 @asynccontextmanager
 async def mock_session():
     db = MagicMock()
@@ -279,64 +318,31 @@ class TestSyncBookingMissingEntities:
 # ---------------------------------------------------------------------------
 
 class TestSyncPendingBookingsRetry:
-    """Tests for retry logic in sync_pending_bookings."""
+    """Tests for retry logic in sync_pending_bookings (bookings in SQLite)."""
 
-    async def test_crm_error_increments_retry_and_schedules_backoff(self):
+    async def test_crm_error_increments_retry_and_schedules_backoff(self, db, crm_session_factory):
         """CRM exception increments retry count and schedules next retry."""
-        booking = _make_booking(extra_data={"crm_retry_count": 1})
+        booking = await _add_booking(db, crm_retry_count=1)
 
-        scalars_mock = MagicMock()
-        scalars_mock.all.return_value = [booking]
-        result_mock = MagicMock()
-        result_mock.scalars.return_value = scalars_mock
-
-        @asynccontextmanager
-        async def session_factory():
-            db = MagicMock()
-            db.execute = AsyncMock(return_value=result_mock)
-            db.commit = AsyncMock()
-            yield db
-
-        with (
-            patch(
-                "src.workers.crm_sync.async_session_factory",
-                side_effect=session_factory,
-            ),
-            patch(
-                "src.workers.crm_sync.sync_booking",
-                new_callable=AsyncMock,
-                side_effect=RuntimeError("CRM connection failed"),
-            ),
+        with patch(
+            "src.workers.crm_sync.sync_booking",
+            new_callable=AsyncMock,
+            side_effect=RuntimeError("CRM connection failed"),
         ):
             from src.workers.crm_sync import sync_pending_bookings
 
             await sync_pending_bookings()
 
-            assert booking.crm_sync_status == "retrying"
-            assert booking.extra_data["crm_retry_count"] == 2
-            assert "crm_next_retry_at" in booking.extra_data
+        assert booking.crm_sync_status == "retrying"
+        assert booking.crm_retry_count == 2
+        delay = booking.crm_next_retry_at - datetime.now(timezone.utc)
+        assert timedelta(seconds=110) < delay <= timedelta(seconds=120)
 
-    async def test_max_retries_sets_failed_and_sends_alert(self):
+    async def test_max_retries_sets_failed_and_sends_alert(self, db, crm_session_factory):
         """After max retries, booking is marked failed and alert is sent."""
-        booking = _make_booking(extra_data={"crm_retry_count": 5})
-
-        scalars_mock = MagicMock()
-        scalars_mock.all.return_value = [booking]
-        result_mock = MagicMock()
-        result_mock.scalars.return_value = scalars_mock
-
-        @asynccontextmanager
-        async def session_factory():
-            db = MagicMock()
-            db.execute = AsyncMock(return_value=result_mock)
-            db.commit = AsyncMock()
-            yield db
+        booking = await _add_booking(db, crm_sync_status="retrying", crm_retry_count=5)
 
         with (
-            patch(
-                "src.workers.crm_sync.async_session_factory",
-                side_effect=session_factory,
-            ),
             patch(
                 "src.workers.crm_sync.sync_booking",
                 new_callable=AsyncMock,
@@ -351,9 +357,103 @@ class TestSyncPendingBookingsRetry:
 
             await sync_pending_bookings()
 
-            assert booking.crm_sync_status == "failed"
-            assert "Max retries" in booking.crm_sync_error
-            mock_alert.assert_awaited_once()
+        assert booking.crm_sync_status == "failed"
+        assert "Max retries" in booking.crm_sync_error
+        assert booking.crm_next_retry_at is None
+        mock_alert.assert_awaited_once()
+
+    async def test_retry_not_due_is_left_alone(self, db, crm_session_factory):
+        """A retrying booking is skipped until crm_next_retry_at passes."""
+        retry_at = datetime.now(timezone.utc) + timedelta(minutes=10)
+        await _add_booking(db, crm_sync_status="retrying", crm_retry_count=2, crm_next_retry_at=retry_at)
+
+        with patch("src.workers.crm_sync.sync_booking", new_callable=AsyncMock) as mock_sync:
+            from src.workers.crm_sync import sync_pending_bookings
+
+            await sync_pending_bookings()
+
+        mock_sync.assert_not_awaited()
+
+
+# ---------------------------------------------------------------------------
+# sync_pending_bookings - claimed batches
+# ---------------------------------------------------------------------------
+
+class TestSyncPendingBookingsBatch:
+    """Tests for batch claiming and concurrency in sync_pending_bookings."""
+
+    async def test_batch_passes_preloaded_lead_and_client(self, db, crm_session_factory):
+        """Leads and clients are loaded with the claim, not per booking."""
+        first = await _add_booking(db)
+        second = await _add_booking(db)
+        seen = {}
+
+        async def _fake_sync(session, booking, lead=None, client=None):
+            seen[booking.id] = (lead.id, client.id)
+            booking.crm_sync_status = "synced"
+
+        with patch("src.workers.crm_sync.sync_booking", side_effect=_fake_sync):
+            from src.workers.crm_sync import sync_pending_bookings
+
+            await sync_pending_bookings()
+
+        assert seen == {
+            first.id: (first.lead_id, first.client_id),
+            second.id: (second.lead_id, second.client_id),
+        }
+        assert first.crm_sync_status == second.crm_sync_status == "synced"
+        assert first.crm_next_retry_at is None
+
+    async def test_booking_changed_after_claim_is_skipped(self, db, crm_session_factory):
+        """A booking whose lease no longer matches is not synced."""
+        booking = await _add_booking(db)
+
+        from src.workers import crm_sync
+
+        batch = await crm_sync._claim_pending_bookings()
+        assert booking.crm_next_retry_at == batch.claimed_until
+
+        booking.crm_next_retry_at = None
+        await db.commit()
+
+        with patch.object(crm_sync, "sync_booking", new_callable=AsyncMock) as mock_sync:
+            assert await crm_sync._sync_claimed_booking(booking.id, batch) is None
+
+        mock_sync.assert_not_awaited()
+
+    async def test_concurrency_is_limited_per_crm_type(self):
+        """Bookings for one CRM type never exceed its CRM_CONCURRENCY slots."""
+        from src.workers import crm_sync
+
+        jobber = _make_client(crm_type="jobber")
+        sheets = _make_client(crm_type="google_sheets")
+        bookings = (
+            [_make_booking(client_id=jobber.id) for _ in range(5)]
+            + [_make_booking(client_id=sheets.id) for _ in range(3)]
+        )
+        batch = crm_sync._SyncBatch(
+            bookings, {}, {jobber.id: jobber, sheets.id: sheets}, datetime.now(timezone.utc),
+        )
+        in_flight = {"jobber": 0, "google_sheets": 0}
+        peak = {"jobber": 0, "google_sheets": 0}
+
+        async def _fake_sync(booking_id, claimed):
+            crm_type = claimed.clients[claimed.client_ids[booking_id]].crm_type
+            in_flight[crm_type] += 1
+            peak[crm_type] = max(peak[crm_type], in_flight[crm_type])
+            await asyncio.sleep(0.01)
+            in_flight[crm_type] -= 1
+
+        with (
+            patch.object(crm_sync, "_claim_pending_bookings", AsyncMock(return_value=batch)),
+            patch.object(crm_sync, "_sync_claimed_booking", side_effect=_fake_sync) as mock_sync,
+            patch.dict(crm_sync.CRM_CONCURRENCY, {"jobber": 2, "google_sheets": 1}),
+            patch("src.services.due_index.schedule", new_callable=AsyncMock),
+        ):
+            await crm_sync.sync_pending_bookings()
+
+        assert mock_sync.await_count == 8
+        assert peak == {"jobber": 2, "google_sheets": 1}
 
 
 # ---------------------------------------------------------------------------
@@ -403,3 +503,35 @@ class TestGetCRMForClient:
         crm = get_crm_for_client(client)
 
         assert crm is None
+
+    def test_adapter_is_reused_for_same_credentials(self):
+        """Repeat syncs for a client reuse one adapter and decrypt the key once."""
+        client = _make_client(crm_type="jobber", crm_config={})
+        client.crm_api_key_encrypted = "enc_key"
+
+        with patch("src.utils.encryption.decrypt_value", return_value="api_key") as mock_decrypt:
+            from src.workers.crm_sync import get_crm_for_client
+
+            first = get_crm_for_client(client)
+            second = get_crm_for_client(client)
+
+        assert first is second
+        mock_decrypt.assert_called_once_with("enc_key")
+
+    def test_adapter_is_rebuilt_when_credentials_change(self):
+        """A new API key, tenant or config replaces the cached adapter."""
+        client = _make_client(crm_type="servicetitan", crm_tenant_id="tenant_1")
+        client.crm_api_key_encrypted = None
+
+        from src.workers.crm_sync import get_crm_for_client
+
+        first = get_crm_for_client(client)
+        client.crm_tenant_id = "tenant_2"
+        second = get_crm_for_client(client)
+        client.crm_config = {**client.crm_config, "client_secret": "rotated"}
+        third = get_crm_for_client(client)
+
+        assert first is not second and second is not third
+        assert second.tenant_id == "tenant_2"
+        assert third.client_secret == "rotated"
+        assert get_crm_for_client(client) is third
@@ -263,7 +263,7 @@ class TestSmsDispatch:
         mock_client = MagicMock()
 
         mock_session = AsyncMock()
-        mock_session.get.side_effect = lambda model, id: mock_lead if id == "lead-1" else mock_client
+        mock_session.get.side_effect = lambda model, id, **kw: mock_lead if id == "lead-1" else mock_client
 
         await _execute_followup_task(mock_session, mock_task)
 